@@ -1,15 +1,19 @@
 """Main API entry point (legacy - use api/app.py)."""
 from api.app import create_app
-from config.settings import Settings
+from config.settings import get_settings
 
 app = create_app()
-settings = Settings()
+settings = get_settings()
 
 if __name__ == "__main__":
     import uvicorn
+    # Several workers each build the app from its factory
     uvicorn.run(
-        app,
+        "api.app:create_app" if settings.api_workers > 1 else app,
+        factory=settings.api_workers > 1,
         host=settings.api_host,
         port=settings.api_port,
-        reload=settings.api_reload
+        reload=settings.api_reload,
+        workers=settings.api_workers,
+        ws_per_message_deflate=settings.ws_per_message_deflate
     )
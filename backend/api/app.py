@@ -1,8 +1,64 @@
 """FastAPI application factory."""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from config.settings import Settings
+from fastapi.responses import PlainTextResponse
+import asyncio
+import os
+from config.settings import Settings, get_settings
+from infrastructure.metrics import CONTENT_TYPE, get_metrics, watch_event_loop_lag
 from api.routes.mission import router as mission_router
+from api.routes.batch import router as batch_router
+from api.routes.cache import router as cache_router
+from api.routes.prices import router as prices_router
+
+
+def api_worker_count(settings: Settings) -> int:
+    """
+    Get the number of uvicorn workers serving the API.
+    
+    Args:
+        settings: Application settings
+        
+    Returns:
+        The larger of api_workers and WEB_CONCURRENCY
+    """
+    try:
+        concurrency = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    except ValueError:
+        concurrency = 1
+    return max(settings.api_workers, concurrency)
+
+
+def check_api_workers(settings: Settings) -> None:
+    """
+    Refuse to serve from several uvicorn workers what only one process can own.
+    
+    Mission records and events are shared through SQLite, but the page
+    cache file and the price store directory are rewritten whole by their
+    single writer, so workers would drop each other's entries. Scheduler
+    queues, result caches and rate limits are not shared either: each
+    worker queues, deduplicates and throttles the missions it started.
+    
+    Args:
+        settings: Application settings
+        
+    Raises:
+        RuntimeError: If several workers are configured with state they cannot share
+    """
+    workers = api_worker_count(settings)
+    if workers <= 1:
+        return
+    required = []
+    if settings.mission_store_backend != "sqlite":
+        required.append("MISSION_STORE_BACKEND=sqlite")
+    if settings.mission_event_backend != "sqlite":
+        required.append("MISSION_EVENT_BACKEND=sqlite")
+    if settings.page_cache_enabled and settings.page_cache_path:
+        required.append("PAGE_CACHE_PATH unset (or PAGE_CACHE_ENABLED=false)")
+    if settings.price_store_enabled and settings.price_store_dir:
+        required.append("PRICE_STORE_DIR unset (or PRICE_STORE_ENABLED=false)")
+    if required:
+        raise RuntimeError(f"{workers} API workers need {', '.join(required)}")
 
 
 def create_app() -> FastAPI:
@@ -11,8 +67,12 @@ def create_app() -> FastAPI:
     
     Returns:
         Configured FastAPI application
+        
+    Raises:
+        RuntimeError: If several workers are configured with state they cannot share
     """
-    settings = Settings()
+    settings = get_settings()
+    check_api_workers(settings)
     
     app = FastAPI(
         title=settings.api_title,
@@ -30,6 +90,9 @@ def create_app() -> FastAPI:
     
     # Include routers
     app.include_router(mission_router, prefix="/api/v1", tags=["missions"])
+    app.include_router(batch_router, prefix="/api/v1", tags=["missions"])
+    app.include_router(cache_router, prefix="/api/v1", tags=["cache"])
+    app.include_router(prices_router, prefix="/api/v1", tags=["prices"])
     
     @app.get("/")
     async def root():
@@ -45,4 +108,26 @@ def create_app() -> FastAPI:
         """Health check endpoint."""
         return {"status": "healthy"}
     
+    metrics = get_metrics()
+    if metrics is not None:
+        lag_watchers = []
+        
+        @app.on_event("startup")
+        async def watch_lag():
+            """Start sampling event loop lag."""
+            lag_watchers.append(asyncio.create_task(
+                watch_event_loop_lag(metrics.event_loop_lag_seconds, settings.metrics_loop_lag_interval)
+            ))
+        
+        @app.on_event("shutdown")
+        async def stop_watching_lag():
+            """Stop sampling event loop lag."""
+            while lag_watchers:
+                lag_watchers.pop().cancel()
+        
+        @app.get("/metrics", include_in_schema=False)
+        async def prometheus_metrics():
+            """Metrics in the Prometheus text exposition format."""
+            return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+    
     return app
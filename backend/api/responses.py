@@ -0,0 +1,21 @@
+"""Response classes for API routes."""
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from infrastructure.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered by the configured serialization backend.
+    
+    Used as the default response class of the mission routes. Routes with
+    large or model payloads return it directly, which also skips FastAPI's
+    jsonable_encoder pass; pydantic models are rendered by pydantic-core
+    without building an intermediate dict.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return dumps(content)
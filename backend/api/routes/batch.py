@@ -0,0 +1,109 @@
+"""Batch mission API routes."""
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, AsyncIterator, Dict, List, Optional
+from api.responses import FastJSONResponse
+from api.routes.mission import client_host, launch_mission, mission_service, settings
+from infrastructure.serialization import dumps
+from services.batch_service import BatchService
+from core.exceptions import BatchNotFoundError
+
+router = APIRouter(default_response_class=FastJSONResponse)
+
+batch_service = BatchService(mission_service, launch_mission, max_batches=settings.batch_max_stored)
+
+
+class BatchRequest(BaseModel):
+    """Request model for submitting a batch of missions."""
+    goals: List[str] = Field(..., description="Mission goals", min_length=1, max_length=settings.batch_max_goals)
+    headless: bool = Field(default=True, description="Run browsers in headless mode")
+    max_iterations: int = Field(
+        default=100,
+        ge=1,
+        le=500,
+        description="Maximum number of iterations per mission"
+    )
+    max_age: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Maximum age in seconds of a cached result to reuse (0 forces new missions)"
+    )
+    max_seconds: Optional[float] = Field(default=None, gt=0, description="Wall-clock budget in seconds per mission")
+    max_pages: Optional[int] = Field(default=None, ge=1, description="Page navigation budget per mission")
+    max_bytes: Optional[int] = Field(default=None, ge=1, description="Network bytes budget per mission")
+    max_cpu_seconds: Optional[float] = Field(default=None, gt=0, description="CPU time budget in seconds per mission")
+
+
+@router.post("/missions/batch")
+async def start_batch(request: BatchRequest, http_request: Request) -> Dict[str, Any]:
+    """
+    Create and start missions for many goals.
+    
+    Goals compiling to the same research share one mission, and missions
+    visiting the same pages share their fetches and extractions.
+    
+    Args:
+        request: Batch request data
+        http_request: Incoming HTTP request
+        
+    Returns:
+        Batch ID, the mission serving each goal and the number of missions started
+    """
+    goals = [goal.strip() for goal in request.goals]
+    if not all(goals):
+        raise HTTPException(status_code=422, detail="Goals must not be empty")
+    try:
+        return batch_service.create_batch(
+            goals,
+            headless=request.headless,
+            max_iterations=request.max_iterations,
+            max_age=request.max_age,
+            budget=request.model_dump(
+                include={"max_seconds", "max_pages", "max_bytes", "max_cpu_seconds"},
+                exclude_none=True
+            ),
+            client_id=client_host(http_request)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/missions/batch/{batch_id}")
+async def get_batch(batch_id: str) -> Dict[str, Any]:
+    """
+    Get aggregate progress and results of a batch.
+    
+    Args:
+        batch_id: Batch identifier
+        
+    Returns:
+        Goal states, counts per status and whether every goal is done
+    """
+    try:
+        return FastJSONResponse(batch_service.get_batch(batch_id))
+    except BatchNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/missions/batch/{batch_id}/stream")
+async def stream_batch(batch_id: str) -> StreamingResponse:
+    """
+    Stream each goal's result as NDJSON as soon as its mission finishes.
+    
+    Args:
+        batch_id: Batch identifier
+        
+    Returns:
+        application/x-ndjson response with one line per goal, ending when the batch is done
+    """
+    try:
+        completions = batch_service.iter_completions(batch_id)
+    except BatchNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    async def lines() -> AsyncIterator[bytes]:
+        async for completion in completions:
+            yield dumps(completion) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
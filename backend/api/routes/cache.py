@@ -0,0 +1,23 @@
+"""Page cache API routes."""
+from fastapi import APIRouter
+from typing import Dict, Any
+from infrastructure.page_cache import get_page_cache
+
+router = APIRouter()
+
+
+@router.get("/cache/stats")
+async def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get cross-mission page cache statistics.
+    
+    Returns:
+        Cache size, hit/miss counters and hit rate
+    """
+    page_cache = get_page_cache()
+    if page_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **page_cache.stats()}
+
+
+cache_router = router
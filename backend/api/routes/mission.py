@@ -1,24 +1,133 @@
 """Mission API routes."""
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import asyncio
 import json
-import queue
+import re
+from api.responses import FastJSONResponse
 from services.mission_service import MissionService
-from repositories.mission_repository import MissionRepository
-from infrastructure.browser_engine import BrowserEngine
-from infrastructure.memory import Memory
-from services.agent import MarketRadarAgent
-from core.exceptions import MissionNotFoundError, MissionAlreadyRunningError
-from config.settings import Settings
+from repositories.mission_repository import create_mission_repository
+from infrastructure.checkpoint_store import CheckpointStore
+from infrastructure.metrics import RadarMetrics, get_metrics
+from infrastructure.page_cache import get_page_cache
+from infrastructure.price_store import get_price_store
+from infrastructure.rate_limiter import get_rate_limiter
+from infrastructure.result_store import csv_chunks, get_result_store, ndjson_chunks
+from infrastructure.message_channel import MessageChannel
+from infrastructure.event_bus import create_event_bus
+from infrastructure.event_hub import TERMINAL_MESSAGES, ProgressDelta, encode_text
+from core.domain.events import ErrorEvent
+from services.mission_runner import (
+    bind_mission_service,
+    init_mission_worker,
+    prewarm_browser,
+    results_url,
+    run_mission
+)
+from services.result_cache import MissionResultCache
+from services.scheduler import MissionScheduler, default_worker_count
+from services.worker_pool import ProcessMissionPool
+from core.exceptions import (
+    MissionAlreadyRunningError,
+    MissionNotFoundError,
+    MissionQueueFullError
+)
+from config.settings import get_settings
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 # Dependency injection - in production, use a DI container
-mission_repository = MissionRepository()
-mission_service = MissionService(mission_repository)
-settings = Settings()
+settings = get_settings()
+mission_repository = create_mission_repository(settings)
+checkpoint_store = CheckpointStore(settings.checkpoint_dir)
+
+
+def fail_lost_mission(mission_id: str, reason: str) -> None:
+    """
+    Fail a mission whose worker process exited before the mission ended.
+    
+    Args:
+        mission_id: Mission identifier
+        reason: Why the worker was lost
+    """
+    if not mission_service.repository.update_if_exists(mission_id, is_running=False, error=reason):
+        return
+    mission_service.result_cache.release(mission_service.repository.get(mission_id)["goal"], mission_id)
+    mission_service.publish(mission_id, ErrorEvent(message=f"Mission failed: {reason}", fatal=True).to_message())
+
+
+def create_scheduler() -> MissionScheduler:
+    """
+    Create the mission scheduler: worker threads, or worker processes when configured.
+    
+    Returns:
+        MissionScheduler or ProcessMissionPool
+    """
+    browser_factory = prewarm_browser if settings.scheduler_prewarm else None
+    if settings.mission_worker_processes > 0:
+        return ProcessMissionPool(
+            processes=settings.mission_worker_processes,
+            initializer=init_mission_worker,
+            browser_factory=browser_factory,
+            max_queue=settings.scheduler_max_queue,
+            max_missions_per_worker=settings.mission_worker_max_missions,
+            start_method=settings.mission_worker_start_method,
+            on_worker_lost=fail_lost_mission,
+            shared={
+                "page_cache": get_page_cache(),
+                "price_store": get_price_store(),
+                "rate_limiter": get_rate_limiter(),
+                "metrics": get_metrics()
+            }
+        )
+    return MissionScheduler(
+        workers=settings.scheduler_workers or default_worker_count(settings.scheduler_browser_memory_mb),
+        browser_factory=browser_factory,
+        max_queue=settings.scheduler_max_queue
+    )
+
+
+scheduler = create_scheduler()
+mission_service = MissionService(
+    mission_repository,
+    MissionResultCache(
+        default_max_age=settings.mission_result_max_age,
+        max_entries=settings.mission_result_cache_size
+    ),
+    scheduler,
+    stop_timeout=settings.mission_stop_timeout,
+    replay_size=settings.mission_event_replay_size,
+    outbox_size=settings.ws_outbox_size,
+    event_bus=create_event_bus(settings)
+)
+bind_mission_service(mission_service)
+if isinstance(scheduler, ProcessMissionPool):
+    scheduler.service = mission_service
+
+
+def bind_metrics(metrics: RadarMetrics) -> None:
+    """
+    Compute the scheduler and WebSocket outbox gauges from their owners when scraped.
+    
+    Args:
+        metrics: Metrics served at /metrics
+    """
+    def missions() -> Dict[tuple, float]:
+        stats = scheduler.stats()
+        return {("running",): stats["running"], ("queued",): stats["queued"]}
+    
+    def outboxes() -> Dict[tuple, float]:
+        depths = mission_service.outbox_depths()
+        return {("total",): sum(depths), ("max",): max(depths, default=0)}
+    
+    metrics.missions.set_function(missions)
+    metrics.ws_outbox_messages.set_function(outboxes)
+
+
+if get_metrics() is not None:
+    bind_metrics(get_metrics())
 
 
 class MissionRequest(BaseModel):
@@ -31,129 +140,175 @@ class MissionRequest(BaseModel):
         le=500,
         description="Maximum number of iterations"
     )
+    max_age: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Maximum age in seconds of a cached result to reuse (0 forces a new mission that is not shared with in-flight requests)"
+    )
+    max_seconds: Optional[float] = Field(default=None, gt=0, description="Wall-clock budget in seconds")
+    max_pages: Optional[int] = Field(default=None, ge=1, description="Page navigation budget")
+    max_bytes: Optional[int] = Field(default=None, ge=1, description="Network bytes budget")
+    max_cpu_seconds: Optional[float] = Field(default=None, gt=0, description="CPU time budget in seconds")
+    autostart: bool = Field(
+        default=True,
+        description="Start the mission right away (otherwise it starts when a WebSocket connects)"
+    )
 
 
-def run_mission(mission_id: str, goal: str, headless: bool, max_iterations: int, message_queue: queue.Queue):
+def launch_mission(mission_id: str, client_id: str) -> Optional[int]:
     """
-    Run mission in a separate thread.
+    Hand a created mission to the scheduler.
     
     Args:
         mission_id: Mission identifier
-        goal: Mission goal
-        headless: Whether to run browser in headless mode
-        max_iterations: Maximum number of iterations
-        message_queue: Queue for sending messages
-    """
-    try:
-        browser = BrowserEngine(headless=headless)
-        memory = Memory()
-        agent = MarketRadarAgent(browser, memory, goal)
+        client_id: Client used for fair queueing
         
-        browser.start()
-        browser.goto("https://www.google.com")
-        
-        message_queue.put({
-            "type": "status",
-            "message": "Mission started",
-            "url": browser.current_url
-        })
-        
-        iteration = 0
-        
-        while not agent.goal_achieved and iteration < max_iterations:
-            iteration += 1
-            
-            page_state = browser.get_page_state()
-            action_command = agent.decide_action(page_state)
-            result = agent.execute_action(action_command)
-            
-            response_data = {
-                "type": "action",
-                "iteration": iteration,
-                "thought_process": action_command["thought_process"],
-                "reasoning": action_command["reasoning"],
-                "action": action_command["action"],
-                "result": result,
-                "is_goal_achieved": action_command["is_goal_achieved"],
-                "url": browser.current_url,
-                "extracted_data_count": len(memory.get_extracted_data()),
-                "sources_visited": len(agent.sources_visited)
-            }
-            
-            message_queue.put(response_data)
-            
-            # Update mission status
-            mission_service.repository.update(
-                mission_id,
-                sources_visited=len(agent.sources_visited),
-                data_points=len(memory.get_extracted_data())
-            )
-            
-            if action_command.get("is_goal_achieved") or action_command["action"]["name"] == "finish":
-                mission_service.repository.update(mission_id, is_complete=True)
-                final_data = {
-                    "type": "complete",
-                    "summary": memory.get_summary(),
-                    "extracted_data": memory.get_extracted_data(),
-                    "total_iterations": iteration
-                }
-                message_queue.put(final_data)
-                break
-            
-            if not result.get("success", False):
-                message_queue.put({
-                    "type": "error",
-                    "message": f"Action failed: {result.get('error', 'Unknown error')}"
-                })
-        
-        if not agent.goal_achieved:
-            mission_service.repository.update(mission_id, is_complete=True)
-            message_queue.put({
-                "type": "incomplete",
-                "message": "Max iterations reached",
-                "summary": memory.get_summary(),
-                "extracted_data": memory.get_extracted_data()
-            })
-        
-        browser.stop()
-        mission_service.repository.update(mission_id, is_running=False)
-        message_queue.put({"type": "finished"})
+    Returns:
+        Queue position while the mission waits for a worker, otherwise None
         
-    except Exception as e:
-        mission_service.repository.update(mission_id, is_running=False, error=str(e))
-        message_queue.put({
-            "type": "error",
-            "message": f"Mission failed: {str(e)}"
-        })
+    Raises:
+        MissionAlreadyRunningError: If the mission is already running
+        MissionQueueFullError: If the scheduler queue is full
+    """
+    mission = mission_service.repository.get(mission_id)
+    return mission_service.start_mission_thread(
+        mission_id,
+        run_mission,
+        mission["goal"],
+        mission["headless"],
+        mission["max_iterations"],
+        mission.get("budget_limits"),
+        mission.get("resume", False),
+        client_id=client_id
+    )
+
+
+def client_host(connection: Any) -> str:
+    """Identify the client of a request or WebSocket for fair queueing."""
+    return connection.client.host if connection.client else "anonymous"
 
 
 @router.post("/mission/start")
-async def start_mission(request: MissionRequest) -> Dict[str, Any]:
+def start_mission(request: MissionRequest, http_request: Request) -> Dict[str, Any]:
     """
-    Start a new mission.
+    Create a mission and start it.
+    
+    The mission runs whether or not anyone is connected; any number of
+    WebSocket clients can watch it. Declared without async so that the
+    repository calls run in the threadpool.
     
     Args:
         request: Mission request data
+        http_request: Incoming HTTP request
         
     Returns:
-        Mission ID and WebSocket URL
+        Mission ID, WebSocket URL and queue position, or the cached result of
+        an equivalent mission that finished within max_age seconds
     """
     try:
         result = mission_service.create_mission(
             goal=request.goal,
             headless=request.headless,
-            max_iterations=request.max_iterations
+            max_iterations=request.max_iterations,
+            max_age=request.max_age,
+            budget=request.model_dump(
+                include={"max_seconds", "max_pages", "max_bytes", "max_cpu_seconds"},
+                exclude_none=True
+            )
         )
+        if request.autostart and not result.get("cached") and not result.get("coalesced"):
+            result["queue_position"] = launch_mission(result["mission_id"], client_host(http_request))
         return result
+    except MissionQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/mission/{mission_id}/resume")
+def resume_mission(mission_id: str, http_request: Request) -> Dict[str, Any]:
+    """
+    Resume a mission from its last checkpoint.
+    
+    Declared without async so that loading the checkpoint and the
+    repository calls run in the threadpool.
+    
+    Args:
+        mission_id: Mission identifier
+        http_request: Incoming HTTP request
+        
+    Returns:
+        Mission ID, WebSocket URL, the iteration the mission resumes from and
+        its queue position
+    """
+    checkpoint = checkpoint_store.load(mission_id)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail=f"No checkpoint for mission {mission_id}")
+    try:
+        result = mission_service.resume_mission(mission_id, checkpoint)
+        result["queue_position"] = launch_mission(mission_id, client_host(http_request))
+        return result
+    except MissionAlreadyRunningError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except MissionQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/missions/queue")
+async def get_queue_stats() -> Dict[str, Any]:
+    """
+    Get mission scheduler statistics.
+    
+    Returns:
+        Worker, running and queued mission counts
+    """
+    return scheduler.stats()
+
+
+@router.post("/missions/queue/restart")
+def restart_workers() -> Dict[str, Any]:
+    """
+    Replace the mission worker processes without interrupting running missions.
+    
+    Declared without async so that stopping idle workers runs in the threadpool.
+    
+    Returns:
+        Number of workers being replaced
+    """
+    if not isinstance(scheduler, ProcessMissionPool):
+        raise HTTPException(status_code=409, detail="Missions run on threads; there are no worker processes")
+    return {"message": "Workers restarting", "workers": scheduler.restart()}
+
+
+@router.on_event("shutdown")
+def stop_worker_processes() -> None:
+    """Stop idle worker processes so their browsers close before the API exits."""
+    if isinstance(scheduler, ProcessMissionPool):
+        scheduler.shutdown()
+
+
+@router.get("/missions/rate-limits")
+async def get_rate_limits() -> Dict[str, Any]:
+    """
+    Get per-host navigation rate limits and their backoff state.
+    
+    Returns:
+        Whether rate limiting is enabled and the state of each host seen
+    """
+    rate_limiter = get_rate_limiter()
+    return {
+        "enabled": rate_limiter is not None,
+        "hosts": rate_limiter.stats() if rate_limiter is not None else {}
+    }
+
+
 @router.get("/mission/{mission_id}/status")
-async def get_mission_status(mission_id: str) -> Dict[str, Any]:
+def get_mission_status(mission_id: str) -> Dict[str, Any]:
     """
     Get mission status.
     
+    Declared without async so that the repository read runs in the threadpool.
+    
     Args:
         mission_id: Mission identifier
         
@@ -161,44 +316,206 @@ async def get_mission_status(mission_id: str) -> Dict[str, Any]:
         Mission status
     """
     try:
-        status = mission_service.get_mission_status(mission_id)
-        return status.model_dump()
+        # Rendered straight from the model by pydantic-core
+        return FastJSONResponse(mission_service.get_mission_status(mission_id))
     except MissionNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated field list, or None to keep every field."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()] or None
+
+
+@router.get("/mission/{mission_id}/results")
+def get_mission_results(
+    mission_id: str,
+    cursor: Optional[int] = Query(None, ge=0, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=settings.results_page_max, description="Records per page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return")
+) -> Dict[str, Any]:
+    """
+    Get a page of a finished mission's extracted data.
+    
+    Declared without async so that SQLite reads run in the threadpool.
+    
+    Args:
+        mission_id: Mission identifier
+        cursor: Cursor returned with the previous page
+        limit: Maximum number of records
+        fields: Comma-separated fields to keep in each record
+        
+    Returns:
+        Records, the cursor of the next page (None on the last page) and the total count
+    """
+    result_store = get_result_store()
+    records, next_cursor = result_store.page(mission_id, cursor, limit, parse_fields(fields))
+    total = result_store.count(mission_id)
+    if not total and not mission_service.repository.exists(mission_id):
+        raise HTTPException(status_code=404, detail=f"Mission {mission_id} not found")
+    return FastJSONResponse({
+        "mission_id": mission_id,
+        "results": records,
+        "next_cursor": next_cursor,
+        "total": total
+    })
+
+
+@router.get("/mission/{mission_id}/results/export")
+def export_mission_results(
+    mission_id: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields (CSV columns) to export")
+) -> StreamingResponse:
+    """
+    Stream a finished mission's extracted data as NDJSON or CSV.
+    
+    Records are read and encoded in chunks, so memory use does not grow
+    with the size of the results.
+    
+    Args:
+        mission_id: Mission identifier
+        format: Export format
+        fields: Comma-separated fields to keep in each record
+        
+    Returns:
+        Streaming response with the records in extraction order
+    """
+    result_store = get_result_store()
+    if not result_store.count(mission_id) and not mission_service.repository.exists(mission_id):
+        raise HTTPException(status_code=404, detail=f"Mission {mission_id} not found")
+    
+    selected = parse_fields(fields)
+    filename = re.sub(r"[^\w-]", "_", mission_id)
+    chunk_size = settings.results_export_chunk_size
+    records = result_store.iter_records(mission_id, selected, chunk_size)
+    if format == "csv":
+        return StreamingResponse(
+            csv_chunks(records, selected or result_store.fields(mission_id), chunk_size),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'}
+        )
+    return StreamingResponse(
+        ndjson_chunks(records, chunk_size),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'}
+    )
+
+
 @router.delete("/mission/{mission_id}")
-async def stop_mission(mission_id: str) -> Dict[str, str]:
+def stop_mission(mission_id: str) -> Dict[str, Any]:
     """
-    Stop a running mission.
+    Stop a running mission and delete it.
+    
+    Declared without async so that waiting for the mission to release its
+    browser runs in the threadpool instead of blocking the event loop.
     
     Args:
         mission_id: Mission identifier
         
     Returns:
-        Success message
+        Success message and whether the mission acknowledged the stop in time
     """
     try:
-        mission_service.stop_mission(mission_id)
+        acknowledged = mission_service.stop_mission(mission_id)
         mission_service.delete_mission(mission_id)
-        return {"message": "Mission stopped"}
+        return {"message": "Mission stopped", "acknowledged": acknowledged}
     except MissionNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+async def pump_messages(
+    websocket: WebSocket,
+    mission_id: str,
+    channel: MessageChannel,
+    delta: bool = False
+) -> None:
+    """
+    Forward mission messages to a WebSocket until the mission ends or the client leaves.
+    
+    Waits on whichever happens first: a message published by the mission
+    thread or a message sent by the client. Neither wait blocks the event
+    loop, so one slow mission cannot stall other requests and sockets.
+    
+    Args:
+        websocket: Accepted WebSocket connection
+        mission_id: Mission identifier
+        channel: Channel receiving the mission's messages
+        delta: Whether to send only the action progress fields that changed
+    """
+    encoder = ProgressDelta() if delta else None
+    channel.bind(asyncio.get_running_loop())
+    next_message = asyncio.ensure_future(channel.get())
+    next_command = asyncio.ensure_future(websocket.receive_text())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_message, next_command}, return_when=asyncio.FIRST_COMPLETED)
+            
+            if next_message in done:
+                message = next_message.result()
+                # Hub messages carry the JSON text encoded once for all subscribers
+                text = encoder.encode(message) if encoder else encode_text(message)
+                await websocket.send_text(text)
+                if message.get("type") in TERMINAL_MESSAGES:
+                    return
+                if message.get("type") == "error" and message.get("fatal"):
+                    return
+                next_message = asyncio.ensure_future(channel.get())
+            
+            if next_command in done:
+                try:
+                    command = json.loads(next_command.result())
+                except WebSocketDisconnect:
+                    return
+                except ValueError:
+                    command = {}
+                if isinstance(command, dict) and command.get("type") == "stop":
+                    # Waiting for the acknowledgement must not block the event loop
+                    await asyncio.get_running_loop().run_in_executor(None, mission_service.stop_mission, mission_id)
+                    return
+                next_command = asyncio.ensure_future(websocket.receive_text())
+    finally:
+        for task in (next_message, next_command):
+            task.cancel()
+
+
 @router.websocket("/ws/{mission_id}")
 async def websocket_endpoint(websocket: WebSocket, mission_id: str):
     """
     WebSocket endpoint for mission updates.
     
+    Every connection subscribes to the mission's event hub and first
+    receives the recent events it missed. A mission created with
+    autostart disabled is started by the first connection. Connecting
+    with ?delta=true sends action progress fields only when they change.
+    
     Args:
         websocket: WebSocket connection
         mission_id: Mission identifier
     """
     await websocket.accept()
     
+    # Missions served from the result cache replay their stored result
+    cached = mission_service.result_cache.get_by_mission(mission_id)
+    if cached is not None:
+        message = {
+            "type": "complete",
+            "summary": cached["summary"],
+            "extracted_data": cached["extracted_data"][:settings.ws_inline_results],
+            "cached": True,
+            "results_url": results_url(mission_id)
+        }
+        if len(cached["extracted_data"]) > settings.ws_inline_results:
+            message.update(results_truncated=True, total_results=len(cached["extracted_data"]))
+        await websocket.send_text(encode_text(message))
+        await websocket.close()
+        return
+    
     try:
         mission = mission_service.repository.get(mission_id)
+        channel = mission_service.subscribe(mission_id)
     except MissionNotFoundError:
         await websocket.send_json({
             "type": "error",
@@ -207,60 +524,30 @@ async def websocket_endpoint(websocket: WebSocket, mission_id: str):
         await websocket.close()
         return
     
-    if mission["is_running"]:
-        await websocket.send_json({
-            "type": "error",
-            "message": "Mission already running"
-        })
-        await websocket.close()
-        return
-    
     try:
-        message_queue = mission_service.get_message_queue(mission_id)
-        
-        mission_service.start_mission_thread(
-            mission_id,
-            run_mission,
-            mission_id,
-            mission["goal"],
-            mission["headless"],
-            mission["max_iterations"],
-            message_queue
-        )
-        
-        while True:
+        if mission.get("started_at") is None and not mission["is_running"]:
             try:
-                try:
-                    message = message_queue.get(timeout=0.5)
-                    await websocket.send_json(message)
-                    if message.get("type") in ["complete", "incomplete", "finished", "error"]:
-                        break
-                except queue.Empty:
-                    if not mission_service.repository.get(mission_id)["is_running"]:
-                        break
-                    pass
-                
-                try:
-                    data = await asyncio.wait_for(websocket.receive_text(), timeout=0.1)
-                    message = json.loads(data)
-                    if message.get("type") == "stop":
-                        mission_service.stop_mission(mission_id)
-                        break
-                except asyncio.TimeoutError:
-                    continue
-                except WebSocketDisconnect:
-                    break
-                    
-            except WebSocketDisconnect:
-                break
+                launch_mission(mission_id, client_host(websocket))
+            except MissionAlreadyRunningError:
+                # Another connection started it first; keep watching
+                pass
         
+        delta = websocket.query_params.get("delta", "").lower() in ("1", "true")
+        await pump_messages(websocket, mission_id, channel, delta=delta)
+    
+    except MissionQueueFullError as e:
+        await websocket.send_json({
+            "type": "error",
+            "message": str(e),
+            "fatal": True
+        })
     except Exception as e:
         await websocket.send_json({
             "type": "error",
             "message": f"WebSocket error: {str(e)}"
         })
     finally:
-        mission_service.repository.update(mission_id, is_running=False)
+        mission_service.unsubscribe(mission_id, channel)
         await websocket.close()
 
 
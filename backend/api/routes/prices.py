@@ -0,0 +1,67 @@
+"""Price analytics API routes."""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, Any, Optional
+import time
+from infrastructure.price_store import GROUP_KEYS, get_price_store
+from services.result_cache import normalize_goal
+
+router = APIRouter()
+
+
+def _filters(
+    product: Optional[str],
+    domain: Optional[str],
+    since_hours: Optional[float]
+) -> Dict[str, Any]:
+    """Build price store filters from query parameters."""
+    return {
+        "product": normalize_goal(product) if product else None,
+        "domain": domain.lower().removeprefix("www.") if domain else None,
+        "since": time.time() - since_hours * 3600 if since_hours else None
+    }
+
+
+@router.get("/prices/stats")
+async def get_price_stats(
+    product: Optional[str] = Query(None, description="Product, matched like mission goals"),
+    domain: Optional[str] = Query(None, description="Source domain"),
+    since_hours: Optional[float] = Query(None, gt=0, description="Only observations from the last N hours"),
+    group_by: Optional[str] = Query(None, description=f"One of: {', '.join(GROUP_KEYS)}")
+) -> Dict[str, Any]:
+    """
+    Aggregate price observations across missions.
+    
+    Returns:
+        Count, mean, median, min and max per group
+    """
+    price_store = get_price_store()
+    if price_store is None:
+        return {"enabled": False}
+    try:
+        groups = price_store.aggregate(group_by=group_by, **_filters(product, domain, since_hours))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"enabled": True, "group_by": group_by, "groups": groups}
+
+
+@router.get("/prices/observations")
+async def get_price_observations(
+    product: Optional[str] = Query(None, description="Product, matched like mission goals"),
+    domain: Optional[str] = Query(None, description="Source domain"),
+    since_hours: Optional[float] = Query(None, gt=0, description="Only observations from the last N hours"),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum observations returned")
+) -> Dict[str, Any]:
+    """
+    List raw price observations.
+    
+    Returns:
+        Matching observations
+    """
+    price_store = get_price_store()
+    if price_store is None:
+        return {"enabled": False}
+    observations = price_store.query(limit=limit, **_filters(product, domain, since_hours))
+    return {"enabled": True, "observations": [o.model_dump() for o in observations]}
+
+
+prices_router = router
@@ -0,0 +1,76 @@
+"""Benchmark per-mission memory footprint of the agent action history.
+
+Usage:
+    python -m benchmarks.bench_memory [actions]
+"""
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List
+from core.domain.models import ActionHistory
+from infrastructure.memory import Memory
+
+
+URLS = [f"https://www.mercadolivre.com.br/creatina-{i}" for i in range(40)]
+
+
+def _result(i: int) -> dict:
+    return {"success": True, "url": URLS[i % len(URLS)], "title": f"Creatina 300g - oferta {i}"}
+
+
+def legacy_history(actions: int) -> List[ActionHistory]:
+    """Unbounded list of pydantic models with stringified results (previous behaviour)."""
+    history = []
+    for i in range(actions):
+        url = URLS[i % len(URLS)]
+        history.append(ActionHistory(
+            timestamp=datetime.now(),
+            action="goto",
+            params={"url": url},
+            url=url,
+            result=str(_result(i))
+        ))
+    return history
+
+
+def ring_buffer_history(actions: int) -> Memory:
+    """Current Memory with its default ring buffer."""
+    memory = Memory()
+    for i in range(actions):
+        url = URLS[i % len(URLS)]
+        memory.add_action("goto", {"url": url}, url, _result(i))
+    return memory
+
+
+def measure(build: Callable[[int], object], actions: int) -> int:
+    """
+    Measure bytes retained by a history built with the given function.
+    
+    Args:
+        build: Function that builds the history
+        actions: Number of actions to record
+        
+    Returns:
+        Bytes still allocated once the history is built
+    """
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    history = build(actions)
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del history
+    return retained
+
+
+def main():
+    actions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    before = measure(legacy_history, actions)
+    after = measure(ring_buffer_history, actions)
+    print(f"Actions recorded:       {actions}")
+    print(f"Legacy pydantic list:   {before / 1024:10.1f} KiB")
+    print(f"Ring buffer (Memory):   {after / 1024:10.1f} KiB")
+    print(f"Reduction:              {before / max(after, 1):10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
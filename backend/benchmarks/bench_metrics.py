@@ -0,0 +1,72 @@
+"""Benchmark the cost of instrumenting agent iterations.
+
+Replays the metric updates one agent iteration makes (clock reads around
+each phase, the phase histograms, one navigation and one extraction) with
+one mission and with several missions contending for the same metrics,
+then times rendering /metrics with a realistic number of series.
+
+Usage:
+    python -m benchmarks.bench_metrics [iterations] [missions]
+"""
+import sys
+import threading
+import time
+from infrastructure.metrics import RadarMetrics
+
+
+DOMAINS = ["mercadolivre.com.br", "amazon.com.br", "google.com", "magazineluiza.com.br", "kabum.com.br"]
+
+
+def iterate(metrics: RadarMetrics, count: int) -> None:
+    """Make the metric updates of count agent iterations."""
+    clock = time.perf_counter
+    for i in range(count):
+        began = clock()
+        observed = clock()
+        decided = clock()
+        navigated = clock()
+        executed = clock()
+        metrics.navigation_seconds.observe(navigated - decided, DOMAINS[i % len(DOMAINS)])
+        metrics.extraction_prices.observe(i % 12, "page")
+        metrics.observe_iteration(
+            snapshot=observed - began,
+            decide=decided - observed,
+            execute=executed - decided,
+            extract=0.01
+        )
+
+
+def per_iteration_us(count: int, missions: int) -> float:
+    """Time the instrumentation of count iterations in each of several threads."""
+    metrics = RadarMetrics()
+    threads = [threading.Thread(target=iterate, args=(metrics, count)) for _ in range(missions)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Threads share the GIL, so wall time over all iterations is the cost per iteration
+    return (time.perf_counter() - began) / (count * missions) * 1e6
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    missions = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    print(f"Instrumentation cost over {count:,} iterations per mission")
+    for threads in (1, missions):
+        print(f"{threads:>2} mission(s)   {per_iteration_us(count, threads):6.2f} us per iteration")
+    
+    metrics = RadarMetrics()
+    iterate(metrics, 10000)
+    for i in range(200):
+        metrics.navigation_seconds.observe(0.5, f"shop{i}.com.br")
+    renders = 200
+    began = time.perf_counter()
+    for _ in range(renders):
+        text = metrics.render()
+    elapsed = (time.perf_counter() - began) / renders
+    print(f"render /metrics ({len(text.splitlines()):,} lines)  {elapsed * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
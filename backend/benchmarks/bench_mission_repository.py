@@ -0,0 +1,90 @@
+"""Benchmark MissionRepository contention under many concurrent missions.
+
+Each mission thread writes progress updates (as run_mission does every
+iteration) while reader threads poll mission status (as the /status route
+does). Reports write throughput and reader latency per backend.
+
+Usage:
+    python -m benchmarks.bench_mission_repository [missions] [updates]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+from repositories.mission_repository import MissionRepository, SQLiteMissionRepository
+
+
+READERS = 8
+
+
+def run(repository: MissionRepository, missions: int, updates: int) -> Dict[str, float]:
+    """Run concurrent writers and readers against a repository."""
+    mission_ids = [repository.create(f"goal {i}", True, 100) for i in range(missions)]
+    start = threading.Barrier(missions + READERS + 1)
+    done = threading.Event()
+    latencies: List[float] = []
+    
+    def writer(mission_id: str) -> None:
+        start.wait()
+        for i in range(updates):
+            repository.update_if_exists(mission_id, sources_visited=i, data_points=i * 2)
+    
+    def reader(offset: int) -> None:
+        start.wait()
+        samples = []
+        i = offset
+        while not done.is_set():
+            began = time.perf_counter()
+            repository.get_status(mission_ids[i % missions])
+            samples.append(time.perf_counter() - began)
+            i += 7
+        latencies.extend(samples)
+    
+    writers = [threading.Thread(target=writer, args=(mission_id,)) for mission_id in mission_ids]
+    readers = [threading.Thread(target=reader, args=(i,)) for i in range(READERS)]
+    for thread in writers + readers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in writers:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    done.set()
+    for thread in readers:
+        thread.join()
+    
+    latencies.sort()
+    return {
+        "writes_per_s": missions * updates / elapsed,
+        "reads": len(latencies),
+        "p50_us": statistics.median(latencies) * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6
+    }
+
+
+def main() -> None:
+    missions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{missions} mission threads x {updates} updates, {READERS} status readers")
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {
+            "memory, 1 lock": MissionRepository(shards=1),
+            "memory, 16 shards": MissionRepository(shards=16),
+            "sqlite (WAL)": SQLiteMissionRepository(os.path.join(directory, "missions.db"))
+        }
+        for name, repository in backends.items():
+            # SQLite commits every write; keep its run comparable in duration
+            scale = 10 if isinstance(repository, SQLiteMissionRepository) else 1
+            result = run(repository, missions, max(1, updates // scale))
+            print(
+                f"{name:<18} {result['writes_per_s']:>10,.0f} writes/s  "
+                f"status p50 {result['p50_us']:7.1f} us  p99 {result['p99_us']:8.1f} us  "
+                f"({result['reads']:,} reads)"
+            )
+
+
+if __name__ == "__main__":
+    main()
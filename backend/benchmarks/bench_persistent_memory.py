@@ -0,0 +1,53 @@
+"""Benchmark per-action overhead of the SQLite-backed memory.
+
+Usage:
+    python -m benchmarks.bench_persistent_memory [actions]
+"""
+import os
+import sys
+import tempfile
+import time
+from infrastructure.memory import Memory
+from infrastructure.persistent_memory import PersistentMemory
+
+
+def record_actions(memory: Memory, actions: int) -> float:
+    """
+    Record actions and extracted data, as the agent loop does.
+    
+    Args:
+        memory: Memory under test
+        actions: Number of actions to record
+        
+    Returns:
+        Seconds spent in the agent thread
+    """
+    started = time.perf_counter()
+    for i in range(actions):
+        url = f"https://www.mercadolivre.com.br/creatina-{i % 40}"
+        memory.add_action("goto", {"url": url}, url, {"success": True, "url": url})
+        if i % 5 == 0:
+            memory.add_extracted_data({"url": url, "prices": [{"value": 90.0 + i % 7, "currency": "BRL"}]})
+    return time.perf_counter() - started
+
+
+def main():
+    actions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    
+    in_memory = record_actions(Memory(), actions)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        memory = PersistentMemory(os.path.join(directory, "memory.db"), "bench")
+        persistent = record_actions(memory, actions)
+        started = time.perf_counter()
+        memory.close()
+        drain = time.perf_counter() - started
+    
+    print(f"Actions recorded:            {actions}")
+    print(f"Memory:                      {in_memory / actions * 1e6:8.2f} us/action")
+    print(f"PersistentMemory (agent):    {persistent / actions * 1e6:8.2f} us/action")
+    print(f"PersistentMemory (drain):    {drain * 1000:8.1f} ms after the last action")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark appends and aggregate queries on the price observation store.
+
+Usage:
+    python -m benchmarks.bench_price_store [rows]
+"""
+import random
+import sys
+import tempfile
+import time
+from core.domain.models import PriceObservation
+from infrastructure.price_store import PriceStore
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+    now = time.time()
+    domains = [f"shop{i}.com.br" for i in range(50)]
+    products = ["creatina", "whey", "cafeteira", "notebook", "tenis"]
+    observations = [
+        PriceObservation(
+            product=rng.choice(products),
+            domain=rng.choice(domains),
+            value=rng.uniform(20, 500),
+            timestamp=now - rng.uniform(0, 30 * 86400),
+            mission_id=f"mission-{i // 100}"
+        )
+        for i in range(rows)
+    ]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = PriceStore(directory, flush_rows=50_000)
+        started = time.perf_counter()
+        store.append(observations)
+        store.flush()
+        append_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        store.compact()
+        compact_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        weekly = store.aggregate(group_by="domain", product="creatina", since=now - 7 * 86400)
+        query_seconds = time.perf_counter() - started
+        store.close()
+    
+    print(f"Rows:                           {rows}")
+    print(f"Append + flush:                 {append_seconds:8.2f} s")
+    print(f"Compaction:                     {compact_seconds:8.2f} s")
+    print(f"Weekly median per domain:       {query_seconds * 1000:8.1f} ms ({len(weekly)} domains)")
+
+
+if __name__ == "__main__":
+    main()
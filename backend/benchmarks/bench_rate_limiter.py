@@ -0,0 +1,87 @@
+"""Benchmark sustained throughput against a site that throttles bursts.
+
+Simulates a retailer that tolerates a fixed number of requests per second
+and answers anything above with 429 and a temporary block, the way
+marketplaces do before serving CAPTCHAs. Concurrent missions navigate it
+without coordination, through the limiter at the right rate, and through
+the limiter configured too high so adaptive backoff has to find the limit.
+
+Usage:
+    python -m benchmarks.bench_rate_limiter [seconds] [missions]
+"""
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from infrastructure.rate_limiter import HostRateLimiter
+
+
+URL = "https://www.mercadolivre.com.br/creatina"
+NAVIGATION_SECONDS = 0.02
+
+
+class ThrottlingSite:
+    """Site allowing `tolerated` requests per second, blocking offenders for `block` seconds."""
+    
+    def __init__(self, tolerated: int = 5, block: float = 2.0):
+        self.tolerated = tolerated
+        self.block = block
+        self.recent: Deque[float] = deque()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+    
+    def request(self) -> Dict[str, object]:
+        time.sleep(NAVIGATION_SECONDS)
+        with self.lock:
+            now = time.monotonic()
+            while self.recent and now - self.recent[0] > 1:
+                self.recent.popleft()
+            self.recent.append(now)
+            if now < self.blocked_until or len(self.recent) > self.tolerated:
+                self.blocked_until = max(self.blocked_until, now + self.block)
+                return {"success": True, "status": 429, "title": "Are you a robot?"}
+            return {"success": True, "status": 200, "title": "Creatina"}
+
+
+def run(limiter: Optional[HostRateLimiter], seconds: float, missions: int) -> Dict[str, float]:
+    """Let missions navigate the site for a while and count useful pages."""
+    site = ThrottlingSite()
+    deadline = time.monotonic() + seconds
+    counts = {"ok": 0, "throttled": 0}
+    lock = threading.Lock()
+    
+    def mission() -> None:
+        while time.monotonic() < deadline:
+            if limiter is not None:
+                limiter.acquire(URL)
+            result = site.request()
+            if limiter is not None:
+                limiter.report(URL, result)
+            with lock:
+                counts["ok" if result["status"] == 200 else "throttled"] += 1
+    
+    threads = [threading.Thread(target=mission) for _ in range(missions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"pages_per_s": counts["ok"] / seconds, "throttled": counts["throttled"]}
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    missions = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    print(f"{missions} missions for {seconds:.0f}s against a site tolerating 5 req/s")
+    variants = {
+        "no coordination": None,
+        "limiter at 4 req/s": HostRateLimiter(domains={"mercadolivre.com.br": 4}, burst=1, base_backoff=1),
+        "limiter at 10 req/s, adaptive": HostRateLimiter(domains={"mercadolivre.com.br": 10}, burst=1, base_backoff=1)
+    }
+    for name, limiter in variants.items():
+        result = run(limiter, seconds, missions)
+        print(f"{name:<32} {result['pages_per_s']:5.2f} pages/s  {result['throttled']:6,} throttled responses")
+
+
+if __name__ == "__main__":
+    main()
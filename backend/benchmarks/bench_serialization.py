@@ -0,0 +1,79 @@
+"""Benchmark encoding large extracted-data payloads with each JSON backend.
+
+Builds a complete message like the one a mission sends at the end (records
+with datetimes and nested price dicts) and reports, per backend, the cost
+of one encode and of delivering it to many subscribers the old way
+(send_json per subscriber) versus the hub's encode-once path.
+
+Usage:
+    python -m benchmarks.bench_serialization [records] [subscribers]
+"""
+import datetime
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+from infrastructure.serialization import available_backends, select_backend
+
+
+def build_message(records: int) -> Dict[str, Any]:
+    """Build a complete message with realistic extracted data."""
+    rng = random.Random(42)
+    now = datetime.datetime.now()
+    data: List[Dict[str, Any]] = []
+    for i in range(records):
+        data.append({
+            "url": f"https://shop{i % 50}.com.br/produto/{i}",
+            "title": f"Creatina Monohidratada {rng.randint(100, 1000)}g - Marca {i % 30}",
+            "prices": [
+                {"value": round(rng.uniform(20, 500), 2), "currency": "BRL", "text": "R$ 99,90"}
+                for _ in range(rng.randint(1, 4))
+            ],
+            "descriptions": ["Suplemento em pó", "Pureza 99,9%", "Sem sabor"],
+            "specifications": {"peso": "300g", "sabor": "natural", "porções": 100},
+            "timestamp": now - datetime.timedelta(seconds=i)
+        })
+    return {"type": "complete", "summary": "Mission summary", "extracted_data": data, "total_iterations": 100}
+
+
+def stdlib_send_json(message: Dict[str, Any]) -> bytes:
+    """What WebSocket.send_json did for every subscriber."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def timed(function: Callable[[], Any], repeat: int = 5) -> float:
+    """Best wall time of several runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - began)
+    return best * 1000
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    subscribers = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    message = build_message(records)
+    size = len(stdlib_send_json(message))
+    print(f"complete message with {records:,} records ({size / 1e6:.1f} MB), {subscribers} subscribers")
+    
+    per_subscriber = timed(lambda: [stdlib_send_json(message) for _ in range(subscribers)], repeat=2)
+    print(f"{'send_json x subscribers':<26} {per_subscriber:9.1f} ms")
+    for name, installed in available_backends().items():
+        if not installed:
+            print(f"{name:<26} not installed")
+            continue
+        backend = select_backend(name)
+        once = timed(lambda: backend.dumps(message))
+        decode = timed(lambda: backend.loads(backend.dumps(message)))
+        print(
+            f"{name + ' encode once':<26} {once:9.1f} ms  "
+            f"({per_subscriber / once:5.1f}x faster than per-subscriber send_json)  "
+            f"round trip {decode:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark the cost of sharing mission state between uvicorn workers.
+
+Compares per-request lookups on the in-process backends with the SQLite
+ones every worker shares: the status lookup done by /status, the hub
+lookup a WebSocket makes for a mission started on another worker, and
+publishing one event. Then measures how long an event published on one
+worker takes to reach a subscriber on another through the event log.
+
+Usage:
+    python -m benchmarks.bench_shared_state [lookups] [events]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List
+from infrastructure.event_bus import SQLiteEventBus
+from repositories.mission_repository import MissionRepository, SQLiteMissionRepository
+from services.mission_service import MissionService
+
+
+MISSIONS = 200
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Median and 99th percentile in microseconds."""
+    samples = sorted(samples)
+    return {
+        "p50_us": statistics.median(samples) * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99)] * 1e6
+    }
+
+
+def time_calls(call: Callable[[int], object], count: int) -> Dict[str, float]:
+    """Time count calls of call(i)."""
+    samples = []
+    for i in range(count):
+        began = time.perf_counter()
+        call(i)
+        samples.append(time.perf_counter() - began)
+    return percentiles(samples)
+
+
+def lookups(directory: str, count: int) -> None:
+    """Compare per-request lookups of the in-process and shared backends."""
+    local = MissionService(MissionRepository())
+    shared = MissionService(
+        SQLiteMissionRepository(os.path.join(directory, "missions.db")),
+        event_bus=SQLiteEventBus(os.path.join(directory, "events.db"))
+    )
+    # A second worker that joins missions started on the first
+    peer = MissionService(
+        SQLiteMissionRepository(os.path.join(directory, "missions.db")),
+        event_bus=SQLiteEventBus(os.path.join(directory, "events.db"))
+    )
+    event = {"type": "action", "iteration": 1, "url": "https://loja.com.br/creatina", "sources_visited": 3}
+    
+    for name, service in (("in-process", local), ("shared sqlite", shared)):
+        mission_ids = [service.create_mission(f"preço do produto {i}")["mission_id"] for i in range(MISSIONS)]
+        for mission_id in mission_ids:
+            for _ in range(20):
+                service.publish(mission_id, event)
+        
+        status = time_calls(lambda i: service.get_mission_status(mission_ids[i % MISSIONS]), count)
+        publish = time_calls(lambda i: service.publish(mission_ids[i % MISSIONS], event), count)
+        print(
+            f"{name:<14} status p50 {status['p50_us']:7.1f} us  p99 {status['p99_us']:8.1f} us   "
+            f"publish p50 {publish['p50_us']:7.1f} us  p99 {publish['p99_us']:8.1f} us"
+        )
+        if service is shared:
+            # Each lookup joins a mission this worker has not seen yet
+            join = time_calls(lambda i: peer.subscribe(mission_ids[i % MISSIONS]), MISSIONS)
+            print(
+                f"{'':<14} first subscribe on another worker (seeds {shared.replay_size} events) "
+                f"p50 {join['p50_us']:7.1f} us  p99 {join['p99_us']:8.1f} us"
+            )
+    
+    shared.event_bus.stop()
+    peer.event_bus.stop()
+
+
+def delivery(directory: str, count: int, poll_interval: float) -> Dict[str, float]:
+    """Measure publish-to-receive latency between two buses on one log."""
+    path = os.path.join(directory, f"delivery-{poll_interval}.db")
+    sender, receiver = SQLiteEventBus(path), SQLiteEventBus(path, poll_interval=poll_interval)
+    received = threading.Semaphore(0)
+    latencies: List[float] = []
+    
+    def handler(seq, kind, mission_id, message):
+        latencies.append(time.perf_counter() - message["sent"])
+        received.release()
+    
+    receiver.start(handler)
+    for i in range(count):
+        sender.append("m1", message={"type": "action", "iteration": i, "sent": time.perf_counter()})
+        received.acquire()
+    receiver.stop()
+    return percentiles(latencies)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    events = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{MISSIONS} missions, {count} lookups per backend")
+    with tempfile.TemporaryDirectory() as directory:
+        lookups(directory, count)
+        print(f"\nCross-worker delivery of {events} events")
+        for poll_interval in (0.05, 0.01):
+            result = delivery(directory, events, poll_interval)
+            print(
+                f"poll every {poll_interval * 1000:4.0f} ms  "
+                f"p50 {result['p50_us'] / 1000:6.1f} ms  p99 {result['p99_us'] / 1000:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
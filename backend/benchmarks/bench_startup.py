@@ -0,0 +1,60 @@
+"""Benchmark API and CLI startup.
+
+Times fresh interpreters importing the API package, importing and building
+the application, and printing the CLI help, next to a bare interpreter as
+the floor. Then compares parsing the settings on every construction with
+the cached settings provider.
+
+Usage:
+    python -m benchmarks.bench_startup [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from config.settings import Settings, get_settings
+
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    "python (bare interpreter)": [sys.executable, "-c", "pass"],
+    "python -c 'import api'": [sys.executable, "-c", "import api"],
+    "python -c 'import api.app'": [sys.executable, "-c", "import api.app"],
+    "create_app()": [sys.executable, "-c", "from api.app import create_app; create_app()"],
+    "python main.py --help": [sys.executable, "main.py", "--help"]
+}
+
+
+def startup_ms(command, runs: int) -> float:
+    """Median wall time of a command in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        subprocess.run(command, cwd=BACKEND, stdout=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - began)
+    return statistics.median(samples) * 1000
+
+
+def per_call_us(call, count: int) -> float:
+    """Mean time of a call in microseconds."""
+    began = time.perf_counter()
+    for _ in range(count):
+        call()
+    return (time.perf_counter() - began) / count * 1e6
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"Median of {runs} fresh interpreters")
+    for name, command in COMMANDS.items():
+        print(f"{name:<28} {startup_ms(command, runs):7.1f} ms")
+    
+    print("\nSettings per agent or browser")
+    print(f"{'Settings()':<28} {per_call_us(Settings, 200):7.1f} us")
+    print(f"{'get_settings()':<28} {per_call_us(get_settings, 200000):7.3f} us")
+
+
+if __name__ == "__main__":
+    main()
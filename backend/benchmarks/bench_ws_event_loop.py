@@ -0,0 +1,108 @@
+"""Benchmark event-loop lag while many WebSocket consumers wait on mission messages.
+
+Each simulated connection follows the endpoint's consume loop: wait for a
+message published by a mission thread, or for the client to send "stop".
+A probe coroutine sleeps 10 ms at a time and records how late it wakes up.
+
+Usage:
+    python -m benchmarks.bench_ws_event_loop [seconds]
+"""
+import asyncio
+import queue
+import statistics
+import sys
+import threading
+import time
+from typing import Callable, List
+from infrastructure.message_channel import MessageChannel
+
+
+PROBE_INTERVAL = 0.01
+PUBLISH_INTERVAL = 1.0  # roughly one agent step per second
+
+
+async def legacy_consumer(message_queue: queue.Queue, stop: asyncio.Event, client: asyncio.Event) -> None:
+    """Previous loop: blocking queue.get(timeout=0.5) inside the coroutine, then poll the client."""
+    while not stop.is_set():
+        try:
+            message_queue.get(timeout=0.5)
+        except queue.Empty:
+            pass
+        try:
+            await asyncio.wait_for(client.wait(), timeout=0.1)
+        except asyncio.TimeoutError:
+            continue
+
+
+async def channel_consumer(channel: MessageChannel, stop: asyncio.Event, client: asyncio.Event) -> None:
+    """Current loop: wait on whichever comes first, a message or a client command."""
+    channel.bind(asyncio.get_running_loop())
+    next_message = asyncio.ensure_future(channel.get())
+    next_command = asyncio.ensure_future(client.wait())
+    stopped = asyncio.ensure_future(stop.wait())
+    while not stop.is_set():
+        done, _ = await asyncio.wait({next_message, next_command, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        if next_message in done:
+            next_message = asyncio.ensure_future(channel.get())
+    for task in (next_message, next_command, stopped):
+        task.cancel()
+
+
+async def measure(connections: int, seconds: float, legacy: bool) -> List[float]:
+    """Run consumers fed by one publisher thread each and return probe lags in ms."""
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    halt = threading.Event()
+    client = asyncio.Event()
+    channels = [queue.Queue() if legacy else MessageChannel() for _ in range(connections)]
+    consumer: Callable = legacy_consumer if legacy else channel_consumer
+    tasks = [asyncio.ensure_future(consumer(channel, stop, client)) for channel in channels]
+    
+    def publisher(channel) -> None:
+        while not halt.wait(PUBLISH_INTERVAL):
+            channel.put({"type": "action", "sent": time.perf_counter()})
+    
+    threads = [threading.Thread(target=publisher, args=(channel,), daemon=True) for channel in channels]
+    for thread in threads:
+        thread.start()
+    
+    lags = []
+    deadline = loop.time() + seconds
+    while loop.time() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - started - PROBE_INTERVAL) * 1000)
+    
+    halt.set()
+    stop.set()
+    for thread in threads:
+        thread.join()
+    if legacy:
+        # Unblock consumers parked in queue.get so they see the stop flag
+        for channel in channels:
+            channel.put(None)
+    await asyncio.wait(tasks, timeout=5)
+    return lags
+
+
+def report(name: str, connections: int, lags: List[float]) -> None:
+    lags = sorted(lags)
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(
+        f"{name:<8} {connections:>5} sockets: "
+        f"p50 {statistics.median(lags):8.1f} ms  p99 {p99:8.1f} ms  max {lags[-1]:8.1f} ms  "
+        f"({len(lags)} probes)"
+    )
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    print(f"Event-loop lag over {seconds:.0f}s, probe every {PROBE_INTERVAL * 1000:.0f} ms")
+    for connections in (1, 10, 100):
+        report("legacy", connections, asyncio.run(measure(connections, seconds, legacy=True)))
+    for connections in (1, 10, 100):
+        report("channel", connections, asyncio.run(measure(connections, seconds, legacy=False)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 """Configuration module for MarketRadar application."""
-from .settings import Settings
+from .settings import Settings, get_settings
 
-__all__ = ["Settings", "settings"]
+__all__ = ["Settings", "get_settings", "settings"]
 
-settings = Settings()
+
+def __getattr__(name: str):
+    """Resolve the legacy module-level settings on first access."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,7 @@
 """Application settings and configuration."""
+from functools import lru_cache
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -12,6 +13,11 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_reload: bool = False
+    # Uvicorn worker processes (WEB_CONCURRENCY, uvicorn's default for --workers,
+    # counts too). More than one needs the sqlite mission store and event
+    # backends, and no file-backed page cache or price store: each file has a
+    # single writer. Scheduler queues, result caches and rate limits stay per worker.
+    api_workers: int = 1
     
     # CORS Settings
     cors_origins: List[str] = ["*"]
@@ -19,6 +25,10 @@ class Settings(BaseSettings):
     cors_allow_methods: List[str] = ["*"]
     cors_allow_headers: List[str] = ["*"]
     
+    # Mission result cache (keyed by normalized goal)
+    mission_result_max_age: int = 3600
+    mission_result_cache_size: int = 256
+    
     # Browser Settings
     browser_headless: bool = True
     browser_timeout: int = 30000
@@ -29,6 +39,132 @@ class Settings(BaseSettings):
     agent_max_iterations: int = 100
     agent_min_sources: int = 5
     agent_loop_threshold: int = 3
+    agent_loop_window: int = 32
+    agent_loop_max_period: int = 4
+    
+    # Agent memory (recent actions kept in RAM; older ones spill to disk if a dir is set,
+    # and the sqlite backend persists the full mission memory)
+    memory_history_size: int = 100
+    memory_spill_dir: Optional[str] = None
+    memory_backend: str = "memory"  # "memory" or "sqlite"
+    memory_db_path: str = ".cache/memory.db"
+    memory_batch_size: int = 200
+    memory_flush_interval: float = 0.5
+    
+    # Mission scheduler (0 workers = derive from CPU count and RAM)
+    scheduler_workers: int = 0
+    scheduler_browser_memory_mb: int = 512
+    scheduler_max_queue: int = 100
+    scheduler_prewarm: bool = True
+    
+    # Worker processes (0 runs missions on scheduler threads inside the API
+    # process; otherwise each process runs one mission at a time with its own
+    # browser and is replaced after mission_worker_max_missions missions)
+    mission_worker_processes: int = 0
+    mission_worker_max_missions: int = 50
+    mission_worker_start_method: str = "spawn"
+    
+    # Mission cancellation (browser waits are split into chunks of this many ms
+    # so a stop interrupts them; stop requests wait this long for acknowledgement)
+    mission_cancel_check_ms: int = 250
+    mission_stop_timeout: float = 5.0
+    
+    # Recent mission events replayed to WebSocket clients that join late
+    mission_event_replay_size: int = 256
+    
+    # WebSocket delivery (unread messages per client before its outbox coalesces
+    # them; permessage-deflate is negotiated with clients that offer it)
+    ws_outbox_size: int = 64
+    ws_per_message_deflate: bool = True
+    
+    # JSON serialization for API and WebSocket payloads ("auto" picks orjson,
+    # then msgspec, then the standard library)
+    json_backend: str = "auto"
+    
+    # Mission records ("memory" keeps them in sharded dicts; "sqlite" shares them
+    # between processes)
+    mission_store_backend: str = "memory"
+    mission_store_db_path: str = ".cache/missions.db"
+    mission_store_shards: int = 16
+    
+    # Mission events ("memory" keeps them in this process; "sqlite" logs them so
+    # every uvicorn worker can stream and stop any mission)
+    mission_event_backend: str = "memory"
+    mission_event_db_path: str = ".cache/events.db"
+    mission_event_poll_interval: float = 0.05
+    mission_event_retention: float = 3600
+    
+    # Mission results (stored for paginated reads and export; the final WebSocket
+    # message inlines at most ws_inline_results records)
+    result_store_path: str = ".cache/results.db"
+    result_store_retention: int = 604800
+    results_page_max: int = 1000
+    results_export_chunk_size: int = 500
+    ws_inline_results: int = 1000
+    
+    # Batch submission (goals per batch; finished batches kept for polling)
+    batch_max_goals: int = 500
+    batch_max_stored: int = 100
+    
+    # Mission checkpoints (resume after crash or restart)
+    checkpoint_dir: str = ".cache/checkpoints"
+    checkpoint_every: int = 5
+    
+    # Mission budgets (per mission, enforced inside the mission loop)
+    budget_max_seconds: float = 900.0
+    budget_max_pages: int = 60
+    budget_max_bytes: int = 500_000_000
+    budget_max_cpu_seconds: float = 300.0
+    
+    # Average-price convergence (sequential stopping rule)
+    agent_price_confidence: float = 0.95
+    agent_price_precision: float = 0.05
+    agent_min_prices: int = 3
+    agent_min_price_sources: int = 2
+    agent_max_sources: int = 15
+    
+    # Cross-mission page cache, kept in memory unless page_cache_path names a
+    # file to persist it to (a file has a single writer: one API worker)
+    page_cache_enabled: bool = True
+    page_cache_max_entries: int = 2000
+    page_cache_ttl: int = 21600
+    page_cache_domain_ttls: Dict[str, int] = {
+        "wikipedia.org": 604800,
+        "mercadolivre.com.br": 3600,
+        "amazon.com.br": 3600
+    }
+    page_cache_path: Optional[str] = None
+    page_cache_store_snapshots: bool = False
+    # Missions reaching a page another mission is fetching wait this long for
+    # its extraction; an unfinished fetch claim lapses after the lease
+    page_cache_fetch_wait: float = 15.0
+    page_cache_fetch_lease: float = 60.0
+    
+    # Per-host navigation rate limits shared by all missions (navigations per
+    # second; subdomains share their domain's rate). Throttled responses and bot
+    # challenges halve a host's rate and pause it, doubling the pause each time
+    rate_limit_enabled: bool = True
+    rate_limit_default_rps: float = 1.0
+    rate_limit_burst: int = 2
+    rate_limit_domains: Dict[str, float] = {
+        "mercadolivre.com.br": 0.5,
+        "amazon.com.br": 0.5,
+        "google.com": 0.5
+    }
+    rate_limit_backoff: float = 5.0
+    rate_limit_max_backoff: float = 300.0
+    
+    # Prometheus metrics served at /metrics; event loop lag is sampled every
+    # metrics_loop_lag_interval seconds
+    metrics_enabled: bool = True
+    metrics_loop_lag_interval: float = 0.5
+    
+    # Columnar price observation store (analytics across missions), kept in
+    # memory unless price_store_dir names a directory to persist it to
+    price_store_enabled: bool = True
+    price_store_dir: Optional[str] = None
+    price_store_flush_rows: int = 1000
+    price_store_max_segments: int = 16
     
     # Trusted Sources
     trusted_domains: List[str] = [
@@ -65,3 +201,18 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings, reading the environment and .env once.
+    
+    Long-lived objects and per-mission ones (agents, browsers) share this
+    instance instead of parsing the configuration again; call
+    get_settings.cache_clear() to pick up changed environment variables.
+    
+    Returns:
+        Cached Settings
+    """
+    return Settings()
@@ -0,0 +1,80 @@
+"""Cooperative cancellation of running missions."""
+from typing import Optional
+import threading
+from core.exceptions import MissionCancelledError
+
+
+class CancellationToken:
+    """
+    Per-mission stop signal shared by the API, the agent and the browser.
+    
+    The mission thread checks the token between and inside actions and
+    replaces plain sleeps with wait(), so a stop interrupts it within one
+    check interval. When the thread has released its browser it calls
+    acknowledge(), which lets the stopping side wait for real completion.
+    """
+    
+    def __init__(self):
+        """Initialize cancellation token."""
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self.reason: Optional[str] = None
+    
+    @property
+    def is_cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._cancelled.is_set()
+    
+    @property
+    def is_done(self) -> bool:
+        """Whether the mission acknowledged it has finished."""
+        return self._done.is_set()
+    
+    def cancel(self, reason: str = "stopped") -> None:
+        """
+        Request cancellation; callable from any thread.
+        
+        Args:
+            reason: Why the mission is being cancelled
+        """
+        if not self._cancelled.is_set():
+            self.reason = reason
+            self._cancelled.set()
+    
+    def raise_if_cancelled(self) -> None:
+        """
+        Stop the current mission step if cancellation was requested.
+        
+        Raises:
+            MissionCancelledError: If the token is cancelled
+        """
+        if self._cancelled.is_set():
+            raise MissionCancelledError(f"Mission cancelled: {self.reason}")
+    
+    def wait(self, seconds: float) -> bool:
+        """
+        Sleep that returns early when cancellation is requested.
+        
+        Args:
+            seconds: Maximum time to sleep
+            
+        Returns:
+            True if the token was cancelled
+        """
+        return self._cancelled.wait(max(seconds, 0))
+    
+    def acknowledge(self) -> None:
+        """Signal that the mission stopped and released its resources."""
+        self._done.set()
+    
+    def wait_done(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the mission to acknowledge it has finished.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+            
+        Returns:
+            True if the mission acknowledged within the timeout
+        """
+        return self._done.wait(timeout)
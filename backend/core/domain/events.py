@@ -0,0 +1,89 @@
+"""Typed events emitted while a mission runs."""
+from typing import Dict, Any, List, Literal, Optional
+from pydantic import BaseModel, Field
+from pydantic_core import to_jsonable_python
+
+
+class AgentEvent(BaseModel):
+    """Base class for mission events."""
+    type: str = Field(..., description="Event type")
+    
+    def to_message(self) -> Dict[str, Any]:
+        """
+        Convert event to a JSON-compatible message.
+        
+        Returns:
+            Dictionary ready to be serialized by the transport
+        """
+        return self.model_dump(mode="json", exclude_none=True)
+
+
+class StatusEvent(AgentEvent):
+    """Mission status change."""
+    type: Literal["status"] = "status"
+    message: str = Field(..., description="Status message")
+    url: str = Field(default="", description="Current URL")
+
+
+class ExtractionEvent(AgentEvent):
+    """Data collected from a source."""
+    type: Literal["extraction"] = "extraction"
+    iteration: int = Field(..., description="Iteration in which the data was collected")
+    url: str = Field(..., description="Source URL")
+    data: Dict[str, Any] = Field(..., description="Extracted data")
+    cached: bool = Field(default=False, description="Whether the data came from the page cache")
+    sources_visited: int = Field(default=0, description="Number of sources visited so far")
+
+
+class ActionEvent(AgentEvent):
+    """Action decided and executed by the agent."""
+    type: Literal["action"] = "action"
+    iteration: int = Field(..., description="Iteration number")
+    thought_process: str = Field(..., description="Agent reasoning about the current state")
+    reasoning: str = Field(..., description="Why the action was chosen")
+    action: Dict[str, Any] = Field(..., description="Action name and parameters")
+    result: Dict[str, Any] = Field(default_factory=dict, description="Action result")
+    is_goal_achieved: bool = Field(default=False, description="Whether the goal was achieved")
+    url: str = Field(default="", description="URL after the action")
+    extracted_data_count: int = Field(default=0, description="Number of extracted data points")
+    sources_visited: int = Field(default=0, description="Number of sources visited")
+    budget: Optional[Dict[str, Any]] = Field(None, description="Budget consumption")
+
+
+class ErrorEvent(AgentEvent):
+    """Error raised while running a mission."""
+    type: Literal["error"] = "error"
+    message: str = Field(..., description="Error message")
+    fatal: bool = Field(default=False, description="Whether the mission stopped because of it")
+
+
+class CompleteEvent(AgentEvent):
+    """Mission finished, with or without achieving its goal."""
+    type: Literal["complete", "incomplete"] = "complete"
+    is_goal_achieved: bool = Field(default=True, description="Whether the goal was achieved")
+    message: Optional[str] = Field(None, description="Why the mission ended early")
+    reason: Optional[str] = Field(None, description="Machine-readable finish reason")
+    summary: str = Field(default="", description="Mission summary")
+    summary_data: Optional[Dict[str, Any]] = Field(None, description="Structured mission summary")
+    extracted_data: List[Dict[str, Any]] = Field(default_factory=list, description="Extracted data")
+    total_iterations: int = Field(default=0, description="Iterations executed")
+    budget: Optional[Dict[str, Any]] = Field(None, description="Budget consumption")
+    
+    def to_message(self, max_results: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Convert event to a JSON-compatible message.
+        
+        Args:
+            max_results: Inline at most this many extracted records (None inlines all)
+            
+        Returns:
+            Dictionary ready to be serialized by the transport; when records
+            were left out it carries results_truncated and total_results
+        """
+        if max_results is None or len(self.extracted_data) <= max_results:
+            return super().to_message()
+        message = self.model_dump(mode="json", exclude_none=True, exclude={"extracted_data"})
+        message["extracted_data"] = to_jsonable_python(self.extracted_data[:max_results])
+        message["results_truncated"] = True
+        message["total_results"] = len(self.extracted_data)
+        return message
@@ -23,6 +23,16 @@ class ExtractedData(BaseModel):
     average_price: Optional[float] = Field(None, description="Calculated average price")
 
 
+class PriceObservation(BaseModel):
+    """Single price observed for a product on a source domain."""
+    product: str = Field(..., description="Product key (normalized mission topic)")
+    domain: str = Field(..., description="Source domain")
+    value: float = Field(..., description="Price value")
+    currency: str = Field(default="BRL", description="Currency code")
+    timestamp: float = Field(..., description="Observation time (Unix seconds)")
+    mission_id: str = Field(..., description="Mission that observed the price")
+
+
 class ActionHistory(BaseModel):
     """Action history model."""
     timestamp: datetime = Field(default_factory=datetime.now)
@@ -32,6 +42,38 @@ class ActionHistory(BaseModel):
     result: str = Field(default="", description="Action result")
 
 
+class MissionSummary(BaseModel):
+    """Structured mission summary built from running aggregates."""
+    total_actions: int = Field(default=0, description="Actions executed")
+    data_points: int = Field(default=0, description="Extracted data points")
+    sources_visited: int = Field(default=0, description="Unique source URLs")
+    sources: List[str] = Field(default_factory=list, description="Source URLs in first-seen order")
+    source_counts: Dict[str, int] = Field(default_factory=dict, description="Data points per source URL")
+    total_prices: int = Field(default=0, description="Prices found")
+    average_price: Optional[float] = Field(None, description="Mean of valid prices")
+    min_price: Optional[float] = Field(None, description="Lowest valid price")
+    max_price: Optional[float] = Field(None, description="Highest valid price")
+    price_stddev: Optional[float] = Field(None, description="Sample standard deviation of valid prices")
+
+
+class LoopSignal(BaseModel):
+    """Repeated action cycle detected in recent agent steps."""
+    period: int = Field(..., description="Number of steps in one cycle")
+    repeats: int = Field(..., description="Consecutive repetitions of the cycle")
+    urls: List[str] = Field(default_factory=list, description="Canonical URLs involved in the cycle")
+    actions: List[str] = Field(default_factory=list, description="Actions of one cycle")
+    strategy: str = Field(..., description="Suggested escape strategy")
+
+
+class BudgetLimits(BaseModel):
+    """Per-mission resource budget (None means unlimited)."""
+    max_iterations: Optional[int] = Field(None, description="Maximum agent iterations")
+    max_seconds: Optional[float] = Field(None, description="Maximum wall-clock seconds")
+    max_pages: Optional[int] = Field(None, description="Maximum page navigations")
+    max_bytes: Optional[int] = Field(None, description="Maximum network bytes received")
+    max_cpu_seconds: Optional[float] = Field(None, description="Maximum CPU seconds of the mission thread")
+
+
 class MissionStatus(BaseModel):
     """Mission status model."""
     mission_id: str = Field(..., description="Mission identifier")
@@ -41,6 +83,9 @@ class MissionStatus(BaseModel):
     error: Optional[str] = Field(None, description="Error message if any")
     sources_visited: int = Field(default=0, description="Number of sources visited")
     data_points: int = Field(default=0, description="Number of data points extracted")
+    budget: Optional[Dict[str, Any]] = Field(None, description="Budget limits and consumption")
+    queue_position: Optional[int] = Field(None, description="Position in the mission queue while waiting for a worker")
+    started_at: Optional[float] = Field(None, description="Unix time the mission was last started")
 
 
 class GoalAnalysis(BaseModel):
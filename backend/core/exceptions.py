@@ -21,6 +21,26 @@ class MissionAlreadyRunningError(MissionException):
     pass
 
 
+class MissionQueueFullError(MissionException):
+    """Exception raised when the mission queue has no room for another mission."""
+    pass
+
+
+class MissionCancelledError(MissionException):
+    """Exception raised inside a mission when it has been asked to stop."""
+    pass
+
+
+class BatchNotFoundError(MissionException):
+    """Exception raised when a mission batch is not found."""
+    pass
+
+
+class WorkerLostError(MissionException):
+    """Exception raised when a mission worker process exits in the middle of a mission."""
+    pass
+
+
 class BrowserException(MarketRadarException):
     """Exception raised for browser-related errors."""
     pass
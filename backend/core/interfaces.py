@@ -1,6 +1,6 @@
 """Interfaces (Protocols) for dependency injection."""
 from typing import Protocol, Dict, Any, List, Optional
-from core.domain.models import ExtractedData, ActionHistory
+from core.domain.models import ExtractedData, ActionHistory, MissionSummary
 
 
 class IBrowserEngine(Protocol):
@@ -37,12 +37,20 @@ class IBrowserEngine(Protocol):
     def get_page_state(self) -> Dict[str, Any]:
         """Get current page state."""
         ...
+    
+    def set_navigation_timeout(self, timeout_ms: int) -> None:
+        """Cap navigation wait time."""
+        ...
+    
+    def get_storage_state(self) -> Optional[Dict[str, Any]]:
+        """Get cookies and local storage."""
+        ...
 
 
 class IMemory(Protocol):
     """Interface for memory storage."""
     
-    def add_action(self, action: str, params: Dict[str, Any], url: str, result: str = "") -> None:
+    def add_action(self, action: str, params: Dict[str, Any], url: str, result: Any = "") -> None:
         """Add action to history."""
         ...
     
@@ -65,6 +73,10 @@ class IMemory(Protocol):
     def get_summary(self) -> str:
         """Get mission summary."""
         ...
+    
+    def get_summary_data(self) -> MissionSummary:
+        """Get structured mission summary."""
+        ...
 
 
 class IDataExtractor(Protocol):
@@ -0,0 +1,62 @@
+"""Streaming statistics helpers."""
+import math
+from typing import Iterable, Optional
+
+
+class RunningStats:
+    """Online mean and variance using Welford's algorithm."""
+    
+    __slots__ = ("count", "mean", "_m2", "minimum", "maximum")
+    
+    def __init__(self):
+        """Initialize empty accumulator."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+    
+    def add(self, value: float) -> None:
+        """
+        Add a single observation.
+        
+        Args:
+            value: Observed value
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+    
+    def extend(self, values: Iterable[float]) -> None:
+        """
+        Add several observations.
+        
+        Args:
+            values: Observed values
+        """
+        for value in values:
+            self.add(value)
+    
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 with fewer than two observations)."""
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+    
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+    
+    @property
+    def std_error(self) -> float:
+        """Standard error of the mean."""
+        if self.count < 2:
+            return math.inf
+        return self.stddev / math.sqrt(self.count)
@@ -1,30 +1,69 @@
 """Browser engine implementation using Playwright."""
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 import time
-from config.settings import Settings
+from config.settings import get_settings
+from core.cancellation import CancellationToken
+from infrastructure.metrics import get_metrics
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, BrowserContext, Page
+
+
+def _load_playwright() -> None:
+    """
+    Import Playwright on first use.
+    
+    Importing it takes longer than the rest of the API, and only processes
+    that start a browser need it. Names already bound on the module (patched
+    in tests) are kept.
+    """
+    from playwright.sync_api import TimeoutError as timeout_error, sync_playwright as start_playwright
+    module = globals()
+    module.setdefault("sync_playwright", start_playwright)
+    module.setdefault("PlaywrightTimeoutError", timeout_error)
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve sync_playwright and PlaywrightTimeoutError on first access."""
+    if name in ("sync_playwright", "PlaywrightTimeoutError"):
+        _load_playwright()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class BrowserEngine:
     """Browser engine for web automation using Playwright."""
     
-    def __init__(self, headless: bool = None):
+    def __init__(self, headless: bool = None, cancel_token: Optional[CancellationToken] = None):
         """
         Initialize browser engine.
         
         Args:
             headless: Whether to run in headless mode (defaults to settings)
+            cancel_token: Token that interrupts navigation waits and sleeps when cancelled
         """
-        self.settings = Settings()
+        self.settings = get_settings()
         self.headless = headless if headless is not None else self.settings.browser_headless
         self.playwright = None
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
-        self.page: Optional[Page] = None
+        self.browser: Optional["Browser"] = None
+        self.context: Optional["BrowserContext"] = None
+        self.page: Optional["Page"] = None
         self.current_url = ""
+        self.navigation_timeout = self.settings.browser_timeout
+        self.bytes_received = 0
+        self.cancel_token = cancel_token
+        self.last_status: Optional[int] = None
+        self.last_retry_after: Optional[float] = None
+        self._context_gauge = None
     
-    def start(self) -> None:
-        """Start the browser and create context."""
+    def start(self, storage_state: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Start the browser and create context.
+        
+        Args:
+            storage_state: Cookies and local storage saved by get_storage_state()
+        """
+        _load_playwright()
         self.playwright = sync_playwright().start()
         self.browser = self.playwright.chromium.launch(headless=self.headless)
         self.context = self.browser.new_context(
@@ -32,20 +71,133 @@ class BrowserEngine:
                 "width": self.settings.browser_viewport_width,
                 "height": self.settings.browser_viewport_height
             },
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            storage_state=storage_state
         )
         self.page = self.context.new_page()
+        self.page.on("response", self._on_response)
+        metrics = get_metrics()
+        if metrics is not None and self._context_gauge is None:
+            self._context_gauge = metrics.browser_contexts
+            self._context_gauge.inc()
+    
+    def _on_response(self, response) -> None:
+        """Accumulate network bytes received and record the status of page navigations."""
+        try:
+            self.bytes_received += int(response.headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            pass
+        try:
+            if response.request.is_navigation_request() and response.frame == self.page.main_frame:
+                self.last_status = response.status
+                retry_after = response.headers.get("retry-after")
+                self.last_retry_after = float(retry_after) if retry_after and retry_after.isdigit() else None
+        except Exception:
+            pass
+    
+    def _navigation_result(self) -> Dict[str, Any]:
+        """
+        Build the result of a successful navigation.
+        
+        Returns:
+            Success status, URL, and the document status, Retry-After and title
+            used by the rate limiter to detect throttling
+        """
+        self.current_url = self.page.url
+        result = {"success": True, "url": self.current_url, "status": self.last_status}
+        if self.last_retry_after is not None:
+            result["retry_after"] = self.last_retry_after
+        try:
+            title = self.page.title()
+            if isinstance(title, str):
+                result["title"] = title
+        except Exception:
+            pass
+        return result
+    
+    def get_storage_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Get cookies and local storage of the browser context.
+        
+        Returns:
+            Storage state, or None if the browser is not started
+        """
+        if not self.context:
+            return None
+        try:
+            return self.context.storage_state()
+        except Exception:
+            return None
+    
+    def set_navigation_timeout(self, timeout_ms: int) -> None:
+        """
+        Cap how long a single navigation may wait.
+        
+        Args:
+            timeout_ms: Timeout in milliseconds (never above browser_timeout)
+        """
+        self.navigation_timeout = max(1, min(int(timeout_ms), self.settings.browser_timeout))
     
     def stop(self) -> None:
-        """Stop the browser and cleanup resources."""
-        if self.page:
-            self.page.close()
-        if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
+        """Stop the browser and cleanup resources, even if some are already closed."""
+        if self._context_gauge is not None:
+            self._context_gauge.dec()
+            self._context_gauge = None
+        for resource in (self.page, self.context, self.browser):
+            if resource:
+                try:
+                    resource.close()
+                except Exception:
+                    pass
         if self.playwright:
-            self.playwright.stop()
+            try:
+                self.playwright.stop()
+            except Exception:
+                pass
+    
+    def _sleep(self, seconds: float) -> None:
+        """
+        Sleep, returning early if the mission is cancelled.
+        
+        Args:
+            seconds: Number of seconds to sleep
+            
+        Raises:
+            MissionCancelledError: If cancelled before or during the sleep
+        """
+        if self.cancel_token is None:
+            time.sleep(seconds)
+            return
+        self.cancel_token.wait(seconds)
+        self.cancel_token.raise_if_cancelled()
+    
+    def _wait_for_load_state(self, state: str, deadline: float) -> None:
+        """
+        Wait for a load state in short chunks, checking for cancellation between them.
+        
+        Args:
+            state: Playwright load state
+            deadline: time.monotonic() value after which the navigation times out
+            
+        Raises:
+            MissionCancelledError: If the mission is cancelled while waiting
+            PlaywrightTimeoutError: If the deadline passes first
+        """
+        _load_playwright()
+        chunk_ms = self.settings.mission_cancel_check_ms
+        while True:
+            if self.cancel_token is not None:
+                self.cancel_token.raise_if_cancelled()
+            remaining_ms = (deadline - time.monotonic()) * 1000
+            if remaining_ms <= 0:
+                raise PlaywrightTimeoutError(
+                    f"Timeout {self.navigation_timeout}ms exceeded waiting for \"{state}\""
+                )
+            try:
+                self.page.wait_for_load_state(state, timeout=min(chunk_ms, remaining_ms))
+                return
+            except PlaywrightTimeoutError:
+                continue
     
     def goto(self, url: str) -> Dict[str, Any]:
         """
@@ -58,13 +210,17 @@ class BrowserEngine:
             Dictionary with success status and URL
         """
         try:
+            # Return once the response starts, then wait for the page to settle
+            # in chunks so a cancelled mission does not sit out the full timeout
+            deadline = time.monotonic() + self.navigation_timeout / 1000
+            self.last_status = self.last_retry_after = None
             self.page.goto(
                 url,
-                wait_until="networkidle",
-                timeout=self.settings.browser_timeout
+                wait_until="commit",
+                timeout=self.navigation_timeout
             )
-            self.current_url = self.page.url
-            return {"success": True, "url": self.current_url}
+            self._wait_for_load_state("networkidle", deadline)
+            return self._navigation_result()
         except Exception as e:
             return {"success": False, "error": str(e)}
     
@@ -84,10 +240,10 @@ class BrowserEngine:
                 return {"success": False, "error": f"Element not found: {selector}"}
             
             element.scroll_into_view_if_needed()
+            self.last_status = self.last_retry_after = None
             element.click(timeout=5000)
-            time.sleep(1)
-            self.current_url = self.page.url
-            return {"success": True, "url": self.current_url}
+            self._sleep(1)
+            return self._navigation_result()
         except Exception as e:
             return {"success": False, "error": str(e)}
     
@@ -112,11 +268,12 @@ class BrowserEngine:
             element.fill("")
             element.type(text, delay=50)
             if press_enter:
+                self.last_status = self.last_retry_after = None
                 element.press("Enter")
-                time.sleep(2)
-                self.current_url = self.page.url
+                self._sleep(2)
+                return self._navigation_result()
             else:
-                time.sleep(0.5)
+                self._sleep(0.5)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -139,7 +296,7 @@ class BrowserEngine:
             else:
                 return {"success": False, "error": "Direction must be 'down' or 'up'"}
             
-            time.sleep(1)
+            self._sleep(1)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -154,7 +311,10 @@ class BrowserEngine:
         Returns:
             Dictionary with success status
         """
-        time.sleep(seconds)
+        try:
+            self._sleep(seconds)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
         return {"success": True}
     
     def get_page_state(self) -> Dict[str, Any]:
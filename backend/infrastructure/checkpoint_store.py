@@ -0,0 +1,79 @@
+"""Local-disk storage of mission checkpoints."""
+from typing import Any, Dict, List, Optional
+import json
+import os
+import re
+import time
+
+
+class CheckpointStore:
+    """Store one JSON checkpoint per mission, written atomically."""
+    
+    def __init__(self, directory: str):
+        """
+        Initialize checkpoint store.
+        
+        Args:
+            directory: Directory holding checkpoint files
+        """
+        self.directory = directory
+    
+    def _path(self, mission_id: str) -> str:
+        """Build the checkpoint path, rejecting IDs that could escape the directory."""
+        if not re.fullmatch(r"[\w-]+", mission_id):
+            raise ValueError(f"Invalid mission id: {mission_id}")
+        return os.path.join(self.directory, f"{mission_id}.json")
+    
+    def save(self, mission_id: str, checkpoint: Dict[str, Any]) -> None:
+        """
+        Save a mission checkpoint, replacing the previous one.
+        
+        Args:
+            mission_id: Mission identifier
+            checkpoint: JSON-serializable checkpoint
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(mission_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**checkpoint, "saved_at": time.time()}, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+    
+    def load(self, mission_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a mission checkpoint.
+        
+        Args:
+            mission_id: Mission identifier
+            
+        Returns:
+            Checkpoint, or None if there is none (or it is unreadable)
+        """
+        try:
+            with open(self._path(mission_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def delete(self, mission_id: str) -> None:
+        """
+        Delete a mission checkpoint if it exists.
+        
+        Args:
+            mission_id: Mission identifier
+        """
+        try:
+            os.remove(self._path(mission_id))
+        except FileNotFoundError:
+            pass
+    
+    def list(self) -> List[str]:
+        """
+        List missions with a checkpoint.
+        
+        Returns:
+            Mission identifiers
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith(".json"))
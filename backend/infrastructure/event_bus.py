@@ -0,0 +1,245 @@
+"""SQLite event log shared by API processes serving the same missions."""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from config.settings import Settings
+from infrastructure.event_hub import EncodedMessage
+from infrastructure.serialization import dumps_text, loads
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mission_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    mission_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mission_events_mission ON mission_events (mission_id, seq);
+CREATE INDEX IF NOT EXISTS idx_mission_events_created_at ON mission_events (created_at);
+"""
+
+# Entry kinds: mission events, and control messages between processes
+EVENT = "event"
+CANCEL = "cancel"
+ACK = "ack"
+DELETE = "delete"
+
+
+class SQLiteEventBus:
+    """
+    Append-only log of mission events and control messages in SQLite.
+    
+    Every API process appends the events of the missions it runs and tails
+    the log for entries appended by the others, so a WebSocket on any
+    process receives events of a mission running on another one. Control
+    entries carry stop requests to the process running a mission and its
+    acknowledgement back.
+    """
+    
+    def __init__(
+        self,
+        db_path: str,
+        poll_interval: float = 0.05,
+        retention: float = 3600,
+        batch_size: int = 500
+    ):
+        """
+        Initialize event bus.
+        
+        Args:
+            db_path: Database file path
+            poll_interval: Seconds between reads of new entries
+            retention: Seconds entries are kept (0 keeps them forever)
+            batch_size: Maximum entries read per poll
+        """
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.batch_size = batch_size
+        self.origin = uuid.uuid4().hex
+        self._local = threading.local()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it in WAL mode on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def append(self, mission_id: str, kind: str = EVENT, message: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Append an entry to the log.
+        
+        Args:
+            mission_id: Mission identifier
+            kind: EVENT, CANCEL, ACK or DELETE
+            message: Event message; an EncodedMessage is stored without re-encoding
+            
+        Returns:
+            Sequence number of the entry
+        """
+        if message is None:
+            data = None
+        elif isinstance(message, EncodedMessage):
+            data = message.text
+        else:
+            data = dumps_text(message)
+        cursor = self._connection().execute(
+            "INSERT INTO mission_events (mission_id, kind, origin, created_at, data) VALUES (?, ?, ?, ?, ?)",
+            (mission_id, kind, self.origin, time.time(), data)
+        )
+        return cursor.lastrowid
+    
+    def recent(self, mission_id: str, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Read the latest events of a mission.
+        
+        Args:
+            mission_id: Mission identifier
+            limit: Maximum number of events
+            
+        Returns:
+            Events oldest first, and the sequence number of the last one (0 if none)
+        """
+        rows = self._connection().execute(
+            "SELECT seq, data FROM mission_events WHERE mission_id = ? AND kind = ? ORDER BY seq DESC LIMIT ?",
+            (mission_id, EVENT, limit)
+        ).fetchall()
+        rows.reverse()
+        return [loads(data) for _, data in rows], rows[-1][0] if rows else 0
+    
+    def last_seq(self) -> int:
+        """Get the sequence number of the latest entry (0 if the log is empty)."""
+        return self._connection().execute("SELECT COALESCE(MAX(seq), 0) FROM mission_events").fetchone()[0]
+    
+    def read_since(self, seq: int) -> List[Tuple[int, str, str, str, Optional[Dict[str, Any]]]]:
+        """
+        Read entries appended after a sequence number.
+        
+        Args:
+            seq: Sequence number of the last entry already read
+            
+        Returns:
+            Up to batch_size (seq, mission_id, kind, origin, message) tuples;
+            entries appended by this bus come without their message
+        """
+        rows = self._connection().execute(
+            "SELECT seq, mission_id, kind, origin, CASE WHEN origin = ? THEN NULL ELSE data END "
+            "FROM mission_events WHERE seq > ? ORDER BY seq LIMIT ?",
+            (self.origin, seq, self.batch_size)
+        ).fetchall()
+        return [
+            (row_seq, mission_id, kind, origin, loads(data) if data is not None else None)
+            for row_seq, mission_id, kind, origin, data in rows
+        ]
+    
+    def prune(self) -> int:
+        """
+        Drop entries older than the retention window.
+        
+        Returns:
+            Number of entries dropped
+        """
+        if not self.retention:
+            return 0
+        cursor = self._connection().execute(
+            "DELETE FROM mission_events WHERE created_at < ?", (time.time() - self.retention,)
+        )
+        return cursor.rowcount
+    
+    def start(
+        self,
+        handler: Callable[[int, str, str, Optional[Dict[str, Any]]], None],
+        prune_interval: float = 60.0
+    ) -> None:
+        """
+        Start tailing entries appended by other processes.
+        
+        Args:
+            handler: Called as handler(seq, kind, mission_id, message) on the tail thread
+            prune_interval: Seconds between retention prunes
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._tail,
+            args=(handler, self.last_seq(), prune_interval),
+            name="mission-event-bus",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop tailing the log."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _tail(
+        self,
+        handler: Callable[[int, str, str, Optional[Dict[str, Any]]], None],
+        seq: int,
+        prune_interval: float
+    ) -> None:
+        """Deliver entries of other processes appended after seq to handler, in log order (tail thread)."""
+        pruned_at = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                entries = self.read_since(seq)
+            except sqlite3.Error:
+                logger.exception("Failed to read mission events")
+                entries = []
+            for entry_seq, mission_id, kind, origin, message in entries:
+                seq = entry_seq
+                if origin == self.origin:
+                    continue
+                try:
+                    handler(entry_seq, kind, mission_id, message)
+                except Exception:
+                    logger.exception("Mission event handler failed for %s", mission_id)
+            if time.monotonic() - pruned_at >= prune_interval:
+                pruned_at = time.monotonic()
+                try:
+                    self.prune()
+                except sqlite3.Error:
+                    logger.exception("Failed to prune mission events")
+            # A full batch means more entries are waiting
+            if len(entries) < self.batch_size:
+                self._stopped.wait(self.poll_interval)
+
+
+def create_event_bus(settings: Settings) -> Optional[SQLiteEventBus]:
+    """
+    Build the event bus selected by settings.
+    
+    Args:
+        settings: Application settings
+        
+    Returns:
+        SQLiteEventBus when mission_event_backend is "sqlite", otherwise None
+    """
+    if settings.mission_event_backend == "sqlite":
+        return SQLiteEventBus(
+            settings.mission_event_db_path,
+            poll_interval=settings.mission_event_poll_interval,
+            retention=settings.mission_event_retention
+        )
+    return None
@@ -0,0 +1,287 @@
+"""Per-mission publish/subscribe hub with a bounded replay buffer."""
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
+import threading
+from infrastructure.message_channel import MessageChannel
+from infrastructure.serialization import dumps, dumps_text
+
+
+# Message types after which a mission publishes nothing more
+TERMINAL_MESSAGES = {"complete", "incomplete", "finished", "stopped"}
+
+# Pending messages of these types are superseded by a newer one of the same type
+LATEST_WINS = {"status", "queued"}
+
+# Message types a full outbox may drop, besides non-fatal errors; results,
+# fatal errors and endings are always kept
+DROPPABLE = {"status", "queued", "action", "extraction"}
+
+# Message types a full outbox folds into the newest one, and the field counting
+# the folded messages (errors only when not fatal)
+FOLDED = {"action": "skipped_actions", "error": "skipped_errors"}
+
+
+def is_droppable(message: Dict[str, Any]) -> bool:
+    """Whether a full outbox may drop or fold a pending message."""
+    message_type = message.get("type")
+    return message_type in DROPPABLE or message_type == "error" and not message.get("fatal")
+
+# Action fields that delta encoding sends only when they change
+PROGRESS_FIELDS = ("url", "sources_visited", "extracted_data_count", "budget")
+
+
+def encode_message(message: Dict[str, Any]) -> str:
+    """
+    Serialize a message to compact JSON text with the configured backend.
+    
+    Args:
+        message: JSON-compatible message
+        
+    Returns:
+        Compact JSON text
+    """
+    return dumps_text(message)
+
+
+class EncodedMessage(dict):
+    """
+    Message dict carrying its JSON encoding, serialized once when published.
+    
+    data holds the UTF-8 bytes for byte-oriented transports (HTTP streams);
+    text decodes them once for WebSocket text frames. Both are shared by
+    every subscriber.
+    """
+    
+    __slots__ = ("data", "_text")
+    
+    def __init__(self, message: Dict[str, Any]):
+        super().__init__(message)
+        self.data = dumps(message)
+        self._text = None
+    
+    @property
+    def text(self) -> str:
+        """JSON text of the message, decoded on first use."""
+        if self._text is None:
+            self._text = self.data.decode("utf-8")
+        return self._text
+
+
+def encode_text(message: Dict[str, Any]) -> str:
+    """
+    Get the JSON text of a message, reusing the text of an EncodedMessage.
+    
+    Args:
+        message: Message to send
+        
+    Returns:
+        Compact JSON text
+    """
+    return message.text if isinstance(message, EncodedMessage) else encode_message(message)
+
+
+class Outbox(MessageChannel):
+    """
+    Bounded subscriber channel that coalesces what a slow consumer has not read.
+    
+    A newer status (or queue position) replaces any pending one. Once
+    max_pending messages are waiting, pending actions are folded into the
+    newest action and non-fatal errors into the newest error, each
+    reporting how many were skipped, and the oldest droppable messages make
+    room after that. Results, fatal errors and terminal messages are never
+    dropped, so however slow the client the outbox holds at most
+    max_pending messages plus the mission's final few.
+    """
+    
+    def __init__(self, max_pending: int = 64):
+        """
+        Initialize outbox.
+        
+        Args:
+            max_pending: Number of unread messages before coalescing kicks in
+        """
+        super().__init__()
+        self.max_pending = max(1, max_pending)
+        self.coalesced = 0
+        self.dropped = 0
+    
+    def _remove(self, matches: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        """Take the pending messages a predicate matches out of the queue."""
+        removed = [message for message in self._messages if matches(message)]
+        if removed:
+            kept = [message for message in self._messages if not matches(message)]
+            self._messages.clear()
+            self._messages.extend(kept)
+        return removed
+    
+    def _append(self, message: Dict[str, Any]) -> None:
+        message_type = message.get("type")
+        if message_type in LATEST_WINS:
+            self.coalesced += len(self._remove(lambda pending: pending.get("type") == message_type))
+        
+        counter = FOLDED.get(message_type)
+        if counter and is_droppable(message) and len(self._messages) >= self.max_pending:
+            skipped = self._remove(lambda pending: pending.get("type") == message_type and is_droppable(pending))
+            if skipped:
+                self.coalesced += len(skipped)
+                message = EncodedMessage({
+                    **message,
+                    counter: message.get(counter, 0) + sum(1 + pending.get(counter, 0) for pending in skipped)
+                })
+        
+        while len(self._messages) >= self.max_pending:
+            index = next(
+                (i for i, pending in enumerate(self._messages) if is_droppable(pending)),
+                None
+            )
+            if index is None:
+                break
+            del self._messages[index]
+            self.dropped += 1
+        
+        self._messages.append(message)
+
+
+class ProgressDelta:
+    """
+    Per-subscriber encoder that sends action progress fields only when they change.
+    
+    Clients opting in merge each action message into the previous state;
+    unchanged progress fields are left out and the budget only lists the
+    resources whose usage changed.
+    """
+    
+    def __init__(self):
+        """Initialize delta encoder."""
+        self._last: Dict[str, Any] = {}
+    
+    def encode(self, message: Dict[str, Any]) -> str:
+        """
+        Serialize a message, delta-encoding the progress fields of actions.
+        
+        Args:
+            message: Message to send
+            
+        Returns:
+            JSON text
+        """
+        if message.get("type") != "action":
+            return encode_text(message)
+        
+        delta = dict(message)
+        for field in PROGRESS_FIELDS:
+            if field not in message:
+                continue
+            value = message[field]
+            last = self._last.get(field)
+            if isinstance(value, dict) and isinstance(last, dict):
+                changed = {key: item for key, item in value.items() if last.get(key) != item}
+                if changed:
+                    delta[field] = changed
+                else:
+                    del delta[field]
+            elif value == last:
+                del delta[field]
+            self._last[field] = value
+        delta["delta"] = True
+        return encode_message(delta)
+
+
+class MissionHub:
+    """
+    Fan mission events out to any number of subscribers.
+    
+    Each published event is serialized once and the same EncodedMessage is
+    put into every subscriber's bounded outbox. The last replay_size events are
+    kept so that subscribers joining late (a dashboard opened mid-mission,
+    or a client reconnecting) first receive what they missed.
+    """
+    
+    def __init__(self, replay_size: int = 256, outbox_size: int = 64):
+        """
+        Initialize hub.
+        
+        Args:
+            replay_size: Number of recent events replayed to new subscribers
+            outbox_size: Unread messages per subscriber before its outbox coalesces
+        """
+        self.outbox_size = outbox_size
+        self._replay: Deque[EncodedMessage] = deque(maxlen=replay_size)
+        self._subscribers: List[MessageChannel] = []
+        self._lock = threading.Lock()
+        self.published = 0
+    
+    def publish(self, message: Dict[str, Any]) -> EncodedMessage:
+        """
+        Deliver an event to every subscriber; callable from any thread.
+        
+        Args:
+            message: Event message
+            
+        Returns:
+            The encoded message that was delivered
+        """
+        encoded = message if isinstance(message, EncodedMessage) else EncodedMessage(message)
+        with self._lock:
+            self._replay.append(encoded)
+            self.published += 1
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.put(encoded)
+        return encoded
+    
+    def subscribe(self, replay: bool = True) -> MessageChannel:
+        """
+        Add a subscriber.
+        
+        Args:
+            replay: Whether to start with the buffered recent events
+            
+        Returns:
+            Outbox receiving the replayed events, then every new one
+        """
+        channel = Outbox(self.outbox_size)
+        with self._lock:
+            if replay:
+                for message in self._replay:
+                    channel.put(message)
+            self._subscribers.append(channel)
+        return channel
+    
+    def recent(self) -> List[EncodedMessage]:
+        """
+        Get the buffered recent events without subscribing.
+        
+        Returns:
+            Events kept for replay, oldest first
+        """
+        with self._lock:
+            return list(self._replay)
+    
+    def unsubscribe(self, channel: MessageChannel) -> None:
+        """
+        Remove a subscriber.
+        
+        Args:
+            channel: Channel returned by subscribe()
+        """
+        with self._lock:
+            if channel in self._subscribers:
+                self._subscribers.remove(channel)
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Number of current subscribers."""
+        with self._lock:
+            return len(self._subscribers)
+    
+    def outbox_depths(self) -> List[int]:
+        """
+        Get how many messages each subscriber has not read yet.
+        
+        Returns:
+            Pending message count per subscriber
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return [subscriber.pending for subscriber in subscribers]
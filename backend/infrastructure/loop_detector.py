@@ -0,0 +1,130 @@
+"""Sequence-aware loop detection over recent agent actions."""
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import hashlib
+from core.domain.models import LoopSignal
+from infrastructure.page_cache import canonical_url
+
+
+STATIC_ACTIONS = {"scroll", "wait"}
+
+
+def page_fingerprint(page_state: Dict[str, Any], text_chars: int = 2000) -> str:
+    """
+    Fingerprint the visible content of a page.
+    
+    Two observations of the same page with unchanged content share a
+    fingerprint, so scrolling that reveals nothing new repeats it.
+    
+    Args:
+        page_state: Page state from the browser engine
+        text_chars: Number of visible-text characters to hash
+        
+    Returns:
+        Short hex digest
+    """
+    content = "\x1f".join((
+        page_state.get("title", ""),
+        page_state.get("visible_text", "")[:text_chars],
+        str(len(page_state.get("interactive_elements", [])))
+    ))
+    return hashlib.blake2b(content.encode("utf-8", "ignore"), digest_size=8).hexdigest()
+
+
+class LoopDetector:
+    """
+    Detect repeated cycles in a sliding window of (URL, action, page) steps.
+    
+    Each step is reduced to a hash. For every candidate period p, the detector
+    keeps the length of the current run where step[i] == step[i - p]; a run of
+    p * (min_repeats - 1) means the last p-step cycle repeated min_repeats times.
+    Updating the runs is O(max_period) per action, independent of mission length.
+    """
+    
+    def __init__(self, window: int = 32, max_period: int = 4, min_repeats: int = 3):
+        """
+        Initialize loop detector.
+        
+        Args:
+            window: Number of recent steps kept
+            max_period: Longest cycle length detected (1 = same step repeated)
+            min_repeats: Times a cycle must repeat to count as a loop
+        """
+        self.max_period = max_period
+        self.min_repeats = min_repeats
+        self._steps: Deque[Tuple[int, str, str]] = deque(maxlen=max(window, max_period * min_repeats))
+        self._runs = [0] * (max_period + 1)
+    
+    def record(self, url: str, action: str, fingerprint: str = "") -> None:
+        """
+        Record an executed action.
+        
+        Args:
+            url: URL where the action was performed
+            action: Action name
+            fingerprint: Page fingerprint before the action
+        """
+        url = canonical_url(url) if url else ""
+        key = hash((url, action, fingerprint))
+        steps = self._steps
+        for period in range(1, self.max_period + 1):
+            if len(steps) >= period and steps[-period][0] == key:
+                self._runs[period] += 1
+            else:
+                self._runs[period] = 0
+        steps.append((key, url, action))
+    
+    def detect(self) -> Optional[LoopSignal]:
+        """
+        Check whether the most recent steps form a repeated cycle.
+        
+        Returns:
+            LoopSignal for the shortest repeating cycle, or None
+        """
+        for period in range(1, self.max_period + 1):
+            if self._runs[period] >= period * (self.min_repeats - 1):
+                cycle = list(self._steps)[-period:]
+                return LoopSignal(
+                    period=period,
+                    repeats=self._runs[period] // period + 1,
+                    urls=list(dict.fromkeys(url for _, url, _ in cycle)),
+                    actions=[action for _, _, action in cycle],
+                    strategy=self.suggest_escape(period, cycle)
+                )
+        return None
+    
+    def involves(self, url: str) -> bool:
+        """
+        Check whether a URL is part of the currently detected loop.
+        
+        Args:
+            url: URL to check
+            
+        Returns:
+            True if a loop is detected and the URL is in its cycle
+        """
+        signal = self.detect()
+        return signal is not None and canonical_url(url) in signal.urls
+    
+    @staticmethod
+    def suggest_escape(period: int, cycle: List[Tuple[int, str, str]]) -> str:
+        """
+        Suggest how the agent should break out of a loop.
+        
+        Args:
+            period: Cycle length
+            cycle: Steps of one cycle
+            
+        Returns:
+            "leave_page" when scrolling or waiting does not change the page,
+            "change_query" when the same interaction is repeated, and
+            "avoid_cycle" when the agent oscillates between pages
+        """
+        if period == 1:
+            return "leave_page" if cycle[0][2] in STATIC_ACTIONS else "change_query"
+        return "avoid_cycle"
+    
+    def reset(self) -> None:
+        """Forget recorded steps, e.g. after the agent escaped a loop."""
+        self._steps.clear()
+        self._runs = [0] * (self.max_period + 1)
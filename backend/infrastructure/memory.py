@@ -1,27 +1,204 @@
 """Memory implementation for agent state management."""
-from typing import List, Dict, Any
+from collections import deque
+from itertools import islice
+from typing import List, Dict, Any, Deque, Iterator, Optional
 from datetime import datetime
-from core.domain.models import ActionHistory
+import json
+import os
+import sys
+import time
+from core.domain.models import ActionHistory, LoopSignal, MissionSummary
+from core.stats import RunningStats
+from infrastructure.loop_detector import LoopDetector
+
+
+class ActionRecord:
+    """Compact action history entry; converted to ActionHistory only on export."""
+    
+    __slots__ = ("timestamp", "action", "params", "url", "result")
+    
+    def __init__(self, timestamp: float, action: str, params: Dict[str, Any], url: str, result: Any):
+        self.timestamp = timestamp
+        self.action = action
+        self.params = params
+        self.url = url
+        self.result = result
+    
+    def to_model(self) -> ActionHistory:
+        """
+        Build the pydantic model for this record.
+        
+        Returns:
+            ActionHistory instance
+        """
+        return ActionHistory(
+            timestamp=datetime.fromtimestamp(self.timestamp),
+            action=self.action,
+            params=self.params,
+            url=self.url,
+            result=self.result if isinstance(self.result, str) else str(self.result)
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert record to a JSON-compatible dictionary.
+        
+        Returns:
+            Dictionary with the record fields
+        """
+        return {
+            "timestamp": self.timestamp,
+            "action": self.action,
+            "params": self.params,
+            "url": self.url,
+            "result": self.result
+        }
 
 
 class Memory:
-    def __init__(self):
-        self.history: List[ActionHistory] = []
+    def __init__(
+        self,
+        history_size: int = 100,
+        spill_path: Optional[str] = None,
+        loop_detector: Optional[LoopDetector] = None
+    ):
+        """
+        Initialize memory.
+        
+        Args:
+            history_size: Number of recent actions kept in memory
+            spill_path: Optional JSONL file receiving actions evicted from the ring buffer
+            loop_detector: Loop detector fed with every action (a default one if omitted)
+        """
+        self.loop_detector = loop_detector or LoopDetector()
+        self.records: Deque[ActionRecord] = deque(maxlen=history_size)
+        self.spill_path = spill_path
+        self.total_actions = 0
         self.extracted_data: List[Dict[str, Any]] = []
         self.url_visit_count: Dict[str, int] = {}
+        self.source_counts: Dict[str, int] = {}
+        self.price_count = 0
+        self.price_stats = RunningStats()
+        self._spill_file = None
+    
+    @property
+    def history(self) -> List[ActionHistory]:
+        """Actions still held in the ring buffer, as ActionHistory models."""
+        return [record.to_model() for record in self.records]
     
-    def add_action(self, action: str, params: Dict[str, Any], url: str, result: str = ""):
-        self.history.append(ActionHistory(
-            timestamp=datetime.now(),
-            action=action,
-            params=params,
-            url=url,
-            result=result
-        ))
+    def add_action(
+        self,
+        action: str,
+        params: Dict[str, Any],
+        url: str,
+        result: Any = "",
+        fingerprint: str = ""
+    ):
+        """
+        Add action to history.
+        
+        Args:
+            action: Action name
+            params: Action parameters
+            url: URL where the action was performed
+            result: Raw action result (stringified only on export)
+            fingerprint: Fingerprint of the page the action was taken on
+        """
+        url = sys.intern(url)
+        if self.records.maxlen is not None and len(self.records) == self.records.maxlen:
+            self._spill(self.records[0])
+        self.records.append(ActionRecord(time.time(), sys.intern(action), params, url, result))
+        self.total_actions += 1
         self.url_visit_count[url] = self.url_visit_count.get(url, 0) + 1
+        self.loop_detector.record(url, action, fingerprint)
+    
+    def _spill(self, record: ActionRecord) -> None:
+        """Append an evicted record to the spill file."""
+        if not self.spill_path:
+            return
+        if self._spill_file is None:
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+        self._spill_file.write(json.dumps(record.to_dict(), ensure_ascii=False, default=str) + "\n")
+    
+    def iter_full_history(self) -> Iterator[ActionHistory]:
+        """
+        Iterate over every recorded action, including spilled ones.
+        
+        Returns:
+            Iterator of ActionHistory objects, oldest first
+        """
+        if self._spill_file is not None:
+            self._spill_file.flush()
+        if self.spill_path and os.path.exists(self.spill_path):
+            with open(self.spill_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    yield ActionRecord(**json.loads(line)).to_model()
+        for record in list(self.records):
+            yield record.to_model()
+    
+    def close(self) -> None:
+        """Flush and close the spill file."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Export memory state for a checkpoint.
+        
+        Returns:
+            JSON-compatible dictionary (aggregates are rebuilt on restore)
+        """
+        return {
+            "records": [record.to_dict() for record in self.records],
+            "total_actions": self.total_actions,
+            "url_visit_count": dict(self.url_visit_count),
+            "extracted_data": list(self.extracted_data)
+        }
+    
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore memory state exported by get_state().
+        
+        Args:
+            state: Memory state
+        """
+        self.records.clear()
+        self.records.extend(ActionRecord(**record) for record in state.get("records", []))
+        self.total_actions = state.get("total_actions", len(self.records))
+        self.url_visit_count = dict(state.get("url_visit_count", {}))
+        self.extracted_data = []
+        self.source_counts = {}
+        self.price_count = 0
+        self.price_stats = RunningStats()
+        for data in state.get("extracted_data", []):
+            Memory.add_extracted_data(self, data)
+            self.extracted_data[-1] = data
+        self.loop_detector.reset()
     
     def is_loop_detected(self, url: str) -> bool:
-        return self.url_visit_count.get(url, 0) >= 3
+        """
+        Check whether the URL is part of a repeating cycle of recent actions.
+        
+        Args:
+            url: URL to check
+            
+        Returns:
+            True if the latest actions loop through this URL
+        """
+        return self.loop_detector.involves(url)
+    
+    def detect_loop(self) -> Optional[LoopSignal]:
+        """
+        Get the loop formed by the most recent actions, if any.
+        
+        Returns:
+            LoopSignal with the suggested escape strategy, or None
+        """
+        return self.loop_detector.detect()
     
     def get_recent_actions(self, count: int = 10) -> List[ActionHistory]:
         """
@@ -33,13 +210,40 @@ class Memory:
         Returns:
             List of recent ActionHistory objects
         """
-        return self.history[-count:] if len(self.history) > count else self.history
+        records = list(self.records)
+        return [record.to_model() for record in records[-count:]]
     
     def add_extracted_data(self, data: Dict[str, Any]):
+        """
+        Add extracted data and update the running aggregates.
+        
+        Args:
+            data: Extracted data dictionary
+        """
         self.extracted_data.append({
             **data,
             "timestamp": datetime.now().isoformat()
         })
+        
+        url = data.get("url")
+        if url:
+            url = sys.intern(url)
+            self.source_counts[url] = self.source_counts.get(url, 0) + 1
+        
+        if "prices" in data:
+            prices = data["prices"]
+            if not isinstance(prices, list):
+                prices = [prices]
+            self.price_count += len(prices)
+            for price in prices:
+                value = price.get("value") if isinstance(price, dict) else price
+                if isinstance(value, (int, float)) and value > 0:
+                    self.price_stats.add(float(value))
+    
+    @property
+    def data_point_count(self) -> int:
+        """Number of extracted data points."""
+        return len(self.extracted_data)
     
     def get_extracted_data(self) -> List[Dict[str, Any]]:
         """
@@ -50,32 +254,40 @@ class Memory:
         """
         return self.extracted_data
     
+    def get_summary_data(self) -> MissionSummary:
+        """
+        Get a structured summary from the running aggregates.
+        
+        Returns:
+            MissionSummary instance
+        """
+        stats = self.price_stats
+        return MissionSummary(
+            total_actions=self.total_actions,
+            data_points=len(self.extracted_data),
+            sources_visited=len(self.source_counts),
+            sources=list(self.source_counts),
+            source_counts=dict(self.source_counts),
+            total_prices=self.price_count,
+            average_price=stats.mean if stats.count else None,
+            min_price=stats.minimum,
+            max_price=stats.maximum,
+            price_stddev=stats.stddev if stats.count > 1 else None
+        )
+    
     def get_summary(self) -> str:
         recent = self.get_recent_actions(5)
         summary = f"Research Summary\n"
-        summary += f"Total actions: {len(self.history)}\n"
-        summary += f"Sources visited: {len(set(d.get('url', '') for d in self.extracted_data))}\n"
+        summary += f"Total actions: {self.total_actions}\n"
+        summary += f"Sources visited: {len(self.source_counts)}\n"
         summary += f"Extracted data points: {len(self.extracted_data)}\n"
         
-        # Count total prices found
-        total_prices = 0
-        for data in self.extracted_data:
-            if "prices" in data:
-                prices = data["prices"]
-                total_prices += len(prices) if isinstance(prices, list) else 1
-        
-        if total_prices > 0:
-            summary += f"Total prices found: {total_prices}\n"
-        
-        # List unique sources
-        unique_sources = set()
-        for data in self.extracted_data:
-            if "url" in data and data["url"]:
-                unique_sources.add(data["url"])
+        if self.price_count > 0:
+            summary += f"Total prices found: {self.price_count}\n"
         
-        if unique_sources:
+        if self.source_counts:
             summary += f"\nSources consulted:\n"
-            for i, source in enumerate(list(unique_sources)[:10], 1):
+            for i, source in enumerate(islice(self.source_counts, 10), 1):
                 summary += f"  {i}. {source}\n"
         
         summary += "\nRecent actions:\n"
@@ -0,0 +1,107 @@
+"""Thread-to-asyncio message channel for streaming mission updates."""
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+import asyncio
+import queue
+import threading
+
+
+class MessageChannel:
+    """
+    Unbounded FIFO fed from mission threads and consumed from the event loop.
+    
+    put() is safe to call from any thread and never blocks. Once a consumer
+    binds the channel to its event loop, every put() wakes it through
+    loop.call_soon_threadsafe, so the consumer awaits get() instead of
+    polling a thread-safe queue from inside a coroutine.
+    """
+    
+    def __init__(self):
+        """Initialize message channel."""
+        self._messages: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+    
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Attach the channel to the event loop of its consumer.
+        
+        Messages put before binding are kept and delivered first.
+        
+        Args:
+            loop: Event loop running the consumer
+        """
+        with self._lock:
+            self._loop = loop
+            self._ready = asyncio.Event()
+            if self._messages:
+                self._ready.set()
+    
+    def put(self, message: Dict[str, Any]) -> None:
+        """
+        Add a message; callable from any thread.
+        
+        Args:
+            message: Message to deliver
+        """
+        with self._lock:
+            self._append(message)
+            loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wake)
+            except RuntimeError:
+                # Consumer's loop already closed; the message stays buffered
+                pass
+    
+    def _append(self, message: Dict[str, Any]) -> None:
+        """Queue a message; called with the lock held (subclasses may coalesce here)."""
+        self._messages.append(message)
+    
+    def _wake(self) -> None:
+        """Signal the consumer that messages are available (runs on the loop)."""
+        if self._ready is not None:
+            self._ready.set()
+    
+    def get_nowait(self) -> Dict[str, Any]:
+        """
+        Remove and return the oldest message.
+        
+        Returns:
+            Message
+            
+        Raises:
+            queue.Empty: If no message is pending
+        """
+        with self._lock:
+            if not self._messages:
+                raise queue.Empty
+            return self._messages.popleft()
+    
+    async def get(self) -> Dict[str, Any]:
+        """
+        Wait for the next message without blocking the event loop.
+        
+        Returns:
+            Message
+        """
+        if self._ready is None:
+            self.bind(asyncio.get_running_loop())
+        while True:
+            with self._lock:
+                if self._messages:
+                    return self._messages.popleft()
+                self._ready.clear()
+            await self._ready.wait()
+    
+    def empty(self) -> bool:
+        """Check whether no message is pending."""
+        with self._lock:
+            return not self._messages
+    
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be read."""
+        with self._lock:
+            return len(self._messages)
@@ -0,0 +1,462 @@
+"""In-process metrics exposed in the Prometheus text exposition format."""
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple, Union
+import asyncio
+import math
+import threading
+from config.settings import get_settings
+
+
+# Content type of the text exposition format served by /metrics
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from a cached page snapshot up to a slow navigation
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Event loop lag in seconds: anything above a few milliseconds is felt by every WebSocket
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Prices found per extraction
+YIELD_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Label values a metric may take before new ones are folded into "other"
+MAX_SERIES = 200
+
+LabelValues = Tuple[str, ...]
+
+# Receives (metric name, method, arguments) of a sample recorded in another process
+Forward = Callable[[str, str, tuple], None]
+
+# Methods whose samples may be forwarded and applied by name
+FORWARDED_METHODS = frozenset({"observe", "set", "inc"})
+
+
+def format_value(value: float) -> str:
+    """Format a sample value the way Prometheus parses it."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metric:
+    """
+    Base of every metric: a name, a help text and one series per label values.
+    
+    Series are created on first use. A metric keeps at most max_series of
+    them so that unbounded label values (hosts of visited pages) cannot grow
+    the registry forever; later label values share a single "other" series.
+    A metric with a forward function hands its samples to it instead of
+    recording them, e.g. to the API process from a mission worker process.
+    """
+    
+    type_name = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), max_series: int = MAX_SERIES):
+        """
+        Initialize metric.
+        
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the metric's labels
+            max_series: Most label value combinations kept
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._series: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+        self.forward: Optional[Forward] = None
+    
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        """Get the series key of label values (lock held)."""
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        key = tuple(labels)
+        if key not in self._series and len(self._series) >= self.max_series:
+            return ("other",) * len(key)
+        return key
+    
+    def _labels(self, key: LabelValues, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        """Render the label set of a sample."""
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{escape_label(str(value))}"' for name, value in pairs) + "}"
+    
+    def samples(self) -> Iterator[str]:
+        """Yield the sample lines of the metric."""
+        raise NotImplementedError
+    
+    def render(self) -> str:
+        """
+        Render the metric in the text exposition format.
+        
+        Returns:
+            HELP and TYPE lines followed by one line per sample
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines) + "\n"
+
+
+class Gauge(Metric):
+    """
+    Value that goes up and down.
+    
+    A gauge is either set by the code it measures, or computed when scraped
+    by a function returning its value (or a value per label values), which
+    suits state some other object already tracks.
+    """
+    
+    type_name = "gauge"
+    
+    def __init__(self, *args, **kwargs):
+        """Initialize gauge; takes the arguments of Metric."""
+        super().__init__(*args, **kwargs)
+        self._function: Optional[Callable[[], Union[float, Dict[LabelValues, float]]]] = None
+    
+    def set(self, value: float, *labels: str) -> None:
+        """Set a series to a value."""
+        if self.forward is not None:
+            self.forward(self.name, "set", (value, *labels))
+            return
+        with self._lock:
+            self._series[self._key(labels)] = float(value)
+    
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        """Increase a series."""
+        if self.forward is not None:
+            self.forward(self.name, "inc", (amount, *labels))
+            return
+        with self._lock:
+            key = self._key(labels)
+            self._series[key] = self._series.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1.0, *labels: str) -> None:
+        """Decrease a series."""
+        self.inc(-amount, *labels)
+    
+    def value(self, *labels: str) -> float:
+        """Current value of a series (0 if never set)."""
+        with self._lock:
+            return self._series.get(tuple(labels), 0.0)
+    
+    def set_function(self, function: Optional[Callable[[], Union[float, Dict[LabelValues, float]]]]) -> None:
+        """
+        Compute the gauge when scraped.
+        
+        Args:
+            function: Returns the value, or a value per label values tuple (None to stop)
+        """
+        self._function = function
+    
+    def samples(self) -> Iterator[str]:
+        function = self._function
+        if function is not None:
+            try:
+                computed = function()
+            except Exception:
+                # A failing source must not break the whole scrape
+                return
+            series = list(computed.items()) if isinstance(computed, dict) else [((), computed)]
+        else:
+            with self._lock:
+                series = list(self._series.items())
+        for key, value in series:
+            yield f"{self.name}{self._labels(key)} {format_value(value)}"
+
+
+class HistogramSeries:
+    """Bucket counts and sum of one histogram series."""
+    
+    __slots__ = ("counts", "total", "count")
+    
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values over fixed buckets.
+    
+    observe() bisects into the bucket list and bumps one counter under the
+    metric's lock, which costs about a microsecond; cumulative bucket
+    counts are only computed when scraped.
+    """
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        max_series: int = MAX_SERIES
+    ):
+        """
+        Initialize histogram.
+        
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the metric's labels
+            buckets: Upper bounds of the buckets, ascending (+Inf is implied)
+            max_series: Most label value combinations kept
+        """
+        super().__init__(name, documentation, labelnames, max_series)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+    
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record an observation.
+        
+        Args:
+            value: Observed value
+            labels: Label values, in labelnames order
+        """
+        if self.forward is not None:
+            self.forward(self.name, "observe", (value, *labels))
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            key = self._key(labels)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = HistogramSeries(len(self.buckets))
+            series.counts[index] += 1
+            series.total += value
+            series.count += 1
+    
+    def snapshot(self, *labels: str) -> Optional[Dict[str, object]]:
+        """
+        Get the state of a series.
+        
+        Returns:
+            Count, sum and cumulative count per upper bound, or None if never observed
+        """
+        with self._lock:
+            series = self._series.get(tuple(labels))
+            if series is None:
+                return None
+            counts, total, count = list(series.counts), series.total, series.count
+        cumulative, buckets = 0, {}
+        for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+            cumulative += bucket_count
+            buckets[bound] = cumulative
+        return {"count": count, "sum": total, "buckets": buckets}
+    
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            keys = list(self._series)
+        for key in keys:
+            state = self.snapshot(*key)
+            for bound, cumulative in state["buckets"].items():
+                labels = self._labels(key, [("le", format_value(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{self._labels(key)} {format_value(state['sum'])}"
+            yield f"{self.name}_count{self._labels(key)} {state['count']}"
+
+
+class MetricsRegistry:
+    """Ordered set of metrics rendered together."""
+    
+    def __init__(self):
+        """Initialize registry."""
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric.
+        
+        Args:
+            metric: Metric to expose
+            
+        Returns:
+            The metric
+            
+        Raises:
+            ValueError: If a metric with the same name is already registered
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def forward_to(self, forward: Optional[Forward]) -> None:
+        """
+        Hand every sample to a function instead of recording it here.
+        
+        Args:
+            forward: Called with (metric name, method, arguments), e.g. to send
+                samples to the process serving /metrics (None records locally again)
+        """
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.forward = forward
+    
+    def record(self, name: str, method: str, args: tuple) -> None:
+        """
+        Apply a sample forwarded from another process's registry.
+        
+        Args:
+            name: Metric name
+            method: observe, set or inc
+            args: Value followed by label values
+            
+        Raises:
+            ValueError: If the metric is unknown or the method cannot be forwarded
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+        if metric is None or method not in FORWARDED_METHODS or not hasattr(metric, method):
+            raise ValueError(f"Cannot record {method} on metric {name}")
+        getattr(metric, method)(*args)
+    
+    def render(self) -> str:
+        """
+        Render every metric in the text exposition format.
+        
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() for metric in metrics)
+
+
+class RadarMetrics:
+    """
+    Metrics of the mission pipeline, from agent iterations to WebSocket outboxes.
+    
+    The agent, the browser engine and the API report into these; gauges of
+    state owned elsewhere (the scheduler's queue, subscriber outboxes) are
+    bound with Gauge.set_function and computed on scrape. Mission worker
+    processes forward their samples to the API process's instance, which
+    serves /metrics.
+    """
+    
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        Initialize mission metrics.
+        
+        Args:
+            registry: Registry to add the metrics to (a new one by default)
+        """
+        self.registry = registry or MetricsRegistry()
+        register = self.registry.register
+        self.iteration_phase_seconds = register(Histogram(
+            "market_radar_iteration_phase_seconds",
+            "Time spent in each phase of an agent iteration",
+            ["phase"]
+        ))
+        self.navigation_seconds = register(Histogram(
+            "market_radar_navigation_seconds",
+            "Time a navigation took, excluding rate limiter waits",
+            ["domain"]
+        ))
+        self.extraction_prices = register(Histogram(
+            "market_radar_extraction_prices",
+            "Prices found per extracted source",
+            ["source"],
+            buckets=YIELD_BUCKETS
+        ))
+        self.missions = register(Gauge(
+            "market_radar_missions",
+            "Missions by scheduler state",
+            ["state"]
+        ))
+        self.browser_contexts = register(Gauge(
+            "market_radar_browser_contexts",
+            "Browser contexts currently open"
+        ))
+        self.ws_outbox_messages = register(Gauge(
+            "market_radar_ws_outbox_messages",
+            "Messages waiting in WebSocket subscriber outboxes",
+            ["stat"]
+        ))
+        self.event_loop_lag_seconds = register(Histogram(
+            "market_radar_event_loop_lag_seconds",
+            "Delay of event loop callbacks past their scheduled time",
+            buckets=LAG_BUCKETS
+        ))
+    
+    def observe_iteration(self, snapshot: float, decide: float, execute: float, extract: float = 0.0) -> None:
+        """
+        Record the phases of one agent iteration.
+        
+        Args:
+            snapshot: Seconds spent reading the page state
+            decide: Seconds spent deciding, extraction excluded
+            execute: Seconds spent executing the action, extraction excluded
+            extract: Seconds spent extracting data (not recorded when nothing was extracted)
+        """
+        observe = self.iteration_phase_seconds.observe
+        observe(snapshot, "snapshot")
+        observe(decide, "decide")
+        observe(execute, "execute")
+        if extract > 0:
+            observe(extract, "extract")
+    
+    def record(self, name: str, method: str, args: tuple) -> None:
+        """Apply a sample forwarded from a mission worker process (see MetricsRegistry.record)."""
+        self.registry.record(name, method, args)
+    
+    def render(self) -> str:
+        """Render every metric in the text exposition format."""
+        return self.registry.render()
+
+
+async def watch_event_loop_lag(histogram: Histogram, interval: float = 0.5) -> None:
+    """
+    Sample how late the running event loop wakes up, until cancelled.
+    
+    A coroutine sleeping for interval seconds should resume right after;
+    any extra delay is time the loop spent on other callbacks, which every
+    WebSocket and request on the loop waits through as well.
+    
+    Args:
+        histogram: Histogram receiving the lag in seconds
+        interval: Seconds between samples
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        histogram.observe(max(0.0, loop.time() - scheduled))
+
+
+_shared_metrics: Optional[RadarMetrics] = None
+_shared_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Optional[RadarMetrics]:
+    """
+    Get the process-wide mission metrics.
+    
+    Returns:
+        Shared RadarMetrics, or None if metrics are disabled
+    """
+    global _shared_metrics
+    if not get_settings().metrics_enabled:
+        return None
+    
+    with _shared_metrics_lock:
+        if _shared_metrics is None:
+            _shared_metrics = RadarMetrics()
+        return _shared_metrics
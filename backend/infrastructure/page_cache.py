@@ -0,0 +1,346 @@
+"""Cross-mission cache of extracted page data."""
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import json
+import os
+import threading
+import time
+from config.settings import get_settings
+from core.cancellation import CancellationToken
+
+
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "ref", "ref_", "srsltid", "_encoding", "psc"
+}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent links share a cache entry.
+    
+    Lowercases scheme and host, drops "www.", fragments, tracking
+    parameters and trailing slashes, and sorts the query string.
+    
+    Args:
+        url: URL to normalize
+        
+    Returns:
+        Canonical URL string
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", host, path, urlencode(query), ""))
+
+
+def domain_of(url: str) -> str:
+    """
+    Get the host of a URL without the "www." prefix.
+    
+    Args:
+        url: URL to inspect
+        
+    Returns:
+        Lowercased host name
+    """
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class PageCache:
+    """
+    Thread-safe LRU cache of canonical URL -> extracted data with per-domain TTLs.
+    
+    Missions about to fetch a page claim it with claim_fetch(); other
+    missions reaching the same URL meanwhile wait_for_fetch() and read the
+    extraction once put() stores it, so overlapping missions fetch and
+    extract each page once.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        default_ttl: float = 21600,
+        domain_ttls: Optional[Dict[str, float]] = None,
+        path: Optional[str] = None,
+        autosave_every: int = 20
+    ):
+        """
+        Initialize page cache.
+        
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            default_ttl: Time-to-live in seconds for domains without an override
+            domain_ttls: Per-domain TTL overrides (matched on host suffix)
+            path: Optional JSON file used to persist the cache on local disk
+            autosave_every: Persist after this many writes (0 disables autosave)
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.domain_ttls = domain_ttls or {}
+        self.path = path
+        self.autosave_every = autosave_every
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty_writes = 0
+        self._fetching: Dict[str, Tuple[threading.Event, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        
+        if self.path:
+            self.load()
+    
+    def ttl_for(self, url: str) -> float:
+        """
+        Get the TTL that applies to a URL.
+        
+        Args:
+            url: URL to look up
+            
+        Returns:
+            TTL in seconds
+        """
+        host = domain_of(url)
+        for domain, ttl in self.domain_ttls.items():
+            if host == domain or host.endswith("." + domain):
+                return ttl
+        return self.default_ttl
+    
+    def get(self, url: str, include_snapshot: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get fresh cached data for a URL.
+        
+        Args:
+            url: URL to look up
+            include_snapshot: Whether to return the raw page snapshot as well
+            
+        Returns:
+            Copy of the cached extracted data, or None on a miss
+        """
+        key = canonical_url(url)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry["expires_at"] <= now:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            data = dict(entry["data"])
+            if include_snapshot and entry.get("snapshot") is not None:
+                data["snapshot"] = entry["snapshot"]
+            return data
+    
+    def put(self, url: str, data: Dict[str, Any], snapshot: Optional[str] = None) -> None:
+        """
+        Store extracted data for a URL.
+        
+        Args:
+            url: Source URL
+            data: Extracted data (must be JSON-serializable)
+            snapshot: Optional raw page text
+        """
+        key = canonical_url(url)
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {
+                "data": data,
+                "snapshot": snapshot,
+                "stored_at": now,
+                "expires_at": now + self.ttl_for(key)
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._dirty_writes += 1
+            should_save = self.autosave_every and self._dirty_writes >= self.autosave_every
+            fetch = self._fetching.pop(key, None)
+        
+        if fetch is not None:
+            fetch[0].set()
+        if self.path and should_save:
+            self.save()
+    
+    def claim_fetch(self, url: str, lease: float = 60) -> bool:
+        """
+        Announce that this mission is about to fetch and extract a URL.
+        
+        The claim ends when put() stores the page, release_fetch() is called
+        or the lease runs out, whichever comes first.
+        
+        Args:
+            url: URL about to be fetched
+            lease: Seconds after which the claim lapses if never completed
+            
+        Returns:
+            True if claimed, False if another mission is already fetching it
+        """
+        key = canonical_url(url)
+        now = time.time()
+        with self._lock:
+            current = self._fetching.get(key)
+            if current is not None and current[1] > now:
+                return False
+            self._fetching[key] = (threading.Event(), now + lease)
+            return True
+    
+    def release_fetch(self, url: str) -> None:
+        """
+        Give up a fetch claim without storing the page, e.g. after a failed navigation.
+        
+        Args:
+            url: Claimed URL
+        """
+        with self._lock:
+            fetch = self._fetching.pop(canonical_url(url), None)
+        if fetch is not None:
+            fetch[0].set()
+    
+    def wait_for_fetch(
+        self,
+        url: str,
+        timeout: float,
+        cancel_token: Optional[CancellationToken] = None,
+        check_interval: float = 0.25
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wait for another mission's in-flight fetch of a URL and read its result.
+        
+        Args:
+            url: URL to look up
+            timeout: Maximum seconds to wait
+            cancel_token: Token that interrupts the wait
+            check_interval: Seconds between cancellation checks
+            
+        Returns:
+            Cached extracted data once stored, or None if nobody is fetching
+            the URL or the fetch did not complete in time
+            
+        Raises:
+            MissionCancelledError: If the mission is cancelled while waiting
+        """
+        key = canonical_url(url)
+        with self._lock:
+            fetch = self._fetching.get(key)
+        if fetch is None:
+            return None
+        event, expires_at = fetch
+        deadline = time.monotonic() + max(0.0, min(timeout, expires_at - time.time()))
+        while True:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            remaining = deadline - time.monotonic()
+            if event.wait(max(0.0, min(remaining, check_interval))):
+                return self.get(url)
+            if remaining <= check_interval:
+                return None
+    
+    def load(self) -> None:
+        """Load persisted entries from disk, dropping expired ones."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        now = time.time()
+        with self._lock:
+            for key, entry in entries.items():
+                if entry.get("expires_at", 0) > now:
+                    self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def save(self) -> None:
+        """Persist entries to disk atomically."""
+        if not self.path:
+            return
+        
+        with self._lock:
+            snapshot = dict(self._entries)
+            self._dirty_writes = 0
+        
+        with self._save_lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self.path)
+    
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.expired = self.evictions = 0
+            self._dirty_writes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with size, hits, misses, evictions and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_shared_cache: Optional[PageCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """
+    Get the process-wide page cache shared by all missions.
+    
+    Returns:
+        Shared PageCache, or None if caching is disabled
+    """
+    global _shared_cache
+    settings = get_settings()
+    if not settings.page_cache_enabled:
+        return None
+    
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = PageCache(
+                max_entries=settings.page_cache_max_entries,
+                default_ttl=settings.page_cache_ttl,
+                domain_ttls=settings.page_cache_domain_ttls,
+                path=settings.page_cache_path
+            )
+        return _shared_cache
@@ -0,0 +1,320 @@
+"""SQLite-backed memory that survives crashes and restarts."""
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from config.settings import Settings
+from infrastructure.loop_detector import LoopDetector
+from infrastructure.memory import Memory
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mission_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    action TEXT NOT NULL,
+    url TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_actions_mission ON actions (mission_id, id);
+CREATE INDEX IF NOT EXISTS idx_actions_url ON actions (url);
+CREATE INDEX IF NOT EXISTS idx_actions_timestamp ON actions (timestamp);
+CREATE TABLE IF NOT EXISTS extracted_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mission_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    url TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_extracted_mission ON extracted_data (mission_id, id);
+CREATE INDEX IF NOT EXISTS idx_extracted_url ON extracted_data (url);
+CREATE INDEX IF NOT EXISTS idx_extracted_timestamp ON extracted_data (timestamp);
+"""
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite connection in WAL mode, creating the schema if needed.
+    
+    Args:
+        db_path: Database file path
+        
+    Returns:
+        SQLite connection
+    """
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class PersistentMemory(Memory):
+    """
+    Memory that also writes every action and extracted data point to SQLite.
+    
+    Reads are served from the in-memory state inherited from Memory. Writes are
+    queued and flushed in batches by a background thread, so the agent loop only
+    pays for a queue put; serialization and disk I/O happen off the hot path.
+    A batch that fails to commit (a locked database, an unwritable value) is
+    logged and counted in failed_rows, and the writer moves on to the next.
+    """
+    
+    def __init__(
+        self,
+        db_path: str,
+        mission_id: str,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        **kwargs: Any
+    ):
+        """
+        Initialize persistent memory.
+        
+        Args:
+            db_path: SQLite database file
+            mission_id: Mission the rows belong to
+            batch_size: Maximum rows written per transaction
+            flush_interval: Seconds the writer waits for more rows before committing
+            **kwargs: Memory arguments (history_size, spill_path, loop_detector)
+        """
+        super().__init__(**kwargs)
+        self.db_path = db_path
+        self.mission_id = mission_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._restoring = False
+        self._closed = False
+        self.failed_rows = 0
+        
+        connect(db_path).close()
+        self._writer = threading.Thread(target=self._write_loop, name=f"memory-writer-{mission_id}", daemon=True)
+        self._writer.start()
+    
+    def add_action(
+        self,
+        action: str,
+        params: Dict[str, Any],
+        url: str,
+        result: Any = "",
+        fingerprint: str = ""
+    ):
+        super().add_action(action, params, url, result, fingerprint=fingerprint)
+        if not self._restoring:
+            record = self.records[-1]
+            self._queue.put(("action", (record.timestamp, record.action, record.url, params, result)))
+    
+    def add_extracted_data(self, data: Dict[str, Any]):
+        super().add_extracted_data(data)
+        if not self._restoring:
+            self._queue.put(("data", (time.time(), data.get("url"), self.extracted_data[-1])))
+    
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a checkpoint without writing its rows to the database again.
+        
+        Rows the mission wrote after the checkpoint was taken are deleted,
+        since the resumed run repeats those iterations and writes them anew.
+        
+        Args:
+            state: Memory state exported by get_state()
+        """
+        self._restoring = True
+        try:
+            super().restore_state(state)
+        finally:
+            self._restoring = False
+        self.flush()
+        self._truncate(self.total_actions, len(self.extracted_data))
+    
+    def _truncate(self, actions: int, data: int) -> None:
+        """Keep only the first rows of this mission in each table."""
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                for table, keep in (("actions", actions), ("extracted_data", data)):
+                    conn.execute(
+                        f"DELETE FROM {table} WHERE mission_id = ? AND id NOT IN "
+                        f"(SELECT id FROM {table} WHERE mission_id = ? ORDER BY id LIMIT ?)",
+                        (self.mission_id, self.mission_id, keep)
+                    )
+        finally:
+            conn.close()
+    
+    def _write_loop(self) -> None:
+        """Drain the write queue in batches until close() is called."""
+        conn: Optional[sqlite3.Connection] = None
+        running = True
+        while running:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                batch.append(item)
+            
+            if batch[-1] is None:
+                running = False
+            rows = [entry for entry in batch if entry is not None]
+            try:
+                if rows:
+                    if conn is None:
+                        conn = connect(self.db_path)
+                    self._write_batch(conn, rows)
+            except Exception:
+                self.failed_rows += len(rows)
+                logger.exception("Failed to write %d memory rows of mission %s", len(rows), self.mission_id)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        if conn is not None:
+            conn.close()
+    
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]) -> None:
+        """Write queued rows in a single transaction."""
+        actions = []
+        data = []
+        for kind, row in batch:
+            if kind == "action":
+                timestamp, action, url, params, result = row
+                if not isinstance(result, str):
+                    result = _dumps(result)
+                actions.append((self.mission_id, timestamp, action, url, _dumps(params), result))
+            else:
+                timestamp, url, payload = row
+                data.append((self.mission_id, timestamp, url, _dumps(payload)))
+        with conn:
+            if actions:
+                conn.executemany(
+                    "INSERT INTO actions (mission_id, timestamp, action, url, params, result) VALUES (?, ?, ?, ?, ?, ?)",
+                    actions
+                )
+            if data:
+                conn.executemany(
+                    "INSERT INTO extracted_data (mission_id, timestamp, url, data) VALUES (?, ?, ?, ?)",
+                    data
+                )
+    
+    def flush(self) -> None:
+        """
+        Block until every queued write has been committed or logged as failed.
+        
+        Raises:
+            RuntimeError: If rows are queued but the writer thread is gone
+        """
+        if not self._writer.is_alive():
+            if self._queue.unfinished_tasks:
+                raise RuntimeError(
+                    f"Memory writer of mission {self.mission_id} stopped with "
+                    f"{self._queue.unfinished_tasks} rows unwritten"
+                )
+            return
+        self._queue.join()
+    
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        elif not self._closed:
+            logger.error(
+                "Memory writer of mission %s stopped early; %d queued rows were not written",
+                self.mission_id,
+                self._queue.unfinished_tasks
+            )
+        self._closed = True
+        super().close()
+    
+    @classmethod
+    def restore(cls, db_path: str, mission_id: str, **kwargs: Any) -> "PersistentMemory":
+        """
+        Rebuild a mission's memory from the database.
+        
+        Args:
+            db_path: SQLite database file
+            mission_id: Mission to restore
+            **kwargs: PersistentMemory arguments
+            
+        Returns:
+            PersistentMemory with history, extracted data and aggregates replayed
+        """
+        memory = cls(db_path, mission_id, **kwargs)
+        conn = connect(db_path)
+        try:
+            actions = conn.execute(
+                "SELECT timestamp, action, url, params, result FROM actions WHERE mission_id = ? ORDER BY id",
+                (mission_id,)
+            ).fetchall()
+            data = conn.execute(
+                "SELECT data FROM extracted_data WHERE mission_id = ? ORDER BY id",
+                (mission_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        
+        memory._restoring = True
+        try:
+            for timestamp, action, url, params, result in actions:
+                memory.add_action(action, json.loads(params), url, result)
+                memory.records[-1].timestamp = timestamp
+            for (payload,) in data:
+                stored = json.loads(payload)
+                memory.add_extracted_data(stored)
+                memory.extracted_data[-1] = stored
+        finally:
+            memory._restoring = False
+        # Replayed actions carry no page fingerprints; start loop detection afresh
+        memory.loop_detector.reset()
+        return memory
+
+
+def create_memory(settings: Settings, mission_id: Optional[str] = None) -> Memory:
+    """
+    Build the mission memory selected by settings.
+    
+    Args:
+        settings: Application settings
+        mission_id: Mission identifier (required by the SQLite backend)
+        
+    Returns:
+        Memory, or PersistentMemory when memory_backend is "sqlite"
+    """
+    spill_path = None
+    if settings.memory_spill_dir and mission_id:
+        spill_path = os.path.join(settings.memory_spill_dir, f"{mission_id}.jsonl")
+    kwargs = {
+        "history_size": settings.memory_history_size,
+        "spill_path": spill_path,
+        "loop_detector": LoopDetector(
+            window=settings.agent_loop_window,
+            max_period=settings.agent_loop_max_period,
+            min_repeats=settings.agent_loop_threshold
+        )
+    }
+    if settings.memory_backend == "sqlite" and mission_id:
+        return PersistentMemory(
+            settings.memory_db_path,
+            mission_id,
+            batch_size=settings.memory_batch_size,
+            flush_interval=settings.memory_flush_interval,
+            **kwargs
+        )
+    return Memory(**kwargs)
@@ -0,0 +1,618 @@
+"""Append-only columnar store of price observations shared across missions."""
+from array import array
+from contextlib import contextmanager
+from itertools import compress
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import json
+import math
+import mmap
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from config.settings import get_settings
+from core.domain.models import PriceObservation
+from infrastructure.page_cache import domain_of
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Column name -> array typecode. Strings are dictionary-encoded as uint32 codes.
+COLUMNS = {
+    "value": "d",
+    "timestamp": "d",
+    "product": "I",
+    "domain": "I",
+    "currency": "I",
+    "mission": "I"
+}
+DICTIONARY_COLUMNS = ("product", "domain", "currency", "mission")
+GROUP_KEYS = ("product", "domain", "currency", "mission", "day")
+
+
+class _Segment:
+    """
+    Immutable, memory-mapped column files written by one flush.
+    
+    Scans hold a reference while they read the segment; a segment retired
+    by compaction or close() is unmapped once the last scan releases it.
+    """
+    
+    def __init__(self, directory: str, meta: Dict[str, Any]):
+        self.name = meta["name"]
+        self.rows = meta["rows"]
+        self.min_ts = meta["min_ts"]
+        self.max_ts = meta["max_ts"]
+        self.maps: Dict[str, mmap.mmap] = {}
+        self.columns: Dict[str, memoryview] = {}
+        self.refs = 0
+        self.retired = False
+        self.closed = False
+        for column, typecode in COLUMNS.items():
+            with open(os.path.join(directory, f"{self.name}.{column}"), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.maps[column] = mapped
+            self.columns[column] = memoryview(mapped).cast(typecode)
+    
+    def retire(self) -> None:
+        """Unmap now, or when the last scan still reading the segment releases it."""
+        self.retired = True
+        if self.refs == 0:
+            self.close()
+    
+    def release(self) -> None:
+        """Drop a scan's reference, unmapping a retired segment nobody reads anymore."""
+        self.refs -= 1
+        if self.retired and self.refs == 0:
+            self.close()
+    
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for view in self.columns.values():
+            view.release()
+        for mapped in self.maps.values():
+            mapped.close()
+
+
+class _Source:
+    """Columns of one segment, or of a copy of the write buffer, read by a scan."""
+    
+    __slots__ = ("columns", "raw", "rows", "min_ts", "max_ts")
+    
+    def __init__(self, columns: Dict[str, Any], raw: Dict[str, Any], rows: int, min_ts: float, max_ts: float):
+        self.columns = columns
+        self.raw = raw
+        self.rows = rows
+        self.min_ts = min_ts
+        self.max_ts = max_ts
+
+
+def _code_mask(raw: Any, code: int, distinct: int) -> bytes:
+    """
+    Mark the rows of a uint32 column holding a code, without a Python-level loop.
+    
+    Each byte plane of the column is sliced out and translated to 0/1 by
+    whether it matches the code's byte; planes are combined with a bitwise
+    AND. Planes above the largest code in the dictionary are all zero and
+    are skipped.
+    
+    Args:
+        raw: mmap or bytes of the column
+        code: Dictionary code to look for
+        distinct: Number of codes in the column's dictionary
+        
+    Returns:
+        One byte per row, 1 where the row holds the code
+    """
+    mask = None
+    for byte in range(4):
+        if byte and distinct <= 256 ** byte:
+            break
+        table = bytearray(256)
+        table[(code >> (8 * byte)) & 0xFF] = 1
+        offset = byte if sys.byteorder == "little" else 3 - byte
+        plane = raw[offset::4].translate(table)
+        if mask is None:
+            mask = plane
+        else:
+            mask = (int.from_bytes(mask, "little") & int.from_bytes(plane, "little")).to_bytes(len(plane), "little")
+    return mask
+
+
+class PriceStore:
+    """
+    Columnar store of (product, domain, value, currency, timestamp, mission) rows.
+    
+    New rows are buffered in in-memory arrays and flushed as immutable segments
+    of fixed-width column files, which are memory-mapped for queries. String
+    columns are dictionary-encoded, each segment keeps its timestamp range so
+    time-filtered queries skip whole segments, and compact() merges segments
+    once they pile up. Filters run over whole columns: with NumPy as vector
+    comparisons, otherwise by translating the raw column bytes into row masks.
+    
+    A directory has a single writer: the store keeps the dictionaries and the
+    segment list in memory and rewrites the manifest from them on every
+    flush, so two stores appending to one directory would drop each other's
+    segments. Processes other than the owner must forward their rows to it.
+    """
+    
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        flush_rows: int = 1000,
+        max_segments: int = 16
+    ):
+        """
+        Initialize price store.
+        
+        Args:
+            directory: Directory holding the store (None keeps everything in memory)
+            flush_rows: Buffered rows that trigger a flush to a new segment
+            max_segments: Segment count that triggers compaction
+        """
+        self.directory = directory
+        self.flush_rows = flush_rows
+        self.max_segments = max_segments
+        self._lock = threading.RLock()
+        self._dictionaries: Dict[str, List[str]] = {column: [] for column in DICTIONARY_COLUMNS}
+        self._codes: Dict[str, Dict[str, int]] = {column: {} for column in DICTIONARY_COLUMNS}
+        self._segments: List[_Segment] = []
+        self._buffer = self._empty_columns()
+        
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._load()
+    
+    @staticmethod
+    def _empty_columns() -> Dict[str, array]:
+        return {column: array(typecode) for column, typecode in COLUMNS.items()}
+    
+    def _encode(self, column: str, value: str) -> int:
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = len(self._dictionaries[column])
+            self._dictionaries[column].append(value)
+            codes[value] = code
+        return code
+    
+    def append(self, observations: List[PriceObservation]) -> int:
+        """
+        Append price observations.
+        
+        Args:
+            observations: Observations to store
+            
+        Returns:
+            Number of rows appended
+        """
+        with self._lock:
+            buffer = self._buffer
+            for observation in observations:
+                buffer["value"].append(observation.value)
+                buffer["timestamp"].append(observation.timestamp)
+                buffer["product"].append(self._encode("product", observation.product))
+                buffer["domain"].append(self._encode("domain", observation.domain))
+                buffer["currency"].append(self._encode("currency", observation.currency))
+                buffer["mission"].append(self._encode("mission", observation.mission_id))
+            if self.directory and len(buffer["value"]) >= self.flush_rows:
+                self.flush()
+        return len(observations)
+    
+    def add_extraction(
+        self,
+        mission_id: str,
+        product: str,
+        url: str,
+        data: Dict[str, Any],
+        timestamp: Optional[float] = None
+    ) -> int:
+        """
+        Append the prices of one extracted page.
+        
+        Args:
+            mission_id: Mission that extracted the page
+            product: Product key (the mission topic)
+            url: Source URL
+            data: Extracted data as produced by DataExtractor
+            timestamp: Observation time (defaults to now)
+            
+        Returns:
+            Number of rows appended
+        """
+        prices = data.get("prices") or []
+        if not isinstance(prices, list):
+            prices = [prices]
+        timestamp = time.time() if timestamp is None else timestamp
+        domain = domain_of(url)
+        observations = []
+        for price in prices:
+            value = price.get("value") if isinstance(price, dict) else price
+            if isinstance(value, (int, float)) and value > 0:
+                currency = price.get("currency", "BRL") if isinstance(price, dict) else "BRL"
+                observations.append(PriceObservation(
+                    product=product,
+                    domain=domain,
+                    value=float(value),
+                    currency=currency,
+                    timestamp=timestamp,
+                    mission_id=mission_id
+                ))
+        return self.append(observations)
+    
+    def flush(self) -> None:
+        """Write buffered rows to a new segment and compact if needed."""
+        if not self.directory:
+            return
+        with self._lock:
+            buffer = self._buffer
+            if not buffer["value"]:
+                return
+            name = f"segment-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+            for column, values in buffer.items():
+                with open(os.path.join(self.directory, f"{name}.{column}"), "wb") as f:
+                    values.tofile(f)
+            meta = {
+                "name": name,
+                "rows": len(buffer["value"]),
+                "min_ts": min(buffer["timestamp"]),
+                "max_ts": max(buffer["timestamp"])
+            }
+            self._segments.append(_Segment(self.directory, meta))
+            self._buffer = self._empty_columns()
+            self._write_manifest()
+            if len(self._segments) > self.max_segments:
+                self.compact()
+    
+    def compact(self) -> None:
+        """Merge all segments into one."""
+        if not self.directory:
+            return
+        with self._lock:
+            if len(self._segments) < 2:
+                return
+            merged = self._empty_columns()
+            for segment in self._segments:
+                for column, values in merged.items():
+                    values.frombytes(segment.columns[column].tobytes())
+            old = self._segments
+            self._segments = []
+            # Buffered rows stay buffered; the merged rows become the only segment
+            pending = self._buffer
+            self._buffer = merged
+            self.flush()
+            self._buffer = pending
+            # Scans still reading old segments keep them mapped until they finish
+            for segment in old:
+                segment.retire()
+                for column in COLUMNS:
+                    os.remove(os.path.join(self.directory, f"{segment.name}.{column}"))
+    
+    def _write_manifest(self) -> None:
+        """Persist the dictionaries and segment list atomically."""
+        manifest = {
+            "dictionaries": self._dictionaries,
+            "segments": [
+                {"name": s.name, "rows": s.rows, "min_ts": s.min_ts, "max_ts": s.max_ts}
+                for s in self._segments
+            ]
+        }
+        path = os.path.join(self.directory, "manifest.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+    
+    def _load(self) -> None:
+        """Load the manifest and memory-map existing segments."""
+        path = os.path.join(self.directory, "manifest.json")
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        for column in DICTIONARY_COLUMNS:
+            values = manifest["dictionaries"].get(column, [])
+            self._dictionaries[column] = list(values)
+            self._codes[column] = {value: code for code, value in enumerate(values)}
+        self._segments = [_Segment(self.directory, meta) for meta in manifest["segments"]]
+    
+    def close(self) -> None:
+        """Flush buffered rows and unmap segments."""
+        with self._lock:
+            self.flush()
+            for segment in self._segments:
+                segment.retire()
+            self._segments = []
+    
+    def _filters(self, **filters: Any) -> Optional[List[Tuple[str, int]]]:
+        """
+        Resolve string filters to dictionary codes.
+        
+        Returns:
+            (column, code) pairs, or None if a value was never stored
+        """
+        codes = []
+        for column, name in (("product", "product"), ("domain", "domain"), ("currency", "currency"), ("mission", "mission_id")):
+            value = filters.get(name)
+            if value is not None:
+                code = self._codes[column].get(value)
+                if code is None:
+                    return None
+                codes.append((column, code))
+        return codes
+    
+    @contextmanager
+    def _sources(self, since: Optional[float], until: Optional[float]) -> Iterator[List[_Source]]:
+        """
+        Hold the segments (and a copy of the buffer) overlapping a time range.
+        
+        Segments stay mapped while the caller reads them, even if a
+        compaction retires them meanwhile.
+        """
+        with self._lock:
+            segments = [
+                segment for segment in self._segments
+                if not (since is not None and segment.max_ts < since or until is not None and segment.min_ts > until)
+            ]
+            for segment in segments:
+                segment.refs += 1
+            buffer = {column: values[:] for column, values in self._buffer.items()}
+        try:
+            sources = [
+                _Source(segment.columns, segment.maps, segment.rows, segment.min_ts, segment.max_ts)
+                for segment in segments
+            ]
+            if buffer["value"]:
+                timestamps = buffer["timestamp"]
+                sources.append(_Source(buffer, buffer, len(timestamps), min(timestamps), max(timestamps)))
+            yield sources
+        finally:
+            with self._lock:
+                for segment in segments:
+                    segment.release()
+    
+    def _select(
+        self,
+        source: _Source,
+        filters: List[Tuple[str, int]],
+        since: Optional[float],
+        until: Optional[float]
+    ) -> Sequence[int]:
+        """
+        Get the rows of one source matching the filters.
+        
+        Returns:
+            Ascending row indices (a NumPy array when NumPy is available)
+        """
+        timed = since is not None and source.min_ts < since or until is not None and source.max_ts > until
+        lower = -math.inf if since is None else since
+        upper = math.inf if until is None else until
+        
+        if np is not None:
+            mask = None
+            for column, code in filters:
+                matches = np.frombuffer(source.raw[column], dtype=np.uint32, count=source.rows) == code
+                mask = matches if mask is None else mask & matches
+            if timed:
+                timestamps = np.frombuffer(source.raw["timestamp"], dtype=np.float64, count=source.rows)
+                in_range = (timestamps >= lower) & (timestamps <= upper)
+                mask = in_range if mask is None else mask & in_range
+            return np.arange(source.rows) if mask is None else np.flatnonzero(mask)
+        
+        if filters:
+            mask = None
+            for column, code in filters:
+                raw = source.raw[column]
+                matches = _code_mask(raw if isinstance(raw, mmap.mmap) else raw.tobytes(), code, len(self._dictionaries[column]))
+                if mask is None:
+                    mask = matches
+                else:
+                    mask = (int.from_bytes(mask, "little") & int.from_bytes(matches, "little")).to_bytes(source.rows, "little")
+            rows = list(compress(range(source.rows), mask))
+        else:
+            rows = range(source.rows)
+        if timed:
+            timestamps = source.columns["timestamp"]
+            rows = [i for i in rows if lower <= timestamps[i] <= upper]
+        return rows
+    
+    def query(self, limit: Optional[int] = None, **filters: Any) -> List[PriceObservation]:
+        """
+        Get observations matching the filters.
+        
+        Args:
+            limit: Maximum number of observations
+            **filters: product, domain, currency, mission_id, since, until
+            
+        Returns:
+            Matching observations
+        """
+        codes = self._filters(**filters)
+        if codes is None:
+            return []
+        since, until = filters.get("since"), filters.get("until")
+        observations = []
+        names = self._dictionaries
+        with self._sources(since, until) as sources:
+            for source in sources:
+                columns = source.columns
+                for i in self._select(source, codes, since, until):
+                    if limit is not None and len(observations) >= limit:
+                        return observations
+                    i = int(i)
+                    observations.append(PriceObservation(
+                        product=names["product"][columns["product"][i]],
+                        domain=names["domain"][columns["domain"][i]],
+                        value=columns["value"][i],
+                        currency=names["currency"][columns["currency"][i]],
+                        timestamp=columns["timestamp"][i],
+                        mission_id=names["mission"][columns["mission"][i]]
+                    ))
+        return observations
+    
+    def aggregate(self, group_by: Optional[str] = None, **filters: Any) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute price statistics, optionally per group.
+        
+        Args:
+            group_by: product, domain, currency, mission or day (None for a single group)
+            **filters: product, domain, currency, mission_id, since, until
+            
+        Returns:
+            Mapping of group key to count, mean, median, min and max
+            
+        Raises:
+            ValueError: If group_by is not supported
+        """
+        if group_by is not None and group_by not in GROUP_KEYS:
+            raise ValueError(f"Unsupported group_by: {group_by}")
+        codes = self._filters(**filters)
+        if codes is None:
+            return {}
+        since, until = filters.get("since"), filters.get("until")
+        
+        with self._sources(since, until) as sources:
+            if np is not None:
+                groups = self._group_arrays(sources, group_by, codes, since, until)
+            else:
+                groups = self._group_lists(sources, group_by, codes, since, until)
+        
+        result = {}
+        for key, summary in groups.items():
+            if group_by == "day":
+                label = time.strftime("%Y-%m-%d", time.gmtime(key * 86400))
+            elif group_by is not None:
+                label = self._dictionaries[group_by][key]
+            else:
+                label = key
+            result[label] = summary
+        return result
+    
+    def _group_lists(
+        self,
+        sources: List[_Source],
+        group_by: Optional[str],
+        codes: List[Tuple[str, int]],
+        since: Optional[float],
+        until: Optional[float]
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Summarize matching values per group key in pure Python."""
+        groups: Dict[Any, List[float]] = {}
+        for source in sources:
+            columns = source.columns
+            values = columns["value"]
+            for i in self._select(source, codes, since, until):
+                if group_by is None:
+                    key = "all"
+                elif group_by == "day":
+                    key = int(columns["timestamp"][i] // 86400)
+                else:
+                    key = columns[group_by][i]
+                groups.setdefault(key, []).append(values[i])
+        return {
+            key: {
+                "count": len(values),
+                "mean": statistics.fmean(values),
+                "median": statistics.median(values),
+                "min": min(values),
+                "max": max(values)
+            }
+            for key, values in groups.items()
+        }
+    
+    def _group_arrays(
+        self,
+        sources: List[_Source],
+        group_by: Optional[str],
+        codes: List[Tuple[str, int]],
+        since: Optional[float],
+        until: Optional[float]
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Summarize matching values per group key with NumPy."""
+        keys, values = [], []
+        for source in sources:
+            rows = self._select(source, codes, since, until)
+            if not len(rows):
+                continue
+            # take() copies, so nothing keeps the segment's mapping exported
+            values.append(np.frombuffer(source.raw["value"], dtype=np.float64, count=source.rows).take(rows))
+            if group_by == "day":
+                timestamps = np.frombuffer(source.raw["timestamp"], dtype=np.float64, count=source.rows).take(rows)
+                keys.append((timestamps // 86400).astype(np.int64))
+            elif group_by is not None:
+                keys.append(np.frombuffer(source.raw[group_by], dtype=np.uint32, count=source.rows).take(rows).astype(np.int64))
+            else:
+                keys.append(np.zeros(len(rows), dtype=np.int64))
+        if not values:
+            return {}
+        
+        keys, values = np.concatenate(keys), np.concatenate(values)
+        order = np.lexsort((values, keys))
+        keys, values = keys[order], values[order]
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+        ends = np.append(starts[1:], len(keys))
+        groups = {}
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            group = values[start:end]
+            middle = (end - start) // 2
+            median = group[middle] if (end - start) % 2 else (group[middle - 1] + group[middle]) / 2
+            key = "all" if group_by is None else int(keys[start])
+            groups[key] = {
+                "count": end - start,
+                "mean": float(group.mean()),
+                "median": float(median),
+                "min": float(group[0]),
+                "max": float(group[-1])
+            }
+        return groups
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+        
+        Returns:
+            Dictionary with row, segment and dictionary sizes
+        """
+        with self._lock:
+            return {
+                "rows": sum(s.rows for s in self._segments) + len(self._buffer["value"]),
+                "buffered_rows": len(self._buffer["value"]),
+                "segments": len(self._segments),
+                "products": len(self._dictionaries["product"]),
+                "domains": len(self._dictionaries["domain"])
+            }
+    
+    def __len__(self) -> int:
+        return self.stats()["rows"]
+
+
+_shared_store: Optional[PriceStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_price_store() -> Optional[PriceStore]:
+    """
+    Get the process-wide price observation store.
+    
+    Returns:
+        Shared PriceStore, or None if the store is disabled
+    """
+    global _shared_store
+    settings = get_settings()
+    if not settings.price_store_enabled:
+        return None
+    
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = PriceStore(
+                directory=settings.price_store_dir,
+                flush_rows=settings.price_store_flush_rows,
+                max_segments=settings.price_store_max_segments
+            )
+        return _shared_store
@@ -0,0 +1,285 @@
+"""Process-wide per-host token buckets with adaptive backoff for navigations."""
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from urllib.parse import urlparse
+import threading
+import time
+from config.settings import get_settings
+from core.cancellation import CancellationToken
+
+
+# Responses that mean the site wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+
+# Page title fragments of bot challenges and block pages
+CHALLENGE_MARKERS = (
+    "captcha",
+    "are you a robot",
+    "are you a human",
+    "unusual traffic",
+    "access denied",
+    "attention required",
+    "just a moment",
+    "não sou um robô",
+    "você é humano",
+    "acesso negado"
+)
+
+
+def host_key(url: str, domains: Dict[str, float]) -> str:
+    """
+    Get the bucket key of a URL: its configured domain, or its host without "www.".
+    
+    Args:
+        url: Navigation URL
+        domains: Configured per-domain rates
+        
+    Returns:
+        Bucket key (empty if the URL has no host)
+    """
+    host = (urlparse(url).hostname or "").lower()
+    for domain in domains:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return host[4:] if host.startswith("www.") else host
+
+
+def is_throttled(result: Dict[str, Any]) -> bool:
+    """
+    Check whether a navigation result shows rate limiting or a bot challenge.
+    
+    Args:
+        result: Browser navigation result with optional status and title
+        
+    Returns:
+        True if the site throttled or challenged the request
+    """
+    if result.get("status") in THROTTLE_STATUSES:
+        return True
+    title = result.get("title")
+    if not isinstance(title, str):
+        return False
+    title = title.lower()
+    return any(marker in title for marker in CHALLENGE_MARKERS)
+
+
+class HostBucket:
+    """Token bucket of one host, with its FIFO of waiting navigations."""
+    
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize bucket.
+        
+        Args:
+            rate: Navigations per second when the host is healthy
+            burst: Navigations allowed back to back
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.factor = 1.0
+        self.strikes = 0
+        self.blocked_until = 0.0
+        self.waiters: Deque[object] = deque()
+        self.granted = 0
+        self.throttled = 0
+    
+    @property
+    def effective_rate(self) -> float:
+        """Current rate after backoff."""
+        return self.rate * self.factor
+    
+    def refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.effective_rate)
+        self.updated_at = now
+    
+    def delay(self, now: float) -> float:
+        """Seconds until a token can be taken (0 if one is available now)."""
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.effective_rate
+
+
+class HostRateLimiter:
+    """
+    Per-host navigation rate limits shared by every mission of the process.
+    
+    Each host has a token bucket refilled at its configured rate. Missions
+    wait for a token in arrival order, so a host's capacity is shared
+    evenly between the missions using it. A throttled response or a bot
+    challenge halves the host's rate and pauses it, doubling the pause for
+    consecutive throttled responses (or for the server's Retry-After); each
+    healthy response then wins back a fraction of the full rate, so
+    throughput settles just under the limit the site tolerates instead of
+    oscillating through blocks. Missions in worker processes use the API
+    process's limiter over their pipe rather than buckets of their own.
+    """
+    
+    def __init__(
+        self,
+        default_rate: float = 1.0,
+        burst: int = 2,
+        domains: Optional[Dict[str, float]] = None,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        min_factor: float = 0.0625,
+        recovery: float = 0.1,
+        check_interval: float = 0.25
+    ):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            default_rate: Navigations per second for hosts without a configured rate
+            burst: Navigations a host allows back to back
+            domains: Navigations per second per domain (subdomains share the domain's bucket)
+            base_backoff: Seconds a host is paused after its first throttled response
+            max_backoff: Longest pause in seconds
+            min_factor: Lowest fraction of the configured rate backoff goes down to
+            recovery: Fraction of the configured rate regained per healthy response
+            check_interval: Seconds between cancellation checks while waiting
+        """
+        self.default_rate = default_rate
+        self.burst = burst
+        self.domains = {domain.lower(): rate for domain, rate in (domains or {}).items()}
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.min_factor = min_factor
+        self.recovery = recovery
+        self.check_interval = check_interval
+        self._buckets: Dict[str, HostBucket] = {}
+        self._cond = threading.Condition()
+    
+    def _bucket(self, key: str) -> HostBucket:
+        """Get or create the bucket of a host (lock held)."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = HostBucket(self.domains.get(key, self.default_rate), self.burst)
+        return bucket
+    
+    def acquire(self, url: str, cancel_token: Optional[CancellationToken] = None) -> float:
+        """
+        Wait for the host of a URL to accept another navigation.
+        
+        Args:
+            url: Navigation URL
+            cancel_token: Token that interrupts the wait
+            
+        Returns:
+            Seconds waited
+            
+        Raises:
+            MissionCancelledError: If the mission is cancelled while waiting
+        """
+        key = host_key(url, self.domains)
+        if not key:
+            return 0.0
+        began = time.monotonic()
+        ticket = object()
+        with self._cond:
+            bucket = self._bucket(key)
+            bucket.waiters.append(ticket)
+            try:
+                while True:
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+                    now = time.monotonic()
+                    delay = bucket.delay(now) if bucket.waiters[0] is ticket else self.check_interval
+                    if delay <= 0:
+                        bucket.tokens -= 1
+                        bucket.granted += 1
+                        return now - began
+                    self._cond.wait(min(delay, self.check_interval))
+            finally:
+                bucket.waiters.remove(ticket)
+                self._cond.notify_all()
+    
+    def report(self, url: str, result: Dict[str, Any]) -> bool:
+        """
+        Adapt a host's rate to the outcome of a navigation.
+        
+        Args:
+            url: Navigation URL
+            result: Browser result with optional status, retry_after and title
+            
+        Returns:
+            True if the navigation was throttled
+        """
+        key = host_key(url, self.domains)
+        if not key:
+            return False
+        throttled = is_throttled(result)
+        with self._cond:
+            bucket = self._bucket(key)
+            now = time.monotonic()
+            bucket.refill(now)
+            if throttled:
+                bucket.throttled += 1
+                bucket.strikes += 1
+                bucket.factor = max(self.min_factor, bucket.factor / 2)
+                pause = min(self.max_backoff, self.base_backoff * 2 ** (bucket.strikes - 1))
+                retry_after = result.get("retry_after")
+                if isinstance(retry_after, (int, float)) and retry_after > 0:
+                    pause = min(self.max_backoff, float(retry_after))
+                bucket.tokens = 0.0
+                bucket.blocked_until = max(bucket.blocked_until, now + pause)
+            elif result.get("success"):
+                bucket.factor = min(1.0, bucket.factor + self.recovery)
+                bucket.strikes = 0
+            self._cond.notify_all()
+        return throttled
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the state of every host seen so far.
+        
+        Returns:
+            Per-host rate, effective rate, waiting navigations, pause and counters
+        """
+        with self._cond:
+            now = time.monotonic()
+            return {
+                key: {
+                    "rate": bucket.rate,
+                    "effective_rate": round(bucket.effective_rate, 4),
+                    "waiting": len(bucket.waiters),
+                    "paused_seconds": round(max(0.0, bucket.blocked_until - now), 3),
+                    "granted": bucket.granted,
+                    "throttled": bucket.throttled
+                }
+                for key, bucket in self._buckets.items()
+            }
+
+
+_shared_limiter: Optional[HostRateLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[HostRateLimiter]:
+    """
+    Get the process-wide navigation rate limiter.
+    
+    Returns:
+        Shared HostRateLimiter, or None if rate limiting is disabled
+    """
+    global _shared_limiter
+    settings = get_settings()
+    if not settings.rate_limit_enabled:
+        return None
+    
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = HostRateLimiter(
+                default_rate=settings.rate_limit_default_rps,
+                burst=settings.rate_limit_burst,
+                domains=settings.rate_limit_domains,
+                base_backoff=settings.rate_limit_backoff,
+                max_backoff=settings.rate_limit_max_backoff,
+                check_interval=settings.mission_cancel_check_ms / 1000
+            )
+        return _shared_limiter
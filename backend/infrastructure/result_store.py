@@ -0,0 +1,267 @@
+"""SQLite storage of mission results for paginated reads and streaming export."""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import csv
+import io
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from config.settings import get_settings
+from infrastructure.serialization import dumps, dumps_text, loads
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    mission_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (mission_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_results_stored_at ON results (stored_at);
+"""
+
+
+def project(record: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """
+    Keep only the requested top-level fields of a record.
+    
+    Args:
+        record: Extracted data record
+        fields: Fields to keep (None keeps every field)
+        
+    Returns:
+        Projected record; missing fields are None
+    """
+    if not fields:
+        return record
+    return {field: record.get(field) for field in fields}
+
+
+def ndjson_chunks(records: Iterable[Dict[str, Any]], chunk_size: int = 500) -> Iterator[bytes]:
+    """
+    Encode records as NDJSON, chunk_size lines per yielded string.
+    
+    Args:
+        records: Records to encode
+        chunk_size: Records per chunk
+        
+    Yields:
+        Newline-terminated JSON lines, UTF-8 encoded
+    """
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        yield b"".join(dumps(record) + b"\n" for record in chunk)
+
+
+def csv_chunks(records: Iterable[Dict[str, Any]], columns: Sequence[str], chunk_size: int = 500) -> Iterator[str]:
+    """
+    Encode records as CSV with a header row, chunk_size rows per yielded string.
+    
+    Lists and objects are written as JSON text in their cell.
+    
+    Args:
+        records: Records to encode
+        columns: Column names, in order
+        chunk_size: Records per chunk
+        
+    Yields:
+        CSV text
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    records = iter(records)
+    while True:
+        for record in itertools.islice(records, chunk_size):
+            writer.writerow([
+                dumps_text(value) if isinstance(value, (list, dict)) else value
+                for value in (record.get(column) for column in columns)
+            ])
+        text = buffer.getvalue()
+        if not text:
+            return
+        yield text
+        buffer.seek(0)
+        buffer.truncate()
+
+
+class ResultStore:
+    """
+    Extracted data of finished missions, one row per record.
+    
+    Records are read back by keyset pagination on their sequence number, so
+    a page or an export chunk only ever holds chunk_size parsed records no
+    matter how large the mission's results are.
+    """
+    
+    def __init__(self, db_path: str, retention: float = 604800):
+        """
+        Initialize result store.
+        
+        Args:
+            db_path: Database file path
+            retention: Seconds results are kept (0 keeps them forever)
+        """
+        self.db_path = db_path
+        self.retention = retention
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it in WAL mode on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def put(self, mission_id: str, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Store the results of a mission, replacing previous ones.
+        
+        Records are serialized one at a time as SQLite consumes them, and
+        results older than the retention window are dropped.
+        
+        Args:
+            mission_id: Mission identifier
+            records: Extracted data records
+            
+        Returns:
+            Number of records stored
+        """
+        now = time.time()
+        rows = (
+            (mission_id, seq, now, dumps_text(record))
+            for seq, record in enumerate(records)
+        )
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM results WHERE mission_id = ?", (mission_id,))
+            cursor = conn.executemany(
+                "INSERT INTO results (mission_id, seq, stored_at, data) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            if self.retention:
+                conn.execute("DELETE FROM results WHERE stored_at < ?", (now - self.retention,))
+        return cursor.rowcount
+    
+    def page(
+        self,
+        mission_id: str,
+        cursor: Optional[int] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Read one page of a mission's results.
+        
+        Args:
+            mission_id: Mission identifier
+            cursor: Cursor returned with the previous page (None starts at the beginning)
+            limit: Maximum number of records
+            fields: Fields to keep in each record (None keeps every field)
+            
+        Returns:
+            Records and the cursor of the next page, or None on the last page
+        """
+        rows = self._connection().execute(
+            "SELECT seq, data FROM results WHERE mission_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (mission_id, -1 if cursor is None else cursor, limit + 1)
+        ).fetchall()
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [project(loads(data), fields) for _, data in rows[:limit]], next_cursor
+    
+    def iter_records(
+        self,
+        mission_id: str,
+        fields: Optional[Sequence[str]] = None,
+        chunk_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all results of a mission, reading chunk_size rows at a time.
+        
+        Args:
+            mission_id: Mission identifier
+            fields: Fields to keep in each record (None keeps every field)
+            chunk_size: Records read per query
+            
+        Yields:
+            Projected records in extraction order
+        """
+        cursor = None
+        while True:
+            records, cursor = self.page(mission_id, cursor, chunk_size, fields)
+            yield from records
+            if cursor is None:
+                return
+    
+    def fields(self, mission_id: str) -> List[str]:
+        """
+        Get every top-level field used by a mission's records, in first-seen order.
+        
+        Args:
+            mission_id: Mission identifier
+            
+        Returns:
+            Field names
+        """
+        rows = self._connection().execute(
+            "SELECT key FROM results, json_each(results.data) WHERE mission_id = ? "
+            "GROUP BY key ORDER BY MIN(seq), MIN(json_each.id)",
+            (mission_id,)
+        ).fetchall()
+        return [key for (key,) in rows]
+    
+    def count(self, mission_id: str) -> int:
+        """
+        Count the stored results of a mission.
+        
+        Args:
+            mission_id: Mission identifier
+            
+        Returns:
+            Number of records
+        """
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM results WHERE mission_id = ?", (mission_id,)
+        ).fetchone()[0]
+    
+    def delete(self, mission_id: str) -> None:
+        """
+        Delete the results of a mission.
+        
+        Args:
+            mission_id: Mission identifier
+        """
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM results WHERE mission_id = ?", (mission_id,))
+
+
+_shared_store: Optional[ResultStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """
+    Get the process-wide mission result store.
+    
+    Returns:
+        Shared ResultStore
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            settings = get_settings()
+            _shared_store = ResultStore(settings.result_store_path, retention=settings.result_store_retention)
+        return _shared_store
@@ -0,0 +1,164 @@
+"""JSON serialization with orjson/msgspec fast paths and a stdlib fallback."""
+from typing import Any, Callable, Dict, Optional, Union
+import datetime
+import json
+import threading
+from config.settings import get_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _default(value: Any) -> Any:
+    """Encode types the JSON libraries do not know: dates as ISO 8601, the rest as text."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+class JSONBackend:
+    """A named JSON encoder and decoder pair."""
+    
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[Union[bytes, str]], Any]
+    ):
+        """
+        Initialize backend.
+        
+        Args:
+            name: Backend name
+            dumps: Encodes a value to compact UTF-8 JSON bytes
+            loads: Decodes JSON bytes or text
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+
+def _stdlib_backend() -> JSONBackend:
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+    
+    return JSONBackend("json", dumps, json.loads)
+
+
+def _orjson_backend() -> JSONBackend:
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    
+    return JSONBackend("orjson", dumps, orjson.loads)
+
+
+def _msgspec_backend() -> JSONBackend:
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+    return JSONBackend("msgspec", encoder.encode, decoder.decode)
+
+
+_FACTORIES: Dict[str, Callable[[], JSONBackend]] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "json": _stdlib_backend
+}
+
+
+def available_backends() -> Dict[str, bool]:
+    """
+    Report which backends can be used in this environment.
+    
+    Returns:
+        Mapping of backend name to availability
+    """
+    return {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+
+
+def select_backend(name: str = "auto") -> JSONBackend:
+    """
+    Build a serialization backend.
+    
+    Args:
+        name: "orjson", "msgspec", "json", or "auto" for the fastest installed one
+        
+    Returns:
+        JSONBackend
+        
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if name == "auto":
+        name = next(candidate for candidate, ok in available_backends().items() if ok)
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    if not available_backends()[name]:
+        raise ValueError(f"JSON backend {name} is not installed")
+    return _FACTORIES[name]()
+
+
+_backend: Optional[JSONBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> JSONBackend:
+    """
+    Get the process-wide backend selected by the json_backend setting.
+    
+    Returns:
+        JSONBackend
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = select_backend(get_settings().json_backend)
+    return _backend
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize a value to compact UTF-8 JSON.
+    
+    Args:
+        value: JSON-compatible value; datetimes become ISO 8601 strings
+        
+    Returns:
+        JSON bytes
+    """
+    return get_backend().dumps(value)
+
+
+def dumps_text(value: Any) -> str:
+    """
+    Serialize a value to compact JSON text.
+    
+    Args:
+        value: JSON-compatible value
+        
+    Returns:
+        JSON string
+    """
+    return get_backend().dumps(value).decode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse JSON bytes or text.
+    
+    Args:
+        data: JSON document
+        
+    Returns:
+        Parsed value
+    """
+    return get_backend().loads(data)
@@ -1,68 +1,151 @@
+import argparse
 import sys
 import os
-from infrastructure.browser_engine import BrowserEngine
-from infrastructure.memory import Memory
-from services.agent import MarketRadarAgent
+import uuid
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Arguments to parse (defaults to sys.argv)
+        
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Run a MarketRadar research mission.",
+        epilog="Example: python main.py 'Find the average price of Creatine in Brazil'"
+    )
+    parser.add_argument("goal", nargs="?", help="Mission goal")
+    parser.add_argument("--resume", metavar="MISSION_ID", help="Resume a mission from its checkpoint")
+    args = parser.parse_args(argv)
+    if not args.goal and not args.resume:
+        parser.error("a goal is required unless --resume is given")
+    return args
+
+
+def print_event(event) -> None:
+    """
+    Print a mission event to the terminal.
+    
+    Args:
+        event: Agent event, already persisted by consume_mission_events()
+    """
+    from core.domain.events import ActionEvent, CompleteEvent, ErrorEvent, ExtractionEvent
+    
+    if isinstance(event, ActionEvent):
+        print(f"\n--- Iteration {event.iteration} ---")
+        print(f"Thought: {event.thought_process}")
+        print(f"Reasoning: {event.reasoning}")
+        print(f"Action: {event.action['name']} {event.action['params']}")
+        print(f"Result: {event.result}")
+    elif isinstance(event, ExtractionEvent):
+        origin = "cache" if event.cached else "page"
+        print(f"Extracted data from {event.url} ({origin})")
+    elif isinstance(event, ErrorEvent):
+        print(f"Error: {event.message}")
+    elif isinstance(event, CompleteEvent):
+        print("\n" + "="*50)
+        print("MISSION COMPLETE" if event.is_goal_achieved else f"MISSION INCOMPLETE - {event.message}")
+        print("="*50)
+        print(f"\nSummary:\n{event.summary}")
+        if event.is_goal_achieved:
+            print(f"\nExtracted Data:")
+            for data in event.extracted_data:
+                print(f"  - {data}")
+        print(f"\nBudget usage: {event.budget}")
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python main.py '<global_goal>'")
-        print("Example: python main.py 'Find the average price of Creatine in Brazil'")
-        sys.exit(1)
+    args = parse_args()
+    # Mission modules load settings and Playwright; --help and usage errors skip them
+    from infrastructure.browser_engine import BrowserEngine
+    from infrastructure.persistent_memory import create_memory
+    from infrastructure.page_cache import get_page_cache
+    from infrastructure.checkpoint_store import CheckpointStore
+    from infrastructure.price_store import get_price_store
+    from infrastructure.result_store import get_result_store
+    from services.agent import MarketRadarAgent
+    from services.budget import BudgetTracker, default_limits
+    from services.mission_runner import consume_mission_events, release_mission_resources
+    from config.settings import get_settings
+    
+    settings = get_settings()
+    checkpoint_store = CheckpointStore(settings.checkpoint_dir)
     
-    global_goal = sys.argv[1]
+    checkpoint = None
+    if args.resume:
+        checkpoint = checkpoint_store.load(args.resume)
+        if checkpoint is None:
+            print(f"No checkpoint found for mission {args.resume}")
+            sys.exit(1)
     
-    headless = os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
+    mission_id = args.resume or str(uuid.uuid4())
+    if checkpoint:
+        mission_meta = checkpoint["mission"]
+    else:
+        mission_meta = {
+            "goal": args.goal,
+            "headless": os.getenv("BROWSER_HEADLESS", "true").lower() == "true",
+            "max_iterations": int(os.getenv("MAX_ITERATIONS", "50")),
+            "budget_limits": {}
+        }
+    global_goal = mission_meta["goal"]
+    max_iterations = mission_meta["max_iterations"]
+    budget = BudgetTracker(default_limits(
+        settings,
+        **{**mission_meta.get("budget_limits", {}), "max_iterations": max_iterations}
+    ))
     
-    browser = BrowserEngine(headless=headless)
-    memory = Memory()
-    agent = MarketRadarAgent(browser, memory, global_goal)
+    browser = BrowserEngine(headless=mission_meta["headless"])
+    memory = create_memory(settings, mission_id)
+    page_cache = get_page_cache()
+    agent = MarketRadarAgent(browser, memory, global_goal, page_cache=page_cache, budget=budget)
+    price_store = get_price_store()
+    
+    start_url = "https://www.google.com"
+    storage_state = None
+    if checkpoint:
+        agent.restore_state(checkpoint["agent"])
+        start_url = checkpoint["agent"].get("current_url") or start_url
+        storage_state = checkpoint["agent"].get("browser_state")
     
     try:
-        browser.start()
-        browser.goto("https://www.google.com")
-        
-        print(f"Goal: {global_goal}\n")
-        print("Starting MarketRadar agent...\n")
-        
-        iteration = 0
-        max_iterations = int(os.getenv("MAX_ITERATIONS", "50"))
+        budget.start()
+        browser.start(storage_state=storage_state)
         
-        while not agent.goal_achieved and iteration < max_iterations:
-            iteration += 1
-            print(f"\n--- Iteration {iteration} ---")
-            
-            response_json = agent.step()
-            print(response_json)
-            
-            import json
-            response = json.loads(response_json)
-            
-            if response.get("is_goal_achieved") or response["action"]["name"] == "finish":
-                print("\n" + "="*50)
-                print("MISSION COMPLETE")
-                print("="*50)
-                print(f"\nSummary:\n{memory.get_summary()}")
-                print(f"\nExtracted Data:")
-                for data in memory.get_extracted_data():
-                    print(f"  - {data}")
-                break
+        print(f"Goal: {global_goal}")
+        print(f"Mission: {mission_id}\n")
+        if checkpoint:
+            print(f"Resuming MarketRadar agent from iteration {agent.iteration_count}...\n")
+        else:
+            print("Starting MarketRadar agent...\n")
         
-        if not agent.goal_achieved:
-            print("\n" + "="*50)
-            print("MISSION INCOMPLETE - Max iterations reached")
-            print("="*50)
-            print(f"\nSummary:\n{memory.get_summary()}")
+        consume_mission_events(
+            agent,
+            mission_id,
+            mission_meta,
+            print_event,
+            checkpoint_store,
+            checkpoint_every=settings.checkpoint_every,
+            price_store=price_store,
+            result_store=get_result_store(),
+            start_url=start_url
+        )
     
     except KeyboardInterrupt:
         print("\n\nMission interrupted by user.")
+        print(f"Resume with: python main.py --resume {mission_id}")
     except Exception as e:
         print(f"\n\nError: {str(e)}")
         import traceback
         traceback.print_exc()
     finally:
-        browser.stop()
+        release_mission_resources(browser, memory, page_cache, price_store)
+        if page_cache:
+            print(f"\nPage cache: {page_cache.stats()}")
 
 
 if __name__ == "__main__":
@@ -1,19 +1,90 @@
 """Repository for mission data management."""
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
+from config.settings import Settings
 from core.domain.models import MissionStatus
 from core.exceptions import MissionNotFoundError
+import json
+import os
+import sqlite3
+import threading
 import uuid
 
 
 class MissionRepository:
-    """Repository for managing mission data."""
+    """
+    Repository for managing mission data.
     
-    def __init__(self):
-        """Initialize repository with in-memory storage."""
-        self._missions: Dict[str, Dict] = {}
+    Missions are spread over shards, each guarded by its own lock, so mission
+    threads writing progress and request handlers reading status rarely wait
+    on each other. Reads return copies and every write, including the
+    compare_and_set() used for state transitions, happens under the lock of
+    the mission's shard.
     
-    def create(self, goal: str, headless: bool, max_iterations: int) -> str:
+    Subclasses change where records live by overriding _read, _write,
+    _modify and _remove.
+    """
+    
+    def __init__(self, shards: int = 16):
+        """
+        Initialize repository with in-memory storage.
+        
+        Args:
+            shards: Number of independently locked partitions
+        """
+        self._shards: List[Tuple[threading.Lock, Dict[str, Dict]]] = [
+            (threading.Lock(), {}) for _ in range(max(1, shards))
+        ]
+    
+    def _shard(self, mission_id: str) -> Tuple[threading.Lock, Dict[str, Dict]]:
+        """Get the lock and records of the shard holding a mission."""
+        return self._shards[hash(mission_id) % len(self._shards)]
+    
+    def _read(self, mission_id: str) -> Optional[Dict]:
+        """Get a copy of a mission record, or None if missing."""
+        lock, missions = self._shard(mission_id)
+        with lock:
+            mission = missions.get(mission_id)
+            return dict(mission) if mission is not None else None
+    
+    def _write(self, mission_id: str, mission: Dict) -> None:
+        """Store a mission record, replacing any previous one."""
+        lock, missions = self._shard(mission_id)
+        with lock:
+            missions[mission_id] = mission
+    
+    def _modify(self, mission_id: str, change: Callable[[Dict], bool]) -> Optional[bool]:
+        """
+        Apply a change to a mission record atomically.
+        
+        Args:
+            mission_id: Mission identifier
+            change: Mutates the record in place and returns whether it changed it
+            
+        Returns:
+            Result of change, or None if the mission does not exist
+        """
+        lock, missions = self._shard(mission_id)
+        with lock:
+            mission = missions.get(mission_id)
+            if mission is None:
+                return None
+            return change(mission)
+    
+    def _remove(self, mission_id: str) -> bool:
+        """Remove a mission record, returning whether it existed."""
+        lock, missions = self._shard(mission_id)
+        with lock:
+            return missions.pop(mission_id, None) is not None
+    
+    def create(
+        self,
+        goal: str,
+        headless: bool,
+        max_iterations: int,
+        budget: Optional[Dict[str, Any]] = None,
+        mission_id: Optional[str] = None
+    ) -> str:
         """
         Create a new mission.
         
@@ -21,22 +92,28 @@ class MissionRepository:
             goal: Mission goal
             headless: Whether to run browser in headless mode
             max_iterations: Maximum number of iterations
+            budget: Optional budget limit overrides (see BudgetLimits)
+            mission_id: Identifier to reuse, e.g. when resuming from a checkpoint
             
         Returns:
             Mission ID
         """
-        mission_id = str(uuid.uuid4())
-        self._missions[mission_id] = {
+        mission_id = mission_id or str(uuid.uuid4())
+        self._write(mission_id, {
             "mission_id": mission_id,
             "goal": goal,
             "headless": headless,
             "max_iterations": max_iterations,
+            "budget_limits": budget or {},
+            "budget": None,
+            "queue_position": None,
+            "started_at": None,
             "is_running": False,
             "is_complete": False,
             "error": None,
             "sources_visited": 0,
             "data_points": 0
-        }
+        })
         return mission_id
     
     def get(self, mission_id: str) -> Dict:
@@ -47,14 +124,15 @@ class MissionRepository:
             mission_id: Mission identifier
             
         Returns:
-            Mission data
+            Copy of the mission data
             
         Raises:
             MissionNotFoundError: If mission not found
         """
-        if mission_id not in self._missions:
+        mission = self._read(mission_id)
+        if mission is None:
             raise MissionNotFoundError(f"Mission {mission_id} not found")
-        return self._missions[mission_id]
+        return mission
     
     def update(self, mission_id: str, **kwargs) -> None:
         """
@@ -67,8 +145,57 @@ class MissionRepository:
         Raises:
             MissionNotFoundError: If mission not found
         """
-        mission = self.get(mission_id)
-        mission.update(kwargs)
+        if not self.update_if_exists(mission_id, **kwargs):
+            raise MissionNotFoundError(f"Mission {mission_id} not found")
+    
+    def update_if_exists(self, mission_id: str, **kwargs) -> bool:
+        """
+        Update mission data unless the mission was deleted.
+        
+        Mission threads use this for progress updates, which must not fail
+        when a client deletes the mission concurrently.
+        
+        Args:
+            mission_id: Mission identifier
+            **kwargs: Fields to update
+            
+        Returns:
+            True if the mission exists and was updated
+        """
+        def change(mission: Dict) -> bool:
+            mission.update(kwargs)
+            return True
+        
+        return self._modify(mission_id, change) is not None
+    
+    def compare_and_set(self, mission_id: str, field: str, expected: Any, value: Any, **kwargs) -> bool:
+        """
+        Set a field only if it still holds the expected value.
+        
+        Args:
+            mission_id: Mission identifier
+            field: Field to transition, e.g. "is_running"
+            expected: Value the field must currently hold
+            value: New value of the field
+            **kwargs: Other fields updated in the same step
+            
+        Returns:
+            True if the field held the expected value and was set
+            
+        Raises:
+            MissionNotFoundError: If mission not found
+        """
+        def change(mission: Dict) -> bool:
+            if mission.get(field) != expected:
+                return False
+            mission[field] = value
+            mission.update(kwargs)
+            return True
+        
+        result = self._modify(mission_id, change)
+        if result is None:
+            raise MissionNotFoundError(f"Mission {mission_id} not found")
+        return result
     
     def delete(self, mission_id: str) -> None:
         """
@@ -80,9 +207,8 @@ class MissionRepository:
         Raises:
             MissionNotFoundError: If mission not found
         """
-        if mission_id not in self._missions:
+        if not self._remove(mission_id):
             raise MissionNotFoundError(f"Mission {mission_id} not found")
-        del self._missions[mission_id]
     
     def get_status(self, mission_id: str) -> MissionStatus:
         """
@@ -107,4 +233,92 @@ class MissionRepository:
         Returns:
             True if exists, False otherwise
         """
-        return mission_id in self._missions
+        return self._read(mission_id) is not None
+
+
+class SQLiteMissionRepository(MissionRepository):
+    """
+    Mission repository stored in SQLite, shared by every process using the file.
+    
+    Each thread gets its own connection. Writes run in BEGIN IMMEDIATE
+    transactions, so read-modify-write updates and compare_and_set() stay
+    atomic across threads and processes.
+    """
+    
+    def __init__(self, db_path: str):
+        """
+        Initialize repository.
+        
+        Args:
+            db_path: Database file path
+        """
+        super().__init__(shards=1)
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS missions (mission_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it in WAL mode on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _read(self, mission_id: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT data FROM missions WHERE mission_id = ?", (mission_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def _write(self, mission_id: str, mission: Dict) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO missions (mission_id, data) VALUES (?, ?)",
+            (mission_id, json.dumps(mission, default=str))
+        )
+    
+    def _modify(self, mission_id: str, change: Callable[[Dict], bool]) -> Optional[bool]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM missions WHERE mission_id = ?", (mission_id,)).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            mission = json.loads(row[0])
+            changed = change(mission)
+            if changed:
+                conn.execute(
+                    "UPDATE missions SET data = ? WHERE mission_id = ?",
+                    (json.dumps(mission, default=str), mission_id)
+                )
+            conn.execute("COMMIT")
+            return changed
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def _remove(self, mission_id: str) -> bool:
+        cursor = self._connection().execute("DELETE FROM missions WHERE mission_id = ?", (mission_id,))
+        return cursor.rowcount > 0
+
+
+def create_mission_repository(settings: Settings) -> MissionRepository:
+    """
+    Build the mission repository selected by settings.
+    
+    Args:
+        settings: Application settings
+        
+    Returns:
+        MissionRepository, or SQLiteMissionRepository when mission_store_backend is "sqlite"
+    """
+    if settings.mission_store_backend == "sqlite":
+        return SQLiteMissionRepository(settings.mission_store_db_path)
+    return MissionRepository(shards=settings.mission_store_shards)
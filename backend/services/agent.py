@@ -1,16 +1,117 @@
 """MarketRadar agent implementation."""
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Iterator, Optional, List
 from infrastructure.browser_engine import BrowserEngine
 from infrastructure.memory import Memory
 from infrastructure.extractor import DataExtractor
-from config.settings import Settings
-from core.domain.models import GoalAnalysis
-import json
+from infrastructure.page_cache import PageCache, canonical_url
+from infrastructure.metrics import RadarMetrics
+from infrastructure.rate_limiter import HostRateLimiter, host_key
+from infrastructure.loop_detector import page_fingerprint
+from config.settings import get_settings
+from core.cancellation import CancellationToken
+from core.domain.models import GoalAnalysis, LoopSignal
+from core.domain.events import (
+    AgentEvent,
+    ActionEvent,
+    CompleteEvent,
+    ErrorEvent,
+    ExtractionEvent,
+    StatusEvent
+)
+from services.budget import BudgetTracker
+from services.convergence import PriceConvergence
+from urllib.parse import quote_plus
 import re
+import time
+
+
+def describe_finish_reason(reason: str) -> str:
+    """
+    Turn a finish reason code into a human-readable message.
+    
+    Args:
+        reason: Reason code from the finish action
+        
+    Returns:
+        Message for the client
+    """
+    if reason.startswith("budget_exhausted:"):
+        return f"Budget exhausted: {reason.split(':', 1)[1]}"
+    if reason == "max_iterations":
+        return "Max iterations reached"
+    if reason == "not_converged":
+        return "Source limit reached before the average price converged"
+    return "Mission finished without reaching the goal"
+
+
+def analyze_goal(goal: str) -> Dict[str, Any]:
+    """
+    Derive the research type, topic and search queries of a mission goal.
+    
+    Depends on the goal text only, so batches can compare goals before
+    starting any mission.
+    
+    Args:
+        goal: Mission goal
+        
+    Returns:
+        Goal analysis with type, keywords, target_data, search_queries and topic
+    """
+    goal_lower = goal.lower()
+    
+    analysis = {
+        "type": "general_research",
+        "keywords": [],
+        "target_data": ["prices", "product_names", "descriptions", "specifications", "reviews", "comparisons"],
+        "search_queries": [],
+        "topic": ""
+    }
+    
+    # Extract main topic
+    if "preço" in goal_lower or "price" in goal_lower:
+        analysis["type"] = "price_research"
+        analysis["target_data"].append("prices")
+    
+    if "média" in goal_lower or "average" in goal_lower:
+        analysis["type"] = "average_calculation"
+    
+    # Extract product/topic name
+    product_match = re.search(r'(?:preço|price|sobre|about)\s+(?:(?:de|do|da|of)\s+)?(.+?)(?=\s+(?:em|in|no|na|brasil|brazil)\b|\?|$)', goal_lower)
+    if product_match:
+        product = product_match.group(1).strip()
+        analysis["keywords"].append(product)
+        analysis["topic"] = product
+    
+    location_match = re.search(r'(?:em|in|no|na)\s+([^?]+)', goal_lower)
+    if location_match:
+        location = location_match.group(1).strip()
+        analysis["keywords"].append(location)
+    
+    # Generate multiple search queries for comprehensive research
+    topic = analysis["topic"] or goal
+    analysis["search_queries"] = [
+        f"{topic}",
+        f"{topic} preço brasil",
+        f"{topic} mercado brasil",
+        f"{topic} informações",
+        f"{topic} dados"
+    ]
+    
+    return analysis
 
 
 class MarketRadarAgent:
-    def __init__(self, browser_engine: BrowserEngine, memory: Memory, global_goal: str):
+    def __init__(
+        self,
+        browser_engine: BrowserEngine,
+        memory: Memory,
+        global_goal: str,
+        page_cache: Optional[PageCache] = None,
+        budget: Optional[BudgetTracker] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        metrics: Optional[RadarMetrics] = None
+    ):
         """
         Initialize MarketRadar agent.
         
@@ -18,63 +119,46 @@ class MarketRadarAgent:
             browser_engine: Browser engine instance
             memory: Memory instance for state management
             global_goal: Mission goal
+            page_cache: Optional cache of extracted pages shared across missions
+            budget: Optional resource budget enforced on every decision
+            cancel_token: Optional token checked between and inside actions
+            rate_limiter: Optional per-host navigation limits shared across missions
+            metrics: Optional metrics receiving iteration, navigation and extraction timings
         """
-        self.settings = Settings()
+        self.settings = get_settings()
         self.browser = browser_engine
         self.memory = memory
         self.global_goal = global_goal
         self.extractor = DataExtractor(browser_engine)
+        self.page_cache = page_cache
         self.iteration_count = 0
+        self.budget = budget
+        self.cancel_token = cancel_token
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
         self.max_iterations = self.settings.agent_max_iterations
+        if budget and budget.limits.max_iterations is not None:
+            self.max_iterations = budget.limits.max_iterations
         self.goal_achieved = False
         self.research_phase = "initial"  # initial, searching, collecting, consolidating
         self.sources_visited = []
         self.target_sources = []
         self.min_sources = self.settings.agent_min_sources
+        self.max_sources = max(self.settings.agent_max_sources, self.min_sources)
         self.data_collection_count = 0
+        self.price_estimate = PriceConvergence(
+            confidence=self.settings.agent_price_confidence,
+            relative_precision=self.settings.agent_price_precision,
+            min_prices=self.settings.agent_min_prices
+        )
+        self.blocked_urls = set()
+        self._query_index = 0
+        self._page_fingerprint = ""
+        self._pending_events: List[AgentEvent] = []
+        self._extract_seconds = 0.0
     
     def analyze_goal(self) -> Dict[str, Any]:
-        goal_lower = self.global_goal.lower()
-        
-        analysis = {
-            "type": "general_research",
-            "keywords": [],
-            "target_data": ["prices", "product_names", "descriptions", "specifications", "reviews", "comparisons"],
-            "search_queries": [],
-            "topic": ""
-        }
-        
-        # Extract main topic
-        if "preço" in goal_lower or "price" in goal_lower:
-            analysis["type"] = "price_research"
-            analysis["target_data"].append("prices")
-        
-        if "média" in goal_lower or "average" in goal_lower:
-            analysis["type"] = "average_calculation"
-        
-        # Extract product/topic name
-        product_match = re.search(r'(?:preço|price|de|of|sobre|about)\s+([^em|in|no|na|?]+?)(?:\s+(?:em|in|no|na|brasil|brazil|?))', goal_lower)
-        if product_match:
-            product = product_match.group(1).strip()
-            analysis["keywords"].append(product)
-            analysis["topic"] = product
-        
-        location_match = re.search(r'(?:em|in|no|na)\s+([^?]+)', goal_lower)
-        if location_match:
-            location = location_match.group(1).strip()
-            analysis["keywords"].append(location)
-        
-        # Generate multiple search queries for comprehensive research
-        topic = analysis["topic"] or self.global_goal
-        analysis["search_queries"] = [
-            f"{topic}",
-            f"{topic} preço brasil",
-            f"{topic} mercado brasil",
-            f"{topic} informações",
-            f"{topic} dados"
-        ]
-        
-        return analysis
+        return analyze_goal(self.global_goal)
     
     def find_search_input(self, page_state: Dict[str, Any]) -> Optional[str]:
         elements = page_state.get("interactive_elements", [])
@@ -161,77 +245,307 @@ class MarketRadarAgent:
         # Check if it's a trusted source
         is_trusted = self.is_trusted_source(url) if url else False
         
-        # Check if it's not already visited
+        # Check if it's not already visited or part of a detected loop
         is_new = url not in self.sources_visited if url else True
+        is_blocked = canonical_url(element["href"]) in self.blocked_urls if url else False
+        
+        return (has_keywords or is_trusted) and is_new and not is_blocked and len(text) > 5
+    
+    def price_estimate_ready(self) -> bool:
+        """
+        Sequential stopping rule for average-price missions.
+        
+        Returns:
+            True once the running estimate meets the precision target, or when
+            the source cap is reached with enough prices to report an average
+        """
+        visited = len(self.sources_visited)
+        if self.price_estimate.count < self.settings.agent_min_prices:
+            return False
+        if self.price_estimate.is_converged() and visited >= self.settings.agent_min_price_sources:
+            return True
+        return visited >= self.max_sources
+    
+    def needs_more_sources(self, goal_analysis: Dict[str, Any]) -> bool:
+        """
+        Decide whether the mission should keep collecting sources.
+        
+        Average-price missions run until the estimate converges (possibly
+        before or past `min_sources`, capped at `max_sources`); every other
+        mission type stops at `min_sources`.
+        
+        Args:
+            goal_analysis: Result of analyze_goal()
+            
+        Returns:
+            True if more sources should be visited
+        """
+        if goal_analysis["type"] == "average_calculation":
+            return not self.price_estimate_ready() and len(self.sources_visited) < self.max_sources
+        return len(self.sources_visited) < self.min_sources
+    
+    def extract(self, data_points: List[str]) -> Dict[str, Any]:
+        """
+        Extract data points from the current page, timing the extraction.
+        
+        Args:
+            data_points: Data points to extract
+            
+        Returns:
+            Extracted data
+        """
+        began = time.perf_counter()
+        extracted = self.extractor.extract_structured_data(data_points)
+        self._extract_seconds += time.perf_counter() - began
+        if self.metrics is not None:
+            self.metrics.extraction_prices.observe(len(extracted.get("prices", [])), "page")
+        return extracted
+    
+    def record_source(self, url: str, extracted: Dict[str, Any], goal_analysis: Dict[str, Any]) -> None:
+        """
+        Record a newly collected source and its extracted data.
+        
+        Args:
+            url: Source URL
+            extracted: Data extracted from the source
+            goal_analysis: Result of analyze_goal()
+        """
+        self.sources_visited.append(url)
+        self.data_collection_count += 1
+        self.memory.add_extracted_data(extracted)
+        self._pending_events.append(ExtractionEvent(
+            iteration=self.iteration_count,
+            url=url,
+            data=extracted,
+            cached=extracted.get("cached", False),
+            sources_visited=len(self.sources_visited)
+        ))
+        if goal_analysis["type"] == "average_calculation":
+            self.price_estimate.add_prices(extracted.get("prices", []))
+    
+    def use_cached_source(self, url: str, goal_analysis: Dict[str, Any], wait: bool = True) -> bool:
+        """
+        Collect a source from the page cache instead of navigating to it.
+        
+        Args:
+            url: Candidate source URL
+            goal_analysis: Result of analyze_goal()
+            wait: Whether to wait for another mission's in-flight fetch of the
+                URL, within the time budget and until cancelled
+                
+        Returns:
+            True if a fresh cache hit was recorded as a visited source
+            
+        Raises:
+            MissionCancelledError: If the mission is cancelled while waiting
+        """
+        # An empty PageCache is falsy, yet another mission may be filling it
+        if self.page_cache is None or not url or url in self.sources_visited:
+            return False
+        if any(domain in url.lower() for domain in self.settings.skip_domains):
+            return False
+        
+        cached = self.page_cache.get(url)
+        if cached is None and wait:
+            # Another mission may be fetching this very page right now
+            timeout = self.settings.page_cache_fetch_wait
+            remaining = self.budget.remaining_seconds() if self.budget else None
+            if remaining is not None:
+                timeout = min(timeout, remaining)
+            cached = self.page_cache.wait_for_fetch(
+                url,
+                timeout,
+                cancel_token=self.cancel_token,
+                check_interval=self.settings.mission_cancel_check_ms / 1000
+            )
+        if cached is None:
+            return False
+        
+        self.record_source(url, {**cached, "cached": True}, goal_analysis)
+        if self.metrics is not None:
+            self.metrics.extraction_prices.observe(len(cached.get("prices", [])), "cache")
+        return True
+    
+    def fetch(self, url: str, navigate: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Navigate to a candidate source while holding its page cache fetch claim.
+        
+        Missions reaching the same URL meanwhile wait for this extraction
+        instead of fetching the page again. The claim is released by the
+        page cache once the page is extracted, or here if navigation fails.
+        
+        Args:
+            url: URL the navigation leads to (empty if unknown)
+            navigate: Performs the navigation and returns the browser result
+            
+        Returns:
+            Browser result
+        """
+        claimed = False
+        if self.page_cache is not None and url and not self.is_search_results(url):
+            claimed = self.page_cache.claim_fetch(url, self.settings.page_cache_fetch_lease)
+        try:
+            # A click without a known target most likely stays on the current site
+            result = self.throttled(url or self.browser.current_url, navigate)
+        except BaseException:
+            if claimed:
+                self.page_cache.release_fetch(url)
+            raise
+        if claimed and not result.get("success"):
+            self.page_cache.release_fetch(url)
+        return result
+    
+    def throttled(self, url: str, navigate: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Navigate once the rate limiter lets another request reach the host.
         
-        return (has_keywords or is_trusted) and is_new and len(text) > 5
+        The outcome is reported back, so throttled responses and bot
+        challenges slow the host down for every mission. The navigation
+        itself, without the wait, is timed per domain when metrics are on.
+        
+        Args:
+            url: URL whose host the navigation reaches
+            navigate: Performs the navigation and returns the browser result
+            
+        Returns:
+            Browser result
+            
+        Raises:
+            MissionCancelledError: If the mission is cancelled while waiting
+        """
+        if self.rate_limiter is not None and url:
+            self.rate_limiter.acquire(url, self.cancel_token)
+        began = time.perf_counter()
+        result = navigate()
+        if self.metrics is not None and url:
+            self.metrics.navigation_seconds.observe(
+                time.perf_counter() - began,
+                host_key(url, self.settings.rate_limit_domains)
+            )
+        if self.rate_limiter is not None and url:
+            self.rate_limiter.report(url, result)
+        return result
+    
+    def finish_with_estimate(self) -> Dict[str, Any]:
+        """
+        Record the final average price and build the finish action.
+        
+        An estimate that stopped at the source cap without converging is
+        still reported, but the mission finishes incomplete with reason
+        "not_converged", since its interval misses the precision target.
+        
+        Returns:
+            Finish action command
+        """
+        estimate = self.price_estimate.to_dict()
+        self.memory.add_extracted_data({**estimate, "currency": "BRL"})
+        converged = estimate["converged"]
+        self.goal_achieved = converged
+        params = {"summary": self.memory.get_summary()}
+        if not converged:
+            params["reason"] = "not_converged"
+        precision = estimate["relative_half_width"]
+        return {
+            "thought_process": f"Collected data from {len(self.sources_visited)} sources. Average calculated from {self.price_estimate.count} prices.",
+            "reasoning": (
+                f"Average converged to ±{precision:.1%} at {self.price_estimate.confidence:.0%} confidence."
+                if converged
+                else f"Source limit of {self.max_sources} reached before the average converged."
+            ),
+            "action": {"name": "finish", "params": params},
+            "is_goal_achieved": converged
+        }
+    
+    @staticmethod
+    def is_search_results(url: str) -> bool:
+        """Check whether a URL is a search engine results page."""
+        url = url.lower()
+        return "google.com/search" in url or "bing.com/search" in url
+    
+    def escape_loop(self, loop: LoopSignal, goal_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Break out of a detected loop using the suggested strategy.
+        
+        Pages in the cycle (other than search results) are blocked from being
+        clicked again, and the agent moves on to the next search query.
+        
+        Args:
+            loop: Detected loop
+            goal_analysis: Goal analysis
+            
+        Returns:
+            Action command that leaves the loop
+        """
+        self.memory.loop_detector.reset()
+        if loop.strategy in ("leave_page", "avoid_cycle"):
+            self.blocked_urls.update(url for url in loop.urls if not self.is_search_results(url))
+        
+        queries = goal_analysis["search_queries"] or [goal_analysis["topic"] or self.global_goal]
+        self._query_index += 1
+        query = queries[self._query_index % len(queries)]
+        
+        return {
+            "thought_process": f"Loop detected: {' -> '.join(loop.actions)} repeated {loop.repeats} times. Changing strategy ({loop.strategy}).",
+            "reasoning": f"Searching for '{query}' instead of repeating the same steps.",
+            "action": {"name": "goto", "params": {"url": "https://www.google.com/search?q=" + quote_plus(query)}},
+            "is_goal_achieved": False
+        }
     
     def decide_action(self, page_state: Dict[str, Any]) -> Dict[str, Any]:
         self.iteration_count += 1
         
-        if self.iteration_count >= self.max_iterations:
+        if self.budget:
+            exhausted = self.budget.exhausted()
+            self.budget.charge_iteration()
+            if exhausted:
+                return {
+                    "thought_process": f"Mission budget exhausted ({exhausted}). Finishing with partial results.",
+                    "reasoning": "Stopping gracefully to stay within the mission budget.",
+                    "action": {
+                        "name": "finish",
+                        "params": {
+                            "summary": self.memory.get_summary(),
+                            "reason": f"budget_exhausted:{exhausted}"
+                        }
+                    },
+                    "is_goal_achieved": False
+                }
+        elif self.iteration_count >= self.max_iterations:
             return {
                 "thought_process": "Maximum iterations reached. Finishing mission.",
                 "reasoning": "Preventing infinite loops.",
-                "action": {"name": "finish", "params": {"summary": self.memory.get_summary()}},
+                "action": {"name": "finish", "params": {"summary": self.memory.get_summary(), "reason": "max_iterations"}},
                 "is_goal_achieved": False
             }
         
         current_url = page_state.get("url", "")
+        self._page_fingerprint = page_fingerprint(page_state)
+        goal_analysis = self.analyze_goal()
         
-        if self.memory.is_loop_detected(current_url):
-            return {
-                "thought_process": f"Loop detected on {current_url}. Changing strategy.",
-                "reasoning": "Visited this URL 3+ times. Need to try different approach.",
-                "action": {"name": "goto", "params": {"url": "https://www.google.com"}},
-                "is_goal_achieved": False
-            }
+        loop = self.memory.detect_loop()
+        if loop:
+            return self.escape_loop(loop, goal_analysis)
         
-        goal_analysis = self.analyze_goal()
         visible_text = page_state.get("visible_text", "").lower()
         elements = page_state.get("interactive_elements", [])
         
         # Extract data from current page if it's a valuable source
         if self.should_extract_data(page_state):
             if current_url not in self.sources_visited:
-                self.sources_visited.append(current_url)
-                self.data_collection_count += 1
-                
                 # Extract comprehensive structured data
-                extracted = self.extractor.extract_structured_data(
-                    goal_analysis["target_data"] + ["url", "title"]
-                )
-                self.memory.add_extracted_data(extracted)
+                extracted = self.extract(goal_analysis["target_data"] + ["url", "title"])
+                self.record_source(current_url, extracted, goal_analysis)
                 
-                # Check if we have enough sources
-                if len(self.sources_visited) >= self.min_sources and self.data_collection_count >= self.min_sources:
-                    if goal_analysis["type"] == "average_calculation":
-                        all_prices = []
-                        for data in self.memory.get_extracted_data():
-                            if "prices" in data:
-                                prices = data["prices"]
-                                if isinstance(prices, list):
-                                    for p in prices:
-                                        if isinstance(p, dict):
-                                            all_prices.append(p["value"])
-                                        else:
-                                            all_prices.append(p)
-                                else:
-                                    all_prices.append(prices)
-                        
-                        if len(all_prices) >= 3:
-                            avg_price = sum(all_prices) / len(all_prices)
-                            self.memory.add_extracted_data({"average_price": avg_price, "currency": "BRL"})
-                            self.goal_achieved = True
-                            return {
-                                "thought_process": f"Collected data from {len(self.sources_visited)} sources. Average calculated from {len(all_prices)} prices.",
-                                "reasoning": "Sufficient data gathered from multiple sources to calculate average.",
-                                "action": {"name": "finish", "params": {"summary": self.memory.get_summary()}},
-                                "is_goal_achieved": True
-                            }
+                if self.page_cache:
+                    snapshot = page_state.get("visible_text") if self.settings.page_cache_store_snapshots else None
+                    self.page_cache.put(current_url, extracted, snapshot=snapshot)
+                
+                # Stop as soon as the running average is precise enough
+                if goal_analysis["type"] == "average_calculation" and self.price_estimate_ready():
+                    return self.finish_with_estimate()
         
         # Phase 1: Initial search on Google
-        if "google" in current_url.lower() or current_url == "" or "google.com" in current_url:
+        if current_url == "" or "google" in current_url.lower() and not self.is_search_results(current_url):
             search_input = self.find_search_input(page_state)
             if search_input:
                 # Use first search query from the list
@@ -252,24 +566,34 @@ class MarketRadarAgent:
                 }
         
         # Phase 2: On search results page - collect links to visit
-        if "google.com/search" in current_url.lower() or "bing.com/search" in current_url.lower():
+        if self.is_search_results(current_url):
             # Find and prioritize links to visit
             relevant_links = []
             for element in elements:
                 if element.get("tag") == "a" and element.get("text", ""):
                     if self.should_visit_link(element, goal_analysis):
+                        # Fresh cache hits count as visited without navigating, as long as
+                        # sources are still needed; in-flight fetches are not waited for here
+                        if self.needs_more_sources(goal_analysis) and self.use_cached_source(
+                            element.get("href", ""), goal_analysis, wait=False
+                        ):
+                            continue
                         element_id = element.get("id", "")
                         if element_id:
                             relevant_links.append({
                                 "selector": f"#{element_id}",
+                                "href": element.get("href", ""),
                                 "text": element.get("text", ""),
                                 "priority": 1 if self.is_trusted_source(element.get("href", "")) else 2
                             })
             
+            if goal_analysis["type"] == "average_calculation" and self.price_estimate_ready():
+                return self.finish_with_estimate()
+            
             # Sort by priority (trusted sources first)
             relevant_links.sort(key=lambda x: x["priority"])
             
-            if relevant_links and len(self.sources_visited) < self.min_sources:
+            if relevant_links and self.needs_more_sources(goal_analysis):
                 next_link = relevant_links[0]
                 self.research_phase = "collecting"
                 return {
@@ -278,12 +602,13 @@ class MarketRadarAgent:
                     "action": {
                         "name": "click",
                         "params": {
-                            "selector": next_link["selector"]
+                            "selector": next_link["selector"],
+                            "href": next_link["href"]
                         }
                     },
                     "is_goal_achieved": False
                 }
-            elif len(self.sources_visited) >= self.min_sources:
+            elif not self.needs_more_sources(goal_analysis):
                 # Have enough sources, can finish
                 return {
                     "thought_process": f"Collected data from {len(self.sources_visited)} sources. Consolidating results.",
@@ -308,10 +633,10 @@ class MarketRadarAgent:
         # Phase 3: On a content page - extract data and then look for more sources
         if self.should_extract_data(page_state):
             # Already extracted above, now decide next action
-            if len(self.sources_visited) < self.min_sources:
+            if self.needs_more_sources(goal_analysis):
                 # Go back to search to find more sources
                 return {
-                    "thought_process": f"Data extracted from current source. Need {self.min_sources - len(self.sources_visited)} more sources. Returning to search.",
+                    "thought_process": f"Data extracted from current source. Need {max(self.min_sources - len(self.sources_visited), 1)} more sources. Returning to search.",
                     "reasoning": "Continuing multi-source research. Going back to search for more sources.",
                     "action": {
                         "name": "goto",
@@ -341,7 +666,7 @@ class MarketRadarAgent:
                         if element_id:
                             relevant_links.append(f"#{element_id}")
             
-            if relevant_links and len(self.sources_visited) < self.min_sources:
+            if relevant_links and self.needs_more_sources(goal_analysis):
                 return {
                     "thought_process": f"Found relevant link on page. Following to collect more data.",
                     "reasoning": f"Following link to expand data collection from additional source.",
@@ -367,10 +692,10 @@ class MarketRadarAgent:
                 }
         
         # Default: scroll or go back to search
-        if len(self.sources_visited) < self.min_sources:
+        if self.needs_more_sources(goal_analysis):
             return {
                 "thought_process": "No clear action. Returning to search to find more sources.",
-                "reasoning": f"Need more sources ({self.min_sources - len(self.sources_visited)} remaining). Going back to search.",
+                "reasoning": f"Need more sources ({max(self.min_sources - len(self.sources_visited), 1)} remaining). Going back to search.",
                 "action": {
                     "name": "goto",
                     "params": {
@@ -398,50 +723,252 @@ class MarketRadarAgent:
         
         result = {"success": False, "error": "Unknown action"}
         
+        if self.budget and action_name in ("goto", "click", "type"):
+            remaining = self.budget.remaining_seconds()
+            if remaining is not None:
+                self.browser.set_navigation_timeout(remaining * 1000)
+        
         if action_name == "goto":
-            result = self.browser.goto(params["url"])
-            self.memory.add_action("goto", params, params["url"], str(result))
+            if self.use_cached_source(params["url"], self.analyze_goal()):
+                result = {"success": True, "url": params["url"], "cached": True}
+            else:
+                result = self.fetch(params["url"], lambda: self.browser.goto(params["url"]))
+            self.memory.add_action("goto", params, params["url"], result, fingerprint=self._page_fingerprint)
         
         elif action_name == "click":
-            result = self.browser.click(params["selector"])
-            self.memory.add_action("click", params, self.browser.current_url, str(result))
+            result = self.fetch(params.get("href", ""), lambda: self.browser.click(params["selector"]))
+            self.memory.add_action("click", params, self.browser.current_url, result, fingerprint=self._page_fingerprint)
         
         elif action_name == "type":
             press_enter = params.get("press_enter", False)
-            result = self.browser.type(params["selector"], params["text"], press_enter=press_enter)
-            self.memory.add_action("type", params, self.browser.current_url, str(result))
+            if press_enter:
+                # Submitting a search navigates, so it is rate limited like goto
+                result = self.throttled(
+                    self.browser.current_url,
+                    lambda: self.browser.type(params["selector"], params["text"], press_enter=True)
+                )
+            else:
+                result = self.browser.type(params["selector"], params["text"], press_enter=False)
+            self.memory.add_action("type", params, self.browser.current_url, result, fingerprint=self._page_fingerprint)
         
         elif action_name == "scroll":
             result = self.browser.scroll(params["direction"])
-            self.memory.add_action("scroll", params, self.browser.current_url, str(result))
+            self.memory.add_action("scroll", params, self.browser.current_url, result, fingerprint=self._page_fingerprint)
         
         elif action_name == "wait":
             result = self.browser.wait(params["seconds"])
-            self.memory.add_action("wait", params, self.browser.current_url, str(result))
+            self.memory.add_action("wait", params, self.browser.current_url, result, fingerprint=self._page_fingerprint)
         
         elif action_name == "extract":
-            extracted = self.extractor.extract_structured_data(params["data_points"])
+            extracted = self.extract(params["data_points"])
             self.memory.add_extracted_data(extracted)
             result = {"success": True, "data": extracted}
-            self.memory.add_action("extract", params, self.browser.current_url, str(result))
+            self.memory.add_action("extract", params, self.browser.current_url, result, fingerprint=self._page_fingerprint)
         
         elif action_name == "finish":
             result = {"success": True, "summary": params.get("summary", "")}
+            if params.get("reason"):
+                result["reason"] = params["reason"]
             self.goal_achieved = action_command.get("is_goal_achieved", False)
         
+        if self.budget:
+            self.charge_budget(action_name, params, result)
+        
         return result
     
-    def step(self) -> str:
+    def charge_budget(self, action_name: str, params: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """
+        Charge page loads and network bytes of an executed action to the budget.
+        
+        Args:
+            action_name: Executed action name
+            params: Action parameters
+            result: Action result
+        """
+        navigated = (
+            action_name in ("goto", "click") and "url" in result
+            or action_name == "type" and params.get("press_enter", False)
+        )
+        if result.get("success") and navigated and not result.get("cached"):
+            self.budget.charge_page()
+        bytes_received = getattr(self.browser, "bytes_received", 0)
+        if isinstance(bytes_received, int):
+            self.budget.record_bytes(bytes_received)
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Export agent progress for a checkpoint.
+        
+        Returns:
+            JSON-compatible state of the agent, its memory, budget and browser
+        """
+        return {
+            "iteration_count": self.iteration_count,
+            "research_phase": self.research_phase,
+            "goal_achieved": self.goal_achieved,
+            "sources_visited": list(self.sources_visited),
+            "blocked_urls": sorted(self.blocked_urls),
+            "query_index": self._query_index,
+            "data_collection_count": self.data_collection_count,
+            "prices": list(self.price_estimate.values),
+            "current_url": self.browser.current_url,
+            "memory": self.memory.get_state(),
+            "budget": self.budget.get_state() if self.budget else None,
+            "browser_state": self.browser.get_storage_state()
+        }
+    
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore agent progress exported by get_state().
+        
+        The browser storage state is not applied here; pass it to
+        BrowserEngine.start() before running the agent.
+        
+        Args:
+            state: Agent state
+        """
+        self.iteration_count = state.get("iteration_count", 0)
+        self.research_phase = state.get("research_phase", "initial")
+        self.goal_achieved = state.get("goal_achieved", False)
+        self.sources_visited = list(state.get("sources_visited", []))
+        self.blocked_urls = set(state.get("blocked_urls", []))
+        self._query_index = state.get("query_index", 0)
+        self.data_collection_count = state.get("data_collection_count", 0)
+        self.price_estimate = PriceConvergence(
+            confidence=self.settings.agent_price_confidence,
+            relative_precision=self.settings.agent_price_precision,
+            min_prices=self.settings.agent_min_prices
+        )
+        self.price_estimate.add_prices(state.get("prices", []))
+        if state.get("memory"):
+            self.memory.restore_state(state["memory"])
+        if self.budget and state.get("budget"):
+            self.budget.restore_state(state["budget"])
+    
+    def check_cancelled(self) -> None:
+        """
+        Stop the mission if its cancellation token was cancelled.
+        
+        Raises:
+            MissionCancelledError: If the mission is cancelled
+        """
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+    
+    def step(self, iteration: Optional[int] = None) -> ActionEvent:
+        """
+        Observe the page, decide and execute one action.
+        
+        Args:
+            iteration: Iteration number reported in the event (defaults to iteration_count)
+            
+        Returns:
+            ActionEvent describing the decision and its result
+            
+        Raises:
+            MissionCancelledError: If the mission is cancelled during the step
+        """
+        began = time.perf_counter()
         page_state = self.browser.get_page_state()
+        observed = time.perf_counter()
+        self.check_cancelled()
+        self._extract_seconds = 0.0
         action_command = self.decide_action(page_state)
+        decided = time.perf_counter()
+        extract_in_decide = self._extract_seconds
         result = self.execute_action(action_command)
+        executed = time.perf_counter()
+        if self.metrics is not None:
+            self.metrics.observe_iteration(
+                snapshot=observed - began,
+                decide=decided - observed - extract_in_decide,
+                execute=executed - decided - (self._extract_seconds - extract_in_decide),
+                extract=self._extract_seconds
+            )
+        # A cancelled browser wait returns a failed result; report the stop instead
+        self.check_cancelled()
+        
+        return ActionEvent(
+            iteration=iteration if iteration is not None else self.iteration_count,
+            thought_process=action_command["thought_process"],
+            reasoning=action_command["reasoning"],
+            action=action_command["action"],
+            result=result,
+            is_goal_achieved=action_command["is_goal_achieved"],
+            url=self.browser.current_url,
+            extracted_data_count=self.memory.data_point_count,
+            sources_visited=len(self.sources_visited),
+            budget=self.budget.usage() if self.budget else None
+        )
+    
+    def run(
+        self,
+        start_url: Optional[str] = "https://www.google.com",
+        max_iterations: Optional[int] = None
+    ) -> Iterator[AgentEvent]:
+        """
+        Run the mission loop, yielding typed events as it progresses.
         
-        response = {
-            "thought_process": action_command["thought_process"],
-            "reasoning": action_command["reasoning"],
-            "action": action_command["action"],
-            "is_goal_achieved": action_command["is_goal_achieved"],
-            "result": result
-        }
+        The browser must already be started; the caller owns its lifecycle.
+        Events are plain objects, so consumers serialize them only if needed.
         
-        return json.dumps(response, indent=2, ensure_ascii=False)
+        Args:
+            start_url: URL to open before the first iteration (None keeps the current page)
+            max_iterations: Iteration limit (defaults to the agent's max_iterations)
+            
+        Yields:
+            StatusEvent, ExtractionEvent, ActionEvent, ErrorEvent and finally CompleteEvent
+            
+        Raises:
+            MissionCancelledError: If the mission is cancelled before it finishes
+        """
+        max_iterations = max_iterations or self.max_iterations
+        
+        if start_url:
+            self.browser.goto(start_url)
+        yield StatusEvent(
+            message="Mission resumed" if self.iteration_count else "Mission started",
+            url=self.browser.current_url
+        )
+        
+        # Resumed agents continue counting from their checkpoint
+        iteration = self.iteration_count
+        finish_reason = "max_iterations"
+        
+        while not self.goal_achieved and iteration < max_iterations:
+            self.check_cancelled()
+            iteration += 1
+            event = self.step(iteration)
+            
+            yield from self._pending_events
+            self._pending_events.clear()
+            yield event
+            
+            if event.is_goal_achieved or event.action["name"] == "finish":
+                if not self.goal_achieved:
+                    finish_reason = event.action["params"].get("reason", "")
+                break
+            
+            if not event.result.get("success", False):
+                yield ErrorEvent(message=f"Action failed: {event.result.get('error', 'Unknown error')}")
+        
+        if self.goal_achieved:
+            yield CompleteEvent(
+                summary=self.memory.get_summary(),
+                summary_data=self.memory.get_summary_data().model_dump(),
+                extracted_data=self.memory.get_extracted_data(),
+                total_iterations=iteration,
+                budget=self.budget.usage() if self.budget else None
+            )
+        else:
+            yield CompleteEvent(
+                type="incomplete",
+                is_goal_achieved=False,
+                message=describe_finish_reason(finish_reason),
+                reason=finish_reason,
+                summary=self.memory.get_summary(),
+                summary_data=self.memory.get_summary_data().model_dump(),
+                extracted_data=self.memory.get_extracted_data(),
+                total_iterations=iteration,
+                budget=self.budget.usage() if self.budget else None
+            )
@@ -0,0 +1,301 @@
+"""Service for batches of missions submitted together."""
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import asyncio
+import threading
+import time
+import uuid
+from core.exceptions import BatchNotFoundError, MissionNotFoundError, MissionQueueFullError
+from infrastructure.event_hub import TERMINAL_MESSAGES
+from services.agent import analyze_goal
+from services.mission_service import MissionService
+from services.result_cache import normalize_goal
+
+
+# Goal statuses after which a batch entry no longer changes
+DONE_STATUSES = {"complete", "incomplete", "finished", "stopped", "failed", "rejected", "missing"}
+
+
+def goal_query_key(goal: str) -> str:
+    """
+    Key shared by goals that compile to the same research.
+    
+    Search queries are derived from the goal's research type and topic, so
+    goals with equal keys would run the same searches and visit the same
+    candidate pages.
+    
+    Args:
+        goal: Mission goal
+        
+    Returns:
+        Research type and normalized topic
+    """
+    analysis = analyze_goal(goal)
+    return f"{analysis['type']}:{normalize_goal(analysis['topic'] or goal)}"
+
+
+def summarize_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce a mission's recent events to the state of a batch goal.
+    
+    Args:
+        events: Mission events, oldest first
+        
+    Returns:
+        Status plus progress counters and, once finished, the mission result
+    """
+    state: Dict[str, Any] = {"status": "pending"}
+    for event in events:
+        event_type = event.get("type")
+        if event_type == "queued":
+            state.update(status="queued", queue_position=event.get("position"))
+        elif event_type == "action":
+            state.update(
+                status="running",
+                iteration=event.get("iteration"),
+                sources_visited=event.get("sources_visited"),
+                data_points=event.get("extracted_data_count")
+            )
+            state.pop("queue_position", None)
+        elif event_type in ("complete", "incomplete"):
+            state.update(
+                status=event_type,
+                summary=event.get("summary", ""),
+                extracted_data=event.get("extracted_data", [])
+            )
+            if event.get("message"):
+                state["message"] = event["message"]
+        elif event_type == "error" and event.get("fatal"):
+            state.update(status="failed", error=event.get("message"))
+        elif event_type in TERMINAL_MESSAGES and state["status"] not in DONE_STATUSES:
+            state["status"] = event_type
+    return state
+
+
+class BatchService:
+    """
+    Service for submitting many mission goals at once.
+    
+    Goals with the same query key share one mission and its result. Goals
+    that differ but reach the same retailer pages still share fetches and
+    extractions through the page cache, and goals with a fresh cached or
+    in-flight equivalent reuse it as single submissions do.
+    """
+    
+    def __init__(
+        self,
+        mission_service: MissionService,
+        launcher: Callable[[str, str], Optional[int]],
+        max_batches: int = 100
+    ):
+        """
+        Initialize batch service.
+        
+        Args:
+            mission_service: Service owning the missions
+            launcher: Starts a created mission for a client and returns its queue position
+            max_batches: Batches kept for polling before the oldest are forgotten
+        """
+        self.mission_service = mission_service
+        self.launcher = launcher
+        self.max_batches = max_batches
+        self._batches: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def create_batch(
+        self,
+        goals: List[str],
+        headless: bool = True,
+        max_iterations: int = 100,
+        max_age: Optional[float] = None,
+        budget: Optional[Dict[str, Any]] = None,
+        client_id: str = "anonymous"
+    ) -> Dict[str, Any]:
+        """
+        Create and start the missions of a batch.
+        
+        Args:
+            goals: Mission goals
+            headless: Whether to run browsers in headless mode
+            max_iterations: Maximum number of iterations per mission
+            max_age: Maximum age in seconds of a reusable result (0 disables reuse)
+            budget: Optional budget limit overrides applied to every mission
+            client_id: Client identifier used for fair queueing
+            
+        Returns:
+            Batch ID, the mission serving each goal and the number of missions started
+        """
+        missions: Dict[str, Dict[str, Any]] = {}
+        entries = []
+        started = 0
+        for goal in goals:
+            key = goal_query_key(goal)
+            shared = key in missions
+            if not shared:
+                result = self.mission_service.create_mission(goal, headless, max_iterations, max_age, budget)
+                if not result.get("cached") and not result.get("coalesced"):
+                    try:
+                        result["queue_position"] = self.launcher(result["mission_id"], client_id)
+                        started += 1
+                    except MissionQueueFullError as e:
+                        self.mission_service.delete_mission(result["mission_id"])
+                        result["error"] = str(e)
+                missions[key] = result
+            result = missions[key]
+            entry = {
+                "goal": goal,
+                "mission_id": result["mission_id"],
+                "shared": shared,
+                "cached": bool(result.get("cached")),
+                "coalesced": bool(result.get("coalesced"))
+            }
+            if result.get("error"):
+                entry["error"] = result["error"]
+            entries.append(entry)
+        
+        batch_id = str(uuid.uuid4())
+        with self._lock:
+            self._batches[batch_id] = {"batch_id": batch_id, "created_at": time.time(), "goals": entries}
+            while len(self._batches) > self.max_batches:
+                self._batches.popitem(last=False)
+        
+        return {
+            "batch_id": batch_id,
+            "goals": entries,
+            "missions": len(missions),
+            "started": started
+        }
+    
+    def _get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Get a stored batch.
+        
+        Raises:
+            BatchNotFoundError: If batch not found
+        """
+        with self._lock:
+            batch = self._batches.get(batch_id)
+        if batch is None:
+            raise BatchNotFoundError(f"Batch {batch_id} not found")
+        return batch
+    
+    def goal_state(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the current state of one batch goal.
+        
+        Args:
+            entry: Goal entry of a batch
+            
+        Returns:
+            Goal, mission ID, status and, once finished, the mission result
+        """
+        state: Dict[str, Any] = {
+            "goal": entry["goal"],
+            "mission_id": entry["mission_id"],
+            "shared": entry["shared"]
+        }
+        if entry.get("error"):
+            return {**state, "status": "rejected", "error": entry["error"]}
+        
+        cached = self.mission_service.result_cache.get_by_mission(entry["mission_id"])
+        if cached is not None:
+            return {
+                **state,
+                "status": "complete",
+                "cached": entry["cached"],
+                "summary": cached["summary"],
+                "extracted_data": cached["extracted_data"]
+            }
+        
+        try:
+            events = self.mission_service.recent_events(entry["mission_id"])
+        except MissionNotFoundError:
+            return {**state, "status": "missing"}
+        return {**state, **summarize_events(events)}
+    
+    def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Get aggregate progress and results of a batch.
+        
+        Args:
+            batch_id: Batch identifier
+            
+        Returns:
+            Goal states, counts per status and whether every goal is done
+            
+        Raises:
+            BatchNotFoundError: If batch not found
+        """
+        batch = self._get_batch(batch_id)
+        goals = [self.goal_state(entry) for entry in batch["goals"]]
+        counts: Dict[str, int] = {}
+        for goal in goals:
+            counts[goal["status"]] = counts.get(goal["status"], 0) + 1
+        done = sum(1 for goal in goals if goal["status"] in DONE_STATUSES)
+        return {
+            "batch_id": batch_id,
+            "created_at": batch["created_at"],
+            "total": len(goals),
+            "done": done,
+            "is_complete": done == len(goals),
+            "counts": counts,
+            "goals": goals
+        }
+    
+    def iter_completions(self, batch_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over each goal's final state as soon as its mission finishes.
+        
+        Goals that are already done come first. The rest are followed
+        through their missions' event hubs without blocking the event loop,
+        and the iteration ends once every goal is done.
+        
+        Args:
+            batch_id: Batch identifier
+            
+        Returns:
+            Async iterator of final goal states with their index in the batch
+            
+        Raises:
+            BatchNotFoundError: If batch not found
+        """
+        return self._completions(self._get_batch(batch_id))
+    
+    async def _completions(self, batch: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield final goal states of a batch as its missions finish."""
+        waiting: Dict[str, List[int]] = {}
+        channels = {}
+        tasks: Dict[asyncio.Future, str] = {}
+        try:
+            for index, entry in enumerate(batch["goals"]):
+                if entry["mission_id"] not in waiting:
+                    state = self.goal_state(entry)
+                    if state["status"] in DONE_STATUSES:
+                        yield {"index": index, **state}
+                        continue
+                    try:
+                        # Replay covers events published before subscribing
+                        channels[entry["mission_id"]] = self.mission_service.subscribe(entry["mission_id"])
+                    except MissionNotFoundError:
+                        yield {"index": index, **state, "status": "missing"}
+                        continue
+                waiting.setdefault(entry["mission_id"], []).append(index)
+            
+            for mission_id, channel in channels.items():
+                tasks[asyncio.ensure_future(channel.get())] = mission_id
+            
+            while tasks:
+                done, _ = await asyncio.wait(set(tasks), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    mission_id = tasks.pop(task)
+                    message = task.result()
+                    if message.get("type") in TERMINAL_MESSAGES or (message.get("type") == "error" and message.get("fatal")):
+                        for index in waiting.pop(mission_id):
+                            yield {"index": index, **self.goal_state(batch["goals"][index])}
+                    else:
+                        tasks[asyncio.ensure_future(channels[mission_id].get())] = mission_id
+        finally:
+            for task in tasks:
+                task.cancel()
+            for mission_id, channel in channels.items():
+                self.mission_service.unsubscribe(mission_id, channel)
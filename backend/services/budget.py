@@ -0,0 +1,174 @@
+"""Per-mission resource budget tracking."""
+from typing import Any, Callable, Dict, Optional
+import time
+from config.settings import Settings
+from core.domain.models import BudgetLimits
+
+
+def default_limits(settings: Settings, **overrides: Any) -> BudgetLimits:
+    """
+    Build budget limits from settings, with optional per-mission overrides.
+    
+    Args:
+        settings: Application settings
+        **overrides: Limit values that replace the defaults (None keeps the default)
+        
+    Returns:
+        BudgetLimits instance
+    """
+    limits = {
+        "max_iterations": settings.agent_max_iterations,
+        "max_seconds": settings.budget_max_seconds,
+        "max_pages": settings.budget_max_pages,
+        "max_bytes": settings.budget_max_bytes,
+        "max_cpu_seconds": settings.budget_max_cpu_seconds
+    }
+    limits.update({key: value for key, value in overrides.items() if value is not None})
+    return BudgetLimits(**limits)
+
+
+class BudgetTracker:
+    """Track mission resource consumption against its limits."""
+    
+    def __init__(
+        self,
+        limits: BudgetLimits,
+        clock: Callable[[], float] = time.monotonic,
+        cpu_clock: Callable[[], float] = time.thread_time
+    ):
+        """
+        Initialize budget tracker.
+        
+        Args:
+            limits: Budget limits
+            clock: Wall-clock source
+            cpu_clock: CPU-time source (per thread, so start() must run on the mission thread)
+        """
+        self.limits = limits
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        self.iterations = 0
+        self.pages = 0
+        self.bytes_received = 0
+        self._started_at: Optional[float] = None
+        self._cpu_started_at: Optional[float] = None
+        self._elapsed_offset = 0.0
+        self._cpu_offset = 0.0
+    
+    def start(self) -> None:
+        """Start the wall-clock and CPU timers."""
+        self._started_at = self._clock()
+        self._cpu_started_at = self._cpu_clock()
+    
+    @property
+    def elapsed_seconds(self) -> float:
+        """Wall-clock seconds since start()."""
+        if self._started_at is None:
+            return self._elapsed_offset
+        return self._elapsed_offset + self._clock() - self._started_at
+    
+    @property
+    def cpu_seconds(self) -> float:
+        """CPU seconds consumed by the mission thread since start()."""
+        if self._cpu_started_at is None:
+            return self._cpu_offset
+        return self._cpu_offset + self._cpu_clock() - self._cpu_started_at
+    
+    def charge_iteration(self) -> None:
+        """Record one agent iteration."""
+        self.iterations += 1
+    
+    def charge_page(self, count: int = 1) -> None:
+        """
+        Record page navigations.
+        
+        Args:
+            count: Number of pages loaded
+        """
+        self.pages += count
+    
+    def record_bytes(self, total: int) -> None:
+        """
+        Record the running total of network bytes received.
+        
+        Args:
+            total: Total bytes received by the browser so far
+        """
+        self.bytes_received = max(self.bytes_received, total)
+    
+    def remaining_seconds(self) -> Optional[float]:
+        """
+        Wall-clock seconds left in the budget.
+        
+        Returns:
+            Remaining seconds, or None if time is unlimited
+        """
+        if self.limits.max_seconds is None:
+            return None
+        return max(self.limits.max_seconds - self.elapsed_seconds, 0.0)
+    
+    def exhausted(self) -> Optional[str]:
+        """
+        Check whether any limit has been reached.
+        
+        Returns:
+            Name of the exhausted resource, or None
+        """
+        limits = self.limits
+        if limits.max_iterations is not None and self.iterations >= limits.max_iterations:
+            return "iterations"
+        if limits.max_seconds is not None and self.elapsed_seconds >= limits.max_seconds:
+            return "time"
+        if limits.max_pages is not None and self.pages >= limits.max_pages:
+            return "pages"
+        if limits.max_bytes is not None and self.bytes_received >= limits.max_bytes:
+            return "bytes"
+        if limits.max_cpu_seconds is not None and self.cpu_seconds >= limits.max_cpu_seconds:
+            return "cpu"
+        return None
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Export consumption for a checkpoint.
+        
+        Returns:
+            Dictionary of consumed resources
+        """
+        return {
+            "iterations": self.iterations,
+            "pages": self.pages,
+            "bytes_received": self.bytes_received,
+            "elapsed_seconds": self.elapsed_seconds,
+            "cpu_seconds": self.cpu_seconds
+        }
+    
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """
+        Carry over consumption from a checkpoint, so a resumed mission keeps its budget.
+        
+        Args:
+            state: State exported by get_state()
+        """
+        self.iterations = state.get("iterations", 0)
+        self.pages = state.get("pages", 0)
+        self.bytes_received = state.get("bytes_received", 0)
+        self._elapsed_offset = state.get("elapsed_seconds", 0.0)
+        self._cpu_offset = state.get("cpu_seconds", 0.0)
+        if self._started_at is not None:
+            self.start()
+    
+    def usage(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report consumption against limits.
+        
+        Returns:
+            Dictionary mapping each resource to its used amount and limit
+        """
+        limits = self.limits
+        return {
+            "iterations": {"used": self.iterations, "limit": limits.max_iterations},
+            "seconds": {"used": round(self.elapsed_seconds, 3), "limit": limits.max_seconds},
+            "pages": {"used": self.pages, "limit": limits.max_pages},
+            "bytes": {"used": self.bytes_received, "limit": limits.max_bytes},
+            "cpu_seconds": {"used": round(self.cpu_seconds, 3), "limit": limits.max_cpu_seconds}
+        }
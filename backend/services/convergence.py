@@ -0,0 +1,191 @@
+"""Sequential stopping rule for average-price missions."""
+import math
+import random
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+from core.stats import RunningStats
+
+
+def t_quantile(confidence: float, dof: int) -> float:
+    """
+    Two-sided Student t quantile.
+    
+    Exact for 1 and 2 degrees of freedom; otherwise uses Hill's algorithm
+    (CACM 396), which matches tabulated quantiles to four decimals at
+    every dof, including the small samples where the stopping rule first
+    fires.
+    
+    Args:
+        confidence: Confidence level (e.g. 0.95)
+        dof: Degrees of freedom
+        
+    Returns:
+        Critical value for the given confidence level
+    """
+    if dof <= 0:
+        return math.inf
+    p = 1 - confidence
+    if dof == 1:
+        return math.cos(p * math.pi / 2) / math.sin(p * math.pi / 2)
+    if dof == 2:
+        return math.sqrt(2 / (p * (2 - p)) - 2)
+    
+    n = dof
+    a = 1 / (n - 0.5)
+    b = 48 / (a * a)
+    c = ((20700 * a / b - 98) * a - 16) * a + 96.36
+    d = ((94.5 / (b + c) - 3) / b + 1) * math.sqrt(a * math.pi / 2) * n
+    x = d * p
+    y = x ** (2 / n)
+    if y > 0.05 + a:
+        # Asymptotic inverse expansion around the normal quantile
+        x = NormalDist().inv_cdf(p / 2)
+        y = x * x
+        if n < 5:
+            c += 0.3 * (n - 4.5) * (x + 0.6)
+        c = (((0.05 * d * x - 5) * x - 7) * x - 2) * x + b + c
+        y = (((((0.4 * y + 6.3) * y + 36) * y + 94.5) / c - y - 3) / b + 1) * x
+        y = math.expm1(a * y * y)
+    else:
+        y = ((1 / (((n + 6) / (n * y) - 0.089 * d - 0.822) * (n + 2) * 3) + 0.5 / (n + 4)) * y - 1) * (n + 1) / (n + 2) + 1 / y
+    return math.sqrt(n * y)
+
+
+class PriceConvergence:
+    """Running price estimate with a confidence-interval stopping rule."""
+    
+    def __init__(
+        self,
+        confidence: float = 0.95,
+        relative_precision: float = 0.05,
+        min_prices: int = 3
+    ):
+        """
+        Initialize convergence tracker.
+        
+        Args:
+            confidence: Confidence level of the interval
+            relative_precision: Target half-width of the interval relative to the mean
+            min_prices: Minimum number of prices before convergence can be declared
+        """
+        self.confidence = confidence
+        self.relative_precision = relative_precision
+        self.min_prices = min_prices
+        self.stats = RunningStats()
+        self.values: List[float] = []
+    
+    def add_prices(self, prices: Any) -> int:
+        """
+        Add prices as produced by the extractor.
+        
+        Args:
+            prices: List of price dicts or numbers, or a single number
+            
+        Returns:
+            Number of prices added
+        """
+        if not isinstance(prices, list):
+            prices = [prices]
+        
+        added = 0
+        for price in prices:
+            value = price.get("value") if isinstance(price, dict) else price
+            if isinstance(value, (int, float)) and value > 0:
+                self.stats.add(float(value))
+                self.values.append(float(value))
+                added += 1
+        return added
+    
+    @property
+    def count(self) -> int:
+        """Number of prices observed."""
+        return self.stats.count
+    
+    @property
+    def estimate(self) -> Optional[float]:
+        """Current mean price estimate."""
+        return self.stats.mean if self.stats.count else None
+    
+    def confidence_interval(self) -> Optional[Tuple[float, float]]:
+        """
+        Confidence interval for the mean using the t approximation.
+        
+        Returns:
+            (lower, upper) bounds, or None with fewer than two prices
+        """
+        if self.stats.count < 2:
+            return None
+        half_width = t_quantile(self.confidence, self.stats.count - 1) * self.stats.std_error
+        return (self.stats.mean - half_width, self.stats.mean + half_width)
+    
+    def bootstrap_interval(
+        self,
+        resamples: int = 1000,
+        seed: Optional[int] = None
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Percentile bootstrap interval for the mean.
+        
+        More robust than the t interval for skewed price lists, but costs
+        O(resamples * n), so it is only computed on demand.
+        
+        Args:
+            resamples: Number of bootstrap resamples
+            seed: Optional random seed for reproducibility
+            
+        Returns:
+            (lower, upper) bounds, or None with fewer than two prices
+        """
+        n = len(self.values)
+        if n < 2:
+            return None
+        
+        rng = random.Random(seed)
+        values = self.values
+        means = sorted(
+            sum(rng.choices(values, k=n)) / n
+            for _ in range(resamples)
+        )
+        alpha = (1 - self.confidence) / 2
+        lower = means[int(alpha * (resamples - 1))]
+        upper = means[int((1 - alpha) * (resamples - 1))]
+        return (lower, upper)
+    
+    @property
+    def relative_half_width(self) -> float:
+        """Half-width of the confidence interval relative to the mean."""
+        interval = self.confidence_interval()
+        if interval is None or self.stats.mean <= 0:
+            return math.inf
+        return (interval[1] - interval[0]) / 2 / self.stats.mean
+    
+    def is_converged(self) -> bool:
+        """
+        Check whether the precision target has been met.
+        
+        Returns:
+            True if enough prices were seen and the interval is narrow enough
+        """
+        if self.stats.count < max(self.min_prices, 2):
+            return False
+        return self.relative_half_width <= self.relative_precision
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the current estimate.
+        
+        Returns:
+            Dictionary with estimate, interval and sample size
+        """
+        interval = self.confidence_interval()
+        return {
+            "average_price": self.estimate,
+            "price_count": self.count,
+            "confidence": self.confidence,
+            "confidence_interval": list(interval) if interval else None,
+            "relative_half_width": (
+                self.relative_half_width if interval else None
+            ),
+            "converged": self.is_converged()
+        }
+
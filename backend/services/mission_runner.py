@@ -0,0 +1,304 @@
+"""
+Mission runs shared by the API, its worker processes and the CLI.
+
+Worker processes import run_mission() and init_mission_worker() from here
+by reference, so this module must stay free of import-time side effects:
+no stores, schedulers or services are created when it is imported.
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
+from config.settings import get_settings
+from core.cancellation import CancellationToken
+from core.domain.events import ActionEvent, AgentEvent, CompleteEvent, ErrorEvent, ExtractionEvent
+from core.exceptions import MissionCancelledError
+from infrastructure.browser_engine import BrowserEngine
+from infrastructure.checkpoint_store import CheckpointStore
+from infrastructure.memory import Memory
+from infrastructure.metrics import get_metrics
+from infrastructure.page_cache import PageCache, get_page_cache
+from infrastructure.persistent_memory import create_memory
+from infrastructure.price_store import PriceStore, get_price_store
+from infrastructure.rate_limiter import HostRateLimiter, get_rate_limiter
+from infrastructure.result_store import ResultStore, get_result_store
+from services.agent import MarketRadarAgent
+from services.budget import BudgetTracker, default_limits
+from services.result_cache import normalize_goal
+
+
+# MissionService run_mission() reports to: the API's own, or a RemoteMissionService in a worker
+mission_service: Any = None
+
+# RemoteMissionService of a worker process (None in the API process)
+remote_service: Any = None
+
+
+def consume_mission_events(
+    agent: MarketRadarAgent,
+    mission_id: str,
+    mission_meta: Dict[str, Any],
+    on_event: Callable[[AgentEvent], None],
+    checkpoint_store: CheckpointStore,
+    checkpoint_every: int = 0,
+    price_store: Optional[PriceStore] = None,
+    result_store: Optional[ResultStore] = None,
+    start_url: Optional[str] = "https://www.google.com"
+) -> None:
+    """
+    Run a mission's agent and persist what its events produce.
+    
+    Progress is checkpointed every checkpoint_every iterations, freshly
+    extracted prices go to the price store, and on completion the results
+    are stored and the checkpoint dropped. Every event is then handed to
+    on_event, which only reports it (publishing, printing).
+    
+    Args:
+        agent: Agent whose browser is started and whose checkpoint, if any, is restored
+        mission_id: Mission identifier
+        mission_meta: Goal, headless, max_iterations and budget_limits saved with checkpoints
+        on_event: Called with each event once it has been persisted
+        checkpoint_store: Store of mission checkpoints
+        checkpoint_every: Iterations between checkpoints (0 disables them)
+        price_store: Optional store of price observations
+        result_store: Optional store of complete mission results
+        start_url: URL to open first (None keeps the current page)
+        
+    Raises:
+        MissionCancelledError: If the mission is cancelled before it finishes
+    """
+    product = normalize_goal(agent.analyze_goal()["topic"] or mission_meta["goal"])
+    
+    for event in agent.run(start_url=start_url, max_iterations=mission_meta["max_iterations"]):
+        if isinstance(event, ActionEvent):
+            if checkpoint_every and event.iteration % checkpoint_every == 0:
+                checkpoint_store.save(mission_id, {"mission": mission_meta, "agent": agent.get_state()})
+        elif isinstance(event, ExtractionEvent):
+            # Cached pages were already recorded by the mission that fetched them
+            if price_store and not event.cached:
+                price_store.add_extraction(mission_id, product, event.url, event.data)
+        elif isinstance(event, CompleteEvent):
+            if result_store is not None:
+                result_store.put(mission_id, event.extracted_data)
+            checkpoint_store.delete(mission_id)
+        on_event(event)
+
+
+def release_mission_resources(
+    browser: Optional[BrowserEngine] = None,
+    memory: Optional[Memory] = None,
+    page_cache: Optional[PageCache] = None,
+    price_store: Optional[PriceStore] = None
+) -> None:
+    """
+    Close a mission's browser and memory and persist the shared caches.
+    
+    Args:
+        browser: Browser engine of the mission, if started
+        memory: Mission memory
+        page_cache: Page cache to save
+        price_store: Price store to flush
+    """
+    if browser is not None:
+        browser.stop()
+    if memory is not None:
+        memory.close()
+    if page_cache:
+        page_cache.save()
+    if price_store:
+        price_store.flush()
+
+
+def bind_mission_service(service: Any) -> None:
+    """
+    Set the service run_mission() reports to.
+    
+    Args:
+        service: MissionService, or a RemoteMissionService in a worker process
+    """
+    global mission_service
+    mission_service = service
+
+
+def init_mission_worker(remote: Any) -> None:
+    """
+    Make run_mission report through the API process when it runs in a worker process.
+    
+    Args:
+        remote: RemoteMissionService forwarding calls to the API process
+    """
+    global remote_service
+    remote_service = remote
+    bind_mission_service(remote)
+    # Samples recorded here are served by the API process's /metrics
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.registry.forward_to(remote.metrics.record)
+
+
+def shared_resources() -> Tuple[Optional[PageCache], Optional[PriceStore], Optional[HostRateLimiter]]:
+    """
+    Get the page cache, price store and rate limiter shared by missions.
+    
+    All three belong to the API process: the stores have a single writer,
+    and a host's rate limit only holds if every mission draws from the
+    same bucket. A worker process gets the stand-ins of its
+    RemoteMissionService, which forward to the API process's instances.
+    
+    Returns:
+        Page cache, price store and rate limiter, each None when disabled
+    """
+    if remote_service is None:
+        return get_page_cache(), get_price_store(), get_rate_limiter()
+    settings = get_settings()
+    return (
+        remote_service.page_cache if settings.page_cache_enabled else None,
+        remote_service.price_store if settings.price_store_enabled else None,
+        remote_service.rate_limiter if settings.rate_limit_enabled else None
+    )
+
+
+def prewarm_browser() -> BrowserEngine:
+    """Start a browser with default settings for the next scheduled mission."""
+    browser = BrowserEngine()
+    browser.start()
+    return browser
+
+
+def results_url(mission_id: str) -> str:
+    """Build the URL of a mission's paginated results."""
+    return f"/api/v1/mission/{mission_id}/results"
+
+
+def run_mission(
+    mission_id: str,
+    goal: str,
+    headless: bool,
+    max_iterations: int,
+    budget_limits: Optional[Dict[str, Any]] = None,
+    resume: bool = False,
+    browser: Optional[BrowserEngine] = None,
+    cancel_token: Optional[CancellationToken] = None
+):
+    """
+    Run mission in a separate thread.
+    
+    Consumes the agent's event stream, keeps the repository up to date and
+    publishes each event to every subscriber of the mission. When a budget
+    runs out the mission ends gracefully with its partial results. Progress
+    is checkpointed every checkpoint_every iterations so the mission can be
+    resumed after a crash or restart. A cancelled mission stops at the next
+    check, and however the mission ends its browser is closed before the
+    run is acknowledged through finish_mission().
+    
+    Args:
+        mission_id: Mission identifier
+        goal: Mission goal
+        headless: Whether to run browser in headless mode
+        max_iterations: Maximum number of iterations
+        budget_limits: Optional budget limit overrides
+        resume: Whether to continue from the mission's checkpoint
+        browser: Pre-warmed browser handed over by the scheduler (the mission stops it)
+        cancel_token: Token cancelled by stop_mission()
+    """
+    def emit(message: Dict[str, Any]) -> None:
+        mission_service.publish(mission_id, message)
+    
+    settings = get_settings()
+    checkpoint_store = CheckpointStore(settings.checkpoint_dir)
+    mission_meta = {
+        "goal": goal,
+        "headless": headless,
+        "max_iterations": max_iterations,
+        "budget_limits": budget_limits or {}
+    }
+    cancel_token = cancel_token or CancellationToken()
+    memory = None
+    page_cache = None
+    price_store = None
+    
+    try:
+        cancel_token.raise_if_cancelled()
+        checkpoint = checkpoint_store.load(mission_id) if resume else None
+        budget = BudgetTracker(default_limits(
+            settings,
+            **{**(budget_limits or {}), "max_iterations": max_iterations}
+        ))
+        budget.start()
+        # A warm browser only fits missions that need a fresh default context
+        if browser is not None and (checkpoint or browser.headless != headless):
+            browser.stop()
+            browser = None
+        warm = browser is not None
+        if not warm:
+            browser = BrowserEngine(headless=headless)
+        browser.cancel_token = cancel_token
+        memory = create_memory(settings, mission_id)
+        page_cache, price_store, rate_limiter = shared_resources()
+        agent = MarketRadarAgent(
+            browser,
+            memory,
+            goal,
+            page_cache=page_cache,
+            budget=budget,
+            cancel_token=cancel_token,
+            rate_limiter=rate_limiter,
+            metrics=get_metrics()
+        )
+        
+        start_url = "https://www.google.com"
+        if checkpoint:
+            agent.restore_state(checkpoint["agent"])
+            start_url = checkpoint["agent"].get("current_url") or start_url
+            browser.start(storage_state=checkpoint["agent"].get("browser_state"))
+        elif not warm:
+            browser.start()
+        
+        def report(event: AgentEvent) -> None:
+            if isinstance(event, ActionEvent):
+                mission_service.repository.update_if_exists(
+                    mission_id,
+                    sources_visited=event.sources_visited,
+                    data_points=event.extracted_data_count,
+                    budget=event.budget
+                )
+            elif isinstance(event, CompleteEvent):
+                mission_service.repository.update_if_exists(mission_id, is_complete=True)
+                mission_service.record_result(
+                    mission_id,
+                    event.summary,
+                    event.extracted_data,
+                    is_complete=event.is_goal_achieved
+                )
+                # Large results are read from the results endpoint, not one huge frame
+                emit({
+                    **event.to_message(max_results=settings.ws_inline_results),
+                    "results_url": results_url(mission_id)
+                })
+                return
+            emit(event.to_message())
+        
+        consume_mission_events(
+            agent,
+            mission_id,
+            mission_meta,
+            report,
+            checkpoint_store,
+            checkpoint_every=settings.checkpoint_every,
+            price_store=price_store,
+            result_store=get_result_store(),
+            start_url=start_url
+        )
+        
+        mission_service.repository.update_if_exists(mission_id, is_running=False, resume=False)
+        emit({"type": "finished"})
+    
+    except MissionCancelledError:
+        # stop_mission() already updated the record and notifies subscribers
+        mission_service.result_cache.release(goal, mission_id)
+    
+    except Exception as e:
+        mission_service.repository.update_if_exists(mission_id, is_running=False, error=str(e))
+        mission_service.result_cache.release(goal, mission_id)
+        emit(ErrorEvent(message=f"Mission failed: {str(e)}", fatal=True).to_message())
+    
+    finally:
+        release_mission_resources(browser, memory, page_cache, price_store)
+        mission_service.finish_mission(mission_id)
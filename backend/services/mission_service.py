@@ -1,52 +1,350 @@
 """Service for mission management."""
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from core.exceptions import MissionAlreadyRunningError, MissionNotFoundError
 from repositories.mission_repository import MissionRepository
 from core.domain.models import MissionStatus
-import queue
+from services.result_cache import MissionResultCache
+from services.scheduler import MissionScheduler
+from infrastructure.message_channel import MessageChannel
+from infrastructure.event_hub import MissionHub
+from infrastructure.event_bus import ACK, CANCEL, DELETE, EVENT, SQLiteEventBus
+from core.cancellation import CancellationToken
 import threading
+import time
 
 
 class MissionService:
     """Service for managing missions."""
     
-    def __init__(self, mission_repository: MissionRepository):
+    def __init__(
+        self,
+        mission_repository: MissionRepository,
+        result_cache: Optional[MissionResultCache] = None,
+        scheduler: Optional[MissionScheduler] = None,
+        stop_timeout: float = 5.0,
+        replay_size: int = 256,
+        outbox_size: int = 64,
+        event_bus: Optional[SQLiteEventBus] = None
+    ):
         """
         Initialize mission service.
         
         Args:
             mission_repository: Repository for mission data
+            result_cache: Cache of finished results keyed by normalized goal
+            scheduler: Worker pool that runs missions (None runs each mission on its own thread)
+            stop_timeout: Seconds stop_mission waits for the mission to acknowledge
+            replay_size: Recent events replayed to subscribers that join late
+            outbox_size: Unread messages per subscriber before its outbox coalesces
+            event_bus: Log shared with other API processes (None keeps events in this process)
         """
         self.repository = mission_repository
+        self.result_cache = result_cache or MissionResultCache()
+        self.scheduler = scheduler
+        self.stop_timeout = stop_timeout
+        self.replay_size = replay_size
+        self.outbox_size = outbox_size
+        if scheduler is not None:
+            scheduler.on_queue_change = self._on_queue_change
         self._active_threads: Dict[str, threading.Thread] = {}
-        self._message_queues: Dict[str, queue.Queue] = {}
+        self._hubs: Dict[str, MissionHub] = {}
+        self._primary_channels: Dict[str, MessageChannel] = {}
+        self._hubs_lock = threading.Lock()
+        self._cancel_tokens: Dict[str, CancellationToken] = {}
+        self._pending_deletes = set()
+        self._lifecycle_lock = threading.Lock()
+        self.event_bus = event_bus
+        self._bus_seq: Dict[str, int] = {}
+        self._remote_stops: Dict[str, threading.Event] = {}
+        if event_bus is not None:
+            event_bus.start(self._on_bus_entry)
     
     def create_mission(
         self,
         goal: str,
         headless: bool = True,
-        max_iterations: int = 100
-    ) -> Dict[str, str]:
+        max_iterations: int = 100,
+        max_age: Optional[float] = None,
+        budget: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Create a new mission.
+        Create a new mission, or reuse an equivalent one.
+        
+        A fresh cached result for the same normalized goal is returned
+        immediately. Otherwise, if an equivalent mission is already in flight,
+        its identifier is returned so the caller subscribes to it instead of
+        starting another browser. With max_age=0 a new mission is always
+        created, and it is not offered to later equivalent requests.
         
         Args:
             goal: Mission goal
             headless: Whether to run browser in headless mode
             max_iterations: Maximum number of iterations
+            max_age: Maximum age in seconds of a reusable result (0 disables reuse and coalescing)
+            budget: Optional budget limit overrides (see BudgetLimits)
+            
+        Returns:
+            Dictionary with mission_id and websocket_url, plus the cached
+            summary and extracted_data when served from cache
+        """
+        if max_age != 0:
+            cached = self.result_cache.get(goal, max_age)
+            if cached is not None:
+                return {
+                    "mission_id": cached["mission_id"],
+                    "websocket_url": self._websocket_url(cached["mission_id"]),
+                    "cached": True,
+                    "age": cached["age"],
+                    "summary": cached["summary"],
+                    "extracted_data": cached["extracted_data"]
+                }
+        
+        mission_id = self.repository.create(goal, headless, max_iterations, budget)
+        if max_age == 0:
+            # A forced run neither joins nor becomes the in-flight mission
+            self._open_channel(mission_id)
+            return {
+                "mission_id": mission_id,
+                "websocket_url": self._websocket_url(mission_id)
+            }
+        
+        inflight_id = self.result_cache.claim(goal, mission_id)
+        if inflight_id != mission_id and self.repository.exists(inflight_id):
+            self.repository.delete(mission_id)
+            return {
+                "mission_id": inflight_id,
+                "websocket_url": self._websocket_url(inflight_id),
+                "coalesced": True
+            }
+        if inflight_id != mission_id:
+            # Stale claim left by a deleted mission
+            self.result_cache.release(goal, inflight_id)
+            self.result_cache.claim(goal, mission_id)
+        
+        self._open_channel(mission_id)
+        
+        return {
+            "mission_id": mission_id,
+            "websocket_url": self._websocket_url(mission_id)
+        }
+    
+    def resume_mission(self, mission_id: str, checkpoint: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Prepare a mission to continue from a checkpoint.
+        
+        The mission is recreated under its original identifier if the
+        process restarted; connecting to the WebSocket starts it again.
+        
+        Args:
+            mission_id: Mission identifier
+            checkpoint: Checkpoint saved by the mission
             
         Returns:
-            Dictionary with mission_id and websocket_url
+            Dictionary with mission_id, websocket_url and the iteration it resumes from
+            
+        Raises:
+            MissionAlreadyRunningError: If mission is still running or has not acknowledged a stop
         """
-        mission_id = self.repository.create(goal, headless, max_iterations)
-        message_queue = queue.Queue()
-        self._message_queues[mission_id] = message_queue
+        with self._lifecycle_lock:
+            stopping = mission_id in self._cancel_tokens
+        if stopping:
+            # Its run still holds the checkpoint, memory and browser profile
+            raise MissionAlreadyRunningError(f"Mission {mission_id} has not finished stopping")
+        if self.repository.exists(mission_id):
+            if self.repository.get(mission_id)["is_running"]:
+                raise MissionAlreadyRunningError(f"Mission {mission_id} is already running")
+        else:
+            mission = checkpoint["mission"]
+            self.repository.create(
+                mission["goal"],
+                mission["headless"],
+                mission["max_iterations"],
+                mission.get("budget_limits"),
+                mission_id=mission_id
+            )
+        
+        self.repository.update(mission_id, resume=True, is_complete=False, error=None)
+        self.result_cache.claim(self.repository.get(mission_id)["goal"], mission_id)
+        self._open_channel(mission_id)
         
         return {
             "mission_id": mission_id,
-            "websocket_url": f"ws://localhost:8000/ws/{mission_id}"
+            "websocket_url": self._websocket_url(mission_id),
+            "resumed": True,
+            "iteration": checkpoint["agent"].get("iteration_count", 0)
         }
     
+    def _open_channel(self, mission_id: str) -> None:
+        """Create a fresh event hub for a mission that is about to run."""
+        with self._hubs_lock:
+            self._hubs[mission_id] = MissionHub(self.replay_size, self.outbox_size)
+            self._primary_channels.pop(mission_id, None)
+    
+    def _get_hub(self, mission_id: str) -> MissionHub:
+        """
+        Get the event hub of a mission.
+        
+        Raises:
+            MissionNotFoundError: If the mission has no hub
+        """
+        with self._hubs_lock:
+            hub = self._hubs.get(mission_id)
+        if hub is None and self.event_bus is not None and self.repository.exists(mission_id):
+            hub = self._join_hub(mission_id)
+        if hub is None:
+            raise MissionNotFoundError(f"Mission {mission_id} not found")
+        return hub
+    
+    def _join_hub(self, mission_id: str) -> MissionHub:
+        """
+        Create the hub of a mission started by another process, seeded from the event log.
+        
+        Entries up to the seeded sequence number are skipped when the tail
+        thread delivers them, so no event is replayed twice.
+        """
+        events, seq = self.event_bus.recent(mission_id, self.replay_size)
+        with self._hubs_lock:
+            hub = self._hubs.get(mission_id)
+            if hub is None:
+                hub = self._hubs[mission_id] = MissionHub(self.replay_size, self.outbox_size)
+                for event in events:
+                    hub.publish(event)
+                self._bus_seq[mission_id] = seq
+        return hub
+    
+    def _on_bus_entry(self, seq: int, kind: str, mission_id: str, message: Optional[Dict[str, Any]]) -> None:
+        """
+        Apply an entry appended to the event log by another process (tail thread).
+        
+        Args:
+            seq: Entry sequence number
+            kind: Entry kind
+            mission_id: Mission identifier
+            message: Event message, for EVENT entries
+        """
+        if kind == EVENT:
+            with self._hubs_lock:
+                hub = self._hubs.get(mission_id)
+                if hub is not None and seq > self._bus_seq.get(mission_id, 0):
+                    hub.publish(message)
+        elif kind == CANCEL:
+            # Waiting for the mission to acknowledge must not hold up the tail
+            threading.Thread(target=self._stop_for_peer, args=(mission_id,), daemon=True).start()
+        elif kind == ACK:
+            with self._lifecycle_lock:
+                waiter = self._remote_stops.get(mission_id)
+            if waiter is not None:
+                waiter.set()
+        elif kind == DELETE:
+            with self._hubs_lock:
+                self._hubs.pop(mission_id, None)
+                self._primary_channels.pop(mission_id, None)
+                self._bus_seq.pop(mission_id, None)
+    
+    def _stop_for_peer(self, mission_id: str) -> None:
+        """Stop a mission on behalf of another process and acknowledge it there."""
+        if self._stop_local(mission_id, self.stop_timeout):
+            self.event_bus.append(mission_id, ACK)
+    
+    def _websocket_url(self, mission_id: str) -> str:
+        """Build the WebSocket URL for a mission."""
+        return f"ws://localhost:8000/ws/{mission_id}"
+    
+    def record_result(
+        self,
+        mission_id: str,
+        summary: str,
+        extracted_data: List[Dict[str, Any]],
+        is_complete: bool = True
+    ) -> None:
+        """
+        Release a finished mission and cache its result.
+        
+        Args:
+            mission_id: Mission identifier
+            summary: Mission summary text
+            extracted_data: Extracted data records
+            is_complete: Whether the goal was achieved (only complete results are cached)
+        """
+        goal = self.repository.get(mission_id)["goal"]
+        if is_complete:
+            self.result_cache.put(goal, mission_id, summary, extracted_data)
+        self.result_cache.release(goal, mission_id)
+    
+    def subscribe(self, mission_id: str, replay: bool = True) -> MessageChannel:
+        """
+        Subscribe to messages of a mission, whoever started it.
+        
+        Args:
+            mission_id: Mission identifier
+            replay: Whether to first receive the recent events kept by the hub
+            
+        Returns:
+            Channel receiving the replayed events, then every new one
+            
+        Raises:
+            MissionNotFoundError: If mission not found
+        """
+        return self._get_hub(mission_id).subscribe(replay=replay)
+    
+    def recent_events(self, mission_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the recent events of a mission without subscribing to it.
+        
+        Args:
+            mission_id: Mission identifier
+            
+        Returns:
+            Events kept for replay, oldest first
+            
+        Raises:
+            MissionNotFoundError: If mission not found
+        """
+        return self._get_hub(mission_id).recent()
+    
+    def unsubscribe(self, mission_id: str, subscriber: MessageChannel) -> None:
+        """
+        Stop delivering mission messages to a subscriber.
+        
+        Args:
+            mission_id: Mission identifier
+            subscriber: Channel returned by subscribe()
+        """
+        with self._hubs_lock:
+            hub = self._hubs.get(mission_id)
+        if hub is not None:
+            hub.unsubscribe(subscriber)
+    
+    def outbox_depths(self) -> List[int]:
+        """
+        Get the unread message count of every subscriber of every mission.
+        
+        Returns:
+            Pending message count per subscriber
+        """
+        with self._hubs_lock:
+            hubs = list(self._hubs.values())
+        return [depth for hub in hubs for depth in hub.outbox_depths()]
+    
+    def publish(self, mission_id: str, message: Dict[str, Any]) -> None:
+        """
+        Deliver a mission message to every subscriber.
+        
+        Safe to call from mission threads; the message is serialized once
+        and subscribers waiting on the event loop are woken without
+        blocking it.
+        
+        Args:
+            mission_id: Mission identifier
+            message: Message to deliver
+        """
+        with self._hubs_lock:
+            hub = self._hubs.get(mission_id)
+        if hub is not None:
+            message = hub.publish(message)
+        if self.event_bus is not None:
+            self.event_bus.append(mission_id, EVENT, message)
+    
     def get_mission_status(self, mission_id: str) -> MissionStatus:
         """
         Get mission status.
@@ -66,78 +364,217 @@ class MissionService:
         self,
         mission_id: str,
         run_function,
-        *args
-    ) -> None:
+        *args,
+        client_id: str = "anonymous"
+    ) -> Optional[int]:
         """
-        Start mission in a separate thread.
+        Start mission on the scheduler, or in a separate thread without one.
+        
+        The run function receives a cancel_token keyword argument; it must
+        call finish_mission() once it has released its resources.
         
         Args:
             mission_id: Mission identifier
             run_function: Function to run in thread
             *args: Arguments for run_function
+            client_id: Client identifier used for fair queueing
+            
+        Returns:
+            Queue position when the mission waits for a worker, otherwise None
             
         Raises:
             MissionNotFoundError: If mission not found
             MissionAlreadyRunningError: If mission already running
+            MissionQueueFullError: If the scheduler queue is full
         """
-        mission = self.repository.get(mission_id)
-        
-        if mission["is_running"]:
+        # Atomic so that two connections cannot both start the same mission
+        if not self.repository.compare_and_set(mission_id, "is_running", False, True, started_at=time.time()):
             raise MissionAlreadyRunningError(f"Mission {mission_id} is already running")
         
-        self.repository.update(mission_id, is_running=True)
+        cancel_token = CancellationToken()
+        with self._lifecycle_lock:
+            self._cancel_tokens[mission_id] = cancel_token
+        
+        if self.scheduler is not None:
+            try:
+                return self.scheduler.submit(
+                    mission_id,
+                    run_function,
+                    *args,
+                    client_id=client_id,
+                    cancel_token=cancel_token
+                )
+            except Exception:
+                self.repository.update(mission_id, is_running=False)
+                self.finish_mission(mission_id)
+                raise
         
         thread = threading.Thread(
             target=run_function,
             args=(mission_id, *args),
+            kwargs={"cancel_token": cancel_token},
             daemon=True
         )
         self._active_threads[mission_id] = thread
         thread.start()
+        return None
     
-    def stop_mission(self, mission_id: str) -> None:
+    def _on_queue_change(self, mission_id: str, position: Optional[int]) -> None:
         """
-        Stop a running mission.
+        Record and publish a mission's queue position.
         
         Args:
             mission_id: Mission identifier
+            position: New position, or None once the mission starts running
+        """
+        if not self.repository.update_if_exists(mission_id, queue_position=position):
+            return
+        if position is not None:
+            self.publish(mission_id, {"type": "queued", "position": position})
+    
+    def stop_mission(self, mission_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        Stop a running mission and wait for it to release its browser.
+        
+        Queued missions are removed from the scheduler. Running missions are
+        cancelled through their token; the mission thread notices within one
+        check interval, closes its browser and acknowledges. With an event
+        bus, a mission running in another process is stopped through it.
+        The mission stays marked running until its run acknowledges through
+        finish_mission(), even past the timeout, so it cannot be started or
+        resumed while the old run still holds its resources.
+        
+        Args:
+            mission_id: Mission identifier
+            timeout: Seconds to wait for acknowledgement (defaults to stop_timeout)
+            
+        Returns:
+            True if the mission acknowledged (or was not running)
             
         Raises:
             MissionNotFoundError: If mission not found
         """
-        mission = self.repository.get(mission_id)
-        self.repository.update(mission_id, is_running=False)
+        was_running = self.repository.get(mission_id)["is_running"]
+        timeout = self.stop_timeout if timeout is None else timeout
         
-        if mission_id in self._active_threads:
-            # Thread will stop on next iteration check
-            pass
+        acknowledged = self._stop_local(mission_id, timeout)
+        if acknowledged is None:
+            if was_running and self.event_bus is not None:
+                acknowledged = self._stop_remote(mission_id, timeout)
+            else:
+                # No run left to acknowledge, e.g. a record from before a restart
+                self.repository.update(mission_id, is_running=False)
+                acknowledged = True
+        
+        # Wake connected clients so they stop streaming this mission
+        self.publish(mission_id, {"type": "stopped", "acknowledged": acknowledged})
+        return acknowledged
+    
+    def _stop_local(self, mission_id: str, timeout: float) -> Optional[bool]:
+        """
+        Stop a mission queued or running in this process.
+        
+        Returns:
+            Whether it acknowledged within the timeout, or None if it is not in this process
+        """
+        if self.scheduler is not None and self.scheduler.cancel(mission_id):
+            self.repository.update_if_exists(mission_id, queue_position=None, is_running=False)
+            self.finish_mission(mission_id)
+            return True
+        
+        with self._lifecycle_lock:
+            cancel_token = self._cancel_tokens.get(mission_id)
+        if cancel_token is None:
+            return None
+        cancel_token.cancel("stopped")
+        return cancel_token.wait_done(timeout)
     
-    def get_message_queue(self, mission_id: str) -> queue.Queue:
+    def _stop_remote(self, mission_id: str, timeout: float) -> bool:
         """
-        Get message queue for mission.
+        Ask the process running a mission to stop it, through the event bus.
+        
+        Returns:
+            Whether that process acknowledged within the timeout
+        """
+        waiter = threading.Event()
+        with self._lifecycle_lock:
+            self._remote_stops[mission_id] = waiter
+        try:
+            self.event_bus.append(mission_id, CANCEL)
+            return waiter.wait(timeout)
+        finally:
+            with self._lifecycle_lock:
+                self._remote_stops.pop(mission_id, None)
+    
+    def finish_mission(self, mission_id: str) -> None:
+        """
+        Acknowledge that a mission's run has ended and its resources are released.
+        
+        Marks a stopped mission as no longer running and completes a
+        deletion requested while the mission was still running.
+        
+        Args:
+            mission_id: Mission identifier
+        """
+        with self._lifecycle_lock:
+            cancel_token = self._cancel_tokens.get(mission_id)
+            delete = mission_id in self._pending_deletes
+            self._pending_deletes.discard(mission_id)
+        if cancel_token is not None:
+            if cancel_token.is_cancelled:
+                self.repository.update_if_exists(mission_id, is_running=False)
+            with self._lifecycle_lock:
+                if self._cancel_tokens.get(mission_id) is cancel_token:
+                    del self._cancel_tokens[mission_id]
+            cancel_token.acknowledge()
+        if delete:
+            self.delete_mission(mission_id)
+    
+    def get_message_queue(self, mission_id: str) -> MessageChannel:
+        """
+        Get the default message channel of a mission.
+        
+        The channel is subscribed on first use, starting with the replayed
+        events, and the same channel is returned afterwards.
         
         Args:
             mission_id: Mission identifier
             
         Returns:
-            Message queue
+            Message channel
             
         Raises:
             MissionNotFoundError: If mission not found
         """
-        if mission_id not in self._message_queues:
-            raise MissionNotFoundError(f"Mission {mission_id} not found")
-        return self._message_queues[mission_id]
+        hub = self._get_hub(mission_id)
+        with self._hubs_lock:
+            channel = self._primary_channels.get(mission_id)
+            if channel is None:
+                channel = self._primary_channels[mission_id] = hub.subscribe()
+        return channel
     
     def delete_mission(self, mission_id: str) -> None:
         """
         Delete mission and cleanup resources.
         
+        A mission whose run has not acknowledged yet is deleted by
+        finish_mission(), so its thread never writes to a missing record.
+        
         Args:
             mission_id: Mission identifier
         """
+        with self._lifecycle_lock:
+            if mission_id in self._cancel_tokens:
+                self._pending_deletes.add(mission_id)
+                return
         if mission_id in self._active_threads:
             del self._active_threads[mission_id]
-        if mission_id in self._message_queues:
-            del self._message_queues[mission_id]
+        with self._hubs_lock:
+            self._hubs.pop(mission_id, None)
+            self._primary_channels.pop(mission_id, None)
+            self._bus_seq.pop(mission_id, None)
+        if self.repository.exists(mission_id):
+            self.result_cache.release(self.repository.get(mission_id)["goal"], mission_id)
         self.repository.delete(mission_id)
+        if self.event_bus is not None:
+            self.event_bus.append(mission_id, DELETE)
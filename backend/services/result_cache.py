@@ -0,0 +1,165 @@
+"""Mission result cache keyed by normalized goal."""
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+import re
+import threading
+import time
+import unicodedata
+
+
+STOPWORDS = {
+    # English
+    "a", "an", "the", "of", "in", "on", "for", "to", "and", "or", "at", "by",
+    "what", "whats", "is", "are", "find", "get", "show", "me", "please", "with",
+    "from", "about", "how", "much", "does", "do",
+    # Portuguese
+    "o", "os", "as", "um", "uma", "de", "do", "da", "dos", "das", "em", "no",
+    "na", "nos", "nas", "para", "por", "e", "ou", "com", "qual", "quais",
+    "encontre", "encontrar", "busque", "buscar", "mostre", "sobre", "quanto",
+    "custa", "pelo", "pela"
+}
+
+
+def normalize_goal(goal: str) -> str:
+    """
+    Normalize a mission goal into a cache key.
+    
+    Lowercases, folds accents, drops punctuation and stopwords, and sorts the
+    remaining tokens so word order does not matter.
+    
+    Args:
+        goal: Raw mission goal
+        
+    Returns:
+        Normalized goal key
+    """
+    folded = unicodedata.normalize("NFKD", goal.lower())
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    tokens = {token for token in re.findall(r"\w+", folded) if token not in STOPWORDS}
+    return " ".join(sorted(tokens))
+
+
+class MissionResultCache:
+    """Thread-safe cache of finished mission results and in-flight missions."""
+    
+    def __init__(self, default_max_age: float = 3600, max_entries: int = 256):
+        """
+        Initialize result cache.
+        
+        Args:
+            default_max_age: Freshness window in seconds when the caller gives none
+            max_entries: Maximum number of stored results
+        """
+        self.default_max_age = default_max_age
+        self.max_entries = max_entries
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, goal: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored result if it is fresh enough.
+        
+        Args:
+            goal: Mission goal
+            max_age: Maximum acceptable age in seconds (defaults to default_max_age)
+            
+        Returns:
+            Stored result with its age, or None
+        """
+        max_age = self.default_max_age if max_age is None else max_age
+        key = normalize_goal(goal)
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            age = time.time() - entry["completed_at"]
+            if age > max_age:
+                return None
+            self._results.move_to_end(key)
+            return {**entry, "age": age}
+    
+    def put(
+        self,
+        goal: str,
+        mission_id: str,
+        summary: str,
+        extracted_data: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Store a finished mission result.
+        
+        Args:
+            goal: Mission goal
+            mission_id: Mission that produced the result
+            summary: Mission summary text
+            extracted_data: Extracted data records
+        """
+        key = normalize_goal(goal)
+        with self._lock:
+            self._results[key] = {
+                "mission_id": mission_id,
+                "summary": summary,
+                "extracted_data": list(extracted_data),
+                "completed_at": time.time()
+            }
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+    
+    def get_by_mission(self, mission_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored result produced by a given mission.
+        
+        Args:
+            mission_id: Mission identifier
+            
+        Returns:
+            Stored result, or None
+        """
+        with self._lock:
+            for entry in self._results.values():
+                if entry["mission_id"] == mission_id:
+                    return dict(entry)
+        return None
+    
+    def claim(self, goal: str, mission_id: str) -> str:
+        """
+        Register a mission as the in-flight runner for a goal.
+        
+        Args:
+            goal: Mission goal
+            mission_id: Candidate mission identifier
+            
+        Returns:
+            The mission already in flight for this goal, or mission_id if none
+        """
+        key = normalize_goal(goal)
+        with self._lock:
+            return self._inflight.setdefault(key, mission_id)
+    
+    def get_inflight(self, goal: str) -> Optional[str]:
+        """
+        Get the in-flight mission for a goal.
+        
+        Args:
+            goal: Mission goal
+            
+        Returns:
+            Mission identifier, or None
+        """
+        with self._lock:
+            return self._inflight.get(normalize_goal(goal))
+    
+    def release(self, goal: str, mission_id: str) -> None:
+        """
+        Remove a mission from the in-flight table.
+        
+        Args:
+            goal: Mission goal
+            mission_id: Mission identifier
+        """
+        key = normalize_goal(goal)
+        with self._lock:
+            if self._inflight.get(key) == mission_id:
+                del self._inflight[key]
@@ -0,0 +1,280 @@
+"""Bounded mission scheduler with fair queueing and pre-warmed workers."""
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+import logging
+import os
+import threading
+import time
+from core.exceptions import MissionQueueFullError
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_count(browser_memory_mb: int = 512, memory_fraction: float = 0.75) -> int:
+    """
+    Derive how many missions can run at once from CPU count and physical RAM.
+    
+    Args:
+        browser_memory_mb: Memory budget of one mission (Chromium plus agent)
+        memory_fraction: Share of physical RAM available to missions
+        
+    Returns:
+        Worker count (at least 1)
+    """
+    cpus = os.cpu_count() or 1
+    try:
+        total_mb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return cpus
+    by_memory = int(total_mb * memory_fraction // browser_memory_mb)
+    return max(1, min(cpus, by_memory))
+
+
+class MissionJob:
+    """Queued mission run."""
+    
+    __slots__ = ("mission_id", "client_id", "run", "args", "kwargs", "submitted_at")
+    
+    def __init__(self, mission_id: str, client_id: str, run: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]):
+        self.mission_id = mission_id
+        self.client_id = client_id
+        self.run = run
+        self.args = args
+        self.kwargs = kwargs
+        self.submitted_at = time.time()
+
+
+class MissionScheduler:
+    """
+    Run missions on a fixed pool of worker threads.
+    
+    Pending missions wait in one FIFO per client and clients are served
+    round-robin, so a client submitting many missions cannot starve the
+    others. Idle workers keep a started browser ready, which is handed to
+    the next mission so it starts without waiting for Chromium to launch.
+    """
+    
+    def __init__(
+        self,
+        workers: int,
+        browser_factory: Optional[Callable[[], Any]] = None,
+        max_queue: int = 100,
+        on_queue_change: Optional[Callable[[str, Optional[int]], None]] = None
+    ):
+        """
+        Initialize scheduler.
+        
+        Args:
+            workers: Maximum number of missions running at once
+            browser_factory: Returns a started browser to pre-warm idle workers (None disables pre-warming)
+            max_queue: Maximum number of pending missions
+            on_queue_change: Called with (mission_id, position) when a queue position
+                changes, and with position None when the mission starts
+        """
+        self.workers = max(1, workers)
+        self.browser_factory = browser_factory
+        self.max_queue = max_queue
+        self.on_queue_change = on_queue_change
+        self._queues: "OrderedDict[str, Deque[MissionJob]]" = OrderedDict()
+        self._queued: Dict[str, MissionJob] = {}
+        self._running: Dict[str, str] = {}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._shutdown = False
+    
+    def submit(self, mission_id: str, run: Callable[..., Any], *args: Any, client_id: str = "anonymous", **kwargs: Any) -> int:
+        """
+        Queue a mission.
+        
+        The run function is called on a worker as run(mission_id, *args, **kwargs),
+        plus browser=<started browser> when a pre-warmed one is available.
+        
+        Args:
+            mission_id: Mission identifier
+            run: Mission function
+            *args: Arguments for run
+            client_id: Client used for fair scheduling
+            **kwargs: Keyword arguments for run
+            
+        Returns:
+            1-based queue position
+            
+        Raises:
+            MissionQueueFullError: If max_queue missions are already waiting
+        """
+        with self._cond:
+            if len(self._queued) >= self.max_queue:
+                raise MissionQueueFullError(f"Mission queue is full ({self.max_queue} pending)")
+            job = MissionJob(mission_id, client_id, run, args, kwargs)
+            self._queues.setdefault(client_id, deque()).append(job)
+            self._queued[mission_id] = job
+            self._start_workers()
+            self._cond.notify()
+            positions = self._positions()
+        self._notify(positions)
+        return positions[mission_id]
+    
+    def cancel(self, mission_id: str) -> bool:
+        """
+        Remove a pending mission from the queue.
+        
+        Args:
+            mission_id: Mission identifier
+            
+        Returns:
+            True if the mission was still queued
+        """
+        with self._cond:
+            job = self._queued.pop(mission_id, None)
+            if job is None:
+                return False
+            queue = self._queues[job.client_id]
+            queue.remove(job)
+            if not queue:
+                del self._queues[job.client_id]
+            positions = self._positions()
+        self._notify(positions)
+        return True
+    
+    def position(self, mission_id: str) -> Optional[int]:
+        """
+        Get the queue position of a mission.
+        
+        Args:
+            mission_id: Mission identifier
+            
+        Returns:
+            1-based position, or None if the mission is not queued
+        """
+        with self._cond:
+            if mission_id not in self._queued:
+                return None
+            return self._positions()[mission_id]
+    
+    def is_running(self, mission_id: str) -> bool:
+        """Check whether a mission is running on a worker."""
+        with self._cond:
+            return mission_id in self._running
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+        
+        Returns:
+            Dictionary with worker, running, queued and client counts
+        """
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "running": len(self._running),
+                "queued": len(self._queued),
+                "clients_waiting": len(self._queues),
+                "max_queue": self.max_queue
+            }
+    
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop workers once their current mission ends; pending missions are dropped.
+        
+        Args:
+            wait: Whether to wait for the workers to exit
+        """
+        with self._cond:
+            self._shutdown = True
+            self._queues.clear()
+            self._queued.clear()
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+    
+    def _positions(self) -> Dict[str, int]:
+        """Compute queue positions following the round-robin order (lock held)."""
+        positions = {}
+        queues = [list(queue) for queue in self._queues.values()]
+        position = 0
+        depth = 0
+        while len(positions) < len(self._queued):
+            for queue in queues:
+                if depth < len(queue):
+                    position += 1
+                    positions[queue[depth].mission_id] = position
+            depth += 1
+        return positions
+    
+    def _next_job(self) -> MissionJob:
+        """Pop the next job, rotating the serving client to the back (lock held)."""
+        client_id, queue = next(iter(self._queues.items()))
+        job = queue.popleft()
+        del self._queues[client_id]
+        if queue:
+            self._queues[client_id] = queue
+        del self._queued[job.mission_id]
+        return job
+    
+    def _notify(self, positions: Dict[str, Optional[int]]) -> None:
+        """Report queue positions outside the lock."""
+        if not self.on_queue_change:
+            return
+        for mission_id, position in positions.items():
+            try:
+                self.on_queue_change(mission_id, position)
+            except Exception:
+                logger.exception("Queue change callback failed for mission %s", mission_id)
+    
+    def _start_workers(self) -> None:
+        """Start worker threads on first use (lock held)."""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f"mission-worker-{len(self._threads) + 1}",
+                daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+    
+    def _prewarm(self) -> Any:
+        """Start a browser for the next mission, or None if it fails."""
+        try:
+            return self.browser_factory()
+        except Exception:
+            logger.exception("Failed to pre-warm browser")
+            return None
+    
+    def _worker_loop(self) -> None:
+        """Run queued missions one at a time, keeping a warm browser while idle."""
+        name = threading.current_thread().name
+        warm = None
+        while True:
+            with self._cond:
+                idle = not self._queued and not self._shutdown
+            if idle and warm is None and self.browser_factory:
+                warm = self._prewarm()
+            
+            with self._cond:
+                while not self._queued and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown:
+                    break
+                job = self._next_job()
+                self._running[job.mission_id] = name
+                positions: Dict[str, Optional[int]] = {job.mission_id: None, **self._positions()}
+            self._notify(positions)
+            
+            kwargs = dict(job.kwargs)
+            if warm is not None:
+                kwargs["browser"] = warm
+                warm = None
+            try:
+                job.run(job.mission_id, *job.args, **kwargs)
+            except Exception:
+                logger.exception("Mission %s failed on %s", job.mission_id, name)
+            finally:
+                with self._cond:
+                    self._running.pop(job.mission_id, None)
+        
+        if warm is not None:
+            try:
+                warm.stop()
+            except Exception:
+                pass
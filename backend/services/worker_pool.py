@@ -0,0 +1,707 @@
+"""Mission workers running in separate processes behind the scheduler queue."""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import itertools
+import logging
+import multiprocessing
+import pickle
+import queue
+import threading
+from core.cancellation import CancellationToken
+from core.exceptions import WorkerLostError
+from services.scheduler import MissionScheduler
+
+logger = logging.getLogger(__name__)
+
+
+# MissionService calls a mission run may make from a worker process, plus
+# calls to the stores the API process owns (ProcessMissionPool.shared)
+FORWARDED_CALLS = frozenset({
+    "publish",
+    "record_result",
+    "finish_mission",
+    "repository.update_if_exists",
+    "result_cache.release",
+    "page_cache.get",
+    "page_cache.put",
+    "page_cache.save",
+    "price_store.add_extraction",
+    "price_store.flush",
+    "rate_limiter.acquire",
+    "rate_limiter.report",
+    "metrics.record"
+})
+
+# Forwarded calls that may wait: the API process passes them the mission's cancel token
+CANCELLABLE_CALLS = frozenset({"rate_limiter.acquire"})
+
+
+class _RemoteRepository:
+    """Mission repository calls forwarded to the API process."""
+    
+    def __init__(self, send: Callable[..., None]):
+        self._send = send
+    
+    def update_if_exists(self, mission_id: str, **kwargs: Any) -> bool:
+        self._send("call", "repository.update_if_exists", (mission_id,), kwargs)
+        return True
+
+
+class _RemoteResultCache:
+    """Result cache calls forwarded to the API process."""
+    
+    def __init__(self, send: Callable[..., None]):
+        self._send = send
+    
+    def release(self, goal: str, mission_id: str) -> None:
+        self._send("call", "result_cache.release", (goal, mission_id), {})
+
+
+class RemotePageCache:
+    """
+    The API process's page cache, seen from a worker process.
+    
+    Lookups wait for the API process's answer and writes are forwarded to
+    it, so every worker shares one cache and only the API process saves it.
+    Fetch claims are not shared across processes: claim_fetch() always
+    succeeds and wait_for_fetch() never waits, so two workers reaching the
+    same uncached page both fetch it.
+    """
+    
+    def __init__(self, send: Callable[..., None], request: Callable[..., Any]):
+        self._send = send
+        self._request = request
+    
+    def get(self, url: str, include_snapshot: bool = False) -> Optional[Dict[str, Any]]:
+        """Get fresh cached data for a URL from the API process."""
+        return self._request("page_cache.get", (url,), {"include_snapshot": include_snapshot})
+    
+    def put(self, url: str, data: Dict[str, Any], snapshot: Optional[str] = None) -> None:
+        """Store extracted data for a URL in the API process."""
+        self._send("call", "page_cache.put", (url, data), {"snapshot": snapshot})
+    
+    def claim_fetch(self, url: str, lease: float = 60) -> bool:
+        """Claim a fetch; claims are local to the process, so this always succeeds."""
+        return True
+    
+    def release_fetch(self, url: str) -> None:
+        """Give up a fetch claim (nothing to release across processes)."""
+    
+    def wait_for_fetch(
+        self,
+        url: str,
+        timeout: float,
+        cancel_token: Optional[CancellationToken] = None,
+        check_interval: float = 0.25
+    ) -> Optional[Dict[str, Any]]:
+        """Never waits: other workers' in-flight fetches are not visible."""
+        return None
+    
+    def save(self) -> None:
+        """Ask the API process to persist its cache."""
+        self._send("call", "page_cache.save", (), {})
+
+
+class RemotePriceStore:
+    """
+    The API process's price store, seen from a worker process.
+    
+    Rows are forwarded to the API process, the single writer of the store's
+    directory, instead of being appended by a store of the worker's own.
+    """
+    
+    def __init__(self, send: Callable[..., None]):
+        self._send = send
+    
+    def add_extraction(
+        self,
+        mission_id: str,
+        product: str,
+        url: str,
+        data: Dict[str, Any],
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Append the prices of one extracted page in the API process."""
+        self._send("call", "price_store.add_extraction", (mission_id, product, url, data), {"timestamp": timestamp})
+    
+    def flush(self) -> None:
+        """Ask the API process to flush buffered rows."""
+        self._send("call", "price_store.flush", (), {})
+
+
+class RemoteRateLimiter:
+    """
+    The API process's navigation rate limiter, seen from a worker process.
+    
+    acquire() waits until the API process grants a token, so every worker
+    draws from the same per-host buckets and a backoff triggered by one
+    worker slows down all of them. The wait is interrupted by the mission's
+    cancel token in the API process.
+    """
+    
+    def __init__(self, request: Callable[..., Any]):
+        self._request = request
+    
+    def acquire(self, url: str, cancel_token: Optional[CancellationToken] = None) -> float:
+        """Wait for the API process to let another navigation reach the host."""
+        return self._request("rate_limiter.acquire", (url,), {})
+    
+    def report(self, url: str, result: Dict[str, Any]) -> bool:
+        """Adapt the host's rate in the API process to a navigation outcome."""
+        return self._request("rate_limiter.report", (url, result), {})
+
+
+class RemoteMetrics:
+    """Sink of a worker process's metric samples, recorded by the API process's metrics."""
+    
+    def __init__(self, send: Callable[..., None]):
+        self._send = send
+    
+    def record(self, name: str, method: str, args: tuple) -> None:
+        """Forward one sample (install with MetricsRegistry.forward_to)."""
+        self._send("call", "metrics.record", (name, method, args), {})
+
+
+class RemoteMissionService:
+    """
+    Stand-in for MissionService inside a worker process.
+    
+    Exposes the part of MissionService a mission run uses and forwards each
+    call to the API process, which applies it to the real service in order.
+    Calls are fire-and-forget, so update_if_exists() always reports True.
+    The stores the API process owns are reached through page_cache,
+    price_store and rate_limiter, and metric samples go to metrics.
+    """
+    
+    def __init__(self, send: Callable[..., None], request: Optional[Callable[..., Any]] = None):
+        """
+        Initialize remote service.
+        
+        Args:
+            send: Sends a message tuple to the API process
+            request: Sends a call to the API process and returns its result
+        """
+        self._send = send
+        self.repository = _RemoteRepository(send)
+        self.result_cache = _RemoteResultCache(send)
+        self.page_cache = RemotePageCache(send, request)
+        self.price_store = RemotePriceStore(send)
+        self.rate_limiter = RemoteRateLimiter(request)
+        self.metrics = RemoteMetrics(send)
+    
+    def publish(self, mission_id: str, message: Dict[str, Any]) -> None:
+        """Publish a mission event to its subscribers."""
+        self._send("call", "publish", (mission_id, message), {})
+    
+    def record_result(self, mission_id: str, summary: str, extracted_data: List[Dict[str, Any]], is_complete: bool = True) -> None:
+        """Store a finished mission's result in the result cache."""
+        self._send("call", "record_result", (mission_id, summary, extracted_data), {"is_complete": is_complete})
+    
+    def finish_mission(self, mission_id: str) -> None:
+        """Acknowledge that the mission's run has ended."""
+        self._send("call", "finish_mission", (mission_id,), {})
+
+
+def apply_forwarded_call(
+    service: Any,
+    name: str,
+    args: tuple,
+    kwargs: Dict[str, Any],
+    shared: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Apply a call forwarded by RemoteMissionService to the real service.
+    
+    Args:
+        service: MissionService of the API process
+        name: Dotted method name, one of FORWARDED_CALLS
+        args: Positional arguments
+        kwargs: Keyword arguments
+        shared: Stores owned by the API process, by name; calls to a
+            disabled (None) store are dropped
+            
+    Returns:
+        Result of the call
+        
+    Raises:
+        ValueError: If the method may not be called from a worker
+    """
+    if name not in FORWARDED_CALLS:
+        raise ValueError(f"Call {name} cannot be forwarded from a worker")
+    attributes = name.split(".")
+    target = service
+    if shared is not None and attributes[0] in shared:
+        target = shared[attributes.pop(0)]
+        if target is None:
+            return None
+    for attribute in attributes:
+        target = getattr(target, attribute)
+    return target(*args, **kwargs)
+
+
+def worker_main(
+    conn: Any,
+    initializer: Optional[Callable[[RemoteMissionService], None]],
+    browser_factory: Optional[Callable[[], Any]]
+) -> None:
+    """
+    Mission loop of a worker process.
+    
+    Runs one mission at a time as run(mission_id, *args, cancel_token=..., **kwargs),
+    plus browser=<started browser> when a pre-warmed one is available. A
+    reader thread keeps receiving while a mission runs so cancellations
+    reach the mission's token right away, and hands replies to the
+    requests the mission is waiting on.
+    
+    Args:
+        conn: Worker end of the pipe to the API process
+        initializer: Called once with the RemoteMissionService before the first mission
+        browser_factory: Returns a started browser to pre-warm while idle (None disables pre-warming)
+    """
+    send_lock = threading.Lock()
+    jobs: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+    tokens: Dict[str, CancellationToken] = {}
+    replies: Dict[int, "queue.Queue[Tuple[bool, Any]]"] = {}
+    replies_lock = threading.Lock()
+    request_ids = itertools.count()
+    
+    def send(*message: Any) -> None:
+        with send_lock:
+            conn.send(message)
+    
+    def request(name: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        reply: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(maxsize=1)
+        with replies_lock:
+            request_id = next(request_ids)
+            replies[request_id] = reply
+        send("request", request_id, name, args, kwargs)
+        ok, value = reply.get()
+        if not ok:
+            raise value
+        return value
+    
+    def disconnect() -> None:
+        jobs.put(None)
+        with replies_lock:
+            pending = list(replies.values())
+            replies.clear()
+        for reply in pending:
+            reply.put((False, ConnectionError("Connection to the API process closed")))
+    
+    if initializer is not None:
+        initializer(RemoteMissionService(send, request))
+    
+    def read() -> None:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                disconnect()
+                return
+            if message[0] == "reply":
+                with replies_lock:
+                    reply = replies.pop(message[1], None)
+                if reply is not None:
+                    reply.put((message[2], message[3]))
+            elif message[0] == "run":
+                # Registered here so a cancel that follows the job is never missed
+                tokens[message[1]] = CancellationToken()
+                jobs.put(message)
+            elif message[0] == "cancel":
+                token = tokens.get(message[1])
+                if token is not None:
+                    token.cancel(message[2])
+            else:
+                disconnect()
+                return
+    
+    threading.Thread(target=read, name="mission-worker-reader", daemon=True).start()
+    
+    warm = None
+    while True:
+        if warm is None and browser_factory is not None and jobs.empty():
+            try:
+                warm = browser_factory()
+            except Exception:
+                logger.exception("Failed to pre-warm browser")
+        job = jobs.get()
+        if job is None:
+            break
+        _, mission_id, run, args, kwargs = job
+        kwargs = dict(kwargs, cancel_token=tokens[mission_id])
+        if warm is not None:
+            kwargs["browser"] = warm
+            warm = None
+        error = None
+        try:
+            run(mission_id, *args, **kwargs)
+        except Exception as e:
+            logger.exception("Mission %s failed in worker process", mission_id)
+            error = str(e)
+        finally:
+            tokens.pop(mission_id, None)
+        send("done", mission_id, error)
+    
+    if warm is not None:
+        try:
+            warm.stop()
+        except Exception:
+            pass
+
+
+class WorkerProcess:
+    """API-side handle of one mission worker process."""
+    
+    def __init__(
+        self,
+        context: Any,
+        name: str,
+        generation: int,
+        initializer: Optional[Callable[[RemoteMissionService], None]] = None,
+        browser_factory: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Start a worker process.
+        
+        Args:
+            context: multiprocessing context
+            name: Process name
+            generation: Pool generation the worker belongs to
+            initializer: Called in the worker before its first mission
+            browser_factory: Browser pre-warming factory run in the worker
+        """
+        self.generation = generation
+        self.missions = 0
+        self.busy = False
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=worker_main,
+            args=(child_conn, initializer, browser_factory),
+            name=name,
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+    
+    @property
+    def is_alive(self) -> bool:
+        """Whether the worker process is running."""
+        return self.process.is_alive()
+    
+    def run(
+        self,
+        mission_id: str,
+        run: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        cancel_token: Optional[CancellationToken],
+        on_call: Callable[[str, tuple, Dict[str, Any]], Any],
+        poll_interval: float = 0.1
+    ) -> Optional[str]:
+        """
+        Run a mission on the worker and relay its calls until it ends.
+        
+        Fire-and-forget calls are applied in order; requests are applied
+        the same way and their result, or exception, is sent back. Requests
+        in CANCELLABLE_CALLS get cancel_token, so a stop interrupts them.
+        
+        Args:
+            mission_id: Mission identifier
+            run: Picklable mission function
+            args: Arguments for run
+            kwargs: Keyword arguments for run
+            cancel_token: Token whose cancellation is forwarded to the worker
+            on_call: Applies a forwarded call and returns its result
+            poll_interval: Seconds between cancellation and liveness checks
+            
+        Returns:
+            Error message if the mission raised, otherwise None
+            
+        Raises:
+            WorkerLostError: If the process exits before the mission ends
+        """
+        self.conn.send(("run", mission_id, run, args, kwargs))
+        cancel_sent = False
+        while True:
+            if cancel_token is not None and cancel_token.is_cancelled and not cancel_sent:
+                self.conn.send(("cancel", mission_id, cancel_token.reason))
+                cancel_sent = True
+            try:
+                if not self.conn.poll(poll_interval):
+                    if not self.process.is_alive():
+                        raise WorkerLostError(f"Worker exited with code {self.process.exitcode}")
+                    continue
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                raise WorkerLostError(f"Worker exited with code {self.process.exitcode}")
+            if message[0] == "call":
+                try:
+                    on_call(message[1], message[2], message[3])
+                except Exception:
+                    logger.exception("Forwarded call %s failed for mission %s", message[1], mission_id)
+            elif message[0] == "request":
+                kwargs = message[4]
+                if message[2] in CANCELLABLE_CALLS:
+                    kwargs = dict(kwargs, cancel_token=cancel_token)
+                self._reply(message[1], on_call, message[2], message[3], kwargs)
+            elif message[0] == "done":
+                self.missions += 1
+                return message[2]
+    
+    def _reply(
+        self,
+        request_id: int,
+        on_call: Callable[[str, tuple, Dict[str, Any]], Any],
+        name: str,
+        args: tuple,
+        kwargs: Dict[str, Any]
+    ) -> None:
+        """Apply a request from the worker and send back its result or exception."""
+        try:
+            reply = (True, on_call(name, args, kwargs))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            self.conn.send(("reply", request_id) + reply)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            # The result or exception could not be pickled
+            self.conn.send(("reply", request_id, False, RuntimeError(f"{name} failed: {e}")))
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Ask the worker to exit after its current mission, terminating it on timeout.
+        
+        Args:
+            timeout: Seconds to wait for the process to exit
+        """
+        try:
+            self.conn.send(("stop",))
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
+        self.conn.close()
+
+
+class ProcessMissionPool(MissionScheduler):
+    """
+    Run missions in worker processes instead of API threads.
+    
+    Queueing is MissionScheduler's: per-client FIFOs served round-robin.
+    Each scheduler worker thread owns one worker process and hands it the
+    next mission, so missions use every core and a crashing browser cannot
+    take the API down. Inside the worker the mission talks to a
+    RemoteMissionService; its calls come back over the pipe and are applied
+    to the real service in order, or to the shared stores, so each store
+    keeps a single writer: the API process. Workers are replaced after
+    max_missions_per_worker missions and on restart(), always between
+    missions, so a restart never interrupts a running mission.
+    """
+    
+    def __init__(
+        self,
+        processes: int,
+        initializer: Optional[Callable[[RemoteMissionService], None]] = None,
+        browser_factory: Optional[Callable[[], Any]] = None,
+        max_queue: int = 100,
+        max_missions_per_worker: int = 0,
+        start_method: str = "spawn",
+        on_worker_lost: Optional[Callable[[str, str], None]] = None,
+        on_queue_change: Optional[Callable[[str, Optional[int]], None]] = None,
+        shared: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize process pool.
+        
+        Args:
+            processes: Number of worker processes (missions running at once)
+            initializer: Picklable function called in each worker with its
+                RemoteMissionService, e.g. to install it where missions find it
+            browser_factory: Picklable function returning a started browser to
+                pre-warm idle workers (None disables pre-warming)
+            max_queue: Maximum number of pending missions
+            max_missions_per_worker: Missions after which a worker is replaced (0 never)
+            start_method: multiprocessing start method ("spawn", "forkserver" or "fork")
+            on_worker_lost: Called with (mission_id, reason) when a worker dies mid-mission
+            on_queue_change: Called with (mission_id, position) when a queue position changes
+            shared: Stores workers reach through RemoteMissionService, by name
+                ("page_cache", "price_store", "rate_limiter", "metrics"); None marks a disabled one
+        """
+        super().__init__(workers=processes, max_queue=max_queue, on_queue_change=on_queue_change)
+        self.initializer = initializer
+        self.process_browser_factory = browser_factory
+        self.max_missions_per_worker = max_missions_per_worker
+        self.on_worker_lost = on_worker_lost
+        self.service: Any = None
+        self.shared = shared or {}
+        self._context = multiprocessing.get_context(start_method)
+        self._local = threading.local()
+        self._workers: List[WorkerProcess] = []
+        self._workers_lock = threading.Lock()
+        self._generation = 0
+        self._started = 0
+        self._restarted = 0
+        self._lost = 0
+    
+    def submit(self, mission_id: str, run: Callable[..., Any], *args: Any, client_id: str = "anonymous", **kwargs: Any) -> int:
+        """
+        Queue a mission for a worker process.
+        
+        run, args and kwargs are sent to the worker, so they must be picklable.
+        
+        Args:
+            mission_id: Mission identifier
+            run: Mission function
+            *args: Arguments for run
+            client_id: Client used for fair scheduling
+            **kwargs: Keyword arguments for run; cancel_token stays in the API process
+            
+        Returns:
+            1-based queue position
+            
+        Raises:
+            MissionQueueFullError: If max_queue missions are already waiting
+        """
+        return super().submit(mission_id, self._dispatch, run, *args, client_id=client_id, **kwargs)
+    
+    def restart(self) -> int:
+        """
+        Replace every worker process without interrupting running missions.
+        
+        Idle workers are stopped now; busy ones are replaced after their
+        current mission. New processes start on demand.
+        
+        Returns:
+            Number of workers scheduled for replacement
+        """
+        with self._workers_lock:
+            self._generation += 1
+            idle = [worker for worker in self._workers if not worker.busy]
+            for worker in idle:
+                self._workers.remove(worker)
+            count = len(self._workers) + len(idle)
+            self._restarted += count
+        for worker in idle:
+            worker.stop()
+        return count
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler and worker process statistics.
+        
+        Returns:
+            Scheduler statistics plus process counts
+        """
+        stats = super().stats()
+        with self._workers_lock:
+            stats.update({
+                "mode": "process",
+                "processes": len(self._workers),
+                "processes_alive": sum(worker.is_alive for worker in self._workers),
+                "processes_started": self._started,
+                "processes_restarted": self._restarted,
+                "processes_lost": self._lost
+            })
+        return stats
+    
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop taking missions and stop worker processes once idle.
+        
+        Args:
+            wait: Whether to wait for running missions and their processes to exit
+        """
+        super().shutdown(wait=wait)
+        with self._workers_lock:
+            self._generation += 1
+            idle = [worker for worker in self._workers if not worker.busy]
+            for worker in idle:
+                self._workers.remove(worker)
+        for worker in idle:
+            worker.stop()
+    
+    def _checkout(self) -> WorkerProcess:
+        """Get this thread's worker process, replacing it if it is stale or dead."""
+        worker: Optional[WorkerProcess] = getattr(self._local, "worker", None)
+        with self._workers_lock:
+            stale = worker is not None and (
+                worker not in self._workers
+                or worker.generation != self._generation
+                or not worker.is_alive
+                or (self.max_missions_per_worker and worker.missions >= self.max_missions_per_worker)
+            )
+            if stale and worker in self._workers:
+                self._workers.remove(worker)
+        if stale:
+            worker.stop()
+            worker = None
+        if worker is None:
+            with self._workers_lock:
+                self._started += 1
+                worker = WorkerProcess(
+                    self._context,
+                    f"mission-process-{self._started}",
+                    self._generation,
+                    self.initializer,
+                    self.process_browser_factory
+                )
+                self._workers.append(worker)
+            self._local.worker = worker
+        worker.busy = True
+        return worker
+    
+    def _apply(self, name: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """Apply a forwarded call to the bound service or a shared store."""
+        if self.service is None and name.split(".")[0] not in self.shared:
+            return None
+        return apply_forwarded_call(self.service, name, args, kwargs, self.shared)
+    
+    def _dispatch(
+        self,
+        mission_id: str,
+        run: Callable[..., Any],
+        *args: Any,
+        cancel_token: Optional[CancellationToken] = None,
+        **kwargs: Any
+    ) -> None:
+        """Run a mission on this scheduler thread's worker process (scheduler thread)."""
+        worker = self._checkout()
+        try:
+            error = worker.run(mission_id, run, args, kwargs, cancel_token, self._apply)
+            if error:
+                logger.error("Mission %s failed in %s: %s", mission_id, worker.process.name, error)
+        except WorkerLostError as e:
+            logger.error("Mission %s lost: %s", mission_id, e)
+            with self._workers_lock:
+                self._lost += 1
+            self._retire(worker, timeout=1)
+            self._fail(mission_id, str(e))
+        except Exception as e:
+            # The job never reached the worker (e.g. it could not be pickled)
+            logger.exception("Could not run mission %s on %s", mission_id, worker.process.name)
+            self._fail(mission_id, str(e))
+        finally:
+            worker.busy = False
+            # Replace now rather than on the next mission so restarts take effect
+            if worker.generation != self._generation:
+                self._retire(worker)
+    
+    def _retire(self, worker: WorkerProcess, timeout: float = 10.0) -> None:
+        """Remove a worker from the pool and stop it (scheduler thread)."""
+        with self._workers_lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        if getattr(self._local, "worker", None) is worker:
+            self._local.worker = None
+        worker.stop(timeout)
+    
+    def _fail(self, mission_id: str, reason: str) -> None:
+        """Report a mission that ended without finishing its run, and acknowledge it."""
+        if self.on_worker_lost is not None:
+            try:
+                self.on_worker_lost(mission_id, reason)
+            except Exception:
+                logger.exception("Worker lost callback failed for mission %s", mission_id)
+        if self.service is not None:
+            self.service.finish_mission(mission_id)
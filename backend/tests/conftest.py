@@ -8,12 +8,20 @@ from unittest.mock import Mock, MagicMock
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from config.settings import get_settings
 from repositories.mission_repository import MissionRepository
 from infrastructure.memory import Memory
 from infrastructure.browser_engine import BrowserEngine
 from services.mission_service import MissionService
 
 
+@pytest.fixture(autouse=True)
+def fresh_settings():
+    """Drop the cached settings after each test, so changes made by one test do not leak."""
+    yield
+    get_settings.cache_clear()
+
+
 @pytest.fixture
 def mission_repository():
     """Fixture for MissionRepository."""
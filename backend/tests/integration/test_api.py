@@ -1,4 +1,5 @@
 """Integration tests for API endpoints."""
+import json
 import pytest
 import sys
 import os
@@ -12,6 +13,19 @@ from repositories.mission_repository import MissionRepository
 from services.mission_service import MissionService
 
 
+@pytest.fixture(autouse=True)
+def offline_missions(monkeypatch):
+    """Run started missions with a stand-in that needs no browser."""
+    from api.routes import mission as mission_routes
+    
+    def fake_run(mission_id, *args, **kwargs):
+        mission_routes.mission_service.publish(mission_id, {"type": "finished"})
+        mission_routes.mission_service.finish_mission(mission_id)
+    
+    monkeypatch.setattr(mission_routes, "run_mission", fake_run)
+    monkeypatch.setattr(mission_routes.scheduler, "browser_factory", None)
+
+
 @pytest.fixture
 def client():
     """Create test client."""
@@ -40,6 +54,15 @@ class TestAPIEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
     
+    def test_metrics_endpoint(self, client):
+        """Test that /metrics serves the mission metrics in Prometheus text format."""
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'market_radar_missions{state="queued"}' in response.text
+        assert "# TYPE market_radar_iteration_phase_seconds histogram" in response.text
+    
     def test_start_mission(self, client):
         """Test starting a mission."""
         response = client.post(
@@ -96,6 +119,26 @@ class TestAPIEndpoints:
         
         assert response.status_code == 404
     
+    def test_resume_without_checkpoint(self, client):
+        """Test resuming a mission that has no checkpoint."""
+        response = client.post("/api/v1/mission/unknown-mission/resume")
+        
+        assert response.status_code == 404
+    
+    def test_price_stats(self, client):
+        """Test price analytics endpoints."""
+        response = client.get("/api/v1/prices/stats", params={"product": "creatina", "group_by": "domain"})
+        
+        assert response.status_code == 200
+        assert "enabled" in response.json()
+        assert client.get("/api/v1/prices/stats", params={"group_by": "price"}).status_code == 400
+    
+    def test_restart_workers_needs_process_mode(self, client):
+        """Test that restarting workers is refused when missions run on threads."""
+        response = client.post("/api/v1/missions/queue/restart")
+        
+        assert response.status_code == 409
+    
     def test_stop_mission(self, client):
         """Test stopping a mission."""
         # First create a mission
@@ -115,3 +158,92 @@ class TestAPIEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
+    
+    def test_websocket_streams_published_messages(self, client, monkeypatch):
+        """Test that the WebSocket forwards messages published by the mission thread."""
+        from api.routes import mission as mission_routes
+        
+        def fake_run(mission_id, *args, **kwargs):
+            mission_routes.mission_service.publish(mission_id, {"type": "status", "message": "working"})
+            mission_routes.mission_service.publish(mission_id, {"type": "finished"})
+        
+        monkeypatch.setattr(mission_routes, "run_mission", fake_run)
+        response = client.post(
+            "/api/v1/mission/start",
+            json={"goal": "websocket stream test", "max_age": 0, "autostart": False}
+        )
+        mission_id = response.json()["mission_id"]
+        
+        messages = []
+        with client.websocket_connect(f"/api/v1/ws/{mission_id}") as websocket:
+            while not messages or messages[-1]["type"] != "finished":
+                messages.append(websocket.receive_json())
+        
+        assert [m for m in messages if m["type"] != "queued"] == [
+            {"type": "status", "message": "working"},
+            {"type": "finished"}
+        ]
+    
+    def test_start_runs_without_websocket_and_late_joiners_replay(self, client):
+        """Test that POST starts the mission and every watcher replays its events."""
+        response = client.post("/api/v1/mission/start", json={"goal": "fire and forget test", "max_age": 0})
+        mission_id = response.json()["mission_id"]
+        
+        watchers = []
+        for _ in range(2):
+            with client.websocket_connect(f"/api/v1/ws/{mission_id}") as websocket:
+                messages = [websocket.receive_json()]
+                while messages[-1]["type"] != "finished":
+                    messages.append(websocket.receive_json())
+            watchers.append([m for m in messages if m["type"] != "queued"])
+        
+        assert watchers[0] == watchers[1] == [{"type": "finished"}]
+        assert client.get(f"/api/v1/mission/{mission_id}/status").json()["started_at"] is not None
+    
+    def test_batch_streams_each_goal(self, client):
+        """Test that a batch shares missions between equivalent goals and streams NDJSON."""
+        response = client.post(
+            "/api/v1/missions/batch",
+            json={"goals": ["preço de batch teste", "Preço do batch teste?", "preço de outro teste"], "max_age": 0}
+        )
+        
+        assert response.status_code == 200
+        batch = response.json()
+        assert batch["missions"] == 2
+        
+        response = client.get(f"/api/v1/missions/batch/{batch['batch_id']}/stream")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert sorted(line["index"] for line in lines) == [0, 1, 2]
+        assert {line["status"] for line in lines} == {"finished"}
+        progress = client.get(f"/api/v1/missions/batch/{batch['batch_id']}").json()
+        assert progress["is_complete"] is True
+        assert client.get("/api/v1/missions/batch/missing").status_code == 404
+    
+    def test_mission_results_pages_and_export(self, client, tmp_path, monkeypatch):
+        """Test cursor pagination, projection and streaming export of mission results."""
+        from infrastructure import result_store as result_store_module
+        
+        store = result_store_module.ResultStore(str(tmp_path / "results.db"))
+        monkeypatch.setattr(result_store_module, "_shared_store", store)
+        store.put("done-mission", ({"url": f"https://shop.com/{i}", "prices": [i]} for i in range(5)))
+        
+        page = client.get("/api/v1/mission/done-mission/results", params={"limit": 3, "fields": "url"}).json()
+        assert page["total"] == 5
+        assert page["results"][0] == {"url": "https://shop.com/0"}
+        rest = client.get(
+            "/api/v1/mission/done-mission/results",
+            params={"limit": 3, "cursor": page["next_cursor"]}
+        ).json()
+        assert [r["prices"] for r in rest["results"]] == [[3], [4]]
+        assert rest["next_cursor"] is None
+        
+        ndjson = client.get("/api/v1/mission/done-mission/results/export")
+        assert len(ndjson.text.splitlines()) == 5
+        exported = client.get("/api/v1/mission/done-mission/results/export", params={"format": "csv"})
+        assert exported.headers["content-type"].startswith("text/csv")
+        assert exported.text.splitlines()[0] == "url,prices"
+        
+        assert client.get("/api/v1/mission/unknown/results").status_code == 404
+        assert client.get("/api/v1/mission/unknown/results/export").status_code == 404
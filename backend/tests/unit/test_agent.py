@@ -1,8 +1,17 @@
 """Unit tests for MarketRadarAgent."""
 import pytest
+import threading
 from unittest.mock import Mock, patch
 from services.agent import MarketRadarAgent
 from infrastructure.memory import Memory
+from infrastructure.metrics import RadarMetrics
+from infrastructure.page_cache import PageCache
+from services.convergence import PriceConvergence
+from services.budget import BudgetTracker
+from core.domain.models import BudgetLimits
+from core.cancellation import CancellationToken
+from core.exceptions import MissionCancelledError
+from core.domain.events import ActionEvent, CompleteEvent, ExtractionEvent, StatusEvent
 
 
 class TestMarketRadarAgent:
@@ -135,3 +144,251 @@ class TestMarketRadarAgent:
         
         assert result["success"] is True
         assert "data" in result
+    
+    def test_needs_more_sources_until_price_converges(self, agent):
+        """Test that average missions continue past min_sources until converged."""
+        goal_analysis = {"type": "average_calculation"}
+        agent.sources_visited = [f"https://shop{i}.com" for i in range(agent.min_sources)]
+        agent.price_estimate.add_prices([20.0, 150.0, 60.0, 300.0])
+        
+        assert agent.needs_more_sources(goal_analysis) is True
+        
+        agent.sources_visited = agent.sources_visited[:2]
+        agent.price_estimate = PriceConvergence(min_prices=3)
+        agent.price_estimate.add_prices([100.0, 101.0, 99.0, 100.5])
+        
+        assert agent.needs_more_sources(goal_analysis) is False
+    
+    def test_needs_more_sources_capped_at_max_sources(self, agent):
+        """Test that unconverged average missions stop at max_sources."""
+        goal_analysis = {"type": "average_calculation"}
+        agent.sources_visited = [f"https://shop{i}.com" for i in range(agent.max_sources)]
+        agent.price_estimate.add_prices([20.0, 150.0, 60.0, 300.0])
+        
+        assert agent.needs_more_sources(goal_analysis) is False
+    
+    def test_unconverged_estimate_finishes_incomplete(self, agent):
+        """Test that stopping at max_sources without convergence is not reported as achieved."""
+        agent.sources_visited = [f"https://shop{i}.com" for i in range(agent.max_sources)]
+        agent.price_estimate.add_prices([20.0, 150.0, 60.0, 300.0])
+        
+        command = agent.finish_with_estimate()
+        
+        assert command["is_goal_achieved"] is False
+        assert command["action"]["params"]["reason"] == "not_converged"
+        assert agent.goal_achieved is False
+    
+    def test_needs_more_sources_for_general_research(self, agent):
+        """Test that non-average missions stop at min_sources."""
+        goal_analysis = {"type": "price_research"}
+        agent.sources_visited = [f"https://shop{i}.com" for i in range(agent.min_sources)]
+        
+        assert agent.needs_more_sources(goal_analysis) is False
+    
+    def test_goto_uses_fresh_cache_hit(self, mock_browser_engine, memory, sample_extracted_data):
+        """Test that a cached page is counted as a source without navigating."""
+        page_cache = PageCache()
+        page_cache.put("https://example.com/product", sample_extracted_data)
+        agent = MarketRadarAgent(mock_browser_engine, memory, "Find the average price of Creatine in Brazil", page_cache=page_cache)
+        
+        result = agent.execute_action({
+            "action": {"name": "goto", "params": {"url": "https://example.com/product"}}
+        })
+        
+        assert result["cached"] is True
+        mock_browser_engine.goto.assert_not_called()
+        assert agent.sources_visited == ["https://example.com/product"]
+        assert agent.price_estimate.count == 3
+        assert memory.get_extracted_data()[0]["cached"] is True
+    
+    def test_goto_waits_for_fetch_in_progress(self, mock_browser_engine, memory, sample_extracted_data):
+        """Test that a page another mission is fetching is read from its extraction."""
+        page_cache = PageCache()
+        page_cache.claim_fetch("https://example.com/product")
+        agent = MarketRadarAgent(mock_browser_engine, memory, "Find the average price of Creatine in Brazil", page_cache=page_cache)
+        other_mission = threading.Timer(0.05, page_cache.put, args=("https://example.com/product", sample_extracted_data))
+        other_mission.start()
+        
+        result = agent.execute_action({
+            "action": {"name": "goto", "params": {"url": "https://example.com/product"}}
+        })
+        other_mission.join()
+        
+        assert result["cached"] is True
+        mock_browser_engine.goto.assert_not_called()
+        assert agent.sources_visited == ["https://example.com/product"]
+    
+    def test_cached_links_stop_at_max_sources(self, mock_browser_engine, memory):
+        """Test that a warm results page adds cached sources only while more are needed."""
+        page_cache = PageCache()
+        agent = MarketRadarAgent(mock_browser_engine, memory, "Find the average price of Creatine in Brazil", page_cache=page_cache)
+        agent.max_sources = 2
+        links = []
+        for i in range(5):
+            url = f"https://shop{i}.com/creatine"
+            page_cache.put(url, {"prices": [{"value": 20.0 + 100 * i}]})
+            links.append({"tag": "a", "id": f"l{i}", "text": "Creatine 300g", "href": url})
+        page_cache.claim_fetch("https://slow.com/creatine")
+        links.insert(0, {"tag": "a", "id": "slow", "text": "Creatine 300g", "href": "https://slow.com/creatine"})
+        
+        agent.decide_action({
+            "url": "https://www.google.com/search?q=creatine",
+            "interactive_elements": links,
+            "visible_text": "results",
+            "title": "Google"
+        })
+        
+        assert agent.sources_visited == ["https://shop0.com/creatine", "https://shop1.com/creatine"]
+    
+    def test_click_claims_fetch_until_navigation_fails(self, mock_browser_engine, memory):
+        """Test that clicking a source claims its URL and releases it on failure."""
+        page_cache = PageCache()
+        agent = MarketRadarAgent(mock_browser_engine, memory, "Find the average price of Creatine in Brazil", page_cache=page_cache)
+        
+        def click(selector):
+            assert page_cache.claim_fetch("https://shop.com/p") is False
+            return {"success": False, "error": "Timeout"}
+        
+        mock_browser_engine.click.side_effect = click
+        agent.execute_action({
+            "action": {"name": "click", "params": {"selector": "#link", "href": "https://shop.com/p"}}
+        })
+        
+        assert page_cache.claim_fetch("https://shop.com/p") is True
+    
+    def test_navigations_go_through_rate_limiter(self, mock_browser_engine, memory):
+        """Test that gotos and search submissions wait for the host and report the outcome."""
+        rate_limiter = Mock()
+        agent = MarketRadarAgent(mock_browser_engine, memory, "Find the average price of Creatine in Brazil", rate_limiter=rate_limiter)
+        mock_browser_engine.goto.return_value = {"success": True, "url": "https://shop.com/p", "status": 429}
+        
+        agent.execute_action({"action": {"name": "goto", "params": {"url": "https://shop.com/p"}}})
+        agent.execute_action({
+            "action": {"name": "type", "params": {"selector": "#q", "text": "creatina", "press_enter": True}}
+        })
+        agent.execute_action({"action": {"name": "type", "params": {"selector": "#q", "text": "creatina"}}})
+        
+        assert [c.args[0] for c in rate_limiter.acquire.call_args_list] == ["https://shop.com/p", "https://www.google.com"]
+        rate_limiter.report.assert_any_call("https://shop.com/p", {"success": True, "url": "https://shop.com/p", "status": 429})
+    
+    def test_step_records_phase_and_navigation_metrics(self, mock_browser_engine, memory):
+        """Test that a step times its phases and navigations are timed per domain."""
+        metrics = RadarMetrics()
+        agent = MarketRadarAgent(mock_browser_engine, memory, "Find the average price of Creatine in Brazil", metrics=metrics)
+        mock_browser_engine.goto.return_value = {"success": True, "url": "https://www.shop.com/p"}
+        
+        agent.step()
+        agent.execute_action({"action": {"name": "goto", "params": {"url": "https://www.shop.com/p"}}})
+        
+        phases = metrics.iteration_phase_seconds
+        assert all(phases.snapshot(phase)["count"] == 1 for phase in ("snapshot", "decide", "execute"))
+        assert metrics.navigation_seconds.snapshot("shop.com")["count"] == 1
+    
+    def test_budget_exhaustion_finishes_gracefully(self, mock_browser_engine, memory):
+        """Test that an exhausted budget ends the mission with partial results."""
+        budget = BudgetTracker(BudgetLimits(max_pages=1))
+        budget.start()
+        agent = MarketRadarAgent(mock_browser_engine, memory, "Find the average price of Creatine in Brazil", budget=budget)
+        
+        agent.execute_action({"action": {"name": "goto", "params": {"url": "https://example.com"}}})
+        command = agent.decide_action(mock_browser_engine.get_page_state())
+        
+        assert command["action"]["name"] == "finish"
+        assert command["action"]["params"]["reason"] == "budget_exhausted:pages"
+        assert command["is_goal_achieved"] is False
+        assert budget.pages == 1
+    
+    def test_step_returns_action_event(self, agent):
+        """Test that step() returns a typed event instead of a JSON string."""
+        event = agent.step()
+        
+        assert isinstance(event, ActionEvent)
+        assert event.iteration == 1
+        assert event.to_message()["type"] == "action"
+    
+    def test_run_yields_event_stream(self, agent, mock_browser_engine):
+        """Test the event sequence of a mission that runs out of iterations."""
+        events = list(agent.run(max_iterations=3))
+        
+        assert isinstance(events[0], StatusEvent)
+        assert [e.iteration for e in events if isinstance(e, ActionEvent)] == [1, 2, 3]
+        assert isinstance(events[-1], CompleteEvent)
+        assert events[-1].type == "incomplete"
+        assert events[-1].reason == "max_iterations"
+        mock_browser_engine.goto.assert_called_once_with("https://www.google.com")
+    
+    def test_run_yields_extraction_and_complete(self, mock_browser_engine, memory, sample_extracted_data):
+        """Test that cached sources produce extraction events and the mission completes."""
+        page_cache = PageCache()
+        agent = MarketRadarAgent(mock_browser_engine, memory, "Find the average price of Creatine in Brazil", page_cache=page_cache)
+        agent.settings.agent_min_price_sources = 1
+        page_cache.put("https://shop.com/creatine", {"prices": [{"value": 100.0}, {"value": 100.5}, {"value": 99.5}]})
+        links = [{"tag": "a", "id": "l1", "text": "Creatine 300g", "href": "https://shop.com/creatine"}]
+        mock_browser_engine.get_page_state.return_value = {
+            "url": "https://www.google.com/search?q=creatine",
+            "interactive_elements": links,
+            "visible_text": "results",
+            "title": "Google"
+        }
+        mock_browser_engine.current_url = "https://www.google.com/search?q=creatine"
+        agent.find_search_input = Mock(return_value=None)
+        
+        events = list(agent.run(start_url=None, max_iterations=5))
+        
+        extraction = next(e for e in events if isinstance(e, ExtractionEvent))
+        assert extraction.cached is True
+        assert events[-1].type == "complete"
+        assert events[-1].extracted_data[-1]["average_price"] == pytest.approx(100.0)
+    
+    def test_escape_oscillation_loop(self, agent, mock_browser_engine):
+        """Test that an A -> B oscillation blocks the page and changes the query."""
+        search = "https://www.google.com/search?q=creatina"
+        for _ in range(3):
+            agent.memory.add_action("goto", {"url": search}, search, {"success": True})
+            agent.memory.add_action("click", {"selector": "#l1"}, "https://shop.com/p", {"success": True})
+        
+        action = agent.decide_action(mock_browser_engine.get_page_state())
+        
+        assert action["action"]["name"] == "goto"
+        assert "/search?q=" in action["action"]["params"]["url"]
+        assert "https://shop.com/p" in agent.blocked_urls
+        assert search not in agent.blocked_urls
+        assert agent.should_visit_link({"text": "Creatine 300g", "href": "https://shop.com/p"}, agent.analyze_goal()) is False
+        assert agent.memory.detect_loop() is None
+    
+    def test_resume_from_state(self, agent, mock_browser_engine, memory):
+        """Test that a restored agent continues from its checkpoint without revisiting sources."""
+        mock_browser_engine.get_storage_state.return_value = {"cookies": []}
+        agent.iteration_count = 7
+        agent.sources_visited = ["https://shop.com/a"]
+        agent.price_estimate.add_prices([100.0, 110.0])
+        state = agent.get_state()
+        
+        resumed = MarketRadarAgent(mock_browser_engine, Memory(), agent.global_goal)
+        resumed.restore_state(state)
+        events = list(resumed.run(start_url=None, max_iterations=9))
+        
+        assert state["browser_state"] == {"cookies": []}
+        assert events[0].message == "Mission resumed"
+        assert [e.iteration for e in events if isinstance(e, ActionEvent)] == [8, 9]
+        assert resumed.price_estimate.count == 2
+        assert resumed.should_visit_link({"text": "Creatine 300g", "href": "https://shop.com/a"}, resumed.analyze_goal()) is False
+    
+    def test_run_stops_when_cancelled(self, mock_browser_engine, memory):
+        """Test that a cancelled mission stops between actions."""
+        token = CancellationToken()
+        agent = MarketRadarAgent(
+            mock_browser_engine,
+            memory,
+            "Find the average price of Creatine in Brazil",
+            cancel_token=token
+        )
+        events = agent.run(max_iterations=50)
+        next(events)
+        next(events)
+        
+        token.cancel()
+        
+        with pytest.raises(MissionCancelledError):
+            list(events)
+        assert agent.iteration_count <= 2
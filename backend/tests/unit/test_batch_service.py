@@ -0,0 +1,145 @@
+"""Unit tests for BatchService."""
+import asyncio
+import pytest
+from core.exceptions import BatchNotFoundError, MissionQueueFullError
+from services.batch_service import BatchService, goal_query_key, summarize_events
+
+
+class TestGoalQueryKey:
+    """Test suite for goal_query_key."""
+    
+    def test_equivalent_goals_share_key(self):
+        """Test that rephrasings of the same research share a key."""
+        assert goal_query_key("Qual o preço de Creatina em Brasil?") == goal_query_key("preço da creatina no brasil")
+    
+    def test_different_research_differs(self):
+        """Test that different topics or research types get different keys."""
+        assert goal_query_key("price of creatine") != goal_query_key("price of whey")
+        assert goal_query_key("price of creatine") != goal_query_key("average price of creatine")
+
+
+class TestSummarizeEvents:
+    """Test suite for summarize_events."""
+    
+    def test_progress_then_result(self):
+        """Test that the latest events decide the goal state."""
+        events = [
+            {"type": "queued", "position": 2},
+            {"type": "action", "iteration": 3, "sources_visited": 1, "extracted_data_count": 4}
+        ]
+        
+        assert summarize_events(events) == {
+            "status": "running", "iteration": 3, "sources_visited": 1, "data_points": 4
+        }
+        
+        state = summarize_events(events + [
+            {"type": "incomplete", "summary": "Partial", "extracted_data": [{"n": 1}], "message": "Max iterations reached"},
+            {"type": "finished"}
+        ])
+        assert state["status"] == "incomplete"
+        assert state["extracted_data"] == [{"n": 1}]
+    
+    def test_fatal_error(self):
+        """Test that a fatal error fails the goal."""
+        state = summarize_events([{"type": "error", "message": "Mission failed: boom", "fatal": True}])
+        
+        assert state["status"] == "failed"
+        assert state["error"] == "Mission failed: boom"
+
+
+class TestBatchService:
+    """Test suite for BatchService."""
+    
+    @pytest.fixture
+    def launched(self):
+        """Missions handed to the launcher."""
+        return []
+    
+    @pytest.fixture
+    def batch_service(self, mission_service, launched):
+        """Create BatchService whose launcher records missions instead of running them."""
+        def launcher(mission_id, client_id):
+            launched.append(mission_id)
+            return None
+        
+        return BatchService(mission_service, launcher)
+    
+    def test_overlapping_goals_share_one_mission(self, batch_service, launched):
+        """Test that goals compiling to the same research start a single mission."""
+        result = batch_service.create_batch([
+            "preço de creatina no brasil",
+            "Qual o preço da Creatina em Brasil?",
+            "preço de whey no brasil"
+        ])
+        
+        goals = result["goals"]
+        assert result["missions"] == 2
+        assert result["started"] == 2
+        assert goals[0]["mission_id"] == goals[1]["mission_id"] != goals[2]["mission_id"]
+        assert [goal["shared"] for goal in goals] == [False, True, False]
+        assert launched == [goals[0]["mission_id"], goals[2]["mission_id"]]
+    
+    def test_cached_goal_is_not_started(self, batch_service, mission_service, launched):
+        """Test that a goal with a fresh cached result reuses it."""
+        mission_service.result_cache.put("preço de creatina", "old-mission", "Done", [{"price": 10}])
+        
+        result = batch_service.create_batch(["preço de creatina"])
+        progress = batch_service.get_batch(result["batch_id"])
+        
+        assert launched == []
+        assert progress["is_complete"] is True
+        assert progress["goals"][0]["status"] == "complete"
+        assert progress["goals"][0]["extracted_data"] == [{"price": 10}]
+    
+    def test_aggregate_progress(self, batch_service, mission_service):
+        """Test that batch progress follows each mission's events."""
+        result = batch_service.create_batch(["preço de creatina", "preço de whey"])
+        creatine, whey = (goal["mission_id"] for goal in result["goals"])
+        
+        mission_service.publish(creatine, {"type": "action", "iteration": 1, "sources_visited": 0, "extracted_data_count": 0})
+        mission_service.publish(whey, {"type": "complete", "summary": "Whey done", "extracted_data": []})
+        progress = batch_service.get_batch(result["batch_id"])
+        
+        assert progress["counts"] == {"running": 1, "complete": 1}
+        assert progress["done"] == 1
+        assert progress["is_complete"] is False
+    
+    def test_queue_full_rejects_goal(self, mission_service):
+        """Test that goals the scheduler cannot accept are reported, not lost."""
+        def launcher(mission_id, client_id):
+            raise MissionQueueFullError("Mission queue is full")
+        
+        batch_service = BatchService(mission_service, launcher)
+        result = batch_service.create_batch(["preço de creatina"])
+        
+        assert result["started"] == 0
+        assert batch_service.get_batch(result["batch_id"])["goals"][0]["status"] == "rejected"
+        assert not mission_service.repository.exists(result["goals"][0]["mission_id"])
+    
+    def test_iter_completions(self, batch_service, mission_service):
+        """Test that each goal is yielded once its mission finishes, shared goals included."""
+        result = batch_service.create_batch(["preço de creatina", "preço da creatina", "preço de whey"])
+        creatine, _, whey = (goal["mission_id"] for goal in result["goals"])
+        mission_service.publish(whey, {"type": "finished"})
+        
+        async def collect():
+            completions = []
+            async for completion in batch_service.iter_completions(result["batch_id"]):
+                completions.append(completion)
+                if len(completions) == 1:
+                    loop = asyncio.get_running_loop()
+                    loop.call_later(0.01, mission_service.publish, creatine, {"type": "complete", "summary": "Done"})
+            return completions
+        
+        completions = asyncio.run(asyncio.wait_for(collect(), timeout=5))
+        
+        assert [completion["index"] for completion in completions] == [2, 0, 1]
+        assert [completion["status"] for completion in completions] == ["finished", "complete", "complete"]
+        assert mission_service._get_hub(creatine).subscriber_count == 0
+    
+    def test_unknown_batch(self, batch_service):
+        """Test that unknown batches raise BatchNotFoundError."""
+        with pytest.raises(BatchNotFoundError):
+            batch_service.get_batch("missing")
+        with pytest.raises(BatchNotFoundError):
+            batch_service.iter_completions("missing")
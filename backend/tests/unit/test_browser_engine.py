@@ -7,7 +7,8 @@ from unittest.mock import Mock, patch, MagicMock
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from infrastructure.browser_engine import BrowserEngine
+from infrastructure.browser_engine import BrowserEngine, PlaywrightTimeoutError
+from core.cancellation import CancellationToken
 
 
 class TestBrowserEngine:
@@ -170,3 +171,64 @@ class TestBrowserEngine:
         assert state["title"] == "Test Page"
         assert "interactive_elements" in state
         assert "visible_text" in state
+    
+    def test_goto_waits_for_network_idle_in_chunks(self, browser_engine):
+        """Test that navigation keeps waiting across chunk timeouts until the page settles."""
+        browser_engine.page = Mock()
+        browser_engine.page.url = "https://example.com"
+        browser_engine.page.wait_for_load_state = Mock(
+            side_effect=[PlaywrightTimeoutError("busy"), PlaywrightTimeoutError("busy"), None]
+        )
+        
+        result = browser_engine.goto("https://example.com")
+        
+        assert result["success"] is True
+        assert browser_engine.page.wait_for_load_state.call_count == 3
+        assert browser_engine.page.goto.call_args.kwargs["wait_until"] == "commit"
+    
+    def test_goto_reports_navigation_status(self, browser_engine):
+        """Test that navigation results carry the document status, Retry-After and title."""
+        browser_engine.page = Mock()
+        browser_engine.page.url = "https://shop.com/p"
+        browser_engine.page.title.return_value = "Too Many Requests"
+        response = Mock(status=429, headers={"retry-after": "30"}, frame=browser_engine.page.main_frame)
+        response.request.is_navigation_request.return_value = True
+        browser_engine.page.goto = Mock(side_effect=lambda *args, **kwargs: browser_engine._on_response(response))
+        
+        result = browser_engine.goto("https://shop.com/p")
+        
+        assert result == {
+            "success": True,
+            "url": "https://shop.com/p",
+            "status": 429,
+            "retry_after": 30.0,
+            "title": "Too Many Requests"
+        }
+    
+    def test_goto_interrupted_by_cancellation(self, browser_engine):
+        """Test that a cancelled mission stops waiting for navigation."""
+        token = CancellationToken()
+        browser_engine.cancel_token = token
+        browser_engine.page = Mock()
+        
+        def busy(state, timeout):
+            token.cancel()
+            raise PlaywrightTimeoutError("busy")
+        
+        browser_engine.page.wait_for_load_state = Mock(side_effect=busy)
+        
+        result = browser_engine.goto("https://example.com")
+        
+        assert result["success"] is False
+        assert "cancelled" in result["error"]
+        assert browser_engine.page.wait_for_load_state.call_count == 1
+    
+    def test_wait_interrupted_by_cancellation(self, browser_engine):
+        """Test that the wait action returns as soon as the mission is cancelled."""
+        token = CancellationToken()
+        token.cancel()
+        browser_engine.cancel_token = token
+        
+        result = browser_engine.wait(30)
+        
+        assert result["success"] is False
@@ -0,0 +1,87 @@
+"""Unit tests for BudgetTracker."""
+import pytest
+from config.settings import Settings
+from core.domain.models import BudgetLimits
+from services.budget import BudgetTracker, default_limits
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestBudgetTracker:
+    """Test suite for BudgetTracker."""
+    
+    def test_default_limits_use_settings_and_overrides(self):
+        """Test building limits from settings with per-mission overrides."""
+        settings = Settings()
+        limits = default_limits(settings, max_iterations=7, max_pages=None)
+        
+        assert limits.max_iterations == 7
+        assert limits.max_pages == settings.budget_max_pages
+        assert limits.max_seconds == settings.budget_max_seconds
+    
+    def test_time_budget(self):
+        """Test wall-clock exhaustion and remaining time."""
+        clock = FakeClock()
+        tracker = BudgetTracker(BudgetLimits(max_seconds=10), clock=clock, cpu_clock=clock)
+        tracker.start()
+        
+        clock.now = 4.0
+        assert tracker.exhausted() is None
+        assert tracker.remaining_seconds() == pytest.approx(6.0)
+        
+        clock.now = 10.0
+        assert tracker.exhausted() == "time"
+    
+    def test_page_and_byte_budgets(self):
+        """Test page and network byte exhaustion."""
+        tracker = BudgetTracker(BudgetLimits(max_pages=2, max_bytes=1000))
+        tracker.start()
+        
+        tracker.charge_page()
+        tracker.record_bytes(500)
+        assert tracker.exhausted() is None
+        
+        tracker.record_bytes(1200)
+        assert tracker.exhausted() == "bytes"
+        
+        tracker.record_bytes(0)
+        assert tracker.bytes_received == 1200
+    
+    def test_usage_report(self):
+        """Test usage report shape."""
+        tracker = BudgetTracker(BudgetLimits(max_iterations=5))
+        tracker.start()
+        tracker.charge_iteration()
+        
+        usage = tracker.usage()
+        
+        assert usage["iterations"] == {"used": 1, "limit": 5}
+        assert usage["pages"]["limit"] is None
+        assert set(usage) == {"iterations", "seconds", "pages", "bytes", "cpu_seconds"}
+    
+    def test_restore_state_carries_consumption(self):
+        """Test that a resumed mission keeps the budget already consumed."""
+        clock = FakeClock()
+        tracker = BudgetTracker(BudgetLimits(max_seconds=10, max_pages=5), clock=clock, cpu_clock=clock)
+        tracker.start()
+        clock.now = 6.0
+        tracker.charge_page(3)
+        state = tracker.get_state()
+        
+        resumed = BudgetTracker(BudgetLimits(max_seconds=10, max_pages=5), clock=clock, cpu_clock=clock)
+        resumed.start()
+        resumed.restore_state(state)
+        clock.now = 9.0
+        
+        assert resumed.pages == 3
+        assert resumed.elapsed_seconds == pytest.approx(9.0)
+        clock.now = 10.0
+        assert resumed.exhausted() == "time"
@@ -0,0 +1,47 @@
+"""Unit tests for CancellationToken."""
+import threading
+import time
+import pytest
+from core.cancellation import CancellationToken
+from core.exceptions import MissionCancelledError
+
+
+class TestCancellationToken:
+    """Test suite for CancellationToken."""
+    
+    def test_cancel_raises_with_reason(self):
+        """Test that a cancelled token raises MissionCancelledError."""
+        token = CancellationToken()
+        token.raise_if_cancelled()
+        
+        token.cancel("user request")
+        
+        assert token.is_cancelled
+        with pytest.raises(MissionCancelledError, match="user request"):
+            token.raise_if_cancelled()
+    
+    def test_wait_returns_early_when_cancelled(self):
+        """Test that wait() is interrupted by a cancel from another thread."""
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+        
+        started = time.monotonic()
+        cancelled = token.wait(5)
+        
+        assert cancelled is True
+        assert time.monotonic() - started < 1
+    
+    def test_wait_times_out_without_cancel(self):
+        """Test that wait() sleeps the full time when not cancelled."""
+        assert CancellationToken().wait(0.01) is False
+    
+    def test_acknowledge(self):
+        """Test that wait_done() observes the acknowledgement."""
+        token = CancellationToken()
+        
+        assert token.wait_done(0.01) is False
+        
+        threading.Timer(0.05, token.acknowledge).start()
+        
+        assert token.wait_done(1) is True
+        assert token.is_done
@@ -0,0 +1,36 @@
+"""Unit tests for CheckpointStore."""
+import pytest
+from infrastructure.checkpoint_store import CheckpointStore
+
+
+class TestCheckpointStore:
+    """Test suite for CheckpointStore."""
+    
+    def test_save_and_load(self, tmp_path):
+        """Test checkpoint round trip."""
+        store = CheckpointStore(str(tmp_path))
+        store.save("mission-1", {"agent": {"iteration_count": 5}})
+        
+        checkpoint = store.load("mission-1")
+        
+        assert checkpoint["agent"]["iteration_count"] == 5
+        assert "saved_at" in checkpoint
+        assert store.list() == ["mission-1"]
+    
+    def test_delete(self, tmp_path):
+        """Test deleting checkpoints, including missing ones."""
+        store = CheckpointStore(str(tmp_path))
+        store.save("mission-1", {})
+        
+        store.delete("mission-1")
+        store.delete("mission-1")
+        
+        assert store.load("mission-1") is None
+    
+    def test_rejects_path_traversal(self, tmp_path):
+        """Test that mission IDs cannot escape the checkpoint directory."""
+        store = CheckpointStore(str(tmp_path))
+        
+        assert store.load("../secrets") is None
+        with pytest.raises(ValueError):
+            store.save("../secrets", {})
@@ -0,0 +1,99 @@
+"""Unit tests for PriceConvergence."""
+import math
+import statistics
+import pytest
+from core.stats import RunningStats
+from services.convergence import PriceConvergence, t_quantile
+
+
+class TestRunningStats:
+    """Test suite for RunningStats."""
+    
+    def test_matches_batch_statistics(self):
+        """Test Welford accumulator against the statistics module."""
+        values = [49.9, 55.0, 61.3, 58.7, 52.1]
+        stats = RunningStats()
+        stats.extend(values)
+        
+        assert stats.count == 5
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values))
+        assert stats.minimum == 49.9
+        assert stats.maximum == 61.3
+    
+    def test_single_value_has_infinite_error(self):
+        """Test that one observation gives no usable error estimate."""
+        stats = RunningStats()
+        stats.add(10.0)
+        
+        assert stats.variance == 0.0
+        assert math.isinf(stats.std_error)
+
+
+class TestPriceConvergence:
+    """Test suite for PriceConvergence."""
+    
+    def test_add_prices_accepts_extractor_payloads(self, sample_extracted_data):
+        """Test adding price dicts, plain numbers and skipping invalid values."""
+        tracker = PriceConvergence()
+        
+        added = tracker.add_prices(sample_extracted_data["prices"])
+        added += tracker.add_prices(65.0)
+        added += tracker.add_prices([{"value": 0}, "n/a"])
+        
+        assert added == 4
+        assert tracker.estimate == pytest.approx(57.5)
+    
+    def test_t_quantile_approaches_normal(self):
+        """Test t quantile approximation."""
+        assert t_quantile(0.95, 4) == pytest.approx(2.776, rel=0.02)
+        assert t_quantile(0.95, 1000) == pytest.approx(1.96, rel=0.01)
+    
+    @pytest.mark.parametrize("confidence, dof, expected", [
+        (0.95, 2, 4.303),
+        (0.95, 5, 2.571),
+        (0.95, 30, 2.042),
+        (0.99, 2, 9.925),
+        (0.99, 5, 4.032),
+        (0.99, 30, 2.750),
+        (0.90, 2, 2.920),
+        (0.90, 5, 2.015),
+        (0.90, 30, 1.697)
+    ])
+    def test_t_quantile_matches_tables(self, confidence, dof, expected):
+        """Test the t quantile against tabulated values, small samples included."""
+        assert t_quantile(confidence, dof) == pytest.approx(expected, abs=5e-4)
+    
+    def test_converges_on_consistent_prices(self):
+        """Test that tightly clustered prices meet the precision target."""
+        tracker = PriceConvergence(relative_precision=0.05, min_prices=3)
+        tracker.add_prices([100.0, 101.0, 99.0, 100.5])
+        
+        assert tracker.is_converged() is True
+        lower, upper = tracker.confidence_interval()
+        assert lower < 100.125 < upper
+    
+    def test_does_not_converge_on_noisy_prices(self):
+        """Test that widely spread prices keep the mission going."""
+        tracker = PriceConvergence(relative_precision=0.05, min_prices=3)
+        tracker.add_prices([20.0, 150.0, 60.0, 300.0])
+        
+        assert tracker.is_converged() is False
+        assert tracker.to_dict()["converged"] is False
+    
+    def test_min_prices_required(self):
+        """Test that convergence needs the minimum sample size."""
+        tracker = PriceConvergence(min_prices=3)
+        tracker.add_prices([100.0, 100.0])
+        
+        assert tracker.is_converged() is False
+    
+    def test_bootstrap_interval(self):
+        """Test on-demand bootstrap interval."""
+        tracker = PriceConvergence()
+        tracker.add_prices([50.0, 55.0, 60.0, 52.0, 58.0])
+        
+        lower, upper = tracker.bootstrap_interval(resamples=500, seed=1)
+        
+        assert lower <= tracker.estimate <= upper
+        assert PriceConvergence().bootstrap_interval() is None
@@ -0,0 +1,119 @@
+"""Unit tests for SQLiteEventBus and missions shared between API processes."""
+import threading
+import pytest
+from infrastructure.event_bus import ACK, EVENT, SQLiteEventBus
+from repositories.mission_repository import SQLiteMissionRepository
+from services.mission_service import MissionService
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until a condition holds."""
+    event = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        event.wait(0.01)
+    return False
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two mission services sharing their state the way two uvicorn workers do."""
+    services = [
+        MissionService(
+            SQLiteMissionRepository(str(tmp_path / "missions.db")),
+            event_bus=SQLiteEventBus(str(tmp_path / "events.db"), poll_interval=0.01)
+        )
+        for _ in range(2)
+    ]
+    yield services
+    for service in services:
+        service.event_bus.stop()
+
+
+class TestSQLiteEventBus:
+    """Test suite for SQLiteEventBus."""
+    
+    def test_recent_events(self, tmp_path):
+        """Test that recent() returns the latest events of one mission, oldest first."""
+        bus = SQLiteEventBus(str(tmp_path / "events.db"))
+        for i in range(5):
+            bus.append("m1", EVENT, {"n": i})
+        bus.append("m1", ACK)
+        bus.append("m2", EVENT, {"n": 99})
+        
+        events, seq = bus.recent("m1", 3)
+        
+        assert events == [{"n": 2}, {"n": 3}, {"n": 4}]
+        assert seq == 5
+        assert bus.recent("missing", 3) == ([], 0)
+    
+    def test_tail_skips_own_entries(self, tmp_path):
+        """Test that a bus only delivers entries appended by other processes."""
+        path = str(tmp_path / "events.db")
+        own, other = SQLiteEventBus(path, poll_interval=0.01), SQLiteEventBus(path)
+        received = []
+        own.start(lambda seq, kind, mission_id, message: received.append((kind, mission_id, message)))
+        
+        own.append("m1", EVENT, {"from": "own"})
+        other.append("m1", EVENT, {"from": "other"})
+        
+        assert wait_for(lambda: received)
+        own.stop()
+        assert received == [(EVENT, "m1", {"from": "other"})]
+    
+    def test_prune(self, tmp_path):
+        """Test that entries older than the retention window are dropped."""
+        bus = SQLiteEventBus(str(tmp_path / "events.db"), retention=1)
+        bus.append("m1", EVENT, {"n": 1})
+        bus._connection().execute("UPDATE mission_events SET created_at = created_at - 10")
+        bus.append("m1", EVENT, {"n": 2})
+        
+        assert bus.prune() == 1
+        assert bus.recent("m1", 10)[0] == [{"n": 2}]
+
+
+class TestSharedMissions:
+    """Test suite for missions served by several processes."""
+    
+    def test_any_worker_streams_any_mission(self, workers):
+        """Test that a mission started on one worker streams on another, without duplicates."""
+        first, second = workers
+        mission_id = first.create_mission("preço de creatina")["mission_id"]
+        first.publish(mission_id, {"type": "action", "iteration": 1})
+        
+        channel = second.subscribe(mission_id)
+        first.publish(mission_id, {"type": "action", "iteration": 2})
+        first.publish(mission_id, {"type": "finished"})
+        
+        assert wait_for(lambda: second.recent_events(mission_id)[-1]["type"] == "finished")
+        messages = []
+        while not channel.empty():
+            messages.append(channel.get_nowait())
+        assert [message.get("iteration") for message in messages] == [1, 2, None]
+    
+    def test_stop_from_another_worker(self, workers):
+        """Test that stopping on one worker cancels the mission running on another."""
+        first, second = workers
+        mission_id = first.create_mission("preço de creatina")["mission_id"]
+        cancelled = []
+        
+        def run(mission_id, cancel_token):
+            cancelled.append(cancel_token.wait(5))
+            first.finish_mission(mission_id)
+        
+        first.start_mission_thread(mission_id, run)
+        
+        assert second.stop_mission(mission_id, timeout=5) is True
+        assert cancelled == [True]
+        assert wait_for(lambda: any(event["type"] == "stopped" for event in first.recent_events(mission_id)))
+    
+    def test_delete_drops_hubs_everywhere(self, workers):
+        """Test that deleting a mission on one worker forgets it on the others."""
+        first, second = workers
+        mission_id = first.create_mission("preço de creatina")["mission_id"]
+        second.subscribe(mission_id)
+        
+        first.delete_mission(mission_id)
+        
+        assert wait_for(lambda: mission_id not in second._hubs)
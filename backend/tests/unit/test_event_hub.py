@@ -0,0 +1,168 @@
+"""Unit tests for MissionHub and subscriber outboxes."""
+import json
+from unittest.mock import patch
+from infrastructure.event_hub import EncodedMessage, MissionHub, Outbox, ProgressDelta
+
+
+class TestMissionHub:
+    """Test suite for MissionHub."""
+    
+    def test_fan_out_to_all_subscribers(self):
+        """Test that every subscriber receives each event."""
+        hub = MissionHub()
+        first = hub.subscribe()
+        second = hub.subscribe()
+        
+        hub.publish({"type": "action", "iteration": 1})
+        
+        assert first.get_nowait() == {"type": "action", "iteration": 1}
+        assert second.get_nowait() == {"type": "action", "iteration": 1}
+        assert hub.subscriber_count == 2
+    
+    def test_serializes_once_per_event(self):
+        """Test that the JSON bytes are built once regardless of subscriber count."""
+        hub = MissionHub()
+        channels = [hub.subscribe() for _ in range(50)]
+        
+        with patch("infrastructure.event_hub.dumps", wraps=lambda value: json.dumps(value).encode()) as encode:
+            hub.publish({"type": "status"})
+        
+        assert encode.call_count == 1
+        received = [channel.get_nowait() for channel in channels]
+        assert all(message is received[0] for message in received)
+        assert isinstance(received[0], EncodedMessage)
+        assert json.loads(received[0].text) == {"type": "status"}
+        assert received[0].text is received[-1].text
+    
+    def test_late_subscriber_replays_bounded_buffer(self):
+        """Test that late joiners catch up on the most recent events only."""
+        hub = MissionHub(replay_size=3)
+        for i in range(5):
+            hub.publish({"n": i})
+        
+        late = hub.subscribe()
+        fresh = hub.subscribe(replay=False)
+        hub.publish({"n": 5})
+        
+        assert [late.get_nowait()["n"] for _ in range(4)] == [2, 3, 4, 5]
+        assert fresh.get_nowait() == {"n": 5}
+        assert fresh.empty()
+    
+    def test_unsubscribe(self):
+        """Test that unsubscribed channels stop receiving events."""
+        hub = MissionHub()
+        channel = hub.subscribe()
+        hub.unsubscribe(channel)
+        
+        hub.publish({"type": "status"})
+        
+        assert channel.empty()
+        assert hub.subscriber_count == 0
+
+
+class TestOutbox:
+    """Test suite for Outbox."""
+    
+    def test_latest_status_wins(self):
+        """Test that a newer status replaces an unread one."""
+        outbox = Outbox(max_pending=10)
+        outbox.put({"type": "status", "message": "old"})
+        outbox.put({"type": "action", "iteration": 1})
+        outbox.put({"type": "status", "message": "new"})
+        
+        assert [outbox.get_nowait() for _ in range(2)] == [
+            {"type": "action", "iteration": 1},
+            {"type": "status", "message": "new"}
+        ]
+        assert outbox.coalesced == 1
+    
+    def test_actions_summarized_when_behind(self):
+        """Test that a slow consumer gets one action summarizing the ones it missed."""
+        outbox = Outbox(max_pending=3)
+        for i in range(10):
+            outbox.put({"type": "action", "iteration": i})
+        
+        pending = []
+        while not outbox.empty():
+            pending.append(outbox.get_nowait())
+        
+        assert len(pending) <= 3
+        assert pending[-1]["iteration"] == 9
+        assert sum(1 + message.get("skipped_actions", 0) for message in pending) == 10
+        assert json.loads(pending[-1].text)["skipped_actions"] == pending[-1]["skipped_actions"]
+    
+    def test_non_fatal_errors_stay_bounded(self):
+        """Test that a stalled client's outbox folds failed actions but keeps fatal errors."""
+        outbox = Outbox(max_pending=4)
+        outbox.put({"type": "error", "message": "fatal", "fatal": True})
+        for i in range(100):
+            outbox.put({"type": "action", "iteration": i})
+            outbox.put({"type": "error", "message": f"Action {i} failed", "fatal": False})
+        outbox.put({"type": "finished"})
+        
+        pending = []
+        while not outbox.empty():
+            pending.append(outbox.get_nowait())
+        
+        assert len(pending) <= 5
+        assert pending[0]["fatal"] is True
+        assert pending[-1]["type"] == "finished"
+        errors = [message for message in pending if message["type"] == "error" and not message["fatal"]]
+        assert errors[-1]["message"] == "Action 99 failed"
+        assert errors[-1]["skipped_errors"] > 0
+    
+    def test_bounded_but_keeps_results(self):
+        """Test that the outbox stays bounded without dropping results or endings."""
+        outbox = Outbox(max_pending=2)
+        outbox.put({"type": "extraction", "url": "a"})
+        outbox.put({"type": "extraction", "url": "b"})
+        outbox.put({"type": "extraction", "url": "c"})
+        outbox.put({"type": "complete", "summary": "done"})
+        outbox.put({"type": "finished"})
+        
+        pending = []
+        while not outbox.empty():
+            pending.append(outbox.get_nowait())
+        
+        assert [message["type"] for message in pending] == ["complete", "finished"]
+        assert outbox.dropped == 3
+    
+    def test_hub_subscribers_get_outboxes(self):
+        """Test that a late joiner's replay is coalesced to the outbox size."""
+        hub = MissionHub(outbox_size=4)
+        for i in range(50):
+            hub.publish({"type": "action", "iteration": i})
+        
+        channel = hub.subscribe()
+        
+        assert isinstance(channel, Outbox)
+        assert len(channel._messages) <= 4
+
+
+class TestProgressDelta:
+    """Test suite for ProgressDelta."""
+    
+    def test_only_changed_progress_fields(self):
+        """Test that repeated progress fields are left out of later actions."""
+        encoder = ProgressDelta()
+        budget = {"pages": {"used": 1, "limit": 60}, "seconds": {"used": 1.0, "limit": 900}}
+        first = json.loads(encoder.encode({"type": "action", "iteration": 1, "url": "a", "sources_visited": 0, "budget": budget}))
+        second = json.loads(encoder.encode({
+            "type": "action",
+            "iteration": 2,
+            "url": "a",
+            "sources_visited": 1,
+            "budget": {**budget, "seconds": {"used": 2.0, "limit": 900}}
+        }))
+        
+        assert first["url"] == "a" and first["budget"] == budget
+        assert "url" not in second
+        assert second["sources_visited"] == 1
+        assert second["budget"] == {"seconds": {"used": 2.0, "limit": 900}}
+        assert second["iteration"] == 2 and second["delta"] is True
+    
+    def test_other_messages_unchanged(self):
+        """Test that non-action messages keep their shared encoding."""
+        message = EncodedMessage({"type": "complete", "summary": "done"})
+        
+        assert ProgressDelta().encode(message) is message.text
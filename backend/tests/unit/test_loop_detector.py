@@ -0,0 +1,78 @@
+"""Unit tests for LoopDetector."""
+from infrastructure.loop_detector import LoopDetector, page_fingerprint
+
+
+class TestLoopDetector:
+    """Test suite for LoopDetector."""
+    
+    def test_repeated_step(self):
+        """Test that the same step repeated min_repeats times is a loop."""
+        detector = LoopDetector(min_repeats=3)
+        detector.record("https://example.com", "click", "fp")
+        detector.record("https://example.com", "click", "fp")
+        assert detector.detect() is None
+        
+        detector.record("https://example.com", "click", "fp")
+        loop = detector.detect()
+        
+        assert loop.period == 1
+        assert loop.repeats == 3
+        assert loop.strategy == "change_query"
+    
+    def test_scroll_in_place(self):
+        """Test that scrolling a page that does not change suggests leaving it."""
+        detector = LoopDetector()
+        for _ in range(3):
+            detector.record("https://example.com/list", "scroll", "same-page")
+        
+        assert detector.detect().strategy == "leave_page"
+    
+    def test_scroll_revealing_content_is_not_a_loop(self):
+        """Test that changing page fingerprints break the cycle."""
+        detector = LoopDetector()
+        for i in range(5):
+            detector.record("https://example.com/list", "scroll", f"page-{i}")
+        
+        assert detector.detect() is None
+    
+    def test_oscillation(self):
+        """Test A -> B -> A -> B oscillation detection."""
+        detector = LoopDetector(min_repeats=3)
+        for _ in range(3):
+            detector.record("https://www.google.com/search?q=creatina", "click", "results")
+            detector.record("https://shop.com/p?utm_source=x", "goto", "product")
+        
+        loop = detector.detect()
+        
+        assert loop.period == 2
+        assert loop.strategy == "avoid_cycle"
+        assert "https://shop.com/p" in loop.urls
+        assert detector.involves("https://www.shop.com/p/")
+    
+    def test_legitimate_revisits(self):
+        """Test that returning to the search page between sources is not a loop."""
+        detector = LoopDetector()
+        search = "https://www.google.com/search?q=creatina"
+        for i in range(4):
+            detector.record(search, "click", f"results-{i}")
+            detector.record(f"https://shop{i}.com/p", "goto", f"product-{i}")
+        
+        assert detector.detect() is None
+        assert detector.involves(search) is False
+    
+    def test_reset(self):
+        """Test that reset clears a detected loop."""
+        detector = LoopDetector()
+        for _ in range(3):
+            detector.record("https://example.com", "wait")
+        
+        detector.reset()
+        
+        assert detector.detect() is None
+    
+    def test_page_fingerprint(self):
+        """Test that fingerprints depend on page content."""
+        page = {"title": "A", "visible_text": "text", "interactive_elements": [{"tag": "a"}]}
+        
+        assert page_fingerprint(page) == page_fingerprint(dict(page))
+        assert page_fingerprint(page) != page_fingerprint({**page, "visible_text": "more text"})
@@ -67,3 +67,74 @@ class TestMemory:
         assert "Total actions: 1" in summary
         assert "Extracted data points: 1" in summary
         assert "Sources visited" in summary
+    
+    def test_history_is_bounded(self):
+        """Test that the ring buffer keeps only the most recent actions."""
+        memory = Memory(history_size=3)
+        for i in range(5):
+            memory.add_action("goto", {"url": f"https://example.com/{i}"}, f"https://example.com/{i}", {"success": True})
+        
+        assert memory.total_actions == 5
+        assert [a.url for a in memory.history] == [f"https://example.com/{i}" for i in range(2, 5)]
+        assert "Total actions: 5" in memory.get_summary()
+    
+    def test_result_stringified_on_export(self, memory):
+        """Test that raw results are kept and converted only when exported."""
+        result = {"success": True, "url": "https://example.com"}
+        memory.add_action("goto", {"url": "https://example.com"}, "https://example.com", result)
+        
+        assert memory.records[0].result is result
+        assert memory.history[0].result == str(result)
+    
+    def test_spill_keeps_full_history(self, tmp_path):
+        """Test that evicted actions are spilled to disk and can be replayed."""
+        spill_path = str(tmp_path / "history.jsonl")
+        memory = Memory(history_size=2, spill_path=spill_path)
+        for i in range(5):
+            memory.add_action("scroll", {"direction": "down"}, f"https://example.com/{i}", {"success": True})
+        
+        full = list(memory.iter_full_history())
+        memory.close()
+        
+        assert len(memory.records) == 2
+        assert [a.url for a in full] == [f"https://example.com/{i}" for i in range(5)]
+    
+    def test_running_aggregates(self, memory, sample_extracted_data):
+        """Test that aggregates are updated as data is added."""
+        memory.add_extracted_data(sample_extracted_data)
+        memory.add_extracted_data(sample_extracted_data)
+        memory.add_extracted_data({"url": "https://example.com/2", "prices": [{"value": 0}]})
+        
+        assert memory.data_point_count == 3
+        assert memory.price_count == 7
+        assert memory.source_counts == {sample_extracted_data["url"]: 2, "https://example.com/2": 1}
+        assert memory.price_stats.count == 6
+    
+    def test_get_summary_data(self, memory, sample_extracted_data):
+        """Test the structured summary."""
+        memory.add_action("goto", {"url": "https://example.com"}, "https://example.com", "success")
+        memory.add_extracted_data(sample_extracted_data)
+        memory.add_extracted_data({"url": "https://example.com/2", "prices": [65.0]})
+        
+        summary = memory.get_summary_data()
+        
+        assert summary.total_actions == 1
+        assert summary.sources == [sample_extracted_data["url"], "https://example.com/2"]
+        assert summary.total_prices == 4
+        assert summary.average_price == pytest.approx(57.5)
+        assert summary.min_price == 50.0
+        assert summary.max_price == 65.0
+        assert "Total prices found: 4" in memory.get_summary()
+    
+    def test_state_round_trip(self, memory, sample_extracted_data):
+        """Test exporting and restoring memory for a checkpoint."""
+        memory.add_action("goto", {"url": "https://example.com"}, "https://example.com", {"success": True})
+        memory.add_extracted_data(sample_extracted_data)
+        
+        restored = Memory()
+        restored.restore_state(memory.get_state())
+        
+        assert restored.total_actions == 1
+        assert restored.history[0].url == "https://example.com"
+        assert restored.get_extracted_data() == memory.get_extracted_data()
+        assert restored.get_summary_data() == memory.get_summary_data()
@@ -0,0 +1,66 @@
+"""Unit tests for MessageChannel."""
+import asyncio
+import queue
+import threading
+import pytest
+from infrastructure.message_channel import MessageChannel
+
+
+class TestMessageChannel:
+    """Test suite for MessageChannel."""
+    
+    def test_get_nowait_in_order(self):
+        """Test that messages are delivered in FIFO order."""
+        channel = MessageChannel()
+        channel.put({"n": 1})
+        channel.put({"n": 2})
+        
+        assert channel.get_nowait() == {"n": 1}
+        assert channel.get_nowait() == {"n": 2}
+        assert channel.empty()
+        with pytest.raises(queue.Empty):
+            channel.get_nowait()
+    
+    def test_buffered_messages_delivered_after_bind(self):
+        """Test that messages put before binding are awaited normally."""
+        channel = MessageChannel()
+        channel.put({"type": "queued"})
+        
+        async def consume():
+            channel.bind(asyncio.get_running_loop())
+            return await asyncio.wait_for(channel.get(), timeout=1)
+        
+        assert asyncio.run(consume()) == {"type": "queued"}
+    
+    def test_put_from_thread_wakes_consumer(self):
+        """Test that a put from another thread wakes an awaiting consumer."""
+        channel = MessageChannel()
+        
+        async def consume():
+            channel.bind(asyncio.get_running_loop())
+            producer = threading.Timer(0.05, lambda: [channel.put({"n": i}) for i in range(3)])
+            producer.start()
+            received = [await asyncio.wait_for(channel.get(), timeout=1) for _ in range(3)]
+            producer.join()
+            return received
+        
+        assert asyncio.run(consume()) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    
+    def test_waiting_does_not_block_event_loop(self):
+        """Test that other coroutines keep running while a consumer waits."""
+        channel = MessageChannel()
+        ticks = []
+        
+        async def ticker():
+            for i in range(5):
+                ticks.append(i)
+                await asyncio.sleep(0.01)
+            channel.put({"type": "finished"})
+        
+        async def main():
+            waiter = asyncio.ensure_future(channel.get())
+            await ticker()
+            return await asyncio.wait_for(waiter, timeout=1)
+        
+        assert asyncio.run(main()) == {"type": "finished"}
+        assert ticks == [0, 1, 2, 3, 4]
@@ -0,0 +1,134 @@
+"""Unit tests for the metrics registry and its Prometheus exposition."""
+import asyncio
+import time
+import pytest
+from infrastructure.event_hub import MissionHub
+from infrastructure.metrics import Gauge, Histogram, MetricsRegistry, RadarMetrics, watch_event_loop_lag
+
+
+class TestHistogram:
+    """Test suite for Histogram."""
+    
+    def test_buckets_are_cumulative(self):
+        """Test that observations land in the first bucket whose bound they do not exceed."""
+        histogram = Histogram("latency_seconds", "Latency", ["phase"], buckets=[0.1, 1])
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value, "decide")
+        
+        state = histogram.snapshot("decide")
+        
+        assert state["count"] == 4
+        assert state["sum"] == pytest.approx(3.65)
+        assert list(state["buckets"].values()) == [2, 3, 4]
+        assert histogram.snapshot("execute") is None
+    
+    def test_render(self):
+        """Test that a histogram renders buckets, sum and count per series."""
+        histogram = Histogram("latency_seconds", "Latency", ["phase"], buckets=[0.5])
+        histogram.observe(0.25, "snapshot")
+        
+        assert histogram.render().splitlines() == [
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{phase="snapshot",le="0.5"} 1',
+            'latency_seconds_bucket{phase="snapshot",le="+Inf"} 1',
+            'latency_seconds_sum{phase="snapshot"} 0.25',
+            'latency_seconds_count{phase="snapshot"} 1'
+        ]
+    
+    def test_series_are_capped(self):
+        """Test that label values past max_series share the "other" series."""
+        histogram = Histogram("navigation_seconds", "Navigation", ["domain"], max_series=2)
+        for domain in ("a.com", "b.com", "c.com", "d.com"):
+            histogram.observe(1.0, domain)
+        
+        assert histogram.snapshot("other")["count"] == 2
+        assert histogram.snapshot("c.com") is None
+
+
+class TestGauge:
+    """Test suite for Gauge."""
+    
+    def test_set_and_function(self):
+        """Test that a gauge is set directly or computed on scrape."""
+        contexts = Gauge("contexts", "Open contexts")
+        contexts.inc()
+        contexts.inc()
+        contexts.dec()
+        missions = Gauge("missions", "Missions", ["state"])
+        missions.set_function(lambda: {("running",): 2, ("queued",): 5})
+        
+        assert "contexts 1\n" in contexts.render()
+        assert 'missions{state="running"} 2' in missions.render()
+        assert 'missions{state="queued"} 5' in missions.render()
+    
+    def test_failing_function_skips_samples(self):
+        """Test that a failing source leaves the gauge empty instead of breaking the scrape."""
+        gauge = Gauge("broken", "Broken")
+        gauge.set_function(lambda: 1 / 0)
+        
+        assert gauge.render() == "# HELP broken Broken\n# TYPE broken gauge\n"
+
+
+class TestRadarMetrics:
+    """Test suite for RadarMetrics."""
+    
+    def test_iteration_phases(self):
+        """Test that extraction is only recorded for iterations that extracted something."""
+        metrics = RadarMetrics()
+        metrics.observe_iteration(snapshot=0.01, decide=0.002, execute=0.5)
+        metrics.observe_iteration(snapshot=0.01, decide=0.002, execute=0.5, extract=0.05)
+        
+        phases = metrics.iteration_phase_seconds
+        assert phases.snapshot("snapshot")["count"] == 2
+        assert phases.snapshot("extract")["count"] == 1
+    
+    def test_registry_renders_every_metric_once(self):
+        """Test that every metric has exactly one TYPE line."""
+        metrics = RadarMetrics(MetricsRegistry())
+        text = metrics.render()
+        
+        names = [line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")]
+        assert len(names) == len(set(names)) == 7
+        assert "market_radar_event_loop_lag_seconds" in names
+    
+    def test_forwarded_samples(self):
+        """Test that a worker's samples are recorded by the metrics they are forwarded to."""
+        worker, api = RadarMetrics(), RadarMetrics()
+        worker.registry.forward_to(api.record)
+        
+        worker.observe_iteration(snapshot=0.01, decide=0.02, execute=0.03)
+        worker.browser_contexts.inc()
+        
+        assert worker.iteration_phase_seconds.snapshot("decide") is None
+        assert api.iteration_phase_seconds.snapshot("decide")["count"] == 1
+        assert api.browser_contexts.value() == 1
+        with pytest.raises(ValueError):
+            api.record("market_radar_missions", "render", ())
+    
+    def test_event_loop_lag(self):
+        """Test that a loop blocked by a callback reports the delay."""
+        metrics = RadarMetrics()
+        
+        async def blocked():
+            watcher = asyncio.create_task(watch_event_loop_lag(metrics.event_loop_lag_seconds, 0.01))
+            await asyncio.sleep(0)
+            time.sleep(0.06)
+            await asyncio.sleep(0.03)
+            watcher.cancel()
+        
+        asyncio.run(blocked())
+        
+        state = metrics.event_loop_lag_seconds.snapshot()
+        assert state["count"] >= 1
+        assert state["sum"] >= 0.04
+    
+    def test_outbox_depths(self):
+        """Test that hubs report the unread messages of each subscriber."""
+        hub = MissionHub()
+        reader, idle = hub.subscribe(), hub.subscribe()
+        for i in range(3):
+            hub.publish({"type": "extraction", "n": i})
+        reader.get_nowait()
+        
+        assert sorted(hub.outbox_depths()) == [2, 3]
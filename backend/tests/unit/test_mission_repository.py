@@ -6,7 +6,13 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from repositories.mission_repository import MissionRepository
+import threading
+from config.settings import Settings
+from repositories.mission_repository import (
+    MissionRepository,
+    SQLiteMissionRepository,
+    create_mission_repository
+)
 from core.exceptions import MissionNotFoundError
 
 
@@ -100,3 +106,104 @@ class TestMissionRepository:
         
         assert mission_repository.exists(mission_id)
         assert not mission_repository.exists("nonexistent-id")
+    
+    def test_get_returns_copy(self, mission_repository):
+        """Test that callers cannot mutate stored missions without update()."""
+        mission_id = mission_repository.create(goal="Test goal", headless=True, max_iterations=50)
+        
+        mission_repository.get(mission_id)["is_running"] = True
+        
+        assert mission_repository.get(mission_id)["is_running"] is False
+    
+    def test_update_if_exists(self, mission_repository):
+        """Test that updates of deleted missions are ignored instead of raising."""
+        mission_id = mission_repository.create(goal="Test goal", headless=True, max_iterations=50)
+        mission_repository.delete(mission_id)
+        
+        assert mission_repository.update_if_exists(mission_id, data_points=3) is False
+        with pytest.raises(MissionNotFoundError):
+            mission_repository.update(mission_id, data_points=3)
+    
+    def test_compare_and_set(self, mission_repository):
+        """Test the atomic is_running transition."""
+        mission_id = mission_repository.create(goal="Test goal", headless=True, max_iterations=50)
+        
+        assert mission_repository.compare_and_set(mission_id, "is_running", False, True, error=None) is True
+        assert mission_repository.compare_and_set(mission_id, "is_running", False, True) is False
+        assert mission_repository.get(mission_id)["is_running"] is True
+        with pytest.raises(MissionNotFoundError):
+            mission_repository.compare_and_set("nonexistent-id", "is_running", False, True)
+    
+    def test_concurrent_start_has_single_winner(self, mission_repository):
+        """Test that only one of many concurrent starts wins the transition."""
+        mission_id = mission_repository.create(goal="Test goal", headless=True, max_iterations=50)
+        barrier = threading.Barrier(16)
+        wins = []
+        
+        def start():
+            barrier.wait()
+            wins.append(mission_repository.compare_and_set(mission_id, "is_running", False, True))
+        
+        threads = [threading.Thread(target=start) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert wins.count(True) == 1
+
+
+class TestSQLiteMissionRepository:
+    """Test suite for SQLiteMissionRepository."""
+    
+    @pytest.fixture
+    def repository(self, tmp_path):
+        """Create a repository backed by a temporary database."""
+        return SQLiteMissionRepository(str(tmp_path / "missions.db"))
+    
+    def test_crud_roundtrip(self, repository):
+        """Test create, update, status and delete through SQLite."""
+        mission_id = repository.create(goal="Test goal", headless=True, max_iterations=50, budget={"max_pages": 5})
+        repository.update(mission_id, sources_visited=2, budget={"pages": 1})
+        
+        status = repository.get_status(mission_id)
+        
+        assert status.sources_visited == 2
+        assert repository.get(mission_id)["budget_limits"] == {"max_pages": 5}
+        
+        repository.delete(mission_id)
+        
+        assert not repository.exists(mission_id)
+        with pytest.raises(MissionNotFoundError):
+            repository.delete(mission_id)
+    
+    def test_shared_between_instances(self, repository):
+        """Test that a second repository on the same file sees the same missions."""
+        mission_id = repository.create(goal="Test goal", headless=True, max_iterations=50)
+        other = SQLiteMissionRepository(repository.db_path)
+        
+        assert other.compare_and_set(mission_id, "is_running", False, True) is True
+        assert repository.compare_and_set(mission_id, "is_running", False, True) is False
+    
+    def test_concurrent_updates_are_not_lost(self, repository):
+        """Test that read-modify-write updates from many threads are atomic."""
+        mission_id = repository.create(goal="Test goal", headless=True, max_iterations=50)
+        
+        def increment():
+            for _ in range(20):
+                repository._modify(mission_id, lambda m: m.update(data_points=m["data_points"] + 1) or True)
+        
+        threads = [threading.Thread(target=increment) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert repository.get(mission_id)["data_points"] == 160
+    
+    def test_factory_selects_backend(self, tmp_path):
+        """Test that settings choose the repository backend."""
+        settings = Settings(mission_store_backend="sqlite", mission_store_db_path=str(tmp_path / "m.db"))
+        
+        assert isinstance(create_mission_repository(settings), SQLiteMissionRepository)
+        assert type(create_mission_repository(Settings())) is MissionRepository
@@ -0,0 +1,58 @@
+"""Unit tests for the mission event consumer shared by the API and the CLI."""
+from unittest.mock import Mock
+from core.domain.events import ActionEvent, CompleteEvent, ExtractionEvent
+from infrastructure.checkpoint_store import CheckpointStore
+from services.mission_runner import consume_mission_events
+
+
+def action(iteration):
+    """Build the ActionEvent of an iteration."""
+    return ActionEvent(
+        iteration=iteration,
+        thought_process="",
+        reasoning="",
+        action={"name": "wait", "params": {}},
+        result={"success": True},
+        is_goal_achieved=False,
+        url="https://shop.com"
+    )
+
+
+class TestConsumeMissionEvents:
+    """Test suite for consume_mission_events."""
+    
+    def test_persists_then_reports_every_event(self, tmp_path):
+        """Test checkpoints, price observations and results are stored before events are reported."""
+        events = [
+            action(1),
+            ExtractionEvent(iteration=1, url="https://shop.com/a", data={"prices": [{"value": 10.0}]}),
+            ExtractionEvent(iteration=2, url="https://shop.com/b", data={"prices": []}, cached=True),
+            action(2),
+            CompleteEvent(extracted_data=[{"price": 10.0}])
+        ]
+        agent = Mock()
+        agent.analyze_goal.return_value = {"topic": "creatina"}
+        agent.run.return_value = iter(events)
+        agent.get_state.return_value = {"iteration_count": 2}
+        checkpoint_store = CheckpointStore(str(tmp_path))
+        checkpoints = []
+        checkpoint_store.save = lambda mission_id, checkpoint: checkpoints.append(checkpoint)
+        price_store, result_store = Mock(), Mock()
+        reported = []
+        
+        consume_mission_events(
+            agent,
+            "m1",
+            {"goal": "preço de creatina", "max_iterations": 10},
+            reported.append,
+            checkpoint_store,
+            checkpoint_every=2,
+            price_store=price_store,
+            result_store=result_store
+        )
+        
+        assert reported == events
+        assert checkpoints == [{"mission": {"goal": "preço de creatina", "max_iterations": 10}, "agent": {"iteration_count": 2}}]
+        price_store.add_extraction.assert_called_once_with("m1", "creatina", "https://shop.com/a", {"prices": [{"value": 10.0}]})
+        result_store.put.assert_called_once_with("m1", [{"price": 10.0}])
+        agent.run.assert_called_once_with(start_url="https://www.google.com", max_iterations=10)
@@ -2,6 +2,7 @@
 import pytest
 import sys
 import os
+import threading
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
@@ -9,6 +10,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from services.mission_service import MissionService
 from repositories.mission_repository import MissionRepository
 from core.exceptions import MissionNotFoundError, MissionAlreadyRunningError
+from services.scheduler import MissionScheduler
+from unittest.mock import Mock
 
 
 class TestMissionService:
@@ -91,3 +94,170 @@ class TestMissionService:
         mission_service.delete_mission(mission_id)
         
         assert not mission_service.repository.exists(mission_id)
+    
+    def test_identical_goals_are_coalesced(self, mission_service):
+        """Test that a second identical request joins the in-flight mission."""
+        first = mission_service.create_mission(goal="Preço da creatina")
+        second = mission_service.create_mission(goal="preco creatina")
+        
+        assert second["mission_id"] == first["mission_id"]
+        assert second["coalesced"] is True
+    
+    def test_cached_result_is_returned(self, mission_service, sample_extracted_data):
+        """Test that a finished result is served without a new mission."""
+        mission_id = mission_service.create_mission(goal="Preço da creatina")["mission_id"]
+        mission_service.record_result(mission_id, "summary", [sample_extracted_data])
+        
+        result = mission_service.create_mission(goal="preco creatina")
+        
+        assert result["cached"] is True
+        assert result["mission_id"] == mission_id
+        assert result["extracted_data"] == [sample_extracted_data]
+    
+    def test_max_age_zero_forces_new_mission(self, mission_service):
+        """Test that max_age=0 bypasses the result cache."""
+        mission_id = mission_service.create_mission(goal="Preço da creatina")["mission_id"]
+        mission_service.record_result(mission_id, "summary", [])
+        
+        result = mission_service.create_mission(goal="preco creatina", max_age=0)
+        
+        assert "cached" not in result
+        assert result["mission_id"] != mission_id
+    
+    def test_max_age_zero_skips_inflight_mission(self, mission_service):
+        """Test that max_age=0 is neither coalesced onto nor joined by an in-flight mission."""
+        inflight_id = mission_service.create_mission(goal="Preço da creatina")["mission_id"]
+        
+        forced = mission_service.create_mission(goal="preco creatina", max_age=0)
+        joined = mission_service.create_mission(goal="preco creatina")
+        
+        assert "coalesced" not in forced
+        assert forced["mission_id"] != inflight_id
+        assert joined["mission_id"] == inflight_id
+    
+    def test_publish_reaches_all_subscribers(self, mission_service):
+        """Test fan-out of mission messages."""
+        mission_id = mission_service.create_mission(goal="Test goal")["mission_id"]
+        watcher = mission_service.subscribe(mission_id)
+        
+        mission_service.publish(mission_id, {"type": "status"})
+        
+        assert mission_service.get_message_queue(mission_id).get_nowait() == {"type": "status"}
+        assert watcher.get_nowait() == {"type": "status"}
+    
+    def test_resume_mission_after_restart(self, mission_service):
+        """Test that a checkpointed mission is recreated under its original ID."""
+        checkpoint = {
+            "mission": {"goal": "Test goal", "headless": True, "max_iterations": 50, "budget_limits": {}},
+            "agent": {"iteration_count": 10}
+        }
+        
+        result = mission_service.resume_mission("mission-1", checkpoint)
+        
+        assert result["mission_id"] == "mission-1"
+        assert result["iteration"] == 10
+        assert mission_service.repository.get("mission-1")["resume"] is True
+        assert mission_service.get_message_queue("mission-1") is not None
+    
+    def test_resume_running_mission_fails(self, mission_service):
+        """Test that a running mission cannot be resumed."""
+        mission_id = mission_service.create_mission(goal="Test goal")["mission_id"]
+        mission_service.repository.update(mission_id, is_running=True)
+        
+        with pytest.raises(MissionAlreadyRunningError):
+            mission_service.resume_mission(mission_id, {"mission": {}, "agent": {}})
+    
+    def test_scheduled_mission_reports_queue_position(self, mission_repository):
+        """Test that missions waiting for a worker expose their queue position."""
+        scheduler = MissionScheduler(workers=1)
+        scheduler._start_workers = Mock()
+        service = MissionService(mission_repository, scheduler=scheduler)
+        first = service.create_mission(goal="First goal")["mission_id"]
+        second = service.create_mission(goal="Second goal")["mission_id"]
+        
+        service.start_mission_thread(first, Mock())
+        position = service.start_mission_thread(second, Mock())
+        
+        assert position == 2
+        assert service.get_mission_status(second).queue_position == 2
+        assert service.get_message_queue(second).get_nowait() == {"type": "queued", "position": 2}
+        
+        service.stop_mission(first)
+        
+        assert service.get_mission_status(second).queue_position == 1
+    
+    def test_stop_mission_cancels_and_waits_for_acknowledgement(self, mission_service):
+        """Test that stopping a running mission cancels its token and waits for it to finish."""
+        mission_id = mission_service.create_mission(goal="Test goal")["mission_id"]
+        released = []
+        
+        def run(mission_id, cancel_token):
+            cancel_token.wait(5)
+            released.append(cancel_token.reason)
+            mission_service.finish_mission(mission_id)
+        
+        mission_service.start_mission_thread(mission_id, run)
+        acknowledged = mission_service.stop_mission(mission_id, timeout=2)
+        
+        assert acknowledged is True
+        assert released == ["stopped"]
+        assert mission_service.get_message_queue(mission_id).get_nowait() == {"type": "stopped", "acknowledged": True}
+    
+    def test_unacknowledged_stop_keeps_mission_running(self, mission_service):
+        """Test that a mission whose run outlives the stop timeout cannot be started or resumed."""
+        mission_id = mission_service.create_mission(goal="Test goal")["mission_id"]
+        release = threading.Event()
+        
+        def run(mission_id, cancel_token):
+            release.wait(5)
+            mission_service.finish_mission(mission_id)
+        
+        mission_service.start_mission_thread(mission_id, run)
+        cancel_token = mission_service._cancel_tokens[mission_id]
+        
+        assert mission_service.stop_mission(mission_id, timeout=0.05) is False
+        assert mission_service.repository.get(mission_id)["is_running"] is True
+        with pytest.raises(MissionAlreadyRunningError):
+            mission_service.resume_mission(mission_id, {"mission": {}, "agent": {}})
+        with pytest.raises(MissionAlreadyRunningError):
+            mission_service.start_mission_thread(mission_id, run)
+        
+        release.set()
+        assert cancel_token.wait_done(5)
+        assert mission_service.repository.get(mission_id)["is_running"] is False
+        assert mission_service.resume_mission(mission_id, {"mission": {}, "agent": {}})["resumed"] is True
+    
+    def test_delete_waits_for_running_mission(self, mission_service):
+        """Test that deleting a mission still running is completed when it finishes."""
+        mission_id = mission_service.create_mission(goal="Test goal")["mission_id"]
+        mission_service.start_mission_thread(mission_id, Mock())
+        
+        mission_service.delete_mission(mission_id)
+        
+        assert mission_service.repository.exists(mission_id)
+        
+        mission_service.finish_mission(mission_id)
+        
+        assert not mission_service.repository.exists(mission_id)
+    
+    def test_concurrent_start_runs_mission_once(self, mission_service):
+        """Test that racing connections start a mission exactly once."""
+        mission_id = mission_service.create_mission(goal="Test goal")["mission_id"]
+        run = Mock()
+        barrier = threading.Barrier(8)
+        errors = []
+        
+        def start():
+            barrier.wait()
+            try:
+                mission_service.start_mission_thread(mission_id, run)
+            except MissionAlreadyRunningError as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=start) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(errors) == 7
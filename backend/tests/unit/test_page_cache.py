@@ -0,0 +1,112 @@
+"""Unit tests for PageCache."""
+import pytest
+import threading
+from unittest.mock import patch
+from core.cancellation import CancellationToken
+from core.exceptions import MissionCancelledError
+from infrastructure.page_cache import PageCache, canonical_url
+
+
+class TestCanonicalUrl:
+    """Test suite for canonical_url."""
+    
+    def test_strips_tracking_and_fragment(self):
+        """Test that equivalent URLs share one canonical form."""
+        a = canonical_url("HTTPS://www.Amazon.com.br/dp/B01/?utm_source=google&b=2&a=1#reviews")
+        b = canonical_url("https://amazon.com.br/dp/B01?a=1&b=2&gclid=xyz")
+        
+        assert a == b
+        assert a == "https://amazon.com.br/dp/B01?a=1&b=2"
+
+
+class TestPageCache:
+    """Test suite for PageCache."""
+    
+    @pytest.fixture
+    def cache(self):
+        """Create an in-memory PageCache."""
+        return PageCache(max_entries=2, default_ttl=60, domain_ttls={"amazon.com.br": 5})
+    
+    def test_put_and_get(self, cache, sample_extracted_data):
+        """Test storing and retrieving extracted data."""
+        cache.put("https://example.com/product", sample_extracted_data)
+        
+        cached = cache.get("https://www.example.com/product/")
+        
+        assert cached["prices"] == sample_extracted_data["prices"]
+        assert cache.stats()["hits"] == 1
+    
+    def test_miss_is_counted(self, cache):
+        """Test that misses are tracked."""
+        assert cache.get("https://example.com/unknown") is None
+        assert cache.stats()["misses"] == 1
+    
+    def test_per_domain_ttl_expiry(self, cache):
+        """Test that entries expire according to their domain TTL."""
+        with patch("infrastructure.page_cache.time.time", return_value=1000.0):
+            cache.put("https://amazon.com.br/dp/1", {"title": "A"})
+            cache.put("https://example.com/p", {"title": "B"})
+        
+        with patch("infrastructure.page_cache.time.time", return_value=1010.0):
+            assert cache.get("https://amazon.com.br/dp/1") is None
+            assert cache.get("https://example.com/p") == {"title": "B"}
+        
+        assert cache.stats()["expired"] == 1
+    
+    def test_lru_eviction(self, cache):
+        """Test that the least recently used entry is evicted."""
+        cache.put("https://a.com/1", {"n": 1})
+        cache.put("https://b.com/2", {"n": 2})
+        cache.get("https://a.com/1")
+        cache.put("https://c.com/3", {"n": 3})
+        
+        assert cache.get("https://b.com/2") is None
+        assert cache.get("https://a.com/1") == {"n": 1}
+        assert cache.stats()["evictions"] == 1
+    
+    def test_persistence(self, tmp_path):
+        """Test saving to and loading from disk."""
+        path = str(tmp_path / "cache.json")
+        cache = PageCache(path=path)
+        cache.put("https://example.com/p", {"title": "Persisted"}, snapshot="raw text")
+        cache.save()
+        
+        reloaded = PageCache(path=path)
+        
+        assert reloaded.get("https://example.com/p") == {"title": "Persisted"}
+        assert reloaded.get("https://example.com/p", include_snapshot=True)["snapshot"] == "raw text"
+    
+    def test_concurrent_fetch_is_claimed_once(self, cache):
+        """Test that a second mission waits for the first mission's extraction."""
+        assert cache.claim_fetch("https://www.shop.com/p?utm_source=x") is True
+        assert cache.claim_fetch("https://shop.com/p") is False
+        
+        fetcher = threading.Timer(0.05, cache.put, args=("https://shop.com/p", {"prices": ["R$ 10,00"]}))
+        fetcher.start()
+        
+        assert cache.wait_for_fetch("https://shop.com/p", timeout=5) == {"prices": ["R$ 10,00"]}
+        assert cache.claim_fetch("https://shop.com/p") is True
+        fetcher.join()
+    
+    def test_wait_for_fetch_without_claim(self, cache):
+        """Test that waiting returns at once when nobody fetches the URL."""
+        assert cache.wait_for_fetch("https://shop.com/p", timeout=5) is None
+    
+    def test_wait_for_fetch_is_cancellable(self, cache):
+        """Test that cancelling the waiting mission ends the wait right away."""
+        cache.claim_fetch("https://shop.com/p")
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel, args=("stop",)).start()
+        
+        with pytest.raises(MissionCancelledError):
+            cache.wait_for_fetch("https://shop.com/p", timeout=30, cancel_token=token, check_interval=0.01)
+        assert cache.wait_for_fetch("https://shop.com/p", timeout=0.02, check_interval=0.01) is None
+    
+    def test_released_or_expired_claims(self, cache):
+        """Test that failed fetches and lapsed leases free the URL."""
+        cache.claim_fetch("https://shop.com/p")
+        cache.release_fetch("https://shop.com/p")
+        
+        assert cache.wait_for_fetch("https://shop.com/p", timeout=5) is None
+        assert cache.claim_fetch("https://shop.com/p", lease=0) is True
+        assert cache.claim_fetch("https://shop.com/p") is True
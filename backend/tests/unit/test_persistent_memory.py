@@ -0,0 +1,141 @@
+"""Unit tests for PersistentMemory."""
+import sqlite3
+import pytest
+from config.settings import Settings
+from infrastructure.memory import Memory
+from infrastructure.persistent_memory import PersistentMemory, create_memory
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fixture for a temporary database path."""
+    return str(tmp_path / "memory.db")
+
+
+class TestPersistentMemory:
+    """Test suite for PersistentMemory."""
+    
+    def test_writes_are_persisted(self, db_path, sample_extracted_data):
+        """Test that actions and extracted data reach the database."""
+        memory = PersistentMemory(db_path, "mission-1", flush_interval=0.01)
+        memory.add_action("goto", {"url": "https://example.com"}, "https://example.com", {"success": True})
+        memory.add_extracted_data(sample_extracted_data)
+        memory.flush()
+        
+        conn = sqlite3.connect(db_path)
+        actions = conn.execute("SELECT mission_id, action, url FROM actions").fetchall()
+        data_rows = conn.execute("SELECT COUNT(*) FROM extracted_data").fetchone()[0]
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+        memory.close()
+        
+        assert actions == [("mission-1", "goto", "https://example.com")]
+        assert data_rows == 1
+        assert journal_mode == "wal"
+    
+    def test_indexes_created(self, db_path):
+        """Test that mission, URL and timestamp indexes exist."""
+        PersistentMemory(db_path, "mission-1").close()
+        
+        conn = sqlite3.connect(db_path)
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        
+        assert {"idx_actions_mission", "idx_actions_url", "idx_actions_timestamp"} <= indexes
+        assert {"idx_extracted_mission", "idx_extracted_url", "idx_extracted_timestamp"} <= indexes
+    
+    def test_restore_after_restart(self, db_path, sample_extracted_data):
+        """Test that a mission's memory can be rebuilt from disk."""
+        memory = PersistentMemory(db_path, "mission-1")
+        for i in range(3):
+            memory.add_action("goto", {"url": f"https://example.com/{i}"}, f"https://example.com/{i}", {"success": True})
+        memory.add_extracted_data(sample_extracted_data)
+        memory.close()
+        PersistentMemory(db_path, "mission-2").close()
+        
+        restored = PersistentMemory.restore(db_path, "mission-1")
+        restored.flush()
+        
+        assert restored.total_actions == 3
+        assert restored.history[-1].url == "https://example.com/2"
+        assert restored.get_extracted_data() == memory.get_extracted_data()
+        assert restored.price_count == 3
+        assert restored.get_summary_data().sources == [sample_extracted_data["url"]]
+        
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM actions").fetchone()[0] == 3
+        conn.close()
+        restored.close()
+    
+    def test_restore_checkpoint_drops_later_rows(self, db_path, sample_extracted_data):
+        """Test that rows written after a checkpoint are not duplicated by the resumed run."""
+        memory = PersistentMemory(db_path, "mission-1")
+        memory.add_action("goto", {"url": "https://example.com/0"}, "https://example.com/0")
+        checkpoint = memory.get_state()
+        memory.add_action("goto", {"url": "https://example.com/1"}, "https://example.com/1")
+        memory.add_extracted_data(sample_extracted_data)
+        memory.close()
+        other = PersistentMemory(db_path, "mission-2")
+        other.add_action("goto", {"url": "https://example.com/x"}, "https://example.com/x")
+        other.close()
+        
+        resumed = PersistentMemory(db_path, "mission-1")
+        resumed.restore_state(checkpoint)
+        resumed.add_action("goto", {"url": "https://example.com/1"}, "https://example.com/1")
+        resumed.close()
+        
+        conn = sqlite3.connect(db_path)
+        urls = conn.execute("SELECT url FROM actions WHERE mission_id = 'mission-1' ORDER BY id").fetchall()
+        data_rows = conn.execute("SELECT COUNT(*) FROM extracted_data").fetchone()[0]
+        other_rows = conn.execute("SELECT COUNT(*) FROM actions WHERE mission_id = 'mission-2'").fetchone()[0]
+        conn.close()
+        
+        assert urls == [("https://example.com/0",), ("https://example.com/1",)]
+        assert data_rows == 0
+        assert other_rows == 1
+    
+    def test_failed_batch_does_not_stop_writer(self, db_path, caplog):
+        """Test that a batch failing to commit is logged and later writes still land."""
+        memory = PersistentMemory(db_path, "mission-1", flush_interval=0.01)
+        write_batch = memory._write_batch
+        calls = []
+        
+        def flaky(conn, batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            write_batch(conn, batch)
+        
+        memory._write_batch = flaky
+        memory.add_action("goto", {"url": "https://a.com"}, "https://a.com", {"success": True})
+        memory.flush()
+        memory.add_action("goto", {"url": "https://b.com"}, "https://b.com", {"success": True})
+        memory.flush()
+        memory.close()
+        
+        conn = sqlite3.connect(db_path)
+        urls = [row[0] for row in conn.execute("SELECT url FROM actions")]
+        conn.close()
+        assert urls == ["https://b.com"]
+        assert memory.failed_rows == 1
+        assert "database is locked" in caplog.text
+    
+    def test_flush_after_writer_stopped(self, db_path):
+        """Test that flush() reports rows the stopped writer can no longer write instead of hanging."""
+        memory = PersistentMemory(db_path, "mission-1")
+        memory.close()
+        memory.flush()
+        
+        memory.add_action("goto", {"url": "https://a.com"}, "https://a.com", {"success": True})
+        
+        with pytest.raises(RuntimeError):
+            memory.flush()
+    
+    def test_create_memory_backend(self, db_path):
+        """Test that settings select the memory backend."""
+        assert type(create_memory(Settings())) is Memory
+        
+        memory = create_memory(Settings(memory_backend="sqlite", memory_db_path=db_path), "mission-1")
+        memory.close()
+        
+        assert isinstance(memory, PersistentMemory)
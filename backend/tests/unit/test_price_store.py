@@ -0,0 +1,110 @@
+"""Unit tests for PriceStore."""
+import pytest
+from core.domain.models import PriceObservation
+from infrastructure import price_store
+from infrastructure.price_store import PriceStore
+
+
+DAY = 86400.0
+
+
+def observation(value, domain="shop.com", product="creatina", timestamp=0.0, mission_id="m1"):
+    """Build a price observation."""
+    return PriceObservation(
+        product=product,
+        domain=domain,
+        value=value,
+        timestamp=timestamp,
+        mission_id=mission_id
+    )
+
+
+class TestPriceStore:
+    """Test suite for PriceStore."""
+    
+    def test_add_extraction(self, sample_extracted_data):
+        """Test turning extracted data into observations."""
+        store = PriceStore()
+        
+        added = store.add_extraction("m1", "creatina", "https://www.example.com/product", sample_extracted_data)
+        
+        assert added == 3
+        rows = store.query()
+        assert {row.domain for row in rows} == {"example.com"}
+        assert [row.value for row in rows] == [50.0, 55.0, 60.0]
+    
+    def test_filter_and_group(self):
+        """Test filtered, grouped aggregates."""
+        store = PriceStore()
+        store.append([
+            observation(100.0, "a.com", timestamp=1 * DAY),
+            observation(110.0, "a.com", timestamp=2 * DAY),
+            observation(90.0, "b.com", timestamp=2 * DAY),
+            observation(10.0, "a.com", product="whey", timestamp=2 * DAY)
+        ])
+        
+        by_domain = store.aggregate(group_by="domain", product="creatina")
+        recent = store.aggregate(product="creatina", since=1.5 * DAY)
+        
+        assert by_domain["a.com"]["median"] == pytest.approx(105.0)
+        assert by_domain["b.com"]["count"] == 1
+        assert recent["all"]["count"] == 2
+        assert store.aggregate(product="unknown") == {}
+        with pytest.raises(ValueError):
+            store.aggregate(group_by="price")
+    
+    def test_persistence_and_compaction(self, tmp_path):
+        """Test flushing segments, compaction and reloading from disk."""
+        store = PriceStore(str(tmp_path), flush_rows=2, max_segments=2)
+        for i in range(7):
+            store.append([observation(float(i + 1), timestamp=i * DAY)])
+        
+        assert store.stats()["segments"] <= 2
+        store.close()
+        
+        reloaded = PriceStore(str(tmp_path))
+        
+        assert len(reloaded) == 7
+        assert reloaded.aggregate()["all"]["mean"] == pytest.approx(4.0)
+        assert len(reloaded.aggregate(group_by="day")) == 7
+        assert len(reloaded.query(since=5 * DAY)) == 2
+    
+    @pytest.mark.parametrize("vectorized", [True, False])
+    def test_bulk_filters_match_per_row(self, tmp_path, monkeypatch, vectorized):
+        """Test column scans with and without NumPy against the expected rows."""
+        if not vectorized:
+            monkeypatch.setattr(price_store, "np", None)
+        elif price_store.np is None:
+            pytest.skip("NumPy is not installed")
+        store = PriceStore(str(tmp_path), flush_rows=4)
+        rows = [
+            observation(float(i), f"d{i % 3}.com", product=("creatina", "whey")[i % 2], timestamp=i * DAY, mission_id=f"m{i % 4}")
+            for i in range(10)
+        ]
+        store.append(rows)
+        
+        matching = store.query(product="creatina", mission_id="m2", since=2 * DAY)
+        by_domain = store.aggregate(group_by="domain", product="creatina", until=8 * DAY)
+        
+        assert [row.value for row in matching] == [2.0, 6.0]
+        assert by_domain == {
+            "d0.com": {"count": 2, "mean": 3.0, "median": 3.0, "min": 0.0, "max": 6.0},
+            "d1.com": {"count": 1, "mean": 4.0, "median": 4.0, "min": 4.0, "max": 4.0},
+            "d2.com": {"count": 2, "mean": 5.0, "median": 5.0, "min": 2.0, "max": 8.0}
+        }
+        assert store.query(limit=3, domain="d1.com")[-1].value == 7.0
+    
+    def test_compaction_unmaps_old_segments(self, tmp_path):
+        """Test compacted segments are closed once no scan reads them."""
+        store = PriceStore(str(tmp_path), flush_rows=1, max_segments=10)
+        store.append([observation(1.0)])
+        store.append([observation(2.0)])
+        old = list(store._segments)
+        assert len(old) == 2
+        
+        with store._sources(None, None):
+            store.compact()
+            assert not any(segment.closed for segment in old)
+        
+        assert all(segment.closed for segment in old)
+        assert store.aggregate()["all"]["count"] == 2
@@ -0,0 +1,102 @@
+"""Unit tests for HostRateLimiter."""
+import threading
+import time
+import pytest
+from core.cancellation import CancellationToken
+from core.exceptions import MissionCancelledError
+from infrastructure.rate_limiter import HostRateLimiter, host_key, is_throttled
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until a condition holds."""
+    event = threading.Event()
+    for _ in range(int(timeout / 0.005)):
+        if condition():
+            return True
+        event.wait(0.005)
+    return False
+
+
+class TestHostKey:
+    """Test suite for host_key and is_throttled."""
+    
+    def test_subdomains_share_configured_domain(self):
+        """Test that subdomains of a configured domain share its bucket."""
+        domains = {"mercadolivre.com.br": 0.5}
+        
+        assert host_key("https://produto.mercadolivre.com.br/MLB-1", domains) == "mercadolivre.com.br"
+        assert host_key("https://www.amazon.com.br/dp/1", domains) == "amazon.com.br"
+        assert host_key("about:blank", domains) == ""
+    
+    def test_throttle_signals(self):
+        """Test that throttling statuses and challenge pages are detected."""
+        assert is_throttled({"success": True, "status": 429})
+        assert is_throttled({"success": True, "status": 200, "title": "Just a moment..."})
+        assert is_throttled({"success": True, "title": "Confirme que você é humano"})
+        assert not is_throttled({"success": True, "status": 200, "title": "Creatina 300g"})
+
+
+class TestHostRateLimiter:
+    """Test suite for HostRateLimiter."""
+    
+    def test_burst_then_paced(self):
+        """Test that a host allows its burst, then one navigation per 1/rate seconds."""
+        limiter = HostRateLimiter(default_rate=20, burst=2)
+        
+        waits = [limiter.acquire("https://shop.com/p") for _ in range(3)]
+        
+        assert waits[0] < 0.01 and waits[1] < 0.01
+        assert 0.03 < waits[2] < 0.2
+        assert limiter.acquire("https://other.com/p") < 0.01
+    
+    def test_throttling_backs_off_and_recovers(self):
+        """Test that a throttled response halves the rate and pauses the host."""
+        limiter = HostRateLimiter(default_rate=10, burst=1, base_backoff=0.1, recovery=0.25)
+        
+        assert limiter.report("https://shop.com/p", {"success": True, "status": 503}) is True
+        stats = limiter.stats()["shop.com"]
+        assert stats["effective_rate"] == 5
+        assert stats["paused_seconds"] > 0
+        assert limiter.acquire("https://shop.com/p") >= 0.08
+        
+        for _ in range(2):
+            limiter.report("https://shop.com/p", {"success": True, "status": 200})
+        assert limiter.stats()["shop.com"]["effective_rate"] == 10
+    
+    def test_retry_after(self):
+        """Test that the server's Retry-After sets the pause."""
+        limiter = HostRateLimiter(base_backoff=100)
+        
+        limiter.report("https://shop.com/p", {"success": True, "status": 429, "retry_after": 2})
+        
+        assert 1 < limiter.stats()["shop.com"]["paused_seconds"] <= 2
+    
+    def test_missions_served_in_arrival_order(self):
+        """Test that navigations waiting for a host are granted first come, first served."""
+        limiter = HostRateLimiter(default_rate=50, burst=1, check_interval=0.01)
+        limiter.acquire("https://shop.com/p")
+        order = []
+        threads = []
+        for mission in ("a", "b", "c"):
+            thread = threading.Thread(target=lambda m=mission: (limiter.acquire("https://shop.com/p"), order.append(m)))
+            thread.start()
+            threads.append(thread)
+            assert wait_for(lambda: limiter.stats()["shop.com"]["waiting"] == len(threads) or len(order) == len(threads))
+        for thread in threads:
+            thread.join()
+        
+        assert order == ["a", "b", "c"]
+    
+    def test_cancelled_while_waiting(self):
+        """Test that a cancelled mission stops waiting for its host."""
+        limiter = HostRateLimiter(base_backoff=60, check_interval=0.01)
+        limiter.report("https://shop.com/p", {"success": True, "status": 429})
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+        
+        began = time.monotonic()
+        with pytest.raises(MissionCancelledError):
+            limiter.acquire("https://shop.com/p", token)
+        
+        assert time.monotonic() - began < 1
+        assert limiter.stats()["shop.com"]["waiting"] == 0
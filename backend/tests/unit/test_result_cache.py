@@ -0,0 +1,53 @@
+"""Unit tests for MissionResultCache."""
+import pytest
+from unittest.mock import patch
+from services.result_cache import MissionResultCache, normalize_goal
+
+
+class TestNormalizeGoal:
+    """Test suite for normalize_goal."""
+    
+    def test_folds_case_accents_and_stopwords(self):
+        """Test that trivially different goals share a key."""
+        assert normalize_goal("Preço da Creatina no Brasil?") == normalize_goal("preco creatina brasil")
+    
+    def test_word_order_is_ignored(self):
+        """Test that token order does not change the key."""
+        assert normalize_goal("creatine average price") == normalize_goal("Average price of creatine")
+
+
+class TestMissionResultCache:
+    """Test suite for MissionResultCache."""
+    
+    @pytest.fixture
+    def cache(self):
+        """Create MissionResultCache."""
+        return MissionResultCache(default_max_age=60)
+    
+    def test_fresh_result_is_returned(self, cache, sample_extracted_data):
+        """Test storing and retrieving a result."""
+        cache.put("Preço da creatina", "m1", "summary", [sample_extracted_data])
+        
+        cached = cache.get("preco creatina")
+        
+        assert cached["mission_id"] == "m1"
+        assert cached["extracted_data"] == [sample_extracted_data]
+        assert cache.get_by_mission("m1")["summary"] == "summary"
+    
+    def test_stale_result_is_ignored(self, cache):
+        """Test that max_age controls freshness."""
+        with patch("services.result_cache.time.time", return_value=1000.0):
+            cache.put("creatina", "m1", "summary", [])
+        
+        with patch("services.result_cache.time.time", return_value=1030.0):
+            assert cache.get("creatina") is not None
+            assert cache.get("creatina", max_age=10) is None
+    
+    def test_claim_coalesces_inflight_missions(self, cache):
+        """Test that the first claimant wins until released."""
+        assert cache.claim("creatina", "m1") == "m1"
+        assert cache.claim("Creatina", "m2") == "m1"
+        
+        cache.release("creatina", "m1")
+        
+        assert cache.claim("creatina", "m2") == "m2"
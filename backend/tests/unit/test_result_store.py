@@ -0,0 +1,104 @@
+"""Unit tests for ResultStore."""
+import csv
+import io
+import json
+import pytest
+from core.domain.events import CompleteEvent
+from infrastructure.result_store import ResultStore, csv_chunks, ndjson_chunks
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a result store in a temporary directory."""
+    return ResultStore(str(tmp_path / "results.db"))
+
+
+class TestResultStore:
+    """Test suite for ResultStore."""
+    
+    def test_cursor_pagination(self, store):
+        """Test that pages follow each other until the last one."""
+        store.put("m1", ({"n": i} for i in range(5)))
+        
+        first, cursor = store.page("m1", limit=2)
+        second, cursor = store.page("m1", cursor, limit=2)
+        third, last = store.page("m1", cursor, limit=2)
+        
+        assert [r["n"] for r in first + second + third] == [0, 1, 2, 3, 4]
+        assert last is None
+        assert store.count("m1") == 5
+    
+    def test_projection(self, store):
+        """Test that only requested fields are returned."""
+        store.put("m1", [{"url": "https://a.com", "prices": [10], "title": "A"}])
+        
+        records, _ = store.page("m1", fields=["url", "missing"])
+        
+        assert records == [{"url": "https://a.com", "missing": None}]
+    
+    def test_put_replaces_previous_results(self, store):
+        """Test that storing a mission again replaces its records."""
+        store.put("m1", [{"n": 1}, {"n": 2}])
+        store.put("m1", [{"n": 3}])
+        store.put("m2", [{"n": 4}])
+        
+        assert [r["n"] for r in store.iter_records("m1")] == [3]
+        assert store.count("m2") == 1
+    
+    def test_iter_records_in_chunks(self, store):
+        """Test that iteration crosses chunk boundaries in order."""
+        store.put("m1", ({"n": i} for i in range(7)))
+        
+        assert [r["n"] for r in store.iter_records("m1", chunk_size=3)] == list(range(7))
+    
+    def test_fields_in_first_seen_order(self, store):
+        """Test that CSV columns cover every field used by any record."""
+        store.put("m1", [{"url": "a", "title": "A"}, {"url": "b", "prices": [1]}])
+        
+        assert store.fields("m1") == ["url", "title", "prices"]
+    
+    def test_retention(self, tmp_path):
+        """Test that results older than the retention window are dropped."""
+        store = ResultStore(str(tmp_path / "results.db"), retention=1)
+        store.put("old", [{"n": 1}])
+        store._connection().execute("UPDATE results SET stored_at = stored_at - 10")
+        store._connection().commit()
+        
+        store.put("new", [{"n": 2}])
+        
+        assert store.count("old") == 0
+        assert store.count("new") == 1
+
+
+class TestExportChunks:
+    """Test suite for NDJSON and CSV export."""
+    
+    def test_ndjson_chunks(self):
+        """Test that records are written one JSON document per line, in chunks."""
+        chunks = list(ndjson_chunks(({"n": i} for i in range(5)), chunk_size=2))
+        
+        assert len(chunks) == 3
+        assert [json.loads(line) for line in b"".join(chunks).splitlines()] == [{"n": i} for i in range(5)]
+    
+    def test_csv_chunks(self):
+        """Test that CSV has a header and JSON-encodes nested values."""
+        records = [{"url": "https://a.com", "prices": [{"value": 10.5}]}, {"url": "https://b.com"}]
+        
+        rows = list(csv.reader(io.StringIO("".join(csv_chunks(records, ["url", "prices"], chunk_size=1)))))
+        
+        assert rows == [["url", "prices"], ["https://a.com", '[{"value":10.5}]'], ["https://b.com", ""]]
+    
+    def test_csv_without_records(self):
+        """Test that an empty export still has its header."""
+        assert "".join(csv_chunks([], ["url"])) == "url\r\n"
+    
+    def test_complete_message_limits_inlined_results(self):
+        """Test that the final message inlines a bounded number of records."""
+        event = CompleteEvent(extracted_data=[{"n": i} for i in range(5)])
+        
+        message = event.to_message(max_results=2)
+        
+        assert message["extracted_data"] == [{"n": 0}, {"n": 1}]
+        assert message["results_truncated"] is True
+        assert message["total_results"] == 5
+        assert "results_truncated" not in event.to_message(max_results=5)
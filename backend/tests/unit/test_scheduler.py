@@ -0,0 +1,113 @@
+"""Unit tests for MissionScheduler."""
+import threading
+import pytest
+from unittest.mock import Mock
+from core.exceptions import MissionQueueFullError
+from services.scheduler import MissionScheduler, default_worker_count
+
+
+class BlockingRun:
+    """Mission function that blocks until released."""
+    
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = []
+        self.kwargs = {}
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+    
+    def __call__(self, mission_id, **kwargs):
+        with self.lock:
+            self.started.append(mission_id)
+            self.kwargs[mission_id] = kwargs
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.release.wait(5)
+        with self.lock:
+            self.running -= 1
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll until a condition holds."""
+    event = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        event.wait(0.01)
+    return False
+
+
+class TestMissionScheduler:
+    """Test suite for MissionScheduler."""
+    
+    def test_default_worker_count(self):
+        """Test that the derived worker count is at least one."""
+        assert default_worker_count() >= 1
+        assert default_worker_count(browser_memory_mb=10 ** 9) == 1
+    
+    def test_concurrency_limit(self):
+        """Test that no more than `workers` missions run at once."""
+        run = BlockingRun()
+        scheduler = MissionScheduler(workers=2)
+        for i in range(5):
+            scheduler.submit(f"m{i}", run)
+        
+        assert wait_for(lambda: len(run.started) == 2)
+        assert scheduler.stats()["queued"] == 3
+        run.release.set()
+        assert wait_for(lambda: len(run.started) == 5)
+        scheduler.shutdown(wait=True)
+        
+        assert run.max_running == 2
+    
+    def test_fair_positions_across_clients(self):
+        """Test round-robin queue positions across clients."""
+        scheduler = MissionScheduler(workers=1)
+        scheduler._start_workers = Mock()
+        for i in range(3):
+            scheduler.submit(f"a{i}", Mock(), client_id="alice")
+        scheduler.submit("b0", Mock(), client_id="bob")
+        
+        assert scheduler.position("a0") == 1
+        assert scheduler.position("b0") == 2
+        assert scheduler.position("a1") == 3
+        assert scheduler.position("a2") == 4
+    
+    def test_cancel_and_queue_full(self):
+        """Test cancelling a pending mission and the queue limit."""
+        scheduler = MissionScheduler(workers=1, max_queue=2)
+        scheduler._start_workers = Mock()
+        scheduler.submit("m1", Mock())
+        scheduler.submit("m2", Mock())
+        
+        with pytest.raises(MissionQueueFullError):
+            scheduler.submit("m3", Mock())
+        
+        assert scheduler.cancel("m1") is True
+        assert scheduler.cancel("m1") is False
+        assert scheduler.position("m2") == 1
+    
+    def test_prewarmed_browser_and_notifications(self):
+        """Test that idle workers hand a warm browser to the next mission."""
+        warm_browser = Mock()
+        run = BlockingRun()
+        changes = []
+        scheduler = MissionScheduler(
+            workers=1,
+            browser_factory=lambda: warm_browser,
+            on_queue_change=lambda mission_id, position: changes.append((mission_id, position))
+        )
+        scheduler._start_workers()
+        
+        assert wait_for(lambda: scheduler._threads[0].is_alive())
+        # Let the idle worker pre-warm before the mission arrives
+        threading.Event().wait(0.05)
+        scheduler.submit("m1", run)
+        assert wait_for(lambda: run.started == ["m1"])
+        run.release.set()
+        scheduler.shutdown(wait=True)
+        
+        assert run.kwargs["m1"]["browser"] is warm_browser
+        assert ("m1", 1) in changes
+        assert ("m1", None) in changes
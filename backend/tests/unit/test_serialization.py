@@ -0,0 +1,75 @@
+"""Unit tests for the serialization layer."""
+import datetime
+import json
+import pytest
+from api.responses import FastJSONResponse
+from core.domain.models import MissionStatus
+from infrastructure import serialization
+from infrastructure.serialization import available_backends, select_backend
+
+
+INSTALLED = [name for name, installed in available_backends().items() if installed]
+
+
+class TestSerialization:
+    """Test suite for JSON backends."""
+    
+    @pytest.mark.parametrize("name", INSTALLED)
+    def test_backends_agree(self, name):
+        """Test that every installed backend produces the same document."""
+        backend = select_backend(name)
+        value = {
+            "url": "https://loja.com.br/creatina",
+            "title": "Creatina Monohidratada 300g – ação",
+            "prices": [{"value": 99.9, "currency": "BRL"}],
+            "timestamp": datetime.datetime(2024, 5, 1, 12, 30),
+            "tags": ("a", "b")
+        }
+        
+        encoded = backend.dumps(value)
+        
+        assert isinstance(encoded, bytes)
+        assert b'", "' not in encoded and b'": ' not in encoded
+        assert "ação".encode("utf-8") in encoded
+        assert json.loads(encoded) == {
+            **value,
+            "timestamp": "2024-05-01T12:30:00",
+            "tags": ["a", "b"]
+        }
+        assert backend.loads(encoded) == json.loads(encoded)
+    
+    def test_auto_prefers_fastest_installed(self):
+        """Test that auto picks the first installed backend."""
+        assert select_backend("auto").name == INSTALLED[0]
+    
+    def test_unknown_backend(self):
+        """Test that unknown backends are rejected."""
+        with pytest.raises(ValueError):
+            select_backend("pickle")
+    
+    def test_unknown_types_become_text(self):
+        """Test that values without a JSON form fall back to their text."""
+        class Opaque:
+            def __str__(self):
+                return "opaque"
+        
+        assert json.loads(serialization.dumps({"value": Opaque()})) == {"value": "opaque"}
+
+
+class TestFastJSONResponse:
+    """Test suite for FastJSONResponse."""
+    
+    def test_renders_dicts(self):
+        """Test that dict content is rendered by the configured backend."""
+        response = FastJSONResponse({"results": [{"n": 1}], "next_cursor": None})
+        
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {"results": [{"n": 1}], "next_cursor": None}
+    
+    def test_renders_models_directly(self):
+        """Test that pydantic models are rendered without model_dump()."""
+        status = MissionStatus(mission_id="m1", goal="g", is_running=True, is_complete=False)
+        
+        response = FastJSONResponse(status)
+        
+        assert json.loads(response.body) == json.loads(status.model_dump_json())
@@ -0,0 +1,70 @@
+"""Unit tests for the cached settings provider and deferred imports."""
+import os
+import subprocess
+import sys
+import pytest
+from api.app import check_api_workers
+from config.settings import Settings, get_settings
+
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def imported_modules(code: str) -> set:
+    """Run code in a fresh interpreter and get the modules it imported."""
+    output = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(' '.join(sys.modules))"],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return set(output.split())
+
+
+class TestStartup:
+    """Test suite for startup cost."""
+    
+    def test_settings_are_parsed_once(self, monkeypatch):
+        """Test that get_settings() reuses one instance until its cache is cleared."""
+        first = get_settings()
+        monkeypatch.setenv("API_PORT", "9001")
+        
+        assert get_settings() is first
+        get_settings.cache_clear()
+        assert get_settings().api_port == 9001
+    
+    def test_api_import_defers_playwright(self):
+        """Test that building the API does not import Playwright until a browser starts."""
+        modules = imported_modules("from api.app import create_app; create_app()")
+        
+        assert "api.routes.mission" in modules
+        assert "playwright" not in modules
+    
+    def test_worker_entry_points_have_no_side_effects(self):
+        """Test that unpickling run_mission in a worker does not build the API's services."""
+        modules = imported_modules("from services.mission_runner import init_mission_worker, run_mission")
+        
+        assert "api.routes.mission" not in modules
+        assert "services.mission_service" not in modules
+        assert "services.worker_pool" not in modules
+    
+    def test_cli_help_skips_mission_modules(self):
+        """Test that the CLI parses its arguments before loading settings and the agent."""
+        modules = imported_modules("import main; main.parse_args(['creatina'])")
+        
+        assert "config.settings" not in modules
+        assert "services.agent" not in modules
+    
+    def test_multiple_workers_need_shared_state(self, monkeypatch, tmp_path):
+        """Test that several uvicorn workers refuse stores with a single writer."""
+        monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+        shared = {"mission_store_backend": "sqlite", "mission_event_backend": "sqlite"}
+        
+        check_api_workers(Settings())
+        check_api_workers(Settings(api_workers=4, **shared))
+        with pytest.raises(RuntimeError, match="PRICE_STORE_DIR"):
+            check_api_workers(Settings(api_workers=4, price_store_dir=str(tmp_path), **shared))
+        monkeypatch.setenv("WEB_CONCURRENCY", "2")
+        with pytest.raises(RuntimeError, match="MISSION_STORE_BACKEND"):
+            check_api_workers(Settings())
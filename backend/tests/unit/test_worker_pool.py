@@ -0,0 +1,240 @@
+"""Unit tests for ProcessMissionPool."""
+import os
+import threading
+import pytest
+from unittest.mock import Mock
+from infrastructure.metrics import RadarMetrics
+from infrastructure.page_cache import PageCache
+from infrastructure.price_store import PriceStore
+from infrastructure.rate_limiter import HostRateLimiter
+from core.exceptions import MissionCancelledError
+from repositories.mission_repository import MissionRepository
+from services.mission_service import MissionService
+from services.worker_pool import ProcessMissionPool, apply_forwarded_call
+
+
+# Installed in each worker process by install_service()
+remote_service = None
+
+
+def install_service(remote):
+    """Worker initializer: keep the remote service where missions find it."""
+    global remote_service
+    remote_service = remote
+
+
+def report_pid(mission_id, cancel_token=None):
+    """Mission that publishes the process it runs in."""
+    remote_service.publish(mission_id, {"type": "action", "pid": os.getpid()})
+    remote_service.repository.update_if_exists(mission_id, data_points=1)
+    remote_service.publish(mission_id, {"type": "finished"})
+    remote_service.finish_mission(mission_id)
+
+
+def wait_for_stop(mission_id, cancel_token=None):
+    """Mission that runs until it is cancelled."""
+    remote_service.publish(mission_id, {"type": "action", "pid": os.getpid()})
+    cancelled = cancel_token.wait(10)
+    remote_service.publish(mission_id, {"type": "finished", "cancelled": cancelled})
+    remote_service.finish_mission(mission_id)
+
+
+def share_page(mission_id, cancel_token=None):
+    """Mission that writes to the API process's stores and reads the cache back."""
+    data = {"prices": [{"value": 10.0, "currency": "BRL"}]}
+    remote_service.page_cache.put("https://shop.com/p", data)
+    remote_service.price_store.add_extraction(mission_id, "creatina", "https://shop.com/p", data)
+    cached = remote_service.page_cache.get("https://www.shop.com/p/")
+    remote_service.publish(mission_id, {"type": "finished", "cached": cached})
+    remote_service.finish_mission(mission_id)
+
+
+def navigate_twice(mission_id, cancel_token=None):
+    """Mission whose first navigation is throttled, then waits for the host."""
+    limiter = remote_service.rate_limiter
+    limiter.acquire("https://shop.com/a")
+    throttled = limiter.report("https://shop.com/a", {"success": False, "status": 429})
+    remote_service.publish(mission_id, {"type": "action", "throttled": throttled})
+    try:
+        limiter.acquire("https://shop.com/b")
+        cancelled = False
+    except MissionCancelledError:
+        cancelled = True
+    remote_service.publish(mission_id, {"type": "finished", "cancelled": cancelled})
+    remote_service.finish_mission(mission_id)
+
+
+def observe_navigation(mission_id, cancel_token=None):
+    """Mission recording a metric sample in its worker."""
+    metrics = RadarMetrics()
+    metrics.registry.forward_to(remote_service.metrics.record)
+    metrics.navigation_seconds.observe(0.5, "shop.com")
+    remote_service.publish(mission_id, {"type": "finished"})
+    remote_service.finish_mission(mission_id)
+
+
+def crash(mission_id, cancel_token=None):
+    """Mission whose process dies."""
+    os._exit(3)
+
+
+def wait_for(condition, timeout=10.0):
+    """Poll until a condition holds."""
+    event = threading.Event()
+    for _ in range(int(timeout / 0.02)):
+        if condition():
+            return True
+        event.wait(0.02)
+    return False
+
+
+@pytest.fixture
+def pool():
+    """Create a two-process pool."""
+    pool = ProcessMissionPool(
+        processes=2,
+        initializer=install_service,
+        start_method="spawn",
+        shared={
+            "page_cache": PageCache(),
+            "price_store": PriceStore(),
+            "rate_limiter": HostRateLimiter(base_backoff=60, check_interval=0.05),
+            "metrics": RadarMetrics()
+        }
+    )
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.fixture
+def service(pool):
+    """Create MissionService running missions on the pool."""
+    service = MissionService(MissionRepository(), scheduler=pool)
+    pool.service = service
+    return service
+
+
+def reported_pid(service, mission_id):
+    """Process id reported by a mission."""
+    return next(event["pid"] for event in service.recent_events(mission_id) if "pid" in event)
+
+
+def finished(service, mission_id):
+    """Whether a mission published its finished event."""
+    return any(event["type"] == "finished" for event in service.recent_events(mission_id))
+
+
+class TestProcessMissionPool:
+    """Test suite for ProcessMissionPool."""
+    
+    def test_missions_run_in_worker_processes(self, pool, service):
+        """Test that missions run outside the API process and report back."""
+        mission_ids = [service.create_mission(f"goal {i}")["mission_id"] for i in range(3)]
+        for mission_id in mission_ids:
+            service.start_mission_thread(mission_id, report_pid)
+        
+        assert wait_for(lambda: all(finished(service, m) for m in mission_ids))
+        pids = {reported_pid(service, m) for m in mission_ids}
+        assert os.getpid() not in pids
+        assert 1 <= len(pids) <= 2
+        assert service.repository.get(mission_ids[0])["data_points"] == 1
+        assert pool.stats()["processes_started"] <= 2
+    
+    def test_stop_reaches_worker(self, pool, service):
+        """Test that stopping a mission cancels it inside its worker."""
+        mission_id = service.create_mission("goal")["mission_id"]
+        service.start_mission_thread(mission_id, wait_for_stop)
+        assert wait_for(lambda: any("pid" in event for event in service.recent_events(mission_id)))
+        
+        assert service.stop_mission(mission_id, timeout=10) is True
+        assert wait_for(lambda: finished(service, mission_id))
+        assert service.recent_events(mission_id)[-2]["cancelled"] is True
+    
+    def test_lost_worker_fails_mission(self, pool, service):
+        """Test that a worker crash fails its mission and a new process takes over."""
+        lost = Mock()
+        pool.on_worker_lost = lost
+        crashed = service.create_mission("crash")["mission_id"]
+        service.start_mission_thread(crashed, crash)
+        
+        assert wait_for(lambda: lost.called)
+        assert lost.call_args[0][0] == crashed
+        assert pool.stats()["processes_lost"] == 1
+        
+        mission_id = service.create_mission("after crash")["mission_id"]
+        service.start_mission_thread(mission_id, report_pid)
+        assert wait_for(lambda: finished(service, mission_id))
+    
+    def test_restart_replaces_workers(self, pool, service):
+        """Test that restart() replaces idle workers between missions."""
+        first = service.create_mission("first")["mission_id"]
+        service.start_mission_thread(first, report_pid)
+        assert wait_for(lambda: finished(service, first))
+        assert wait_for(lambda: not pool.is_running(first))
+        
+        assert pool.restart() == 1
+        second = service.create_mission("second")["mission_id"]
+        service.start_mission_thread(second, report_pid)
+        assert wait_for(lambda: finished(service, second))
+        
+        assert reported_pid(service, first) != reported_pid(service, second)
+        assert pool.stats()["processes_restarted"] == 1
+    
+    
+    def test_workers_write_to_api_stores(self, pool, service):
+        """Test that the API process is the only writer of the shared stores."""
+        mission_id = service.create_mission("creatina")["mission_id"]
+        service.start_mission_thread(mission_id, share_page)
+        
+        assert wait_for(lambda: finished(service, mission_id))
+        assert service.recent_events(mission_id)[-1]["cached"]["prices"][0]["value"] == 10.0
+        assert pool.shared["price_store"].aggregate()["all"]["count"] == 1
+        assert len(pool.shared["page_cache"]) == 1
+    
+    
+    def test_workers_share_api_rate_limits(self, pool, service):
+        """Test that workers wait on the API process's buckets and a stop interrupts them."""
+        mission_id = service.create_mission("creatina")["mission_id"]
+        service.start_mission_thread(mission_id, navigate_twice)
+        assert wait_for(lambda: any(event.get("throttled") for event in service.recent_events(mission_id)))
+        
+        assert wait_for(lambda: pool.shared["rate_limiter"].stats()["shop.com"]["waiting"] == 1)
+        assert service.stop_mission(mission_id, timeout=10) is True
+        assert wait_for(lambda: finished(service, mission_id))
+        assert service.recent_events(mission_id)[-2]["cancelled"] is True
+        assert pool.shared["rate_limiter"].stats()["shop.com"]["throttled"] == 1
+    
+    
+    def test_worker_metrics_reach_api(self, pool, service):
+        """Test that samples recorded in a worker are served by the API process."""
+        mission_id = service.create_mission("creatina")["mission_id"]
+        service.start_mission_thread(mission_id, observe_navigation)
+        
+        assert wait_for(lambda: finished(service, mission_id))
+        assert pool.shared["metrics"].navigation_seconds.snapshot("shop.com")["count"] == 1
+
+
+class TestApplyForwardedCall:
+    """Test suite for apply_forwarded_call."""
+    
+    def test_nested_call(self):
+        """Test that dotted names resolve on the service."""
+        service = Mock()
+        
+        apply_forwarded_call(service, "repository.update_if_exists", ("m1",), {"data_points": 2})
+        
+        service.repository.update_if_exists.assert_called_once_with("m1", data_points=2)
+    
+    def test_shared_store_call(self):
+        """Test that store calls resolve on the shared stores and skip disabled ones."""
+        store = Mock()
+        
+        result = apply_forwarded_call(Mock(), "page_cache.get", ("u",), {}, {"page_cache": store})
+        
+        assert result is store.get.return_value
+        assert apply_forwarded_call(Mock(), "price_store.flush", (), {}, {"price_store": None}) is None
+    
+    def test_rejects_other_calls(self):
+        """Test that only the allowed calls can be forwarded."""
+        with pytest.raises(ValueError):
+            apply_forwarded_call(Mock(), "delete_mission", ("m1",), {})